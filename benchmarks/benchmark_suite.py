@@ -0,0 +1,265 @@
+"""
+Benchmark suite of the stages of htcanalyze on synthetic logs.
+
+Generates data sets of 1k, 100k and 1M user logs with log_generator.py
+and times the LogValidator, the EventHandler, the HTCAnalyzer, the
+HTCSummarizer and both views on them. The results are written as JSON,
+to compare them with the results of another commit:
+
+    python benchmarks/benchmark_suite.py --output before.json
+    git checkout <commit>
+    python benchmarks/benchmark_suite.py --compare before.json
+
+Data sets are kept in --data and reused by later runs.
+The views print at most VIEW_FILES logs, the analyzed view of a
+million logs would only measure the terminal.
+
+Usage: python benchmarks/benchmark_suite.py [--scales N ...] [--jobs N]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess  # nosec B404 - only to get the commit hash
+import sys
+import tempfile
+import time
+from datetime import datetime as date_time
+
+from rich.console import Console
+
+from htcanalyze.log_analyzer.event_handler.event_handler import (
+    SUMMARY_EVENT_TYPES,
+    EventHandler
+)
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+from htcanalyze.log_analyzer.logvalidator import LogValidator
+from htcanalyze.log_summarizer.htcsummarizer import HTCSummarizer
+from htcanalyze.profiler import Profiler, profiling
+from htcanalyze.view.analyzed_logfile_view import AnalyzedLogfileView
+from htcanalyze.view.summarized_logfile_view import SummarizedLogfileView
+
+from log_generator import generate_data_set
+
+SCALES = (1_000, 100_000, 1_000_000)
+VIEW_FILES = 1_000
+# a benchmark is reported as regression if it is this much slower
+REGRESSION_FACTOR = 1.1
+RESULTS_VERSION = 1
+
+
+def quiet_console() -> Console:
+    """Console that renders everything, into memory."""
+    return Console(file=io.StringIO(), width=120, force_terminal=True)
+
+
+def git_commit() -> str:
+    """Returns the commit of the working tree, None outside of git."""
+    try:
+        return subprocess.run(  # nosec B603 B607
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_validator(directory: str, _files, _jobs) -> tuple:
+    validator = LogValidator()
+    valid_files = validator.common_validation(
+        [directory],
+        recursive=True,
+        console=quiet_console()
+    )
+    return sum(1 for _ in valid_files), "files"
+
+
+def bench_event_handler(_directory, files, _jobs) -> tuple:
+    event_handler = EventHandler()
+    n_events = 0
+    for file in files:
+        event_handler.next_file()
+        for event in event_handler.get_events(file):
+            event_handler.get_job_event(event)
+            n_events += 1
+    return n_events, "events"
+
+
+def bench_analyzer(_directory, files, jobs) -> tuple:
+    analyzer = HTCAnalyzer(console=quiet_console(), workers=jobs)
+    return sum(1 for _ in analyzer.analyze(files)), "files"
+
+
+def bench_summarizer(_directory, files, jobs) -> tuple:
+    """Summary mode, only the summarization stage is reported."""
+    analyzer = HTCAnalyzer(
+        console=quiet_console(),
+        workers=jobs,
+        event_types=SUMMARY_EVENT_TYPES
+    )
+    with profiling(Profiler()) as profiler:
+        HTCSummarizer(analyzer.analyze(files)).summarize()
+    stats = profiler.stages["summarization"]
+    return stats.items, "jobs", stats.wall
+
+
+def bench_analyzed_view(_directory, files, _jobs) -> tuple:
+    analyzer = HTCAnalyzer(console=quiet_console())
+    condor_logs = list(analyzer.analyze(files[:VIEW_FILES]))
+    start = time.perf_counter()
+    AnalyzedLogfileView(console=quiet_console()).print_condor_logs(
+        condor_logs
+    )
+    return len(condor_logs), "files", time.perf_counter() - start
+
+
+def bench_summarized_view(_directory, files, jobs) -> tuple:
+    analyzer = HTCAnalyzer(
+        console=quiet_console(),
+        workers=jobs,
+        event_types=SUMMARY_EVENT_TYPES
+    )
+    summarized_condor_logs = HTCSummarizer(
+        analyzer.analyze(files)
+    ).summarize()
+    start = time.perf_counter()
+    SummarizedLogfileView(
+        console=quiet_console()
+    ).print_summarized_condor_logs(
+        summarized_condor_logs,
+        show_histograms=True
+    )
+    return len(summarized_condor_logs), "states", time.perf_counter() - start
+
+
+# benchmark functions return the number of items and their unit,
+# those that need a setup return their own time as third value
+BENCHMARKS = {
+    "LogValidator": bench_validator,
+    "EventHandler": bench_event_handler,
+    "HTCAnalyzer": bench_analyzer,
+    "HTCSummarizer": bench_summarizer,
+    "AnalyzedLogfileView": bench_analyzed_view,
+    "SummarizedLogfileView": bench_summarized_view
+}
+
+
+def run_benchmark(name, directory, files, jobs, repeat) -> dict:
+    """Run the benchmark repeat times, the fastest run is reported."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = BENCHMARKS[name](directory, files, jobs)
+        elapsed = time.perf_counter() - start
+        if len(result) == 3:
+            items, unit, elapsed = result
+        else:
+            items, unit = result
+        if best is None or elapsed < best["seconds"]:
+            best = {
+                "benchmark": name,
+                "files": len(files),
+                "seconds": elapsed,
+                "items": items,
+                "unit": unit,
+                "items_per_second": items / elapsed if elapsed else None
+            }
+    print(
+        f"{name:<22} {len(files):>9} files {best['seconds']:9.3f} s "
+        f"{best['items_per_second'] or 0:>12,.0f} {unit}/s"
+    )
+    return best
+
+
+def compare(results: list, baseline_file: str) -> int:
+    """
+    Print the ratio of the times to those of the baseline.
+
+    :return: number of regressions
+    """
+    with open(baseline_file) as read_file:
+        baseline = json.load(read_file)
+    baseline_times = {
+        (result["benchmark"], result["files"]): result["seconds"]
+        for result in baseline["results"]
+    }
+    print(f"\nCompared with {baseline.get('commit') or baseline_file}:")
+    n_regressions = 0
+    for result in results:
+        key = (result["benchmark"], result["files"])
+        if key not in baseline_times or not baseline_times[key]:
+            continue
+        ratio = result["seconds"] / baseline_times[key]
+        regression = ratio > REGRESSION_FACTOR
+        n_regressions += regression
+        print(
+            f"{key[0]:<22} {key[1]:>9} files {ratio:9.2f} x the time"
+            + ("  REGRESSION" if regression else "")
+        )
+    return n_regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        choices=list(BENCHMARKS),
+        default=list(BENCHMARKS)
+    )
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--data",
+        default=os.path.join(tempfile.gettempdir(), "htcanalyze-benchmark")
+    )
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", metavar="BASELINE", default=None)
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = []
+    for n_files in args.scales:
+        directory = os.path.join(args.data, f"seed{args.seed}-{n_files}")
+        start = time.perf_counter()
+        files = generate_data_set(directory, n_files, args.seed)
+        print(
+            f"{n_files} logs in {directory} "
+            f"({time.perf_counter() - start:.1f} s)"
+        )
+        for name in args.benchmarks:
+            results.append(
+                run_benchmark(name, directory, files, args.jobs, args.repeat)
+            )
+
+    output = args.output or f"benchmark-{commit or 'results'}.json"
+    with open(output, "w") as write_file:
+        json.dump(
+            {
+                "version": RESULTS_VERSION,
+                "commit": commit,
+                "date": date_time.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed": args.seed,
+                "jobs": args.jobs,
+                "results": results
+            },
+            write_file,
+            indent=2
+        )
+    print(f"Results written to {output}")
+
+    if args.compare is not None and compare(results, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
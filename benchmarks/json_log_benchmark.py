@@ -0,0 +1,102 @@
+"""
+Benchmark of reading the text and the JSON format of HTCondor user logs.
+
+Writes the same synthetic log in both formats and reads it with the
+UserLogParser, respectively the JsonLogParser, once with all events
+and once with the event types of the summary mode.
+
+Usage: python benchmarks/json_log_benchmark.py [--jobs N]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from htcanalyze.log_analyzer.event_handler.event_handler import (
+    SUMMARY_EVENT_TYPES
+)
+from htcanalyze.log_analyzer.event_handler.json_log_parser import (
+    JsonLogParser
+)
+from htcanalyze.log_analyzer.event_handler.user_log_parser import (
+    UserLogParser
+)
+
+TEMPLATE_LOG = os.path.join(
+    os.path.dirname(__file__),
+    "..", "tests", "test_logs", "valid_logs", "job_evicted.log"
+)
+TEMPLATE_JOB_ID = "(164275.000.000)"
+
+
+def write_logs(directory: str, n_jobs: int) -> (str, str):
+    """
+    Write the events of n_jobs copies of the template job,
+    in the text and in the JSON format.
+
+    :return: paths of the text log and of the JSON log
+    """
+    with open(TEMPLATE_LOG) as template_file:
+        template = template_file.read().rstrip("\n") + "\n"
+    text_file = os.path.join(directory, "benchmark.log")
+    with open(text_file, "w") as write_file:
+        for job in range(n_jobs):
+            write_file.write(
+                template.replace(TEMPLATE_JOB_ID, f"({job}.000.000)")
+            )
+    json_file = os.path.join(directory, "benchmark.json.log")
+    with open(json_file, "w") as write_file:
+        write_file.write("[\n")
+        separator = ""
+        for event in UserLogParser(text_file).events():
+            write_file.write(separator)
+            json.dump(event.to_dict(), write_file, indent=4)
+            separator = "\n,\n"
+        write_file.write("\n")
+    return text_file, json_file
+
+
+def measure(name: str, parser) -> float:
+    """Read all events and print the elapsed time."""
+    start = time.perf_counter()
+    n_events = sum(1 for _ in parser.events())
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(parser.file) / 1024 ** 2
+    print(
+        f"{name:<24} {elapsed:8.3f} s "
+        f"{parser.n_events / elapsed / 1e3:8.1f} k events/s "
+        f"{size / elapsed:8.1f} MB/s "
+        f"({n_events} events parsed)"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        text_file, json_file = write_logs(directory, args.jobs)
+        print(
+            f"{args.jobs} jobs, "
+            f"text: {os.path.getsize(text_file) / 1024 ** 2:.1f} MB, "
+            f"JSON: {os.path.getsize(json_file) / 1024 ** 2:.1f} MB"
+        )
+        text = measure("text", UserLogParser(text_file))
+        elapsed = measure("JSON", JsonLogParser(json_file))
+        print(f"{'':<24} {elapsed / text:8.2f} x the time of text")
+        text = measure(
+            "text (summary events)",
+            UserLogParser(text_file, event_types=SUMMARY_EVENT_TYPES)
+        )
+        elapsed = measure(
+            "JSON (summary events)",
+            JsonLogParser(json_file, event_types=SUMMARY_EVENT_TYPES)
+        )
+        print(f"{'':<24} {elapsed / text:8.2f} x the time of text")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""
+Seeded generator of synthetic HTCondor user logs.
+
+Writes user logs in the default text format with the job histories of a
+busy pool: normal and abnormal terminations, bursts of image size
+updates, evictions, shadow exceptions, holds and releases, aborted,
+idle and running jobs, GPU jobs and clusters of several procs sharing
+a log. Each file is generated from (seed, index) alone, so the first
+files of a large data set are the same as those of a small one.
+
+Usage: python benchmarks/log_generator.py DIRECTORY [--files N] [--seed S]
+"""
+import argparse
+import json
+import os
+import random
+from datetime import datetime as date_time, timedelta
+from typing import List, Tuple
+
+# changes whenever the generated logs change, see generate_data_set
+GENERATOR_VERSION = 2
+# files per subdirectory, a million files in a single one are unwieldy
+FILES_PER_DIRECTORY = 1000
+MANIFEST = "manifest.json"
+
+# job histories and their weights
+SCENARIOS = {
+    "normal": 50,
+    "gpu": 10,
+    "evicted": 10,
+    "held": 6,
+    "held_aborted": 4,
+    "abnormal": 5,
+    "aborted": 5,
+    "running": 6,
+    "idle": 4
+}
+# probability that a log holds a cluster of several procs
+MULTI_PROC_RATE = 0.1
+MAX_PROCS = 8
+MAX_RUNTIME = 12 * 3600
+
+SUBMIT_HOST = "10.0.8.10"
+EXECUTE_HOSTS = [f"10.0.9.{i}" for i in range(1, 65)]
+GPU_HOSTS = [f"10.0.10.{i}" for i in range(1, 9)]
+HOLD_REASONS = [
+    ("Job has encountered an out-of-memory event.", 34, 0),
+    ("Error from starter: disk quota exceeded.", 13, 122),
+    ("Failed to transfer files: no such file or directory.", 12, 2)
+]
+
+Event = Tuple[date_time, str]
+
+
+def _host(address: str, rng: random.Random) -> str:
+    return (
+        f"<{address}:9618?addrs={address}-9618&noUDP"
+        f"&sock={rng.randrange(1000, 99999)}_{rng.randrange(16 ** 4):04x}_3>"
+    )
+
+
+def _usage(seconds: int) -> str:
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{days} {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _resource_row(
+        name: str,
+        usage: str,
+        request: int,
+        allocated: int,
+        assigned: str = None
+) -> str:
+    """
+    Returns a row of the resource table, the values are right-aligned
+    to the end of the column headers like HTCondor writes them.
+    """
+    row = f"\t   {name:<20} : {usage:>8} {request:>8} {allocated:>9}"
+    return row if assigned is None else f"{row} {assigned}"
+
+
+def _resources(rng: random.Random, memory: int, gpu: bool) -> str:
+    cpus = rng.choice([1, 1, 1, 2, 4, 8])
+    request_memory = rng.choice([1024, 2048, 4096, 8192, 20480])
+    request_disk = rng.choice([1048576, 10485760, 73400320])
+    lines = [
+        "\tPartitionable Resources :    Usage  Request Allocated"
+        + (" Assigned" if gpu else ""),
+        _resource_row(
+            "Cpus", f"{rng.uniform(0.05, cpus):.2f}", cpus, cpus
+        ),
+        # integer usage is aligned to the decimal point of the floats
+        _resource_row(
+            "Disk (KB)",
+            f"{rng.randrange(1, 5000)}   ",
+            request_disk,
+            request_disk + rng.randrange(10 ** 6)
+        )
+    ]
+    if gpu:
+        lines.append(_resource_row(
+            "Gpus",
+            f"{rng.uniform(0.1, 1):.2f}",
+            1,
+            1,
+            f"\"CUDA{rng.randrange(8)}\""
+        ))
+    lines.append(_resource_row(
+        "Memory (MB)", f"{memory}   ", request_memory, request_memory
+    ))
+    return "\n".join(lines)
+
+
+def _usage_lines(run_seconds: int, total: bool) -> str:
+    user = run_seconds * 4 // 5
+    system = run_seconds - user
+    lines = [
+        f"\t\tUsr {_usage(user)}, Sys {_usage(system)}  -  Run Remote Usage",
+        "\t\tUsr 0 00:00:00, Sys 0 00:00:00  -  Run Local Usage"
+    ]
+    if total:
+        lines += [
+            f"\t\tUsr {_usage(user)}, Sys {_usage(system)}"
+            "  -  Total Remote Usage",
+            "\t\tUsr 0 00:00:00, Sys 0 00:00:00  -  Total Local Usage"
+        ]
+    lines += [
+        "\t0  -  Run Bytes Sent By Job",
+        "\t0  -  Run Bytes Received By Job"
+    ]
+    if total:
+        lines += [
+            "\t0  -  Total Bytes Sent By Job",
+            "\t0  -  Total Bytes Received By Job"
+        ]
+    return "\n".join(lines)
+
+
+class _Job:
+    """Writes the events of one job, see generate_job."""
+
+    def __init__(self, rng: random.Random, cluster: int, proc: int):
+        self.rng = rng
+        self.job_id = f"({cluster:03d}.{proc:03d}.000)"
+        self.events: List[Event] = []
+        self.memory = rng.randrange(10, 4000)
+
+    def add(self, time: date_time, code: int, text: str):
+        header = (
+            f"{code:03d} {self.job_id} {time.strftime('%m/%d %H:%M:%S')} "
+        )
+        self.events.append((time, header + text))
+
+    def submit(self, time: date_time):
+        self.add(
+            time,
+            0,
+            f"Job submitted from host: {_host(SUBMIT_HOST, self.rng)}"
+        )
+
+    def execute(self, time: date_time, gpu: bool):
+        address = self.rng.choice(GPU_HOSTS if gpu else EXECUTE_HOSTS)
+        self.add(
+            time,
+            1,
+            f"Job executing on host: {_host(address, self.rng)}"
+        )
+
+    def image_sizes(self, start: date_time, end: date_time):
+        """Image size updates every 5 minutes, bursts at the start."""
+        rng = self.rng
+        time = start + timedelta(seconds=rng.randrange(2, 10))
+        memory = rng.randrange(1, 50)
+        burst = rng.randrange(0, 6)
+        while time < end:
+            memory = min(self.memory, memory + rng.randrange(0, 400))
+            self.add(
+                time,
+                6,
+                f"Image size of job updated: {memory * 1024 + 512}\n"
+                f"\t{memory}  -  MemoryUsage of job (MB)\n"
+                f"\t{memory * 1024}  -  ResidentSetSize of job (KB)"
+            )
+            if burst:
+                burst -= 1
+                time += timedelta(seconds=rng.randrange(1, 5))
+            else:
+                time += timedelta(seconds=300 + rng.randrange(3))
+
+    def evicted(self, time: date_time, run_seconds: int, gpu: bool):
+        self.add(
+            time,
+            4,
+            "Job was evicted.\n"
+            "\t(0) Job was not checkpointed.\n"
+            f"{_usage_lines(run_seconds, total=False)}\n"
+            f"{_resources(self.rng, self.memory, gpu)}"
+        )
+
+    def shadow_exception(self, time: date_time, reason: str):
+        self.add(
+            time,
+            7,
+            "Shadow exception!\n"
+            f"\tError from slot1_4@cpu1.htc.example.org: {reason}\n"
+            "\t0  -  Run Bytes Sent By Job\n"
+            "\t0  -  Run Bytes Received By Job"
+        )
+
+    def held(self, time: date_time, reason: str, code: int, subcode: int):
+        self.add(
+            time,
+            12,
+            "Job was held.\n"
+            f"\tError from slot1_4@cpu1.htc.example.org: {reason}\n"
+            f"\tCode {code} Subcode {subcode}"
+        )
+
+    def released(self, time: date_time):
+        self.add(
+            time,
+            13,
+            "Job was released.\n\tvia condor_release (by user bench)"
+        )
+
+    def aborted(self, time: date_time):
+        self.add(
+            time,
+            9,
+            "Job was aborted by the user.\n\tvia condor_rm (by user bench)"
+        )
+
+    def terminated(
+            self,
+            time: date_time,
+            run_seconds: int,
+            gpu: bool,
+            signal: int = None
+    ):
+        if signal is None:
+            status = (
+                "\t(1) Normal termination "
+                f"(return value {self.rng.choice([0, 0, 0, 0, 1])})"
+            )
+        else:
+            status = (
+                f"\t(0) Abnormal termination (signal {signal})\n"
+                "\t(0) No core file"
+            )
+        self.add(
+            time,
+            5,
+            "Job terminated.\n"
+            f"{status}\n"
+            f"{_usage_lines(run_seconds, total=True)}\n"
+            f"{_resources(self.rng, self.memory, gpu)}"
+        )
+
+    def run(self, start: date_time, gpu: bool) -> Tuple[date_time, int]:
+        """Execute with image size updates, returns the end and runtime."""
+        # most jobs are short, few run for hours
+        run_seconds = 60 + min(
+            int(self.rng.expovariate(1 / 1800)),
+            MAX_RUNTIME
+        )
+        end = start + timedelta(seconds=run_seconds)
+        self.execute(start, gpu)
+        self.image_sizes(start, end)
+        return end, run_seconds
+
+
+def generate_job(
+        rng: random.Random,
+        cluster: int,
+        proc: int,
+        submitted: date_time,
+        scenario: str
+) -> List[Event]:
+    """
+    Returns the events of a job, ordered by time.
+
+    :param rng: random number generator of the log file
+    :param cluster: cluster id
+    :param proc: process id
+    :param submitted: submission time
+    :param scenario: job history, see SCENARIOS
+    """
+    job = _Job(rng, cluster, proc)
+    gpu = scenario == "gpu"
+    job.submit(submitted)
+    if scenario == "idle":
+        return job.events
+    started = submitted + timedelta(seconds=rng.randrange(1, 7200))
+    if scenario == "aborted":
+        job.aborted(started)
+        return job.events
+
+    end, run_seconds = job.run(started, gpu)
+    if scenario == "running":
+        return job.events
+    if scenario == "evicted":
+        job.evicted(end, run_seconds, gpu)
+        end, run_seconds = job.run(end + timedelta(seconds=1), gpu)
+    elif scenario in ("held", "held_aborted"):
+        reason, code, subcode = rng.choice(HOLD_REASONS)
+        job.shadow_exception(end, reason)
+        job.held(end, reason, code, subcode)
+        end += timedelta(seconds=rng.randrange(60, 86400))
+        if scenario == "held_aborted":
+            job.aborted(end)
+            return job.events
+        job.released(end)
+        end, run_seconds = job.run(end + timedelta(seconds=30), gpu)
+    job.terminated(
+        end,
+        run_seconds,
+        gpu,
+        signal=rng.choice([6, 9, 11]) if scenario == "abnormal" else None
+    )
+    return job.events
+
+
+def generate_log(seed: int, index: int) -> str:
+    """
+    Returns the content of the log file index of the data set seed.
+
+    A log holds a single job or, like a cluster submitted with
+    queue N, several procs with their events interleaved by time.
+    """
+    rng = random.Random(f"{seed}-{index}")
+    n_procs = (
+        rng.randrange(2, MAX_PROCS + 1)
+        if rng.random() < MULTI_PROC_RATE else 1
+    )
+    # far from the turn of the year, the time stamps have no year
+    submitted = date_time(2021, 2, 1) + timedelta(
+        seconds=rng.randrange(180 * 86400)
+    )
+    scenarios, weights = zip(*SCENARIOS.items())
+    events: List[Event] = []
+    for proc in range(n_procs):
+        events.extend(generate_job(
+            rng,
+            cluster=index,
+            proc=proc,
+            submitted=submitted + timedelta(seconds=proc),
+            scenario=rng.choices(scenarios, weights)[0]
+        ))
+    events.sort(key=lambda event: event[0])
+    return "".join(f"{text}\n...\n" for _, text in events)
+
+
+def log_path(directory: str, index: int) -> str:
+    """Returns the path of the log file index in the data set directory."""
+    return os.path.join(
+        directory,
+        f"{index // FILES_PER_DIRECTORY:04d}",
+        f"job_{index:07d}.log"
+    )
+
+
+def write_logs(directory: str, n_files: int, seed: int = 0) -> List[str]:
+    """
+    Write n_files user logs into subdirectories of directory.
+
+    :return: paths of the log files
+    """
+    files = []
+    for index in range(n_files):
+        file = log_path(directory, index)
+        if index % FILES_PER_DIRECTORY == 0:
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+        with open(file, "w") as log_file:
+            log_file.write(generate_log(seed, index))
+        files.append(file)
+    return files
+
+
+def generate_data_set(
+        directory: str,
+        n_files: int,
+        seed: int = 0
+) -> List[str]:
+    """
+    Write the data set, unless the directory holds it already.
+
+    The manifest records the seed, number of files and generator
+    version, so a data set is reused as long as they are the same.
+
+    :return: paths of the log files
+    """
+    manifest = {
+        "generator_version": GENERATOR_VERSION,
+        "seed": seed,
+        "files": n_files
+    }
+    manifest_file = os.path.join(directory, MANIFEST)
+    try:
+        with open(manifest_file) as read_file:
+            if json.load(read_file) == manifest:
+                return [log_path(directory, i) for i in range(n_files)]
+    except (OSError, ValueError):
+        pass
+    files = write_logs(directory, n_files, seed)
+    with open(manifest_file, "w") as write_file:
+        json.dump(manifest, write_file)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("directory")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    files = generate_data_set(args.directory, args.files, args.seed)
+    size = sum(os.path.getsize(file) for file in files)
+    print(
+        f"{len(files)} logs, {size / 1024 ** 2:.1f} MB "
+        f"in {args.directory}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Memory benchmark of the analyzed jobs.
+
+Analyzes synthetic logs written by log_generator.py and measures
+the bytes allocated per analyzed job (CondorLog) and per object of the
+classes created for each event, with tracemalloc.
+
+Usage: python benchmarks/memory_benchmark.py [--files N]
+"""
+import argparse
+import io
+import os
+import tempfile
+import tracemalloc
+from datetime import datetime as date_time
+
+from rich.console import Console
+
+from htcanalyze.log_analyzer.condor_log.logresource import (
+    CPULogResource,
+    DiskLogResource,
+    LogResources,
+    MemoryLogResource
+)
+from htcanalyze.log_analyzer.condor_log.time_manager import JobTimes
+from htcanalyze.log_analyzer.event_handler.job_events import (
+    ImageSizeEvent,
+    JobExecutionEvent,
+    NormalTerminationEvent
+)
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+
+from log_generator import generate_data_set
+
+N_OBJECTS = 100_000
+TIME_STAMP = date_time(2021, 7, 11, 20, 41)
+OBJECTS = {
+    "ImageSizeEvent": lambda: ImageSizeEvent(6, TIME_STAMP, 1024, 1, 1024),
+    "JobExecutionEvent": lambda: JobExecutionEvent(1, TIME_STAMP, "node"),
+    "NormalTerminationEvent": lambda: NormalTerminationEvent(
+        5, TIME_STAMP, return_value=0
+    ),
+    "CPULogResource": lambda: CPULogResource(0.5, 1.0, 1.0),
+    "LogResources": lambda: LogResources(
+        CPULogResource(0.5, 1.0, 1.0),
+        DiskLogResource(1.0, 2.0, 2.0),
+        MemoryLogResource(1.0, 2.0, 2.0)
+    ),
+    "JobTimes": JobTimes
+}
+
+
+def allocated(function) -> (int, object):
+    """Returns the bytes allocated by function and its result."""
+    start = tracemalloc.get_traced_memory()[0]
+    result = function()
+    return tracemalloc.get_traced_memory()[0] - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--data",
+        default=os.path.join(tempfile.gettempdir(), "htcanalyze-benchmark")
+    )
+    args = parser.parse_args()
+
+    files = generate_data_set(
+        os.path.join(args.data, f"seed{args.seed}-{args.files}"),
+        args.files,
+        args.seed
+    )
+    analyzer = HTCAnalyzer(console=Console(file=io.StringIO()))
+    tracemalloc.start()
+    for name, create in OBJECTS.items():
+        size, _ = allocated(lambda: [create() for _ in range(N_OBJECTS)])
+        # without the list of the objects
+        size -= N_OBJECTS * 8
+        print(f"{name:<24} {size / N_OBJECTS:8.1f} bytes")
+    size, condor_logs = allocated(lambda: list(analyzer.analyze(files)))
+    tracemalloc.stop()
+    print(
+        f"{'analyzed job':<24} {size / len(condor_logs):8.1f} bytes "
+        f"({len(condor_logs)} jobs of {len(files)} files)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of the lookups of job states in dictionaries.
+
+Groups error events by their error state with the ErrorEventManager,
+for an increasing number of distinct error states. The states are
+singletons hashed by identity, the time per event stays the same.
+The states of earlier versions had the same hash and compared equal
+to instances of the same class; they are emulated with the grouping of
+a plain dictionary, each lookup compared the key with every state.
+
+Usage: python benchmarks/state_lookup_benchmark.py [--events N]
+"""
+import argparse
+import time
+from datetime import datetime as date_time
+
+from htcanalyze.log_analyzer.condor_log.error_events import (
+    LogfileErrorEvents
+)
+from htcanalyze.log_analyzer.event_handler.job_events import ErrorEvent
+from htcanalyze.log_analyzer.event_handler.states import ErrorState
+from htcanalyze.log_summarizer.summarizer.error_event_summarizer import (
+    ErrorEventManager
+)
+
+N_STATES = (1, 10, 100, 1000)
+TIME_STAMP = date_time(2021, 7, 11, 20, 41)
+
+
+class CollidingState:
+    """Hashes and compares like the states of earlier versions."""
+    __slots__ = ("state",)
+
+    def __init__(self, state):
+        self.state = state
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingState) and isinstance(
+            other.state, self.state.__class__
+        )
+
+    def __hash__(self):
+        return hash(property)
+
+
+def error_states(n_states: int) -> list:
+    """Returns n_states distinct error states."""
+    return [
+        type(f"BenchmarkState{i}", (ErrorState,), {
+            "__slots__": (), "name": f"BENCHMARK_{i}"
+        })()
+        for i in range(n_states)
+    ]
+
+
+def group(n_events: int, states: list) -> float:
+    """Seconds per event to group n_events by their state."""
+    error_events = [
+        ErrorEvent(i, TIME_STAMP, states[i % len(states)], "reason")
+        for i in range(n_events)
+    ]
+    start = time.perf_counter()
+    ErrorEventManager().add_events(LogfileErrorEvents(error_events, "log"))
+    return (time.perf_counter() - start) / n_events
+
+
+def group_colliding(n_events: int, states: list) -> float:
+    """Seconds per event to count n_events by colliding states."""
+    keys = [
+        CollidingState(states[i % len(states)]) for i in range(n_events)
+    ]
+    counts = {}
+    start = time.perf_counter()
+    for key in keys:
+        counts[key] = counts.get(key, 0) + 1
+    return (time.perf_counter() - start) / n_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--states", type=int, nargs="+", default=N_STATES)
+    args = parser.parse_args()
+
+    print(f"{'States':>8} {'Singletons':>14} {'Colliding hash':>16}")
+    for n_states in args.states:
+        states = error_states(n_states)
+        print(
+            f"{n_states:>8} "
+            f"{group(args.events, states) * 1e9:>11.0f} ns "
+            f"{group_colliding(args.events, states) * 1e9:>13.0f} ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
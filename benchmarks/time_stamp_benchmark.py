@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of the time stamp decoding of HTCJobEventWrapper.
+
+Decodes the EventTime of a synthetic log with strptime
+and with the fixed-format decoder of htcanalyze.
+
+Usage: python benchmarks/time_stamp_benchmark.py [--events N]
+"""
+import argparse
+import random
+import time
+from datetime import datetime as date_time, timedelta
+
+from htcanalyze.globals import STRP_FORMAT
+from htcanalyze.log_analyzer.event_handler.time_stamp import (
+    decode_epoch,
+    decode_time_stamp
+)
+
+
+def synthetic_event_times(n_events: int, seed: int = 0) -> list:
+    """
+    Returns the EventTime strings of a synthetic log.
+
+    Like in a busy log, several events are logged per second.
+    """
+    rng = random.Random(seed)
+    date = date_time(2021, 7, 11, 20, 41)
+    event_times = []
+    for _ in range(n_events):
+        date += timedelta(seconds=rng.choice([0, 0, 0, 1, 1, 2, 60]))
+        event_times.append(date.strftime(STRP_FORMAT))
+    return event_times
+
+
+def measure(name: str, decode, event_times: list) -> float:
+    """Decode all event times and print the elapsed time."""
+    start = time.perf_counter()
+    for event_time in event_times:
+        decode(event_time)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<20} {elapsed:8.3f} s "
+        f"{len(event_times) / elapsed / 1e6:8.2f} M events/s"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    event_times = synthetic_event_times(args.events)
+    print(
+        f"{args.events} events, "
+        f"{len(set(event_times))} distinct time stamps"
+    )
+    baseline = measure(
+        "strptime",
+        lambda event_time: date_time.strptime(event_time, STRP_FORMAT),
+        event_times
+    )
+    elapsed = measure(
+        "sliced (no cache)", decode_time_stamp.__wrapped__, event_times
+    )
+    print(f"{'':<20} {baseline / elapsed:8.1f} x faster")
+    decode_time_stamp.cache_clear()
+    elapsed = measure("sliced + cache", decode_time_stamp, event_times)
+    print(f"{'':<20} {baseline / elapsed:8.1f} x faster")
+    decode_epoch.cache_clear()
+    elapsed = measure("epoch + cache", decode_epoch, event_times)
+    print(f"{'':<20} {baseline / elapsed:8.1f} x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import json
 import sys
 import logging
 from abc import ABC
+from functools import lru_cache
 
 
 class ReprObject(ABC):
@@ -11,6 +12,8 @@ class ReprObject(ABC):
     inheriting from it can be easily printed to the command line represented by
     a self.__dict__ with indentation.
     """
+    __slots__ = ()
+
     @staticmethod
     def get_dict_or_str(obj):
         """Try to get __dict__ of obj. Else return str(obj)."""
@@ -26,6 +29,51 @@ class ReprObject(ABC):
         )
 
 
+@lru_cache(maxsize=None)
+def slot_names(cls) -> tuple:
+    """Returns the names of the __slots__ of cls and its base classes."""
+    return tuple(
+        name
+        for base in reversed(cls.__mro__)
+        for name in base.__dict__.get("__slots__", ())
+    )
+
+
+class SlotsReprObject(ReprObject):
+    """
+    ReprObject keeping its attributes in __slots__.
+
+    Objects created per event or per job save the instance dictionary,
+    the classes declare their attributes in __slots__ instead
+    (subclasses without new attributes declare empty __slots__).
+    __dict__ is a representation of the slots, hence the repr is the
+    same, and the objects are pickled as a tuple of the slots.
+    """
+    __slots__ = ()
+
+    @property
+    def __dict__(self):
+        return {
+            name: getattr(self, name, None)
+            for name in slot_names(self.__class__)
+        }
+
+    def __getstate__(self):
+        return tuple(
+            getattr(self, name, None)
+            for name in slot_names(self.__class__)
+        )
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # pickled before the class had __slots__
+            state = tuple(
+                state.get(name) for name in slot_names(self.__class__)
+            )
+        for name, value in zip(slot_names(self.__class__), state):
+            object.__setattr__(self, name, value)
+
+
 def setup_logging_tool(verbose_mode):
     """
         Set up the logging device.
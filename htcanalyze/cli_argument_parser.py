@@ -10,6 +10,9 @@ from .globals import (
     EXT_ERR_DEFAULT,
     TOLERATED_USAGE,
     BAD_USAGE,
+    JOBS_DEFAULT,
+    OUTPUT_FORMATS,
+    OUTPUT_FORMAT_DEFAULT,
     ARGUMENT_ERROR
 )
 
@@ -112,7 +115,9 @@ def setup_parser() -> CLIArgumentParser:
     parser.add_argument(
         "paths",
         nargs="*",
-        help="Directory of file paths for log files"
+        help="Directory of file paths for log files, "
+             "compressed files and tar archives, "
+             "archive members as archive::member"
     )
     parser.add_argument(
         "-r", "--recursive",
@@ -137,6 +142,34 @@ def setup_parser() -> CLIArgumentParser:
         default=False,
         help="Analyze given files one by one"
     )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        default=False,
+        help="Keep the log files open and show a live summary "
+             "of the job states, updated as new events are written"
+    )
+    parser.add_argument(
+        "--event-log",
+        action="store_true",
+        default=False,
+        help="The paths are global event logs (EVENT_LOG) of a schedd, "
+             "read with their rotated files, oldest first"
+    )
+    parser.add_argument(
+        "--emit-partial",
+        metavar="FILE",
+        default=None,
+        help="Summarize and write the partial summary to FILE "
+             "instead of printing it, e.g. on each submit host"
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        default=False,
+        help="The paths are partial summaries written with "
+             "--emit-partial, merge them and print the summary"
+    )
     parser.add_argument(
         "--ext-log",
         help="Suffix of HTCondor job logs (default: none)",
@@ -162,6 +195,14 @@ def setup_parser() -> CLIArgumentParser:
         choices=allowed_show_vals,
         help="Show more details"
     )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default=OUTPUT_FORMAT_DEFAULT,
+        help="Print tables (rich) or stream one record per job, "
+             "respectively per summarized state, "
+             "as JSON Lines (jsonl) or CSV (default: rich)"
+    )
     parser.add_argument(
         "--rdns-lookup",
         action="store_true",
@@ -169,6 +210,49 @@ def setup_parser() -> CLIArgumentParser:
         help="Resolve the ip-address of an execution nodes"
              " to their dns entry"
     )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=JOBS_DEFAULT,
+        help="Number of worker processes to analyze the files in parallel, "
+             "0 uses all available cpus (default: 1)"
+    )
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Do not use the cache of validated files "
+             "and analyzed, terminated job logs"
+    )
+    cache.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        default=False,
+        help="Drop the cache of validated files and analyzed job logs "
+             "and fill it again"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Print the wall time, CPU time and throughput "
+             "of each stage of the run to stderr"
+    )
+    parser.add_argument(
+        "--profile-pstats",
+        metavar="FILE",
+        default=None,
+        help="Profile the run with cProfile and dump the statistics "
+             "to FILE, implies --profile"
+    )
+    parser.add_argument(
+        "--profile-trace",
+        metavar="FILE",
+        default=None,
+        help="Write the stages as Chrome trace-event JSON to FILE, "
+             "implies --profile"
+    )
     parser.add_argument(
         "--tolerated-usage",
         type=float,
@@ -14,12 +14,87 @@ CONFIG_PATHS = [
 
 ALLOWED_SHOW_VALUES = [
     "htc-err",
-    "htc-out"
+    "htc-out",
+    "histograms"
 ]
 
+# rich prints tables, the others stream one record per job or summary
+OUTPUT_FORMATS = ["rich", "jsonl", "csv"]
+OUTPUT_FORMAT_DEFAULT = "rich"
+
 EXT_LOG_DEFAULT = ".log"
 EXT_OUT_DEFAULT = ".out"
 EXT_ERR_DEFAULT = ".err"
+# separates a tar archive and the path of a member: jobs.tar.zst::job.log
+ARCHIVE_MEMBER_SEPARATOR = "::"
+
+# Parallel analysis
+JOBS_DEFAULT = 1
+# chunks sent to the process pool per worker, to balance the load
+CHUNKS_PER_WORKER = 4
+MAX_CHUNK_SIZE = 256
+
+# global event log (EVENT_LOG), jobs kept in memory until they terminate,
+# the longest waiting jobs are given out incomplete if exceeded
+EVENT_LOG_MAX_JOBS = 1_000_000
+
+# threads reading the headers of log files while validating
+VALIDATION_WORKERS = 16
+# maximum number of files validated by one task of the threads
+VALIDATION_BATCH_SIZE = 256
+
+# Analysis cache
+CACHE_MAX_SIZE = 512 * 1024 ** 2  # bytes
+# ImageSizeEvents kept per job in the cache
+CACHE_MAX_RAM_HISTORY = 256
+# bytes of new entries and checkpoints kept before they are written
+CACHE_WRITE_SIZE = 16 * 1024 ** 2
+# bytes before the offset of a checkpoint, that must not change
+CHECKPOINT_TAIL_SIZE = 64
+# layout of the analysis cache tables, older tables are dropped
+ANALYSIS_CACHE_VERSION = 4
+
+
+def get_cache_file() -> str:
+    """
+    Returns the default path of the cache file,
+    XDG_CACHE_HOME is read when a cache is created.
+    """
+    return os.path.join(
+        os.environ.get("XDG_CACHE_HOME", "~/.cache"),
+        get_package_name(),
+        "analysis_cache.sqlite"
+    )
+
+
+# reverse DNS lookups of the execution hosts
+RDNS_WORKERS = 16
+RDNS_TIMEOUT = 2.0  # seconds per lookup
+# CondorLogs whose host addresses are resolved at once
+RDNS_BATCH_SIZE = 1024
+RDNS_TTL = 24 * 3600  # seconds
+RDNS_NEGATIVE_TTL = 3600  # seconds, failed lookups
+RDNS_CACHE_MAX_ENTRIES = 65536
+
+# rows of the job table the summarizers reduce over at once
+JOB_TABLE_CHUNK_SIZE = 65536
+
+# file header of partial summaries, see HTCSummarizer.write_partial,
+# the version changes with the layout of the summarizers
+PARTIAL_SUMMARY_HEADER = b"HTCANALYZE-PARTIAL\n"
+PARTIAL_SUMMARY_VERSION = 3
+
+# distribution statistics in summary mode
+QUANTILES = (0.5, 0.9, 0.99)
+# size of the quantile sketches, quantiles are exact up to this many jobs
+SKETCH_SIZE = 200
+HISTOGRAM_BINS = 20
+
+# follow mode, seconds between two redraws of the live summary
+FOLLOW_REFRESH_INTERVAL = 1.0
+
+# --profile, maximum number of stage spans kept for the trace-event file
+PROFILE_MAX_TRACE_EVENTS = 100_000
 
 # Exit Codes
 NORMAL_EXECUTION = 0
@@ -38,3 +113,5 @@ MAX_ERROR_LIMIT = 10
 # HTCondor date format
 STRP_FORMAT = "%Y-%m-%dT%H:%M:%S"
 STRF_FORMAT = "%m-%d %H:%M:%S"
+# number of decoded time stamps remembered, many events share a second
+TIME_STAMP_CACHE_SIZE = 4096
@@ -0,0 +1,481 @@
+"""Persistent on-disk cache of analyzed log files."""
+
+import logging
+import os
+import pickle  # nosec B403 - the cache is written by htcanalyze only
+import sqlite3
+import time
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from .condor_log.condor_log import CondorLog
+from .sqlite_cache import SQLiteCache
+from .event_handler.states import TerminationState
+from htcanalyze.globals import (
+    ANALYSIS_CACHE_VERSION,
+    CACHE_MAX_SIZE,
+    CACHE_MAX_RAM_HISTORY,
+    CACHE_WRITE_SIZE,
+    CHECKPOINT_TAIL_SIZE
+)
+
+
+def _event_types_key(event_types: Optional[Collection]) -> str:
+    """Returns the event types as key of the cache, "" for all events."""
+    if event_types is None:
+        return ""
+    return ",".join(str(int(event_type)) for event_type in sorted(
+        event_types
+    ))
+
+
+class AnalysisCache(SQLiteCache):
+    """
+    Caches the CondorLogs of log files in a single SQLite file.
+
+    A log file is cached only if all of its jobs are terminated,
+    because the log of a job that is still idle or running will grow.
+    Entries are invalidated, if the size, mtime or inode
+    of a log file changed since it was analyzed.
+
+    For log files with jobs that are still idle or running, a checkpoint
+    can be stored instead: the byte offset of the last complete event
+    with the state of the reader at that offset.
+    A checkpoint stays valid as long as the file is only appended to,
+    i.e. the inode is the same, the file did not shrink
+    and the bytes right before the offset did not change.
+
+    Entries and checkpoints are also keyed by the event types read,
+    e.g. SUMMARY_EVENT_TYPES, the entry of all events of a log file
+    is returned for any event types.
+
+    Tables written by a version with another ANALYSIS_CACHE_VERSION
+    are dropped when the cache is opened.
+
+    New entries and checkpoints and the last accesses are kept in
+    memory and written in a single transaction, see write_pending,
+    at the latest when the cache is closed.
+    If the cache grows beyond max_size bytes, the least recently
+    used entries and checkpoints are evicted.
+
+    The cache can be pickled and sent to worker processes,
+    see SQLiteCache.
+
+    :param path: path of the cache file, by default get_cache_file()
+    :param max_size: maximum size of all cached entries in bytes
+    :param rebuild: drop all entries when the cache is opened
+    """
+
+    def __init__(
+            self,
+            path: str = None,
+            max_size: int = CACHE_MAX_SIZE,
+            rebuild: bool = False
+    ):
+        super().__init__(path, rebuild)
+        self.max_size = max_size
+        # rows by (path, event types) and last access by
+        # (table, path, event types), written at once by write_pending
+        self._pending_logs: Dict[Tuple[str, str], tuple] = {}
+        self._pending_checkpoints: Dict[Tuple[str, str], tuple] = {}
+        self._pending_size = 0
+        self._accesses: Dict[Tuple[str, str, str], float] = {}
+        # upper bound of size, None until summed up by the connection
+        self._size: Optional[int] = None
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_pending_logs"] = {}
+        state["_pending_checkpoints"] = {}
+        state["_pending_size"] = 0
+        state["_accesses"] = {}
+        state["_size"] = None
+        return state
+
+    def _create_tables(self, connection: sqlite3.Connection):
+        # the other caches in the file do not use the user_version
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != ANALYSIS_CACHE_VERSION:
+            connection.execute("DROP TABLE IF EXISTS condor_logs")
+            connection.execute("DROP TABLE IF EXISTS checkpoints")
+            connection.execute(
+                f"PRAGMA user_version = {int(ANALYSIS_CACHE_VERSION)}"
+            )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS condor_logs ("
+            "path TEXT NOT NULL, "
+            "event_types TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "inode INTEGER NOT NULL, "
+            "last_access REAL NOT NULL, "
+            "data BLOB NOT NULL, "
+            "PRIMARY KEY (path, event_types))"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "path TEXT NOT NULL, "
+            "event_types TEXT NOT NULL, "
+            "inode INTEGER NOT NULL, "
+            "offset INTEGER NOT NULL, "
+            "tail BLOB NOT NULL, "
+            "last_access REAL NOT NULL, "
+            "data BLOB NOT NULL, "
+            "PRIMARY KEY (path, event_types))"
+        )
+
+    def _clear(self, connection: sqlite3.Connection):
+        connection.execute("DELETE FROM condor_logs")
+        connection.execute("DELETE FROM checkpoints")
+
+    def get(
+            self,
+            file: str,
+            file_stat: os.stat_result,
+            event_types: Optional[Collection] = None
+    ) -> Optional[List[CondorLog]]:
+        """
+        Returns the cached CondorLogs of the log file.
+
+        :param file: log file
+        :param file_stat: current stat result of the log file
+        :param event_types: event types read, by default all
+        :return: list of CondorLogs or None if not cached or out of date
+        """
+        path = os.path.abspath(file)
+        # the entry of all events serves any event types
+        keys = dict.fromkeys([_event_types_key(event_types), ""])
+        try:
+            for key in keys:
+                pending = self._pending_logs.get((path, key))
+                if pending is not None:
+                    row = pending[2:5] + pending[6:]
+                else:
+                    row = self.connection.execute(
+                        "SELECT size, mtime_ns, inode, data FROM condor_logs "
+                        "WHERE path = ? AND event_types = ?",
+                        (path, key)
+                    ).fetchone()
+                if row is None:
+                    continue
+                if row[:3] != (
+                        file_stat.st_size,
+                        file_stat.st_mtime_ns,
+                        file_stat.st_ino
+                ):
+                    for pending_key in keys:
+                        self._pending_logs.pop((path, pending_key), None)
+                    self.connection.execute(
+                        "DELETE FROM condor_logs "
+                        "WHERE path = ?",
+                        (path,)
+                    )
+                    self.connection.commit()
+                    return None
+                self._accesses["condor_logs", path, key] = time.time()
+                return pickle.loads(row[3])  # nosec B301
+            return None
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError,
+                AttributeError, ImportError) as err:
+            logging.debug("Analysis cache lookup failed for %s: %s", file, err)
+            return None
+
+    def put(
+            self,
+            file: str,
+            file_stat: os.stat_result,
+            condor_logs: List[CondorLog],
+            event_types: Optional[Collection] = None
+    ) -> bool:
+        """
+        Cache the CondorLogs of the log file, if all jobs terminated.
+        The entry is written with the next write_pending.
+
+        The ram histories are downsampled
+        to at most CACHE_MAX_RAM_HISTORY ImageSizeEvents.
+
+        :param file: log file
+        :param file_stat: stat result of the log file before it was read
+        :param condor_logs: CondorLogs of all jobs in the log file
+        :param event_types: event types read, by default all
+        :return: whether the CondorLogs were cached
+        """
+        if not condor_logs or not all(
+                isinstance(condor_log.job_details.state, TerminationState)
+                for condor_log in condor_logs
+        ):
+            return False
+
+        cached_logs = [
+            CondorLog(
+                condor_log.file,
+                condor_log.job_details,
+                condor_log.logfile_error_events,
+                condor_log.ram_history.downsample(CACHE_MAX_RAM_HISTORY),
+                job_id=condor_log.job_id
+            )
+            for condor_log in condor_logs
+        ]
+        data = pickle.dumps(cached_logs, pickle.HIGHEST_PROTOCOL)
+        path = os.path.abspath(file)
+        key = _event_types_key(event_types)
+        self._pending_logs[path, key] = (
+            path,
+            key,
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            file_stat.st_ino,
+            time.time(),
+            data
+        )
+        # all jobs terminated, the file is not read again,
+        # its checkpoint is deleted by write_pending
+        self._pending_checkpoints.pop((path, key), None)
+        try:
+            self._added(len(data))
+        except sqlite3.Error as err:
+            logging.debug("Not able to cache %s: %s", file, err)
+            return False
+        return True
+
+    @staticmethod
+    def _read_tail(file: str, offset: int) -> Optional[bytes]:
+        """Returns the bytes right before the offset."""
+        try:
+            with open(file, "rb") as log_file:
+                start = max(offset - CHECKPOINT_TAIL_SIZE, 0)
+                log_file.seek(start)
+                return log_file.read(offset - start)
+        except OSError:
+            return None
+
+    def get_checkpoint(
+            self,
+            file: str,
+            file_stat: os.stat_result,
+            event_types: Optional[Collection] = None
+    ) -> Optional[Any]:
+        """
+        Returns the reader state checkpointed for the log file.
+
+        :param file: log file
+        :param file_stat: current stat result of the log file
+        :param event_types: event types read, by default all
+        :return: the state given to put_checkpoint
+            or None if not checkpointed or the file was not only appended
+        """
+        path = os.path.abspath(file)
+        key = _event_types_key(event_types)
+        try:
+            pending = self._pending_checkpoints.get((path, key))
+            if pending is not None:
+                row = pending[2:5] + pending[6:]
+            else:
+                row = self.connection.execute(
+                    "SELECT inode, offset, tail, data FROM checkpoints "
+                    "WHERE path = ? AND event_types = ?",
+                    (path, key)
+                ).fetchone()
+            if row is None:
+                return None
+            inode, offset, tail, data = row
+            if (
+                    inode != file_stat.st_ino or
+                    file_stat.st_size < offset or
+                    self._read_tail(file, offset) != tail
+            ):
+                logging.debug("%s was truncated or replaced", file)
+                self._pending_checkpoints.pop((path, key), None)
+                self.connection.execute(
+                    "DELETE FROM checkpoints "
+                    "WHERE path = ? AND event_types = ?",
+                    (path, key)
+                )
+                self.connection.commit()
+                return None
+            self._accesses["checkpoints", path, key] = time.time()
+            return pickle.loads(data)  # nosec B301
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError,
+                AttributeError, ImportError) as err:
+            logging.debug(
+                "Checkpoint lookup failed for %s: %s", file, err
+            )
+            return None
+
+    def put_checkpoint(
+            self,
+            file: str,
+            file_stat: os.stat_result,
+            offset: int,
+            state: Any,
+            event_types: Optional[Collection] = None
+    ) -> bool:
+        """
+        Checkpoint the state of a reader at the byte offset of the log file.
+        The checkpoint is written with the next write_pending.
+
+        :param file: log file
+        :param file_stat: stat result of the log file before it was read
+        :param offset: byte offset after the last complete event
+        :param state: picklable state of the reader at the offset
+        :param event_types: event types read, by default all
+        :return: whether the checkpoint was stored
+        """
+        tail = self._read_tail(file, offset)
+        if tail is None:
+            return False
+        try:
+            data = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+            path = os.path.abspath(file)
+            key = _event_types_key(event_types)
+            self._pending_checkpoints[path, key] = (
+                path,
+                key,
+                file_stat.st_ino,
+                offset,
+                tail,
+                time.time(),
+                data
+            )
+            self._added(len(data))
+        except (sqlite3.Error, pickle.PicklingError) as err:
+            logging.debug("Not able to checkpoint %s: %s", file, err)
+            return False
+        return True
+
+    def write_pending(self):
+        """
+        Write the entries and checkpoints put since the last call
+        and the last access of those returned, in a single transaction.
+        """
+        if not (
+                self._pending_logs or
+                self._pending_checkpoints or
+                self._accesses
+        ):
+            return
+        logs = self._pending_logs
+        checkpoints = self._pending_checkpoints
+        accesses = self._accesses
+        self._pending_logs = {}
+        self._pending_checkpoints = {}
+        self._pending_size = 0
+        self._accesses = {}
+        try:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO condor_logs VALUES "
+                "(?, ?, ?, ?, ?, ?, ?)",
+                logs.values()
+            )
+            self.connection.executemany(
+                "DELETE FROM checkpoints WHERE path = ? AND event_types = ?",
+                logs
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO checkpoints VALUES "
+                "(?, ?, ?, ?, ?, ?, ?)",
+                checkpoints.values()
+            )
+            for table in ["condor_logs", "checkpoints"]:
+                self.connection.executemany(
+                    f"UPDATE {table} "  # nosec B608 - fixed table names
+                    "SET last_access = ? "
+                    "WHERE path = ? AND event_types = ?",
+                    [
+                        (last_access, path, key)
+                        for (accessed_table, path, key), last_access
+                        in accesses.items()
+                        if accessed_table == table
+                    ]
+                )
+            self.connection.commit()
+        except sqlite3.Error as err:
+            logging.debug("Not able to write to the analysis cache: %s", err)
+
+    def close(self):
+        """Write the pending changes and close the database connection."""
+        self.write_pending()
+        super().close()
+        # other processes may have added entries in the meantime
+        self._size = None
+
+    def _added(self, n_bytes: int):
+        """
+        Write the pending entries if they exceed CACHE_WRITE_SIZE,
+        evict entries if the cache may have grown beyond max_size.
+
+        The size is summed up once per connection, afterwards only the
+        added bytes are counted. Replaced and deleted entries are not
+        subtracted, an estimate beyond max_size is corrected by _evict.
+
+        :param n_bytes: size of the added entry or checkpoint
+        """
+        self._pending_size += n_bytes
+        if self._pending_size > CACHE_WRITE_SIZE:
+            self.write_pending()
+        if self._size is None:
+            self._size = self.size
+        else:
+            self._size += n_bytes
+        if self._size > self.max_size:
+            self._evict()
+
+    def _evict(self):
+        """Delete the least recently used entries beyond max_size."""
+        # entries returned by get are used recently
+        self.write_pending()
+        total_size = self._size = self.size
+        if total_size <= self.max_size:
+            return
+        rows = self.connection.execute(
+            "SELECT 'condor_logs', rowid, last_access, length(data) "
+            "FROM condor_logs "
+            "UNION ALL "
+            "SELECT 'checkpoints', rowid, last_access, length(data) "
+            "FROM checkpoints "
+            "ORDER BY last_access"
+        ).fetchall()
+        evicted = []
+        for table, rowid, _, size in rows:
+            if total_size <= self.max_size:
+                break
+            evicted.append((table, rowid))
+            total_size -= size
+        self._size = total_size
+        for table in ["condor_logs", "checkpoints"]:
+            self.connection.executemany(
+                f"DELETE FROM {table} "  # nosec B608 - fixed table names
+                "WHERE rowid = ?",
+                [
+                    (rowid,)
+                    for evicted_table, rowid in evicted
+                    if evicted_table == table
+                ]
+            )
+        self.connection.commit()
+        logging.debug(
+            "Evicted %d entries from the analysis cache", len(evicted)
+        )
+
+    @property
+    def size(self) -> int:
+        """Returns the size of all cached entries and checkpoints in bytes."""
+        self.write_pending()
+        return self.connection.execute(
+            "SELECT "
+            "(SELECT COALESCE(SUM(length(data)), 0) FROM condor_logs) + "
+            "(SELECT COALESCE(SUM(length(data)), 0) FROM checkpoints)"
+        ).fetchone()[0]
+
+    def __len__(self):
+        self.write_pending()
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM condor_logs"
+        ).fetchone()[0]
+
+    @property
+    def n_checkpoints(self) -> int:
+        """Returns the number of checkpointed log files."""
+        self.write_pending()
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM checkpoints"
+        ).fetchone()[0]
@@ -10,7 +10,7 @@ from .ram_history import RamHistory
 
 class CondorLog(ReprObject):
     """
-    Represents the analysis of one single log file.
+    Represents the analysis of one single job of a log file.
 
     :param file: HTCondor log file
     :param job_details: JobDetails
@@ -19,6 +19,8 @@ class CondorLog(ReprObject):
         All Error Events that occurred in the log file
     :param ram_history: RamHistory
         Can be used to generate a ram histogram
+    :param job_id: "cluster.proc" id of the job,
+        a log file can hold the events of several jobs
     """
 
     def __init__(
@@ -26,9 +28,11 @@ class CondorLog(ReprObject):
             file: str,
             job_details: JobDetails,
             logfile_error_events: LogfileErrorEvents,
-            ram_history: RamHistory
+            ram_history: RamHistory,
+            job_id: str = None
     ):
         self.file = file
+        self.job_id = job_id
         self.job_spec_id = self.get_job_spec_id(file)
         self.job_details = job_details
         self.logfile_error_events = logfile_error_events
@@ -0,0 +1,129 @@
+"""Execution attempts of a job, one per execution (EXECUTE event)."""
+from datetime import datetime as date_time, timedelta
+from typing import Optional
+
+from htcanalyze import SlotsReprObject
+from ..event_handler.job_events import JobExecutionEvent
+from ..event_handler.states import (
+    AbnormalTerminationState,
+    NormalTerminationState,
+    State
+)
+from .time_manager import TimeManager
+
+# attempts that ended in these states ran to completion,
+# unless the job was executed again
+GOODPUT_STATES = frozenset([
+    NormalTerminationState(),
+    AbnormalTerminationState()
+])
+
+
+class ExecutionAttempt(SlotsReprObject):
+    """
+    Represents a single execution of a job on a node.
+
+    An attempt starts with a JobExecutionEvent and ends with the event
+    that removed the job from the node: termination, eviction, abortion,
+    hold, shadow exception or a failed reconnect. An attempt that is
+    followed by another execution without such an event ends when
+    the next attempt starts, its end state is the JobDisconnectedState
+    if the job was disconnected last, else None.
+
+    The time of attempts that were evicted with a checkpoint is goodput,
+    the progress of the job was kept, as is the time of the last attempt
+    of a job that terminated, normally or by a signal: the attempt ran
+    to its end, a signal is a result of the job, not of the pool.
+    The time of all other finished attempts is badput: the attempts
+    that were evicted, held or aborted, that ended without an event
+    and the terminated attempts that were followed by another attempt.
+
+    :param execution_event: JobExecutionEvent that started the attempt,
+        its host address is resolved with the other execution events
+    :param end_date: time stamp of the end of the attempt,
+        None while the job is running
+    :param end_state: State of the event that ended the attempt
+    :param checkpointed: whether the progress was kept in a checkpoint
+    :param cpus: allocated cpus, if known
+    :param retried: whether the job was executed again after the attempt
+    """
+    __slots__ = (
+        "execution_event",
+        "end_date",
+        "end_state",
+        "checkpointed",
+        "cpus",
+        "retried"
+    )
+
+    def __init__(
+            self,
+            execution_event: JobExecutionEvent,
+            end_date: date_time = None,
+            end_state: State = None,
+            checkpointed: bool = False,
+            cpus: float = None,
+            retried: bool = False
+    ):
+        self.execution_event = execution_event
+        self.end_date = end_date
+        self.end_state = end_state
+        self.checkpointed = checkpointed
+        self.cpus = cpus
+        self.retried = retried
+
+    @property
+    def host_address(self) -> str:
+        """Returns the address of the execution node."""
+        return self.execution_event.host_address
+
+    @property
+    def start_date(self) -> date_time:
+        """Returns the start of the attempt."""
+        return self.execution_event.time_stamp
+
+    @property
+    def is_finished(self) -> bool:
+        """Returns True if the attempt ended."""
+        return self.end_date is not None and self.start_date is not None
+
+    @property
+    def is_goodput(self) -> bool:
+        """Returns True if the progress of the attempt was kept."""
+        return self.checkpointed or (
+            self.end_state in GOODPUT_STATES and not self.retried
+        )
+
+    @property
+    def wall_time(self) -> timedelta:
+        """Returns the duration of a finished attempt, else 00:00:00."""
+        if not self.is_finished:
+            return timedelta()
+        start_date = self.start_date
+        if start_date > self.end_date:
+            # the year is not logged, the attempt rolled over new year
+            start_date = TimeManager.decrease_year(start_date)
+        return self.end_date - start_date
+
+    @property
+    def core_hours(self) -> float:
+        """
+        Returns the wall time multiplied by the allocated cpus,
+        jobs are assumed to use a single core if the cpus are unknown.
+        """
+        cpus = self.cpus if self.cpus and self.cpus > 0 else 1
+        return cpus * self.wall_time.total_seconds() / 3600
+
+    def end(
+            self,
+            end_date: Optional[date_time],
+            end_state: Optional[State],
+            checkpointed: bool = False,
+            cpus: float = None
+    ):
+        """End the attempt, the cpus are kept if cpus is None."""
+        self.end_date = end_date
+        self.end_state = end_state
+        self.checkpointed = checkpointed
+        if cpus is not None:
+            self.cpus = cpus
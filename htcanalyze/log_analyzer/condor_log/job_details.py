@@ -1,8 +1,10 @@
 """Save HTCondor job execution details."""
+from typing import List
 
 from htcanalyze import ReprObject
 from ..event_handler.set_events import SETEvents
 from ..event_handler.states import JobState
+from .execution_attempt import ExecutionAttempt
 from .time_manager import TimeManager, JobTimes
 from .logresource import LogResources
 
@@ -13,17 +15,32 @@ class JobDetails(ReprObject):
 
     Mostly the complexity lies in creating
     colored output depending on the states
+
+    :param set_events: SETEvents, the execution event is the last one
+    :param state: JobState
+    :param execution_attempts: ExecutionAttempts in order of execution
     """
 
     def __init__(
             self,
             set_events: SETEvents,
-            state: JobState
+            state: JobState,
+            execution_attempts: List[ExecutionAttempt] = None
     ):
         self.set_events = set_events
-        self.time_manager = TimeManager.from_set_events(set_events)
+        self.execution_attempts = execution_attempts or []
+        self.time_manager = TimeManager.from_set_events(
+            set_events,
+            self.execution_attempts
+        )
         self.state = state
 
+    def __setstate__(self, state):
+        if "execution_attempts" not in state:
+            # cached by an older version, the AnalysisCache reads it again
+            raise AttributeError("JobDetails without execution attempts")
+        self.__dict__.update(state)
+
     @property
     def resources(self) -> LogResources:
         """Returns log resources."""
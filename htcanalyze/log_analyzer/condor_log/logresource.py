@@ -6,7 +6,7 @@ from enum import Enum
 from typing import List, Union
 from numpy import isnan, nan_to_num as ntn
 
-from htcanalyze import ReprObject
+from htcanalyze import SlotsReprObject
 
 
 class LevelColors(Enum):
@@ -17,7 +17,7 @@ class LevelColors(Enum):
     NORMAL = 'green'
 
 
-class LogResource(ABC):
+class LogResource(SlotsReprObject, ABC):
     """
     Class of one single HTCondor-JobLog resource.
 
@@ -29,6 +29,7 @@ class LogResource(ABC):
     :param allocated:
     :param description:
     """
+    __slots__ = ("usage", "requested", "allocated", "description")
 
     def __init__(
             self,
@@ -130,6 +131,7 @@ class LogResource(ABC):
 
 class CPULogResource(LogResource):
     """Represents a CPU log resource."""
+    __slots__ = ()
 
     def __init__(
             self,
@@ -142,6 +144,7 @@ class CPULogResource(LogResource):
 
 class DiskLogResource(LogResource):
     """Represents a disk log resource."""
+    __slots__ = ()
 
     def __init__(
             self,
@@ -154,6 +157,7 @@ class DiskLogResource(LogResource):
 
 class MemoryLogResource(LogResource):
     """Represents a memory log resource."""
+    __slots__ = ()
 
     def __init__(
             self,
@@ -166,6 +170,7 @@ class MemoryLogResource(LogResource):
 
 class GPULogResource(LogResource):
     """Represents a GPU log resource."""
+    __slots__ = ("assigned",)
 
     def __init__(
             self,
@@ -178,7 +183,7 @@ class GPULogResource(LogResource):
         self.assigned = assigned
 
 
-class LogResources(ReprObject):
+class LogResources(SlotsReprObject):
     """
     Represents log resources of a single log file.
 
@@ -187,6 +192,13 @@ class LogResources(ReprObject):
     :param memory_resource:
     :param gpu_resource: Optional
     """
+    __slots__ = (
+        "cpu_resource",
+        "disc_resource",
+        "memory_resource",
+        "gpu_resource"
+    )
+
     def __init__(
             self,
             cpu_resource: CPULogResource,
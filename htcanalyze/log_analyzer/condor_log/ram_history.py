@@ -1,7 +1,6 @@
 """Ram history of a single log file created with ImageSizeEvent events."""
 
 from typing import List
-from plotille import Figure
 from htcanalyze import ReprObject
 from ..event_handler.job_events import ImageSizeEvent
 
@@ -28,6 +27,31 @@ class RamHistory(ReprObject):
     def __init__(self, image_size_events: List[ImageSizeEvent]):
         self.image_size_events = image_size_events
 
+    def downsample(self, max_events: int) -> "RamHistory":
+        """
+        Returns a RamHistory with at most max_events ImageSizeEvents.
+
+        The events are picked evenly spaced, the first, the last
+        and the event with the highest size update are always kept.
+
+        :param max_events: maximum number of events, at least 3
+        :return: RamHistory
+        """
+        n_events = len(self.image_size_events)
+        if n_events <= max_events:
+            return self
+
+        peak = max(
+            range(n_events),
+            key=lambda i: self.image_size_events[i].size_update
+        )
+        step = (n_events - 1) / (max_events - 2)
+        indices = {round(i * step) for i in range(max_events - 1)}
+        indices.add(peak)
+        return RamHistory(
+            [self.image_size_events[i] for i in sorted(indices)]
+        )
+
     @staticmethod
     def mean_y_value(y_values, min_, max_):
         """Callback method for y-ticks."""
@@ -62,6 +86,7 @@ class RamHistory(ReprObject):
             )
 
         # else
+        from plotille import Figure
         fig = Figure()
         fig.y_ticks_fkt = lambda x, y: self.mean_y_value(ram, x, y)
         fig.width = 55
@@ -1,7 +1,8 @@
 """Manage times of HTCondor job logs."""
 from datetime import datetime as date_time, timedelta
+from typing import Iterable
 
-from htcanalyze import ReprObject
+from htcanalyze import ReprObject, SlotsReprObject
 from ..event_handler.set_events import SETEvents
 
 
@@ -9,6 +10,7 @@ class TimeDeltaWrapper(timedelta):
     """
     Wrapper class for time delta objects to have an __repr__ function.
     """
+    __slots__ = ()
 
     def __new__(cls, time_delta: timedelta, *_, **__):
         if time_delta:
@@ -28,8 +30,12 @@ class TimeDeltaWrapper(timedelta):
             return str(None)
         return str(self)
 
+    def __reduce__(self):
+        """Pickle support, __new__ expects a timedelta object."""
+        return self.__class__, (timedelta(self.days, self.seconds),)
 
-class JobTimes(ReprObject):
+
+class JobTimes(SlotsReprObject):
     """
     Represents the waiting, execution and total runtime of a job.
 
@@ -37,6 +43,7 @@ class JobTimes(ReprObject):
     :param execution_time:
     :param total_runtime:
     """
+    __slots__ = ("waiting_time", "execution_time", "total_runtime")
 
     def __init__(
             self,
@@ -85,16 +92,31 @@ class TimeManager(ReprObject):
     Furthermore it can be returned as a dictionary resolving the year,
     only if the job was running of new year.
 
+    The goodput and badput are the summed up wall times of the finished
+    execution attempts whose progress was kept, respectively lost,
+    see ExecutionAttempt.
+
     :param submission_date:
     :param execution_date:
     :param termination_date:
+    :param execution_attempts: ExecutionAttempts of the job
     """
+    __slots__ = (
+        "submission_date",
+        "execution_date",
+        "termination_date",
+        "rolled_over_year_boundary",
+        "job_times",
+        "goodput",
+        "badput"
+    )
 
     def __init__(
             self,
             submission_date: date_time,
             execution_date: date_time,
-            termination_date: date_time
+            termination_date: date_time,
+            execution_attempts: Iterable = ()
     ):
         self.submission_date = submission_date
         self.execution_date = execution_date
@@ -106,17 +128,20 @@ class TimeManager(ReprObject):
             self.termination_date
         )
         self.job_times = self._manage_times()
+        self.goodput, self.badput = self._manage_attempts(execution_attempts)
 
     @classmethod
     def from_set_events(
             cls,
-            set_events: SETEvents
+            set_events: SETEvents,
+            execution_attempts: Iterable = ()
     ):
         """Overload constructor to init with SETEvents."""
         return cls(
             set_events.submission_date,
             set_events.execution_date,
-            set_events.termination_date
+            set_events.termination_date,
+            execution_attempts
         )
 
     def is_empty(self):
@@ -170,6 +195,19 @@ class TimeManager(ReprObject):
             total_runtime
         )
 
+    @staticmethod
+    def _manage_attempts(execution_attempts: Iterable) -> tuple:
+        """Sum up the goodput and badput in a single pass."""
+        goodput = badput = timedelta()
+        for attempt in execution_attempts:
+            if not attempt.is_finished:
+                continue
+            if attempt.is_goodput:
+                goodput += attempt.wall_time
+            else:
+                badput += attempt.wall_time
+        return TimeDeltaWrapper(goodput), TimeDeltaWrapper(badput)
+
     @staticmethod
     def decrease_year(date, val=1) -> date_time:
         """Decrease year of a date by val if possible."""
@@ -257,5 +295,33 @@ class TimeManager(ReprObject):
             "waiting_time": str(self.waiting_time),
             "execution_time": str(self.execution_time),
             "total_runtime": str(self.total_runtime),
+            "goodput": str(self.goodput),
+            "badput": str(self.badput),
             "rolled_over_year_boundary": str(self.rolled_over_year_boundary)
         }
+
+    def __getstate__(self):
+        """Pickle the attributes, __dict__ is only a representation."""
+        return (
+            self.submission_date,
+            self.execution_date,
+            self.termination_date,
+            self.rolled_over_year_boundary,
+            self.job_times,
+            self.goodput,
+            self.badput
+        )
+
+    def __setstate__(self, state):
+        if len(state) == 5:
+            # pickled before the execution attempts were kept
+            state = (*state, TimeDeltaWrapper(None), TimeDeltaWrapper(None))
+        (
+            self.submission_date,
+            self.execution_date,
+            self.termination_date,
+            self.rolled_over_year_boundary,
+            self.job_times,
+            self.goodput,
+            self.badput
+        ) = state
@@ -4,17 +4,23 @@ import os
 import re
 import logging
 import json
-from typing import List, Union
-from datetime import datetime as date_time
+from collections import Counter
+from typing import (
+    TYPE_CHECKING, Any, Callable, Collection, Dict, List, Optional, Tuple,
+    Union
+)
 
 import numpy as np
-from htcondor import (
-    JobEventLog,
-    JobEventType as jet,
-    JobEvent as HTCJobEvent
-)
 
-from htcanalyze.globals import STRP_FORMAT
+from .time_stamp import decode_epoch, decode_time_stamp
+from ..log_source import READ_ERRORS, is_plain_file
+from .json_log_parser import JsonLogParser, is_json_log
+from .user_log_parser import (
+    UserLogParser,
+    UserLogEvent,
+    JobEventType,
+    UnsupportedEventError
+)
 from .states import (
     JobState,
     RunningState,
@@ -53,6 +59,34 @@ from ..condor_log.logresource import (
     GPULogResource
 )
 
+# identical to htcondor.JobEventType, the events of both compare equal
+jet = JobEventType
+
+if TYPE_CHECKING:  # pragma: no cover
+    from htcondor import JobEvent as HTCJobEvent
+else:
+    # the htcondor module is only imported to read files
+    # the UserLogParser can't read, see get_job_event_log
+    HTCJobEvent = Any
+
+
+def get_job_event_log() -> Optional[type]:
+    """
+    Import the JobEventLog of the htcondor python bindings.
+
+    :return: htcondor.JobEventLog, None if the module is not installed
+    """
+    try:
+        from htcondor import JobEventLog
+    except ImportError:  # pragma: no cover
+        # the UserLogParser works without the htcondor python bindings
+        return None
+    return JobEventLog
+
+
+# (cluster, proc) of a job, None if no job could be read
+JobId = Optional[Tuple[int, int]]
+
 
 class ReadLogException(Exception):
     """Can't read log file exception."""
@@ -71,10 +105,12 @@ class HTCJobEventWrapper:
     def __init__(self, job_event: HTCJobEvent):
         self.wrapped_class = job_event
         self.event_number = job_event.get('EventTypeNumber')
-        self.time_stamp = date_time.strptime(
-                job_event.get('EventTime'),
-                STRP_FORMAT
-            )
+        self.time_stamp = decode_time_stamp(job_event.get('EventTime'))
+
+    @property
+    def epoch(self) -> int:
+        """Returns the time stamp in seconds since the epoch."""
+        return decode_epoch(self.wrapped_class.get('EventTime'))
 
     def __getattr__(self, attr):
         return getattr(self.wrapped_class, attr)
@@ -107,16 +143,112 @@ class HTCJobEventWrapper:
 
 
 class EventHandler:
-    """Event handler to wrap HTCondor job events."""
+    """
+    Event handler to wrap HTCondor job events.
+
+    A log file can hold the events of several jobs,
+    therefore the state is kept for each (cluster, proc) job id.
+
+    The handler also remembers how far the log file was read,
+    so a restored (e.g. unpickled) handler continues with new events.
+
+    The job events are read by the function registered for their type
+    in EVENT_READERS, events of other types are only counted.
 
-    def __init__(self):
-        self._state: Union[JobState, None] = None
+    :param event_types: only events of these types are returned
+        by get_events, the others are skipped before they are parsed,
+        by default all events, see SUMMARY_EVENT_TYPES
+    :param follow: keep the JobEventLog of the htcondor module open
+        after a fallback, the next get_events continues at its position
+        instead of reading the file again, e.g. for --follow
+    """
+
+    def __init__(
+            self,
+            event_types: Optional[Collection] = None,
+            follow: bool = False
+    ):
+        self._states: Dict[JobId, Union[JobState, None]] = {}
+        self._job_id: JobId = None
+        self.event_types = (
+            None if event_types is None else frozenset(event_types)
+        )
+        # byte offset after the last complete event read by the parser,
+        # None if the htcondor module was used to read the file
+        self.offset: Optional[int] = 0
+        # number of events read from the start of the file
+        self.n_events = 0
+        # number of events by type name, without an EVENT_READERS entry
+        self.unhandled_events = Counter()
+        self.follow = follow
+        self._job_event_log = None
+
+    def __getstate__(self):
+        # the JobEventLog can't be pickled, it is opened again if needed
+        state = dict(self.__dict__)
+        state["_job_event_log"] = None
+        return state
+
+    def __setstate__(self, state):
+        # checkpoints of older versions lack newer attributes
+        self.__init__()
+        self.__dict__.update(state)
+
+    @property
+    def _state(self) -> Union[JobState, None]:
+        """State of the job the current event belongs to."""
+        return self._states.get(self._job_id)
+
+    @_state.setter
+    def _state(self, state: JobState):
+        self._states[self._job_id] = state
 
     @property
     def state(self) -> JobState:
         """Returns current job state."""
         return self._state
 
+    @property
+    def states(self) -> Dict[JobId, JobState]:
+        """Returns the state of each job, in order of appearance."""
+        return dict(self._states)
+
+    def get_state(self, job_id: JobId) -> Union[JobState, None]:
+        """Returns the state of the given job."""
+        return self._states.get(job_id)
+
+    def set_initial_state(self, job_id: JobId):
+        """
+        Give a job the WaitingState, if its events did not set a state,
+        e.g. a job seen first by a hold in the middle of a rotated
+        event log, which was submitted before the log starts.
+        """
+        if self._states.get(job_id) is None:
+            self._states[job_id] = WaitingState()
+
+    def forget(self, job_id: JobId):
+        """Drop the state of a job, e.g. after it terminated."""
+        self._states.pop(job_id, None)
+
+    def next_file(self):
+        """
+        Continue with the next file of a rotated log,
+        keeping the states of the jobs.
+        """
+        self.offset = 0
+        self.n_events = 0
+
+    def set_error_state(self):
+        """Marks every job of the log file as not readable."""
+        self._states[self._job_id] = ErrorWhileReadingState()
+        for job_id in self._states:
+            self._states[job_id] = ErrorWhileReadingState()
+
+    @staticmethod
+    def get_job_id(event: Union[HTCJobEvent, UserLogEvent]) -> JobId:
+        """Returns the (cluster, proc) job id of an event."""
+        return event.cluster, event.proc
+
     def get_submission_event(
             self,
             event: HTCJobEventWrapper
@@ -154,16 +286,15 @@ class EventHandler:
 
     def get_execution_event(
             self,
-            event: HTCJobEventWrapper,
-            rdns_lookup: bool = False
+            event: HTCJobEventWrapper
     ) -> Union[JobExecutionEvent, ErrorEvent]:
         """
         Reads and returns a JobExecutionEvent or an ErrorEvent if
         the host address was dubious.
 
+        The host address is not resolved, see RDNSResolver.
+
         :param event:
-        :param rdns_lookup: bool
-            Whether to reversely resolve host addresses by domain name
         :return:
         """
         assert event.type == jet.EXECUTE
@@ -177,8 +308,7 @@ class EventHandler:
             return JobExecutionEvent(
                 event.event_number,
                 event.time_stamp,
-                execution_host,
-                rdns_lookup
+                execution_host
             )
         # ERROR
         reason = "Can't read host address"
@@ -253,7 +383,8 @@ class EventHandler:
         return JobEvictedEvent(
             event.event_number,
             event.time_stamp,
-            checkpointed=event.get("Checkpointed")
+            checkpointed=event.get("Checkpointed"),
+            cpus=event.get("Cpus")
         )
 
     @staticmethod
@@ -297,7 +428,7 @@ class EventHandler:
                 event.time_stamp,
                 reason
             )
-        elif self._state == WaitingState():
+        elif self._state is WaitingState():
             aborted_event = JobAbortedBeforeExecutionEvent(
                 event.event_number,
                 event.time_stamp,
@@ -362,57 +493,29 @@ class EventHandler:
 
     def get_job_event(
             self,
-            event: HTCJobEvent,
-            rdns_lookup: bool = False
-    ) -> JobEvent:
+            event: Union[HTCJobEvent, UserLogEvent]
+    ) -> Optional[JobEvent]:
         """
         Takes a HTCondor job event and returns an own wrapped JobEvent class.
 
-        :param event: HTCJobEvent
-            A job event from the HTCondor python bindings.
-        :param rdns_lookup: bool
-            Whether to reversely resolve host addresses by domain name
+        :param event: HTCJobEvent or UserLogEvent
+            A job event from the HTCondor python bindings
+            or from the UserLogParser.
         :return: JobEvent
             Wrapped JobEvent class with own properties
+            or None if the event type is not handled
         """
-        wrapped_job_event = HTCJobEventWrapper(event)
-        if wrapped_job_event.type == jet.SUBMIT:
-            return self.get_submission_event(wrapped_job_event)
-
-        if wrapped_job_event.type == jet.EXECUTE:
-            return self.get_execution_event(
-                wrapped_job_event,
-                rdns_lookup=rdns_lookup
-            )
-
-        if wrapped_job_event.type == jet.JOB_EVICTED:
-            return self.get_job_evicted_event(wrapped_job_event)
-
-        if wrapped_job_event.type == jet.JOB_TERMINATED:
-            return self.get_job_terminated_event(wrapped_job_event)
-
-        if wrapped_job_event.type == jet.IMAGE_SIZE:
-            return self.get_image_size_event(wrapped_job_event)
-
-        if wrapped_job_event.type == jet.SHADOW_EXCEPTION:
-            return self.get_shadow_exception_event(wrapped_job_event)
-
-        if wrapped_job_event.type == jet.JOB_ABORTED:
-            return self.get_job_aborted_event(wrapped_job_event)
-
-        if wrapped_job_event.type == jet.JOB_HELD:
-            return self.get_job_held_event(wrapped_job_event)
-
-        if wrapped_job_event.type == jet.JOB_DISCONNECTED:
-            return self.get_job_disconnected_event(wrapped_job_event)
-
-        if wrapped_job_event.type == jet.JOB_RECONNECT_FAILED:
-            return self.get_job_reconnect_failed_event(wrapped_job_event)
-
-        # else:
-        raise AttributeError(
-            f"Event type: {wrapped_job_event.type} not handled yet"
-        )
+        self._job_id = self.get_job_id(event)
+        read_event = EVENT_READERS.get(event.type)
+        if read_event is None:
+            self.unhandled_events[JobEventType(int(event.type)).name] += 1
+            return None
+        if isinstance(event, UserLogEvent):
+            # already provides event_number and time_stamp
+            wrapped_job_event = event
+        else:
+            wrapped_job_event = HTCJobEventWrapper(event)
+        return read_event(self, wrapped_job_event)
 
     def get_htc_events(
             self,
@@ -425,7 +528,25 @@ class EventHandler:
         :param sec: seconds to wait for new events
         :return: list of HTCondor job events
         """
-        jel = JobEventLog(file)
+        jel = self._job_event_log
+        if jel is None:
+            job_event_log = get_job_event_log()
+            if job_event_log is None:
+                self.set_error_state()
+                raise ReadLogException(
+                    f"Not able to read the file without the htcondor "
+                    f"module: {os.path.basename(file)}"
+                )
+            if not is_plain_file(file):
+                # the bindings only read plain files
+                self.set_error_state()
+                raise ReadLogException(
+                    f"Not able to read the compressed or archived file: "
+                    f"{os.path.basename(file)}"
+                )
+            jel = job_event_log(file)
+            if self.follow:
+                self._job_event_log = jel
 
         try:
             # Read all currently-available events
@@ -444,5 +565,157 @@ class EventHandler:
             else:
                 reason = f"Not able to open the file: {file_name}"
 
-            self._state = ErrorWhileReadingState()
+            self.set_error_state()
             raise ReadLogException(reason) from err
+
+    def get_events(
+            self,
+            file: str,
+            sec: int = 0
+    ) -> iter(List[Union[HTCJobEvent, UserLogEvent]]):
+        """
+        Returns a generator over job events read by the UserLogParser,
+        respectively the JsonLogParser for logs in the JSON format.
+
+        Reading continues after the events this handler already read.
+        Falls back to the HTCondor python bindings,
+        if the parser is not able to read an event,
+        the events that were already returned are skipped,
+        unless the JobEventLog was kept open (follow).
+        The bindings have to continue with the event the parser
+        failed on, else ReadLogException is raised.
+        Events not in event_types are skipped, but counted by n_events,
+        see UserLogParser.tail_first_events.
+
+        :param file: HTCondor log file
+        :param sec: seconds to wait for new events (bindings only)
+        :return: job events
+        """
+        # the event the parser failed on, the first one of the bindings
+        failed_event_id = None
+        if self.offset is not None:
+            parser_class = (
+                JsonLogParser if is_json_log(file) else UserLogParser
+            )
+            parser = parser_class(
+                file,
+                self.offset,
+                event_types=self.event_types
+            )
+            n_events = self.n_events
+            try:
+                # a terminated log is read without the skipped events
+                events = parser.tail_first_events()
+                if events is None:
+                    events = parser.events()
+                for event in events:
+                    self.offset = parser.offset
+                    self.n_events = n_events + parser.n_events
+                    yield event
+                # skipped events at the end of the file
+                self.offset = parser.offset
+                self.n_events = n_events + parser.n_events
+                return
+            except UnsupportedEventError as err:
+                logging.debug(
+                    "Falling back to the htcondor module to read %s: %s",
+                    file, err
+                )
+                # the bindings do not tell the byte offset of an event
+                self.offset = None
+                self.n_events = n_events + parser.n_events
+                failed_event_id = err.event_id
+            except READ_ERRORS as err:
+                logging.exception(err)
+                self.set_error_state()
+                raise ReadLogException(
+                    f"Not able to open the file: {os.path.basename(file)}"
+                ) from err
+
+        # a kept JobEventLog continues after the events already read
+        n_skipped = 0 if self._job_event_log is not None else self.n_events
+        for i, event in enumerate(self.get_htc_events(file, sec)):
+            if i >= n_skipped:
+                if failed_event_id is not None:
+                    self._check_event_id(file, event, failed_event_id)
+                    failed_event_id = None
+                self.n_events += 1
+                if (
+                        self.event_types is None or
+                        event.type in self.event_types
+                ):
+                    yield event
+        if failed_event_id is not None:
+            self._check_event_id(file, None, failed_event_id)
+
+    def _check_event_id(
+            self,
+            file: str,
+            event: Optional[HTCJobEvent],
+            event_id: Tuple[int, int, int]
+    ):
+        """
+        Check that the bindings continue with the event the parser
+        failed on, else both counted the events before differently
+        and the events already returned are not the skipped ones.
+
+        :raises ReadLogException: if the event is another one
+        """
+        if event is None or (event.type, event.cluster, event.proc) != (
+                event_id
+        ):
+            self.set_error_state()
+            raise ReadLogException(
+                f"The htcondor module counts the events differently: "
+                f"{os.path.basename(file)}"
+            )
+
+
+# reads the event of a type, called with (handler, event)
+EventReader = Callable[[EventHandler, HTCJobEventWrapper], JobEvent]
+
+EVENT_READERS: Dict[int, EventReader] = {
+    jet.SUBMIT: lambda handler, event: (
+        handler.get_submission_event(event)
+    ),
+    jet.EXECUTE: lambda handler, event: (
+        handler.get_execution_event(event)
+    ),
+    jet.JOB_EVICTED: lambda handler, event: (
+        handler.get_job_evicted_event(event)
+    ),
+    jet.JOB_TERMINATED: lambda handler, event: (
+        handler.get_job_terminated_event(event)
+    ),
+    jet.IMAGE_SIZE: lambda handler, event: (
+        handler.get_image_size_event(event)
+    ),
+    jet.SHADOW_EXCEPTION: lambda handler, event: (
+        handler.get_shadow_exception_event(event)
+    ),
+    jet.JOB_ABORTED: lambda handler, event: (
+        handler.get_job_aborted_event(event)
+    ),
+    jet.JOB_HELD: lambda handler, event: (
+        handler.get_job_held_event(event)
+    ),
+    jet.JOB_DISCONNECTED: lambda handler, event: (
+        handler.get_job_disconnected_event(event)
+    ),
+    jet.JOB_RECONNECTED: lambda handler, event: (
+        handler.get_job_reconnected_event(event)
+    ),
+    jet.JOB_RECONNECT_FAILED: lambda handler, event: (
+        handler.get_job_reconnect_failed_event(event)
+    )
+}
+
+# event types that change the state of a job
+STATE_EVENT_TYPES = frozenset([
+    jet.SUBMIT,
+    jet.EXECUTE,
+    jet.JOB_TERMINATED,
+    jet.JOB_ABORTED
+])
+# the summary does not use the ram history
+SUMMARY_EVENT_TYPES = frozenset(EVENT_READERS) - {jet.IMAGE_SIZE}
@@ -2,8 +2,7 @@
 from abc import ABC
 from datetime import datetime as date_time
 
-from htcanalyze import ReprObject
-from .node_cache import NodeCache
+from htcanalyze import SlotsReprObject
 from .states import (
     TerminationState,
     NormalTerminationState,
@@ -20,7 +19,7 @@ from .states import (
 )
 
 
-class JobEvent(ReprObject, ABC):
+class JobEvent(SlotsReprObject, ABC):
     """
     Abstract class to wrap each HTCondor JobEvent.
 
@@ -34,6 +33,7 @@ class JobEvent(ReprObject, ABC):
     :param time_stamp: date_time
         time stamp of event
     """
+    __slots__ = ("event_number", "time_stamp")
 
     def __init__(
             self,
@@ -53,6 +53,7 @@ class ErrorEvent(JobEvent, ABC):
     :param error_state:
     :param reason:
     """
+    __slots__ = ("error_state", "reason")
 
     def __init__(
             self,
@@ -81,6 +82,8 @@ class JobSubmissionEvent(JobEvent):
     :param time_stamp:
     :param submitter_address:
     """
+    __slots__ = ("submitter_address",)
+
     def __init__(
             self,
             event_number=None,
@@ -98,6 +101,13 @@ class JobSubmissionEvent(JobEvent):
             "submitter_address": self.submitter_address
         }
 
+    def __getstate__(self):
+        """Pickle the attributes, __dict__ is only a representation."""
+        return self.event_number, self.time_stamp, self.submitter_address
+
+    def __setstate__(self, state):
+        self.event_number, self.time_stamp, self.submitter_address = state
+
 
 class JobExecutionEvent(JobEvent):
     """
@@ -108,25 +118,24 @@ class JobExecutionEvent(JobEvent):
     Event Description: This shows up when a job is running.
         It might occur more than once.
 
+    The host address is the ip-address,
+    it is resolved afterwards, see RDNSResolver.
+
     :param event_number:
     :param time_stamp:
     :param host_address:
-    :param rdns_lookup:
     """
+    __slots__ = ("host_address",)
 
     def __init__(
             self,
             event_number=None,
             time_stamp=None,
-            host_address=None,
-            rdns_lookup=False
+            host_address=None
     ):
 
         super().__init__(event_number, time_stamp)
-        self.host_address = (
-            NodeCache().get_host_by_addr_cached(host_address)
-            if rdns_lookup else host_address
-        )
+        self.host_address = host_address
 
 
 class ExecutableErrorEvent(ErrorEvent):
@@ -141,6 +150,8 @@ class ExecutableErrorEvent(ErrorEvent):
     :param time_stamp:
     :param reason:
     """
+    __slots__ = ()
+
     def __init__(
             self,
             event_number,
@@ -166,6 +177,7 @@ class JobCheckpointedEvent(JobEvent):
         because the checkpointing can happen periodically.
 
     """
+    __slots__ = ()
     # Todo: figure out data load
 
 
@@ -179,12 +191,19 @@ class JobEvictedEvent(ErrorEvent):
         usually for a policy reason. Perhaps an interactive user has
         claimed the computer, or perhaps another job is higher priority.
 
+    :param event_number:
+    :param time_stamp:
+    :param checkpointed: whether the progress was kept in a checkpoint
+    :param cpus: cpus allocated to the evicted execution, if known
     """
+    __slots__ = ("checkpointed", "cpus")
+
     def __init__(
             self,
             event_number,
             time_stamp,
             checkpointed=False,
+            cpus: float = None
     ):
         if checkpointed:
             message = (
@@ -203,6 +222,8 @@ class JobEvictedEvent(ErrorEvent):
             JobEvictedState(),
             message
         )
+        self.checkpointed = bool(checkpointed)
+        self.cpus = cpus
 
 
 class JobTerminationEvent(JobEvent, ABC):
@@ -219,6 +240,7 @@ class JobTerminationEvent(JobEvent, ABC):
     :param termination_state:
     :param return_value:
     """
+    __slots__ = ("resources", "return_value", "termination_state")
 
     def __init__(
             self,
@@ -236,6 +258,7 @@ class JobTerminationEvent(JobEvent, ABC):
 
 class NormalTerminationEvent(JobTerminationEvent):
     """Normal Termination Event."""
+    __slots__ = ()
 
     def __init__(self, *args, **kwargs):
         super().__init__(
@@ -247,6 +270,7 @@ class NormalTerminationEvent(JobTerminationEvent):
 
 class AbnormalTerminationEvent(JobTerminationEvent):
     """Abnormal Termination Event."""
+    __slots__ = ()
 
     def __init__(self, *args, **kwargs):
         super().__init__(
@@ -273,6 +297,7 @@ class ImageSizeEvent(JobEvent):
     :param memory_usage:
     :param resident_set_size:
     """
+    __slots__ = ("size_update", "memory_usage", "resident_set_size")
 
     def __init__(
             self,
@@ -303,6 +328,7 @@ class ShadowExceptionEvent(ErrorEvent):
     :param time_stamp:
     :param reason:
     """
+    __slots__ = ()
 
     def __init__(
             self,
@@ -318,7 +344,7 @@ class ShadowExceptionEvent(ErrorEvent):
         )
 
 
-class JobAbortedEvent(ErrorEvent, JobTerminationEvent):
+class JobAbortedEvent(ErrorEvent):
     """
     Job aborted event.
 
@@ -326,10 +352,15 @@ class JobAbortedEvent(ErrorEvent, JobTerminationEvent):
     Event Name: Job aborted
     Event Description: The user canceled the job.
 
+    The event is an ErrorEvent and a JobTerminationEvent,
+    two base classes with __slots__ can't be combined,
+    hence it is registered as JobTerminationEvent.
+
     :param event_number:
     :param time_stamp:
     :param reason:
     """
+    __slots__ = ("resources", "return_value", "termination_state")
 
     def __init__(
             self,
@@ -343,15 +374,22 @@ class JobAbortedEvent(ErrorEvent, JobTerminationEvent):
             AbortedState(),
             reason
         )
+        self.resources = None
+        self.return_value = None
         self.termination_state = AbortedState()
 
 
+JobTerminationEvent.register(JobAbortedEvent)
+
+
 class JobAbortedBeforeSubmissionEvent(JobAbortedEvent):
     """Job was aborted before submission event."""
+    __slots__ = ()
 
 
 class JobAbortedBeforeExecutionEvent(JobAbortedEvent):
     """Job was aborted before execution event."""
+    __slots__ = ()
 
 
 class JobSuspendedEvent(ErrorEvent):
@@ -369,6 +407,7 @@ class JobSuspendedEvent(ErrorEvent):
     :param time_stamp:
     :param reason:
     """
+    __slots__ = ()
 
     def __init__(
             self,
@@ -393,6 +432,7 @@ class JobUnsuspendedEvent(JobEvent):
     Event Description: The job has resumed execution,
         after being suspended earlier.
     """
+    __slots__ = ()
 
 
 class JobHeldEvent(ErrorEvent):
@@ -409,6 +449,7 @@ class JobHeldEvent(ErrorEvent):
     :param time_stamp:
     :param reason:
     """
+    __slots__ = ()
 
     def __init__(
             self,
@@ -433,6 +474,7 @@ class JobReleasedEvent(JobEvent):
     Event Description: The job was in the hold state and is to be re-run.
 
     """
+    __slots__ = ()
 
 
 class JobDisconnectedEvent(ErrorEvent):
@@ -445,6 +487,7 @@ class JobDisconnectedEvent(ErrorEvent):
         (which communicate while the job runs) have lost contact.
 
     """
+    __slots__ = ()
 
     def __init__(
             self,
@@ -471,6 +514,7 @@ class JobReconnectedEvent(JobEvent):
         to resume contact before the job lease expired.
 
     """
+    __slots__ = ()
 
 
 class JobReconnectFailedEvent(ErrorEvent):
@@ -487,6 +531,7 @@ class JobReconnectFailedEvent(ErrorEvent):
     :param time_stamp:
     :param reason:
     """
+    __slots__ = ()
 
     def __init__(
             self,
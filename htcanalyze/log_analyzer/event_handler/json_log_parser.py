@@ -0,0 +1,194 @@
+"""
+Streaming reader for HTCondor user logs written in the JSON format.
+
+HTCondor writes one JSON object per event, if the log is written
+with the JSON format option (e.g. ULOG_JSON or EVENT_LOG_FORMAT_OPTIONS):
+
+    [
+    {
+        "EventTypeNumber": 0,
+        "Cluster": 469,
+        "Proc": 1418,
+        "Subproc": 0,
+        "EventTime": "2021-02-28T12:49:24",
+        "SubmitHost": "<...>"
+    }
+    ,
+    ...
+
+The array is never closed while the log is written, so the objects are
+decoded one by one with json.JSONDecoder.raw_decode from a buffer that
+is refilled in chunks, the file is never loaded completely.
+The events are the same UserLogEvents the UserLogParser reads from the
+text format, their attributes are the ClassAd attributes of the event.
+"""
+import codecs
+import json
+import re
+from typing import Iterator, Optional
+
+from .time_stamp import TIME_STAMP_LENGTH, decode_time_stamp
+from .user_log_parser import (
+    JobEventType,
+    UnsupportedEventError,
+    UserLogEvent,
+    UserLogParser
+)
+from ..log_source import READ_ERRORS, open_log
+
+# bytes decoded at once
+JSON_READ_SIZE = 64 * 1024
+# an event that does not end within this many characters is invalid
+JSON_MAX_EVENT_SIZE = 1024 ** 2
+# bytes of the first event read to detect the format
+JSON_HEADER_SIZE = 8 * 1024
+# whitespace, brackets and commas between two event objects
+JSON_FILL_REGEX = re.compile(r"[\s,\[\]]*")
+# attributes provided by every UserLogEvent
+EVENT_KEYS = ("EventTypeNumber", "Cluster", "Proc", "Subproc", "EventTime")
+
+
+def is_json_start(data: bytes) -> bool:
+    """Whether data looks like the start of a JSON log."""
+    return data.lstrip()[:1] in (b"[", b"{")
+
+
+def is_json_header(data: bytes) -> bool:
+    """
+    Check whether data starts with a JSON event.
+
+    :param data: the first bytes of a file, at least the first event
+    :return: True if the first object has an EventTypeNumber
+    """
+    text = data.decode("utf-8", errors="replace")
+    start = JSON_FILL_REGEX.match(text).end()
+    try:
+        event, _ = json.JSONDecoder().raw_decode(text, start)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(event, dict) and "EventTypeNumber" in event
+
+
+def is_json_log(file: str) -> bool:
+    """
+    Whether the log file is written in the JSON format.
+
+    :param file: HTCondor user log
+    :return: True if the first non-whitespace character opens a JSON
+        array or object, False also if the file can't be read
+    """
+    try:
+        with open_log(file) as log_file:
+            return is_json_start(log_file.read(64))
+    except READ_ERRORS:
+        return False
+
+
+def to_user_log_event(event: dict) -> UserLogEvent:
+    """
+    Convert a decoded JSON event to a UserLogEvent.
+
+    :param event: JSON object of an event
+    :return: UserLogEvent
+    :raises UnsupportedEventError: if the event lacks its type, job id
+        or time stamp
+    """
+    if not isinstance(event, dict):
+        raise UnsupportedEventError(f"Not an event object: {event!r}")
+    try:
+        event_type = JobEventType(event["EventTypeNumber"])
+        time_stamp = decode_time_stamp(
+            # fractional seconds and time zones are ignored,
+            # like in the text format
+            event["EventTime"][:TIME_STAMP_LENGTH]
+        )
+        cluster = int(event["Cluster"])
+        proc = int(event["Proc"])
+        subproc = int(event.get("Subproc", 0))
+    except (KeyError, TypeError, ValueError) as err:
+        raise UnsupportedEventError(f"Invalid event: {err!r}") from err
+    return UserLogEvent(
+        event_type,
+        cluster,
+        proc,
+        subproc,
+        time_stamp,
+        {
+            key: value for key, value in event.items()
+            if key not in EVENT_KEYS
+        }
+    )
+
+
+class JsonLogParser(UserLogParser):
+    """
+    Streaming reader for HTCondor user logs in the JSON format.
+
+    Like the UserLogParser, the offset is the byte position right after
+    the last complete event and an incomplete trailing event
+    (still being written) is skipped.
+
+    :param file: HTCondor user log
+    :param offset: byte offset to start reading from
+    :param year: unused, JSON time stamps include the year
+    :param event_types: only events of these types are converted and
+        yielded, the others are only counted, by default all events
+    """
+
+    def events(self) -> Iterator[UserLogEvent]:
+        """
+        Returns a generator over the events of the file.
+
+        :raises UnsupportedEventError: if an event can't be read
+            or the file is not valid UTF-8
+        :raises OSError: if the file can't be read
+        """
+        decoder = json.JSONDecoder()
+        # strict, so that the byte offset is the length of the text,
+        # bytes of an incomplete character are kept until the next read
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        with open_log(self.file) as log_file:
+            if self.offset:
+                log_file.seek(self.offset)
+            end_of_file = False
+            while not end_of_file:
+                chunk = log_file.read(JSON_READ_SIZE)
+                end_of_file = not chunk
+                try:
+                    buffer += text_decoder.decode(chunk)
+                except UnicodeDecodeError as err:
+                    raise UnsupportedEventError(str(err)) from err
+                position = 0
+                while True:
+                    start = JSON_FILL_REGEX.match(buffer, position).end()
+                    if start == len(buffer):
+                        break
+                    try:
+                        event, end = decoder.raw_decode(buffer, start)
+                    except json.JSONDecodeError as err:
+                        if len(buffer) - start > JSON_MAX_EVENT_SIZE:
+                            raise UnsupportedEventError(str(err)) from err
+                        # incomplete, wait for the next chunk
+                        break
+                    self.offset += len(buffer[position:end].encode("utf-8"))
+                    self.n_events += 1
+                    position = end
+                    if self.is_wanted_event(event):
+                        yield to_user_log_event(event)
+                buffer = buffer[position:]
+
+    def is_wanted_event(self, event) -> bool:
+        """Whether the decoded event has to be converted."""
+        if self.event_types is None or not isinstance(event, dict):
+            return True
+        # invalid events are converted to raise an UnsupportedEventError
+        event_number = event.get("EventTypeNumber")
+        return (
+            not isinstance(event_number, int) or
+            event_number in self.event_types
+        )
+
+    def tail_first_events(self) -> Optional[Iterator[UserLogEvent]]:
+        """JSON logs are always read from the start, see events()."""
+        return None
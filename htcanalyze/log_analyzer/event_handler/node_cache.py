@@ -4,7 +4,11 @@ import logging
 
 
 class NodeCache:
-    """Cache to save reverse DNS lookups."""
+    """
+    Cache to save reverse DNS lookups.
+
+    The rdns_cache is the in-memory layer of the RDNSResolver.
+    """
     _instance = None
 
     def __new__(cls, *args, **kwargs):
@@ -1,7 +1,7 @@
 """Module for submission, execution and termination events."""
 
 from datetime import datetime
-from htcanalyze import ReprObject
+from htcanalyze import SlotsReprObject
 from .states import TerminationState
 from .job_events import (
     JobSubmissionEvent,
@@ -10,10 +10,11 @@ from .job_events import (
 )
 
 
-class SETEvents(ReprObject):
+class SETEvents(SlotsReprObject):
     """
     Submission, Execution and Termination Events (SET-Events)
     """
+    __slots__ = ("submission_event", "execution_event", "termination_event")
 
     def __init__(
             self,
@@ -1,168 +1,169 @@
 """State Module."""
 from abc import ABC
+from typing import Dict
+
 from htcanalyze import ReprObject
 
 
 class State(ReprObject, ABC):
-    """Abstract state class."""
-    _name: str
+    """
+    Abstract state class.
+
+    A state has no data besides its name and color, which are constant
+    per class. Hence there is a single, immutable instance per class:
+    WaitingState() returns the same object each time, states are equal
+    only if they are identical and hash by identity, which makes them
+    cheap dictionary keys. Unpickled states are the singletons as well.
+    """
+    __slots__ = ()
+    _instances: Dict[type, "State"] = {}
+
+    name: str = None
+    color: str = None
+
+    def __new__(cls):
+        instance = State._instances.get(cls)
+        if instance is None:
+            instance = State._instances[cls] = super().__new__(cls)
+        return instance
+
+    def __reduce__(self):
+        return self.__class__, ()
+
+    @staticmethod
+    def from_name(name: str) -> "State":
+        """
+        Returns the state with the given name, e.g. of a partial summary.
+
+        :raises ValueError: if there is no state with this name
+        """
+        classes = [State]
+        while classes:
+            cls = classes.pop()
+            if cls.__dict__.get("name") == name:
+                return cls()
+            classes.extend(cls.__subclasses__())
+        raise ValueError(f"Unknown state: {name}")
+
+    def __setstate__(self, _):
+        """States pickled by older versions carry their name and color."""
 
     @property
-    def name(self):
-        """Name getter."""
-        return self._name
-
-    @name.setter
-    def name(self, name):
-        """Name setter."""
-        self._name = name
-
-    def __eq__(self, other):
-        return isinstance(self, other.__class__)
-
-    def __hash__(self):
-        """Use class name as hash to use states as dictionary keys."""
-        return hash(self.__class__.name)
+    def __dict__(self):
+        return {"_name": self.name, "_color": self.color}
 
 
 class JobState(State, ABC):
     """Represents the current state of a job."""
-    _color: str = None
-
-    @property
-    def color(self):
-        """Color getter."""
-        return self._color
-
-    @color.setter
-    def color(self, color):
-        """Color setter."""
-        self._color = color
+    __slots__ = ()
 
 
 class TerminationState(JobState, ABC):
     """Abstract class to represent a termination state."""
+    __slots__ = ()
 
 
 class NormalTerminationState(TerminationState):
     """Represents a normal termination state."""
-
-    def __init__(self):
-        self.color = "green"
-        self.name = "NORMAL_TERMINATION"
+    __slots__ = ()
+    name = "NORMAL_TERMINATION"
+    color = "green"
 
 
 class AbnormalTerminationState(TerminationState):
     """Represents an abnormal termination state."""
-
-    def __init__(self):
-        self.color = "red"
-        self.name = "ABNORMAL_TERMINATION"
+    __slots__ = ()
+    name = "ABNORMAL_TERMINATION"
+    color = "red"
 
 
 class ExecutionState(JobState, ABC):
     """Abstract class to represent an execution state."""
-
-    def __init__(self):
-        self.color = "blue"
+    __slots__ = ()
+    color = "blue"
 
 
 class WaitingState(ExecutionState):
     """Represents a waiting state."""
-
-    def __init__(self):
-        super().__init__()
-        self.name = "WAITING"
+    __slots__ = ()
+    name = "WAITING"
 
 
 class RunningState(ExecutionState):
     """Represents a running state."""
-
-    def __init__(self):
-        super().__init__()
-        self.name = "RUNNING"
+    __slots__ = ()
+    name = "RUNNING"
 
 
 class ErrorState(State, ABC):
     """Represents an error state."""
-
-    def __init__(self, name=None):
-        self.name = name
-        self.color = "red"
+    __slots__ = ()
+    color = "red"
 
 
 class ErrorWhileReadingState(JobState, ErrorState):
     """Represents an error while reading state."""
-    def __init__(self):
-        super().__init__("ERROR_WHILE_READING")
+    __slots__ = ()
+    name = "ERROR_WHILE_READING"
+    color = "red"
 
 
 class InvalidHostAddressState(ErrorState):
     """Represents an invalid host address state."""
-
-    def __init__(self):
-        super().__init__("INVALID_HOST_ADDRESS")
+    __slots__ = ()
+    name = "INVALID_HOST_ADDRESS"
 
 
 class InvalidUserAddressState(ErrorState):
     """Represents an invalid user address state."""
-
-    def __init__(self):
-        super().__init__("INVALID_USER_ADDRESS")
+    __slots__ = ()
+    name = "INVALID_USER_ADDRESS"
 
 
 class AbortedState(TerminationState, ErrorState):
     """Represents an abortion state."""
-
-    def __init__(self):
-        super().__init__("ABORTED")
+    __slots__ = ()
+    name = "ABORTED"
+    color = "red"
 
 
 class JobHeldState(ErrorState):
     """Represents a job held state."""
-
-    def __init__(self):
-        super().__init__()
-        self.name = "JOB_HELD"
+    __slots__ = ()
+    name = "JOB_HELD"
 
 
 class ShadowExceptionState(ErrorState):
     """Represents a shadow exception state."""
-
-    def __init__(self):
-        super().__init__("SHADOW_EXCEPTION")
+    __slots__ = ()
+    name = "SHADOW_EXCEPTION"
 
 
 class JobSuspendedState(ErrorState):
     """Represents if a suspended job state."""
-
-    def __init__(self):
-        super().__init__("JOB_SUSPENDED")
+    __slots__ = ()
+    name = "JOB_SUSPENDED"
 
 
 class JobEvictedState(ErrorState):
     """Represents an evicted job."""
-
-    def __init__(self):
-        super().__init__("JOB_EVICTED")
+    __slots__ = ()
+    name = "JOB_EVICTED"
 
 
 class ExecutableErrorState(ErrorState):
     """Represents an evicted job."""
-
-    def __init__(self):
-        super().__init__("EXECUTABLE_ERROR")
+    __slots__ = ()
+    name = "EXECUTABLE_ERROR"
 
 
 class JobDisconnectedState(ErrorState):
     """Represents a disconnected job state."""
-
-    def __init__(self):
-        super().__init__("JOB_DISCONNECTED")
+    __slots__ = ()
+    name = "JOB_DISCONNECTED"
 
 
 class JobReconnectFailedState(ErrorState):
     """Represents if a job reconnect failed."""
-
-    def __init__(self):
-        super().__init__("JOB_RECONNECT_FAILED")
+    __slots__ = ()
+    name = "JOB_RECONNECT_FAILED"
@@ -0,0 +1,63 @@
+"""
+Decoder for the time stamps of HTCondor job events.
+
+The htcondor module gives the EventTime in the fixed layout
+STRP_FORMAT (e.g. 2021-07-11T20:41:00). Instead of
+datetime.strptime, which parses the format string on every call,
+the integer fields are sliced at their fixed positions.
+Consecutive events often share the same second,
+hence decoded time stamps are memoized.
+"""
+import re
+from datetime import datetime as date_time
+from functools import lru_cache
+
+from htcanalyze.globals import STRP_FORMAT, TIME_STAMP_CACHE_SIZE
+
+EPOCH = date_time(1970, 1, 1)
+# length of a time stamp in STRP_FORMAT
+TIME_STAMP_LENGTH = 19
+# time stamps in STRP_FORMAT, with ASCII digits only
+TIME_STAMP_REGEX = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}\Z"
+)
+
+
+@lru_cache(maxsize=TIME_STAMP_CACHE_SIZE)
+def decode_time_stamp(time_stamp: str) -> date_time:
+    """
+    Decode a time stamp in the STRP_FORMAT layout.
+
+    Time stamps in a different layout are given to strptime,
+    which raises the same ValueError as before.
+
+    :param time_stamp: e.g. 2021-07-11T20:41:00
+    :return: naive datetime
+    :raises ValueError: if the time stamp is invalid
+    """
+    # int() also accepts signs, spaces and non-ASCII digits,
+    # strptime does not
+    if not TIME_STAMP_REGEX.match(time_stamp):
+        return date_time.strptime(time_stamp, STRP_FORMAT)
+    return date_time(
+        int(time_stamp[0:4]), int(time_stamp[5:7]), int(time_stamp[8:10]),
+        int(time_stamp[11:13]), int(time_stamp[14:16]),
+        int(time_stamp[17:19])
+    )
+
+
+@lru_cache(maxsize=TIME_STAMP_CACHE_SIZE)
+def decode_epoch(time_stamp: str) -> int:
+    """
+    Decode a time stamp to whole seconds since the epoch,
+    for consumers that don't need datetime objects.
+
+    Like the JobTable, the naive time stamp is not converted
+    to UTC, see job_table.to_epoch.
+
+    :param time_stamp: e.g. 2021-07-11T20:41:00
+    :return: seconds since 1970-01-01T00:00:00
+    :raises ValueError: if the time stamp is invalid
+    """
+    delta = decode_time_stamp(time_stamp) - EPOCH
+    return delta.days * 86400 + delta.seconds
@@ -0,0 +1,770 @@
+"""
+Pure-Python reader for HTCondor user logs written in the default text format.
+
+Each event is a block like:
+
+    000 (469.1418.000) 02/28 12:49:24 Job submitted from host: <...>
+    ...
+
+The blocks are split on the '...' separator, the header line is tokenized
+and only the payload fields the EventHandler uses are extracted.
+Everything that does not look like the expected layout raises an
+UnsupportedEventError, so that the caller can fall back to the
+htcondor python bindings.
+"""
+import itertools
+import os
+import re
+import json
+import sys
+from datetime import datetime as date_time
+from enum import IntEnum
+from typing import Collection, Iterator, List, Optional, Tuple
+
+from ..log_source import READ_ERRORS, is_plain_file, open_log
+
+
+EVENT_SEPARATOR = "..."
+
+
+class JobEventType(IntEnum):
+    """
+    HTCondor job event types.
+
+    The values are identical to htcondor.JobEventType,
+    so both can be compared with each other.
+    """
+    SUBMIT = 0
+    EXECUTE = 1
+    EXECUTABLE_ERROR = 2
+    CHECKPOINTED = 3
+    JOB_EVICTED = 4
+    JOB_TERMINATED = 5
+    IMAGE_SIZE = 6
+    SHADOW_EXCEPTION = 7
+    GENERIC = 8
+    JOB_ABORTED = 9
+    JOB_SUSPENDED = 10
+    JOB_UNSUSPENDED = 11
+    JOB_HELD = 12
+    JOB_RELEASED = 13
+    NODE_EXECUTE = 14
+    NODE_TERMINATED = 15
+    POST_SCRIPT_TERMINATED = 16
+    GLOBUS_SUBMIT = 17
+    GLOBUS_SUBMIT_FAILED = 18
+    GLOBUS_RESOURCE_UP = 19
+    GLOBUS_RESOURCE_DOWN = 20
+    REMOTE_ERROR = 21
+    JOB_DISCONNECTED = 22
+    JOB_RECONNECTED = 23
+    JOB_RECONNECT_FAILED = 24
+    GRID_RESOURCE_UP = 25
+    GRID_RESOURCE_DOWN = 26
+    GRID_SUBMIT = 27
+    JOB_AD_INFORMATION = 28
+    JOB_STATUS_UNKNOWN = 29
+    JOB_STATUS_KNOWN = 30
+    JOB_STAGE_IN = 31
+    JOB_STAGE_OUT = 32
+    ATTRIBUTE_UPDATE = 33
+    PRESKIP = 34
+    CLUSTER_SUBMIT = 35
+    CLUSTER_REMOVE = 36
+    FACTORY_PAUSED = 37
+    FACTORY_RESUMED = 38
+    NONE = 39
+    FILE_TRANSFER = 40
+    RESERVE_SPACE = 41
+    RELEASE_SPACE = 42
+    FILE_COMPLETE = 43
+    FILE_USED = 44
+    FILE_REMOVED = 45
+
+
+class UnsupportedEventError(ValueError):
+    """
+    The event block can't be read by the UserLogParser.
+
+    The event_id is the (event type, cluster, proc) of the event,
+    if its header could be read, see EventHandler.get_events.
+    """
+    event_id = None
+
+
+# 000 (469.1418.000) 02/28 12:49:24 Job submitted from host: <...>
+# 000 (469.1418.000) 2021-02-28 12:49:24 Job submitted from host: <...>
+HEADER_REGEX = re.compile(
+    r"([0-9]{3}) \(([0-9]+)\.([0-9]+)\.([0-9]+)\) "
+    r"(?:([0-9]{4})-([0-9]{2})-([0-9]{2})|([0-9]{2})/([0-9]{2}))"
+    r"[ T]([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.[0-9]+)?"
+    r"(?:Z|[+-][0-9]{2}:?[0-9]{2})? ?(.*)"
+)
+HOST_REGEX = re.compile(r"Job (?:submitted from|executing on) host: (.*)")
+IMAGE_SIZE_REGEX = re.compile(r"Image size of job updated: ([0-9]+)")
+IMAGE_SIZE_VALUE_REGEX = re.compile(r"\s*(-?[0-9]+)\s+-\s+(\w+) of job")
+NORMAL_TERMINATION_REGEX = re.compile(
+    r"\s*\(1\) Normal termination \(return value (-?[0-9]+)\)"
+)
+ABNORMAL_TERMINATION_REGEX = re.compile(
+    r"\s*\(0\) Abnormal termination \(signal ([0-9]+)\)"
+)
+CHECKPOINTED_REGEX = re.compile(r"\s*\([0-9]\) Job was (not )?checkpointed")
+HOLD_CODE_REGEX = re.compile(r"\s*Code (-?[0-9]+) Subcode (-?[0-9]+)")
+RESOURCE_TOKEN_REGEX = re.compile(r'"[^"]*"|\S+')
+
+# plain layout written by HTCondor, used by tail_first_events
+SEPARATOR = b"\n...\n"
+EMPTY_BLOCK = b"\n...\n...\n"
+# a line starting with ... which is not a plain separator
+SEPARATOR_VARIANT_REGEX = re.compile(rb"\n\.\.\.[^\n]")
+TERMINATION_HEADERS = tuple(
+    b"%03d " % event_type
+    for event_type in (JobEventType.JOB_TERMINATED, JobEventType.JOB_ABORTED)
+)
+# bytes read at once from the end to find the last event block
+TAIL_SIZE = 64 * 1024
+# bytes read at once to locate the wanted event blocks
+TAIL_FIRST_READ_SIZE = 1024 ** 2
+
+
+def _to_value(token: str):
+    """Convert a token to int, float or str like a ClassAd value."""
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return token.strip('"')
+
+
+def _first_line(body: List[str]):
+    """Returns the first line of the event body or None."""
+    return body[0].strip() if body else None
+
+
+def _resource_fields(header_line: str) -> List[Tuple[str, int, int]]:
+    """
+    Returns the (column, start, end) of the values below each header,
+    the fixed positions the htcondor module reads the values from:
+    a Usage or Request value ends at most one character after its
+    header, an Allocated value with its header and an Assigned value
+    starts after the character following the Allocated header.
+    """
+    value_start = start = header_line.index(":") + 1
+    fields = []
+    for match in re.finditer(r"\S+", header_line[value_start:]):
+        column, end = match.group(), value_start + match.end()
+        if column in ("Usage", "Request"):
+            fields.append((column, start, end + 1))
+            start = end + 1
+        elif column == "Allocated":
+            fields.append((column, start, end))
+            start = end + 1
+        elif column == "Assigned":
+            fields.append((column, start, sys.maxsize))
+            start = sys.maxsize
+        else:
+            raise UnsupportedEventError(
+                f"Unknown Partitionable Resources column: {column}"
+            )
+    if not fields:
+        raise UnsupportedEventError("Empty Partitionable Resources header")
+    return fields
+
+
+def _read_resources(body: List[str]) -> dict:
+    """
+    Read the Partitionable Resources table of an event.
+
+        Partitionable Resources :    Usage  Request Allocated
+           Cpus                 :     0.11        1         1
+           Disk (KB)            :   375         375   3770656
+
+    The values are aligned to the column headers, each value has to lie
+    in the field below a header, see _resource_fields. This way also
+    rows with missing values are read correctly. A value beyond its
+    field is cut off or dropped by the htcondor module, in this case
+    UnsupportedEventError is raised, so that the module reads the event.
+    """
+    attributes = {}
+    for i, line in enumerate(body):
+        if "Partitionable Resources" in line and ":" in line:
+            break
+    else:
+        return attributes
+
+    header_line = body[i]
+    colon = header_line.index(":")
+    fields = _resource_fields(header_line)
+
+    for line in body[i + 1:]:
+        if ":" not in line:
+            break
+        name, _ = line.split(":", 1)
+        name = name.strip().split(" ")[0]
+        if line.index(":") != colon:
+            raise UnsupportedEventError(
+                f"Misaligned resource row: {line.strip()}"
+            )
+        assigned = set()
+        for match in RESOURCE_TOKEN_REGEX.finditer(line, colon + 1):
+            for column, start, end in fields:
+                if start <= match.start() and match.end() <= end:
+                    break
+            else:
+                raise UnsupportedEventError(
+                    f"Misaligned value in resource row: {line.strip()}"
+                )
+            if column in assigned:
+                raise UnsupportedEventError(
+                    f"Ambiguous value in resource row: {line.strip()}"
+                )
+            assigned.add(column)
+            value = _to_value(match.group())
+            if column != "Assigned" and isinstance(value, str):
+                raise UnsupportedEventError(
+                    f"Invalid value in resource row: {line.strip()}"
+                )
+            if column == "Usage":
+                attributes[f"{name}Usage"] = value
+            elif column == "Request":
+                attributes[f"Request{name}"] = value
+            elif column == "Allocated":
+                attributes[name] = value
+            else:
+                attributes[f"Assigned{name}"] = value
+
+    return attributes
+
+
+def _read_submit(description, _):
+    match = HOST_REGEX.match(description)
+    if not match or not description.startswith("Job submitted"):
+        raise UnsupportedEventError(description)
+    return {"SubmitHost": match[1].strip()}
+
+
+def _read_execute(description, _):
+    match = HOST_REGEX.match(description)
+    if not match or not description.startswith("Job executing"):
+        raise UnsupportedEventError(description)
+    return {"ExecuteHost": match[1].strip()}
+
+
+def _read_evicted(description, body):
+    if not description.startswith("Job was evicted"):
+        raise UnsupportedEventError(description)
+    attributes = {}
+    for line in body:
+        match = CHECKPOINTED_REGEX.match(line)
+        if match:
+            attributes["Checkpointed"] = not match[1]
+            break
+    # unlike the htcondor module, which skips them, for the cpus
+    # of the execution attempt, see EventHandler.get_job_evicted_event
+    attributes.update(_read_resources(body))
+    return attributes
+
+
+def _read_terminated(description, body):
+    if not description.startswith("Job terminated") or not body:
+        raise UnsupportedEventError(description)
+    match = NORMAL_TERMINATION_REGEX.match(body[0])
+    if match:
+        attributes = {
+            "TerminatedNormally": True,
+            "ReturnValue": int(match[1])
+        }
+    else:
+        match = ABNORMAL_TERMINATION_REGEX.match(body[0])
+        if not match:
+            raise UnsupportedEventError(body[0].strip())
+        attributes = {
+            "TerminatedNormally": False,
+            "TerminatedBySignal": int(match[1])
+        }
+    attributes.update(_read_resources(body))
+    return attributes
+
+
+def _read_image_size(description, body):
+    match = IMAGE_SIZE_REGEX.match(description)
+    if not match:
+        raise UnsupportedEventError(description)
+    attributes = {"Size": int(match[1])}
+    for line in body:
+        value_match = IMAGE_SIZE_VALUE_REGEX.match(line)
+        if value_match:
+            attributes[value_match[2]] = int(value_match[1])
+    return attributes
+
+
+def _read_shadow_exception(description, body):
+    if not description.startswith("Shadow exception"):
+        raise UnsupportedEventError(description)
+    return {"Message": _first_line(body)}
+
+
+def _read_aborted(description, body):
+    if not description.startswith("Job was aborted"):
+        raise UnsupportedEventError(description)
+    return {"Reason": _first_line(body)}
+
+
+def _read_held(description, body):
+    if not description.startswith("Job was held"):
+        raise UnsupportedEventError(description)
+    attributes = {}
+    for line in body:
+        match = HOLD_CODE_REGEX.match(line)
+        if match:
+            attributes["HoldReasonCode"] = int(match[1])
+            attributes["HoldReasonSubCode"] = int(match[2])
+        elif "HoldReason" not in attributes:
+            attributes["HoldReason"] = line.strip()
+    return attributes
+
+
+def _read_disconnected(description, body):
+    if not description.startswith("Job disconnected"):
+        raise UnsupportedEventError(description)
+    return {"DisconnectReason": _first_line(body)}
+
+
+def _read_reconnect_failed(description, body):
+    if not description.startswith("Job reconnection failed"):
+        raise UnsupportedEventError(description)
+    return {"Reason": _first_line(body)}
+
+
+# payload readers by event type,
+# other event types are returned without payload
+PAYLOAD_READERS = {
+    JobEventType.SUBMIT: _read_submit,
+    JobEventType.EXECUTE: _read_execute,
+    JobEventType.JOB_EVICTED: _read_evicted,
+    JobEventType.JOB_TERMINATED: _read_terminated,
+    JobEventType.IMAGE_SIZE: _read_image_size,
+    JobEventType.SHADOW_EXCEPTION: _read_shadow_exception,
+    JobEventType.JOB_ABORTED: _read_aborted,
+    JobEventType.JOB_HELD: _read_held,
+    JobEventType.JOB_DISCONNECTED: _read_disconnected,
+    JobEventType.JOB_RECONNECT_FAILED: _read_reconnect_failed,
+}
+
+
+class UserLogEvent:
+    """
+    HTCondor job event read by the UserLogParser.
+
+    Provides the interface of the HTCJobEventWrapper (event_number,
+    time_stamp, type, get, ...) without constructing a ClassAd.
+
+    :param event_type: JobEventType
+    :param cluster: cluster id of the job
+    :param proc: process id of the job
+    :param subproc: subprocess id of the job
+    :param time_stamp: time stamp of the event
+    :param attributes: payload of the event
+    """
+
+    def __init__(
+            self,
+            event_type: JobEventType,
+            cluster: int,
+            proc: int,
+            subproc: int,
+            time_stamp: date_time,
+            attributes: dict = None
+    ):
+        self.type = event_type
+        self.cluster = cluster
+        self.proc = proc
+        self.subproc = subproc
+        self.time_stamp = time_stamp
+        self.attributes = attributes if attributes else {}
+
+    @property
+    def event_number(self) -> int:
+        """Returns the HTCondor event number."""
+        return int(self.type)
+
+    def get(self, key, default=None):
+        """Get an attribute like from a HTCondor JobEvent."""
+        if key in self.attributes:
+            return self.attributes[key]
+        if key == "EventTypeNumber":
+            return self.event_number
+        if key == "EventTime":
+            return self.time_stamp.isoformat()
+        if key == "Cluster":
+            return self.cluster
+        if key == "Proc":
+            return self.proc
+        if key == "Subproc":
+            return self.subproc
+        return default
+
+    def to_dict(self):
+        """Returns all attributes as a dictionary."""
+        event_dict = {
+            "EventTypeNumber": self.event_number,
+            "EventTime": self.time_stamp.isoformat(),
+            "Cluster": self.cluster,
+            "Proc": self.proc,
+            "Subproc": self.subproc
+        }
+        event_dict.update(self.attributes)
+        return event_dict
+
+    def items(self):
+        """Returns all attribute items."""
+        return self.to_dict().items()
+
+    def keys(self):
+        """Returns all attribute keys."""
+        return self.to_dict().keys()
+
+    def values(self):
+        """Returns all attribute values."""
+        return self.to_dict().values()
+
+    def __repr__(self):
+        return json.dumps(
+            self.to_dict(),
+            indent=2
+        )
+
+
+class UserLogParser:
+    """
+    Streaming reader for HTCondor user logs in the text format.
+
+    Events are yielded one by one, the file is never loaded completely.
+    The offset is the byte position right after the last complete event,
+    a trailing block without separator (still being written) is skipped.
+
+    :param file: HTCondor user log
+    :param offset: byte offset to start reading from
+    :param year: year of the time stamps, which are logged without a year,
+        by default the current year like the htcondor module does
+    :param event_types: only events of these types are parsed and yielded,
+        the others are skipped by the event number of their header,
+        by default all events
+    """
+
+    def __init__(
+            self,
+            file: str,
+            offset: int = 0,
+            year: int = None,
+            event_types: Optional[Collection[int]] = None
+    ):
+        self.file = file
+        self.offset = offset
+        self.year = year if year else date_time.now().year
+        self.event_types = event_types
+        # number of complete events read, including the skipped ones
+        self.n_events = 0
+
+    def is_wanted(self, header: str) -> bool:
+        """Whether the event with the given header line has to be parsed."""
+        if self.event_types is None:
+            return True
+        event_number = header[:3]
+        # invalid headers are parsed to raise an UnsupportedEventError
+        return (
+            not event_number.isdigit() or
+            int(event_number) in self.event_types
+        )
+
+    def events(self) -> Iterator[UserLogEvent]:
+        """
+        Returns a generator over the events of the file.
+
+        :raises UnsupportedEventError: if an event can't be read
+        :raises OSError: if the file can't be read
+        """
+        block = []
+        block_size = 0
+        with open_log(self.file) as log_file:
+            if self.offset:
+                log_file.seek(self.offset)
+            for raw_line in log_file:
+                block_size += len(raw_line)
+                line = raw_line.decode("utf-8", errors="replace").rstrip()
+                if line == EVENT_SEPARATOR:
+                    if block and not self.is_wanted(block[0]):
+                        event = None
+                    else:
+                        event = self.parse_block(block)
+                    self.offset += block_size
+                    self.n_events += 1
+                    block = []
+                    block_size = 0
+                    if event is not None:
+                        yield event
+                elif line or block:
+                    block.append(line)
+                else:
+                    # skip empty lines between two events
+                    self.offset += block_size
+                    block_size = 0
+
+    def tail_first_events(self) -> Optional[Iterator[UserLogEvent]]:
+        """
+        Read a log file, whose last event terminates or aborts a job,
+        without decoding the events that are not in event_types.
+
+        The last complete event block is read first, from the end of
+        the file. If it is a termination, the blocks of wanted event
+        types are located by a search over the raw bytes and only these
+        are decoded and parsed, e.g. the image size updates making up
+        most of a long job's log are skipped.
+        The file is read in blocks of TAIL_FIRST_READ_SIZE, parts
+        which do not have the plain layout written by HTCondor
+        are read line by line by events().
+        The events, the offset and n_events are the same as the ones
+        of events(), which has to be used if None is returned.
+
+        :return: generator over the events or None, if the file
+            is read from an offset, has no event types to skip
+            or does not end with a termination
+        """
+        if self.offset != 0 or self.event_types is None:
+            return None
+        try:
+            with open_log(self.file) as log_file:
+                size = self._terminated_size(log_file)
+        except READ_ERRORS:
+            # events() raises the error
+            return None
+        if size is None:
+            return None
+        return self._parse_wanted_blocks(size)
+
+    def _terminated_size(self, log_file) -> Optional[int]:
+        """
+        Returns the size of the log file, if its last event block
+        is a termination, else None.
+
+        A plain file is read backwards in blocks of TAIL_SIZE until
+        the separator in front of the last event block is found,
+        a compressed log has to be decompressed completely.
+
+        :param log_file: log file opened by open_log
+        """
+        if not is_plain_file(self.file):
+            size = 0
+            tail = b""
+            complete = True
+            chunk = log_file.read(TAIL_FIRST_READ_SIZE)
+            while chunk:
+                size += len(chunk)
+                tail += chunk
+                # keep the last complete block and the one being read
+                last = tail.rfind(SEPARATOR)
+                start = tail.rfind(SEPARATOR, 0, last + 1) if last > 0 else -1
+                if start > 0:
+                    tail = tail[start:]
+                    complete = False
+                chunk = log_file.read(TAIL_FIRST_READ_SIZE)
+            if self._ends_with_termination(tail, complete):
+                return size
+            return None
+
+        size = log_file.seek(0, os.SEEK_END)
+        position = size
+        tail = b""
+        last_length = len(SEPARATOR)
+        while position > 0:
+            read_size = min(TAIL_SIZE, position)
+            position -= read_size
+            log_file.seek(position)
+            tail = log_file.read(read_size) + tail
+            if position + read_size == size:
+                if tail.endswith(SEPARATOR[:-1]):
+                    # the last separator is not terminated by a newline
+                    last_length = len(SEPARATOR) - 1
+                elif not tail.endswith(SEPARATOR):
+                    # not terminated by an event or still being written
+                    return None
+            # the separator in front of the last one, searched in the
+            # bytes read and the ones overlapping with them
+            if tail.rfind(SEPARATOR, 0, min(
+                    len(tail) - last_length + 1,
+                    read_size + len(SEPARATOR) - 1
+            )) >= 0:
+                break
+        if self._ends_with_termination(tail, position == 0):
+            return size
+        return None
+
+    @staticmethod
+    def _ends_with_termination(tail: bytes, complete: bool) -> bool:
+        """
+        Whether the last event block of a file is a termination.
+
+        :param tail: last bytes of the file
+        :param complete: whether the tail is the whole file
+        """
+        if tail.endswith(SEPARATOR[:-1]):
+            tail += b"\n"
+        elif not tail.endswith(SEPARATOR):
+            return False
+        start = tail.rfind(SEPARATOR, 0, len(tail) - len(SEPARATOR))
+        if start >= 0:
+            start += len(SEPARATOR)
+        elif not complete:
+            # the last block does not fit into the tail
+            return False
+        else:
+            start = 0
+        return tail[start:start + 4] in TERMINATION_HEADERS
+
+    def _parse_wanted_blocks(self, size: int) -> Iterator[UserLogEvent]:
+        """
+        Parse the blocks at the start of the file and after every
+        separator followed by a wanted (or no valid) event number.
+
+        The file is read up to its last separator in blocks of
+        TAIL_FIRST_READ_SIZE, events() continues at the first
+        block which does not have the plain layout.
+
+        :param size: size of the file up to its last separator
+        """
+        wanted_block_regex = re.compile(
+            re.escape(SEPARATOR) +
+            b"(?=(?:" +
+            b"|".join(b"%03d" % event_type for event_type in sorted(
+                self.event_types
+            )) +
+            b") |(?![0-9]{3} ))"
+        )
+        with open_log(self.file) as log_file:
+            data = b""
+            n_read = 0
+            while n_read < size:
+                chunk = log_file.read(min(TAIL_FIRST_READ_SIZE, size - n_read))
+                if not chunk:
+                    # truncated while reading
+                    break
+                n_read += len(chunk)
+                data += chunk
+                if n_read == size:
+                    if not data.endswith(SEPARATOR):
+                        # the last separator is not terminated by a newline
+                        data += b"\n"
+                    end = len(data)
+                else:
+                    end = data.rfind(SEPARATOR) + len(SEPARATOR)
+                    if end < len(SEPARATOR):
+                        # the block continues in the next chunk
+                        continue
+                part = data[:end]
+                if (
+                        part.startswith(EVENT_SEPARATOR.encode()) or
+                        SEPARATOR_VARIANT_REGEX.search(part) or
+                        EMPTY_BLOCK in part
+                ):
+                    break
+                yield from self._parse_part(part, wanted_block_regex, size)
+                data = data[end:]
+        if self.offset < size:
+            yield from self.events()
+
+    def _parse_part(
+            self,
+            data: bytes,
+            wanted_block_regex,
+            size: int
+    ) -> Iterator[UserLogEvent]:
+        """
+        Parse the wanted blocks of a part of the file,
+        which starts at the offset and ends with a SEPARATOR.
+
+        :param data: bytes of the part
+        :param wanted_block_regex: regex of the separators
+            in front of the wanted blocks
+        :param size: size of the file
+        """
+        base = self.offset
+        starts = itertools.chain(
+            [0],
+            (match.end() for match in wanted_block_regex.finditer(data))
+        )
+        counted = 0
+        for start in starts:
+            if start == len(data):
+                break
+            end = data.find(SEPARATOR, start) + 1
+            lines = [
+                line.rstrip() for line in
+                data[start:end].decode("utf-8", errors="replace").split("\n")
+            ][:-1]
+            # skip empty lines between two events
+            while lines and not lines[0]:
+                del lines[0]
+            event = (
+                self.parse_block(lines)
+                if not lines or self.is_wanted(lines[0]) else None
+            )
+            # the skipped blocks before and this one
+            position = end + len(SEPARATOR) - 1
+            self.n_events += data.count(SEPARATOR, counted, position)
+            self.offset = min(base + position, size)
+            counted = position
+            if event is not None:
+                yield event
+        self.n_events += data.count(SEPARATOR, counted)
+        self.offset = min(base + len(data), size)
+
+    def parse_block(self, block: List[str]) -> UserLogEvent:
+        """
+        Parse the lines of one event block (without the separator).
+
+        :param block: lines of the event
+        :return: UserLogEvent
+        """
+        if not block:
+            raise UnsupportedEventError("Empty event")
+        match = HEADER_REGEX.fullmatch(block[0])
+        if not match:
+            raise UnsupportedEventError(f"Invalid event header: {block[0]}")
+
+        (
+            event_number, cluster, proc, subproc,
+            year, month, day, short_month, short_day,
+            hour, minute, second, description
+        ) = match.groups()
+        try:
+            event_type = JobEventType(int(event_number))
+            time_stamp = date_time(
+                int(year) if year else self.year,
+                int(month or short_month),
+                int(day or short_day),
+                int(hour),
+                int(minute),
+                int(second)
+            )
+        except ValueError as err:
+            raise UnsupportedEventError(str(err)) from err
+
+        reader = PAYLOAD_READERS.get(event_type)
+        try:
+            attributes = reader(description, block[1:]) if reader else None
+        except UnsupportedEventError as err:
+            err.event_id = (event_type, int(cluster), int(proc))
+            raise
+
+        return UserLogEvent(
+            event_type,
+            int(cluster),
+            int(proc),
+            int(subproc),
+            time_stamp,
+            attributes
+        )
@@ -0,0 +1,214 @@
+"""Notification about changes of followed log files."""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Set, Tuple
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+# struct inotify_event: int wd, uint32 mask, uint32 cookie, uint32 len
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class FileWatcher(ABC):
+    """
+    Watches a set of files for changes.
+
+    :param files: files to watch
+    """
+
+    def __init__(self, files: Iterable[str]):
+        self.files = list(files)
+
+    @abstractmethod
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        Wait for changes of the files.
+
+        :param timeout: maximum seconds to wait
+        :return: changed files, empty if none changed until the timeout
+        """
+
+    def close(self):
+        """Release the resources of the watcher."""
+
+
+class PollingWatcher(FileWatcher):
+    """
+    Detects changes by comparing the size and mtime of the files.
+
+    :param files: files to watch
+    :param interval: seconds between two polls
+    """
+
+    def __init__(self, files: Iterable[str], interval: float = 1.0):
+        super().__init__(files)
+        self.interval = interval
+        self._stats: Dict[str, Tuple[int, int, int]] = {
+            file: self._stat(file) for file in self.files
+        }
+
+    @staticmethod
+    def _stat(file: str) -> Tuple[int, int, int]:
+        try:
+            file_stat = os.stat(file)
+        except OSError:
+            return -1, -1, -1
+        return file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino
+
+    def poll(self) -> Set[str]:
+        """Returns the files that changed since the last poll."""
+        changed = set()
+        for file in self.files:
+            file_stat = self._stat(file)
+            if file_stat != self._stats[file]:
+                self._stats[file] = file_stat
+                changed.add(file)
+        return changed
+
+    def wait(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = self.poll()
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+
+class InotifyWatcher(PollingWatcher):
+    """
+    Uses Linux inotify to be notified about changes.
+
+    A single inotify file descriptor watches all files, so thousands of
+    files are watched by one process without a thread per file.
+    Files that can't be watched (e.g. the watch limit is reached)
+    or were moved or deleted are polled instead,
+    until they can be watched again.
+
+    :param files: files to watch
+    :param interval: seconds between two polls of the unwatched files
+    :raises OSError: if inotify is not available
+    """
+
+    def __init__(self, files: Iterable[str], interval: float = 1.0):
+        super().__init__(files, interval)
+        self._libc = self._load_libc()
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._watches: Dict[int, str] = {}
+        self._unwatched: Set[str] = set()
+        for file in self.files:
+            self._add_watch(file)
+
+    @staticmethod
+    def _load_libc():
+        library = ctypes.util.find_library("c")
+        try:
+            libc = ctypes.CDLL(library, use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [
+                ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32
+            ]
+        except (OSError, AttributeError) as err:
+            raise OSError(f"inotify is not available: {err}") from err
+        return libc
+
+    def _add_watch(self, file: str) -> bool:
+        wd = self._libc.inotify_add_watch(
+            self._fd,
+            os.fsencode(file),
+            WATCH_MASK
+        )
+        if wd < 0:
+            logging.debug(
+                "Polling %s, not able to watch it: %s",
+                file, os.strerror(ctypes.get_errno())
+            )
+            self._unwatched.add(file)
+            return False
+        self._watches[wd] = file
+        self._unwatched.discard(file)
+        return True
+
+    def _read_events(self) -> Set[str]:
+        changed = set()
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size + length
+            file = self._watches.get(wd)
+            if file is None:
+                continue
+            changed.add(file)
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                # rotated or removed, poll until it exists again
+                del self._watches[wd]
+                self._unwatched.add(file)
+        return changed
+
+    def wait(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        changed = set()
+        while not changed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait_time = (
+                min(self.interval, remaining)
+                if self._unwatched else remaining
+            )
+            readable, _, _ = select.select([self._fd], [], [], wait_time)
+            if readable:
+                changed |= self._read_events()
+            for file in list(self._unwatched):
+                file_stat = self._stat(file)
+                if file_stat != self._stats[file]:
+                    self._stats[file] = file_stat
+                    changed.add(file)
+                    self._add_watch(file)
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def get_file_watcher(
+        files: Iterable[str],
+        interval: float = 1.0
+) -> FileWatcher:
+    """
+    Returns an InotifyWatcher if available, else a PollingWatcher.
+
+    :param files: files to watch
+    :param interval: seconds between two polls
+    :return: FileWatcher
+    """
+    files = list(files)
+    try:
+        return InotifyWatcher(files, interval)
+    except OSError as err:
+        logging.debug("Falling back to polling: %s", err)
+        return PollingWatcher(files, interval)
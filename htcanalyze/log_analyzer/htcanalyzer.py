@@ -2,7 +2,9 @@
 
 import logging
 import os.path
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Collection, Dict, Iterator, List, Optional
 from rich.console import Console
 
 # import own module
@@ -12,13 +14,283 @@ from .condor_log.condor_log import (
     RamHistory,
     JobDetails
 )
+from .condor_log.execution_attempt import ExecutionAttempt
 from .event_handler.event_handler import (
-    EventHandler, ReadLogException, ErrorEvent,
+    EventHandler, JobId, ReadLogException, ErrorEvent,
     JobExecutionEvent, JobSubmissionEvent,
     JobTerminationEvent, ImageSizeEvent
 )
+from .event_handler.job_events import (
+    ExecutableErrorEvent,
+    JobDisconnectedEvent,
+    JobEvictedEvent,
+    JobHeldEvent,
+    JobReconnectedEvent,
+    JobReconnectFailedEvent,
+    ShadowExceptionEvent
+)
+from .analysis_cache import AnalysisCache
+from .rdns_cache import RDNSCache
+from .rdns_resolver import RDNSResolver
+from .log_source import is_plain_file, is_seekable_archive, split_member
 from .event_handler.set_events import SETEvents
-from .event_handler.states import ErrorWhileReadingState
+from .event_handler.states import (
+    ErrorWhileReadingState,
+    JobDisconnectedState,
+    TerminationState
+)
+from ..log_summarizer.htcsummarizer import HTCSummarizer
+from ..profiler import Profiler, get_profiler, is_profiling, profiling
+from htcanalyze.globals import (
+    MAX_CHUNK_SIZE,
+    CHUNKS_PER_WORKER,
+    EVENT_LOG_MAX_JOBS
+)
+
+
+def _analyze_chunk(
+        log_files: List[str],
+        cache: AnalysisCache = None,
+        event_types: Optional[Collection] = None
+) -> List[CondorLog]:
+    """
+    Analyze a chunk of log files inside a worker process.
+
+    Defined on module level, so that it can be pickled
+    and sent to the process pool.
+    The host addresses are resolved by the main process.
+    """
+    htc_analyzer = HTCAnalyzer(cache=cache, event_types=event_types)
+    try:
+        return [
+            condor_log
+            for file in log_files
+            for condor_log in htc_analyzer.get_condor_logs(file)
+        ]
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _profile_chunk(
+        function: Callable,
+        log_files: List[str],
+        trace: bool = False,
+        **kwargs
+) -> tuple:
+    """
+    Run _analyze_chunk or _summarize_chunk with a profiler,
+    which is sent back with the result.
+    """
+    with profiling(Profiler(trace)) as profiler:
+        return function(log_files, **kwargs), profiler
+
+
+def _summarize_chunk(
+        log_files: List[str],
+        cache: AnalysisCache = None,
+        event_types: Optional[Collection] = None
+) -> HTCSummarizer:
+    """
+    Summarize a chunk of log files inside a worker process.
+
+    Only the partial summary is sent back, not the CondorLogs.
+    """
+    htc_analyzer = HTCAnalyzer(cache=cache, event_types=event_types)
+    try:
+        return HTCSummarizer(
+            condor_log
+            for file in log_files
+            for condor_log in htc_analyzer.get_condor_logs(file)
+        ).accumulate()
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+# events that remove a running job from its node
+ATTEMPT_END_EVENTS = (
+    ExecutableErrorEvent,
+    JobHeldEvent,
+    JobReconnectFailedEvent,
+    ShadowExceptionEvent
+)
+
+
+class _JobEvents:
+    """
+    Collects the events of a single job while reading a log file.
+
+    Every execution starts an ExecutionAttempt, which is ended by
+    the next event that removed the job from the node.
+    """
+
+    def __init__(self):
+        self.submission_event = None
+        self.execution_event = None
+        self.termination_event = None
+        self.image_size_events = []
+        self.occurred_errors = []
+        self.execution_attempts = []
+        # attempt of the current execution, until it ended
+        self.running_attempt = None
+
+    def __setstate__(self, state):
+        if "execution_attempts" not in state:
+            # checkpointed by an older version, the log is read again
+            raise AttributeError("Checkpoint without execution attempts")
+        self.__dict__.update(state)
+
+    def add(self, job_event):
+        """Keep the job event, depending on its type."""
+        if isinstance(job_event, JobSubmissionEvent):
+            self.submission_event = job_event
+
+        if isinstance(job_event, JobExecutionEvent):
+            self.execution_event = job_event
+            self._start_attempt(job_event)
+        elif self.running_attempt is not None:
+            self._update_attempt(job_event)
+
+        if isinstance(job_event, JobTerminationEvent):
+            self.termination_event = job_event
+
+        if isinstance(job_event, ImageSizeEvent):
+            self.image_size_events.append(job_event)
+
+        if isinstance(job_event, ErrorEvent):
+            self.occurred_errors.append(job_event)
+
+    def _start_attempt(self, execution_event: JobExecutionEvent):
+        """Start an attempt, a running one ends without an end event."""
+        running_attempt = self.running_attempt
+        if running_attempt is not None:
+            # disconnected last, or an event that was not logged
+            running_attempt.end_date = execution_event.time_stamp
+        if self.execution_attempts:
+            self.execution_attempts[-1].retried = True
+        self.running_attempt = ExecutionAttempt(execution_event)
+        self.execution_attempts.append(self.running_attempt)
+
+    def _update_attempt(self, job_event):
+        """End the running attempt, if the job event removed the job."""
+        running_attempt = self.running_attempt
+        if isinstance(job_event, JobTerminationEvent):
+            running_attempt.end(
+                job_event.time_stamp,
+                job_event.termination_state
+            )
+        elif isinstance(job_event, JobEvictedEvent):
+            running_attempt.end(
+                job_event.time_stamp,
+                job_event.error_state,
+                checkpointed=job_event.checkpointed,
+                cpus=job_event.cpus
+            )
+        elif isinstance(job_event, ATTEMPT_END_EVENTS):
+            running_attempt.end(job_event.time_stamp, job_event.error_state)
+        elif isinstance(job_event, JobDisconnectedEvent):
+            # ends the attempt only if the job runs again
+            running_attempt.end_state = JobDisconnectedState()
+            return
+        elif isinstance(job_event, JobReconnectedEvent):
+            running_attempt.end_state = None
+            return
+        else:
+            return
+        self.running_attempt = None
+
+    def _get_execution_attempts(self) -> List[ExecutionAttempt]:
+        """Returns the attempts, with the cpus of the job if unknown."""
+        resources = (
+            self.termination_event.resources
+            if self.termination_event is not None else None
+        )
+        cpus = None
+        if resources is not None and resources.cpu_resource is not None:
+            cpu_resource = resources.cpu_resource
+            cpus = (
+                cpu_resource.allocated if cpu_resource.allocated > 0
+                else cpu_resource.requested
+            )
+        for attempt in self.execution_attempts:
+            if attempt.cpus is None:
+                attempt.cpus = cpus
+        return self.execution_attempts
+
+    def to_condor_log(self, file: str, job_id: JobId, state) -> CondorLog:
+        """Create the CondorLog of this job."""
+        set_events = SETEvents(
+            self.submission_event,
+            self.execution_event,
+            self.termination_event,
+        )
+        job_details = JobDetails(
+            set_events,
+            state,
+            self._get_execution_attempts()
+        )
+        error_events = LogfileErrorEvents(
+            self.occurred_errors,
+            os.path.basename(file)
+        )
+        ram_history = RamHistory(self.image_size_events)
+
+        return CondorLog(
+            file,
+            job_details,
+            error_events,
+            ram_history,
+            job_id=f"{job_id[0]}.{job_id[1]}" if job_id else None
+        )
+
+
+def _add_read_error(jobs: Dict[JobId, _JobEvents], err: ReadLogException):
+    """Add an error event to each job of a file that could not be read."""
+    if not jobs:
+        jobs[None] = _JobEvents()
+    for job_events in jobs.values():
+        job_events.occurred_errors.append(
+            ErrorEvent(
+                None,
+                None,
+                ErrorWhileReadingState(),
+                reason=str(err)
+            )
+        )
+
+
+def _count_bytes(profiler, start: Optional[int], end: Optional[int]):
+    """Count the bytes read in the event reading stage."""
+    # the offset is unknown if the events were read by the htcondor module
+    if start is not None and end is not None:
+        profiler.count("event reading", n_bytes=max(end - start, 0))
+
+
+class LogCheckpoint:
+    """
+    State of reading a log file up to the last complete event.
+
+    Checkpointed in the AnalysisCache for files with jobs that are
+    still idle or running, the next run continues at the byte offset
+    of the EventHandler and only reads the appended events.
+
+    :param event_types: event types to read, by default all
+    """
+
+    def __init__(self, event_types: Optional[Collection] = None):
+        self.event_handler = EventHandler(event_types)
+        self.jobs: Dict[JobId, _JobEvents] = {}
+        self.failed = False
+
+    @property
+    def is_resumable(self) -> bool:
+        """Whether reading can continue at a byte offset."""
+        return (
+            not self.failed and
+            self.event_handler.offset is not None and
+            self.event_handler.offset > 0
+        )
 
 
 class HTCAnalyzer:
@@ -30,116 +302,529 @@ class HTCAnalyzer:
         summarize,
         analyzed-summary
 
+    :param console: Console
+    :param rdns_lookup: reverse dns lookup for ip-addresses,
+        resolved in batches after the files are read, see RDNSResolver
+    :param workers: number of worker processes,
+        1 analyzes the files in this process, 0 uses all available cpus
+    :param chunk_size: number of files sent to a worker at once,
+        by default chosen by the number of files and workers
+    :param cache: AnalysisCache for the CondorLogs of terminated jobs,
+        None disables the cache
+    :param event_types: only events of these types are read,
+        e.g. SUMMARY_EVENT_TYPES, by default all.
+        CondorLogs of a subset of the events are cached apart
+        from the CondorLogs of all events, they would be incomplete
+        for other uses.
+    :param rdns_cache: RDNSCache of the resolved host addresses,
+        None keeps them in memory only
     """
 
     def __init__(
             self,
             console=None,
-            rdns_lookup=False
+            rdns_lookup=False,
+            workers=1,
+            chunk_size=None,
+            cache: AnalysisCache = None,
+            event_types: Optional[Collection] = None,
+            rdns_cache: RDNSCache = None
     ):
         self.console = console if console else Console()
-        self.rdns_cache = {}
-        self.rdns_lookup = rdns_lookup
+        self.resolver = RDNSResolver(rdns_cache) if rdns_lookup else None
+        self.workers = workers if workers > 0 else os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.event_types = event_types
 
-    def analyze(self, log_files: List[str]) -> List[CondorLog]:
+    def analyze(
+            self,
+            log_files: List[str],
+            ordered: bool = True
+    ) -> List[CondorLog]:
         """
-        Analyze the given log files one by one.
+        Analyze the given log files one by one,
+        yields one CondorLog per job found in the files.
+
+        If more than one worker is set, the files are analyzed in chunks
+        by a process pool.
 
         :param log_files: list of valid HTCondor log files
-        :return: list with information of each log file
+        :param ordered: yield the results in the order of log_files,
+            else in the order the chunks are completed
+        :return: list with information of each job
         """
 
         if not log_files:
             raise ValueError("No files to analyze")
 
+        if self.workers > 1 and len(log_files) > 1:
+            condor_logs = (
+                condor_log
+                for condor_logs in self._map_chunks(
+                    _analyze_chunk,
+                    log_files,
+                    ordered
+                )
+                for condor_log in condor_logs
+            )
+        else:
+            condor_logs = (
+                condor_log
+                for file in log_files
+                for condor_log in self.get_condor_logs(file)
+            )
+        if self.resolver is not None:
+            condor_logs = self.resolver.resolve_batches(condor_logs)
+        yield from condor_logs
+
+    def summarize(self, log_files: List[str]) -> Iterator[HTCSummarizer]:
+        """
+        Summarize the given log files, yields partial summaries.
+
+        If more than one worker is set, each worker summarizes a chunk
+        of files and sends back the partial summary instead of the
+        CondorLogs, else the files are summarized in this process.
+        The partial summaries are merged with HTCSummarizer.merge.
+
+        :param log_files: list of valid HTCondor log files
+        :return: generator over partial summaries,
+            in the order the chunks are completed
+        """
+        if not log_files:
+            raise ValueError("No files to analyze")
+
+        if self.workers > 1 and len(log_files) > 1:
+            summarizers = self._map_chunks(
+                _summarize_chunk,
+                log_files,
+                ordered=False
+            )
+        else:
+            summarizers = [
+                HTCSummarizer(
+                    condor_log
+                    for file in log_files
+                    for condor_log in self.get_condor_logs(file)
+                )
+            ]
+        for summarizer in summarizers:
+            if self.resolver is not None:
+                summarizer.resolve_nodes(self.resolver.resolve)
+            yield summarizer
+
+    def _get_chunk_size(self, n_files: int) -> int:
+        """Returns chunk size, several chunks per worker to balance load."""
+        if self.chunk_size:
+            return self.chunk_size
+        chunk_size = -(-n_files // (self.workers * CHUNKS_PER_WORKER))
+        return max(1, min(chunk_size, MAX_CHUNK_SIZE))
+
+    @staticmethod
+    def _get_chunks(log_files: List[str], chunk_size: int) -> List[List]:
+        """
+        Split the log files into chunks of chunk_size files.
+
+        Consecutive members of a compressed archive stay in one chunk,
+        it has to be decompressed from the start by each worker
+        reading one of its members.
+
+        :param log_files: list of valid HTCondor log files
+        :param chunk_size: number of files per chunk
+        :return: chunks in the order of log_files
+        """
+        chunks = []
+        chunk = []
+        streamed_archive = None
         for file in log_files:
-            condor_log = self.get_condor_log(file, self.rdns_lookup)
-            yield condor_log
+            archive, member = split_member(file)
+            if member is None or is_seekable_archive(archive):
+                archive = None
+            if len(chunk) >= chunk_size and (
+                    archive is None or archive != streamed_archive
+            ):
+                chunks.append(chunk)
+                chunk = []
+            chunk.append(file)
+            streamed_archive = archive
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _map_chunks(
+            self,
+            function: Callable,
+            log_files: List[str],
+            ordered: bool = True
+    ) -> Iterator:
+        """
+        Apply the function to chunks of the log files with a process pool.
+
+        :param function: _analyze_chunk or _summarize_chunk
+        :param log_files: list of valid HTCondor log files
+        :param ordered: yield the results in the order of log_files
+        :return: generator over the result of each chunk
+        """
+        chunks = self._get_chunks(
+            log_files,
+            self._get_chunk_size(len(log_files))
+        )
+        profiler = get_profiler()
+        if is_profiling():
+            # the stages of the workers are merged into this profiler
+            function = partial(
+                _profile_chunk,
+                function,
+                trace=profiler.trace_events is not None
+            )
+        if self.cache is not None and self.cache.rebuild:
+            # the copies sent to the workers do not rebuild the cache
+            self.cache.open()
+        analyze_chunk = partial(
+            function,
+            cache=self.cache,
+            event_types=self.event_types
+        )
+        n_workers = min(self.workers, len(chunks))
+        logging.debug(
+            "Analyzing %d files in %d chunks with %d workers",
+            len(log_files), len(chunks), n_workers
+        )
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            if ordered:
+                results = executor.map(analyze_chunk, chunks)
+            else:
+                futures = [
+                    executor.submit(analyze_chunk, chunk) for chunk in chunks
+                ]
+                results = (future.result() for future in as_completed(futures))
+            for result in results:
+                if is_profiling():
+                    result, worker_profiler = result
+                    profiler.merge(worker_profiler)
+                yield result
 
-    def get_condor_log(
+    def get_condor_logs(
             self,
             file: str,
             rdns_lookup=False
-    ) -> CondorLog:
+    ) -> List[CondorLog]:
         """
-        Read the log file with the htcondor module.
+        Read the log file with the UserLogParser,
+        falls back to the htcondor module for events it can't read.
+        If a cache is set, the CondorLogs are taken from the cache
+        if the log file did not change since it was cached.
+        Log files with jobs that are still idle or running are
+        checkpointed, if they were only appended to since,
+        just the new events are read, see LogCheckpoint.
 
-        Return five dicts holding information about:
+        A log file can be shared by several jobs (e.g. all procs
+        of a cluster), the events are demultiplexed by their
+        (cluster, proc) job id in a single pass over the file.
+
+        Return one CondorLog per job holding information about:
         execution node, used resources, times, used ram history and errors
 
         :type file: str
         :param file: HTCondor log file
-        :param rdns_lookup: reverse dns lookup for ip-adresses
-        :return: job_details, resources, time_manager, ram_history, errors
+        :param rdns_lookup: reverse dns lookup for ip-adresses,
+            analyze resolves the addresses of many files at once instead
+        :return: list of CondorLogs in order of appearance of the jobs
 
-        Consider that the return values can be None or empty dictionaries
+        Consider that the values of a CondorLog can be None or empty
         """
-        submission_event = None
-        execution_event = None
-        termination_event = None
-        image_size_events = []
-        occurred_errors = []
-        condor_event_handler = EventHandler()
+        with get_profiler().stage("analysis", items=1):
+            condor_logs = self._get_condor_logs(file)
+        if rdns_lookup:
+            self._resolve(condor_logs)
+        return condor_logs
+
+    def _get_condor_logs(self, file: str) -> List[CondorLog]:
+        """Returns the CondorLogs of the file, see get_condor_logs."""
+        if self.cache is None:
+            return self.read_condor_logs(file)
 
         try:
-            for event in condor_event_handler.get_htc_events(file):
+            # stat before reading, changes while reading invalidate the entry,
+            # the members of an archive are invalidated by the archive
+            file_stat = os.stat(split_member(file)[0])
+        except OSError:
+            return self.read_condor_logs(file)
 
-                try:
-                    job_event = condor_event_handler.get_job_event(
-                        event,
-                        rdns_lookup
-                    )
+        condor_logs = self.cache.get(file, file_stat, self.event_types)
+        if condor_logs is not None:
+            return condor_logs
+        if not is_plain_file(file):
+            # compressed logs can't be continued at a byte offset
+            condor_logs = self.read_condor_logs(file)
+            self.cache.put(file, file_stat, condor_logs, self.event_types)
+            return condor_logs
 
-                    if isinstance(job_event, JobSubmissionEvent):
-                        submission_event = job_event
+        # continue after the last complete event of the previous run
+        checkpoint = self.cache.get_checkpoint(
+            file,
+            file_stat,
+            self.event_types
+        )
+        if checkpoint is not None:
+            resumed_offset = checkpoint.event_handler.offset
+            logging.debug("Resuming %s at byte %d", file, resumed_offset)
+        else:
+            resumed_offset = None
+            checkpoint = LogCheckpoint(self.event_types)
+        condor_logs = self._read_condor_logs(file, checkpoint)
+        if (
+                not self.cache.put(
+                    file,
+                    file_stat,
+                    condor_logs,
+                    self.event_types
+                )
+                and checkpoint.is_resumable
+                # else no event was added, the checkpoint is the same
+                and checkpoint.event_handler.offset != resumed_offset
+        ):
+            self.cache.put_checkpoint(
+                file,
+                file_stat,
+                checkpoint.event_handler.offset,
+                checkpoint,
+                self.event_types
+            )
+        return condor_logs
 
-                    if isinstance(job_event, JobExecutionEvent):
-                        execution_event = job_event
+    def _resolve(self, condor_logs: List[CondorLog]):
+        """Resolve the host addresses of the CondorLogs."""
+        resolver = self.resolver if self.resolver else RDNSResolver()
+        resolver.resolve_condor_logs(condor_logs)
 
-                    if isinstance(job_event, JobTerminationEvent):
-                        termination_event = job_event
+    def read_condor_logs(
+            self,
+            file: str,
+            rdns_lookup=False
+    ) -> List[CondorLog]:
+        """
+        Read the CondorLogs of all jobs in the log file,
+        without consulting the cache.
 
-                    if isinstance(job_event, ImageSizeEvent):
-                        image_size_events.append(job_event)
+        :param file: HTCondor log file
+        :param rdns_lookup: reverse dns lookup for ip-adresses
+        :return: list of CondorLogs in order of appearance of the jobs
+        """
+        condor_logs = self._read_condor_logs(
+            file,
+            LogCheckpoint(self.event_types)
+        )
+        if rdns_lookup:
+            self._resolve(condor_logs)
+        return condor_logs
 
-                    if isinstance(job_event, ErrorEvent):
-                        occurred_errors.append(job_event)
+    def _read_condor_logs(
+            self,
+            file: str,
+            checkpoint: "LogCheckpoint"
+    ) -> List[CondorLog]:
+        """
+        Read the events after the checkpoint and update it.
+
+        :param file: HTCondor log file
+        :param checkpoint: state of the reader, updated in place
+        :return: list of CondorLogs in order of appearance of the jobs
+        """
+        jobs = checkpoint.jobs
+        condor_event_handler = checkpoint.event_handler
+        profiler = get_profiler()
+        offset = condor_event_handler.offset
+        n_events = 0
+
+        try:
+            with profiler.stage("event dispatch"):
+                for event in profiler.iterate(
+                        "event reading",
+                        condor_event_handler.get_events(file)
+                ):
+                    n_events += 1
+                    job_id = condor_event_handler.get_job_id(event)
+                    job_events = jobs.get(job_id)
+                    if job_events is None:
+                        job_events = jobs[job_id] = _JobEvents()
 
-                except AttributeError as err:
-                    self.console.print(f"[yellow]{err}[/yellow]")
+                    job_event = condor_event_handler.get_job_event(event)
+                    if job_event is not None:
+                        job_events.add(job_event)
 
         except ReadLogException as err:
             logging.debug(err)
             self.console.print(f"[red]{err}[/red]")
-            occurred_errors.append(
-                ErrorEvent(
-                    None,
-                    None,
-                    ErrorWhileReadingState(),
-                    reason=str(err)
-                )
-            )
+            checkpoint.failed = True
+            _add_read_error(jobs, err)
+        profiler.count("event dispatch", items=n_events)
+        _count_bytes(profiler, offset, condor_event_handler.offset)
 
         # End of the file
+        if condor_event_handler.unhandled_events:
+            logging.debug(
+                "Event types not handled yet in %s: %s",
+                file, dict(condor_event_handler.unhandled_events)
+            )
 
-        set_events = SETEvents(
-            submission_event,
-            execution_event,
-            termination_event,
-        )
-        job_details = JobDetails(
-            set_events,
-            condor_event_handler.state
-        )
-        error_events = LogfileErrorEvents(
-            occurred_errors,
-            os.path.basename(file)
-        )
-        ram_history = RamHistory(image_size_events)
+        return [
+            job_events.to_condor_log(
+                file,
+                job_id,
+                condor_event_handler.get_state(job_id)
+            )
+            for job_id, job_events in jobs.items()
+        ]
 
-        return CondorLog(
+
+class EventLogAnalyzer:
+    """
+    Analyze the global event log (EVENT_LOG) of a schedd.
+
+    The event log holds the events of all jobs of the schedd,
+    it is read once, in the order it was written, from its oldest
+    rotation to the current file. The events are demultiplexed by
+    their job id, only the jobs in flight are kept in memory, the
+    CondorLog of a job is given out as soon as it terminates or aborts.
+
+    If more than max_jobs jobs are in flight, the jobs seen first are
+    given out in their current state. Their later events are given out
+    as another CondorLog of the same job id, at termination.
+    A job without a state at its first event, e.g. submitted before the
+    oldest rotation or given out before, starts in the WaitingState.
+
+    :param console: Console
+    :param rdns_lookup: reverse dns lookup for ip-addresses
+    :param rdns_cache: persistent cache of the reverse dns lookups
+    :param event_types: only events of these types are read,
+        e.g. SUMMARY_EVENT_TYPES to skip the image size updates,
+        by default all
+    :param max_jobs: maximum number of jobs in flight
+    """
+
+    def __init__(
+            self,
+            console=None,
+            rdns_lookup=False,
+            event_types: Optional[Collection] = None,
+            max_jobs: int = EVENT_LOG_MAX_JOBS,
+            rdns_cache: RDNSCache = None
+    ):
+        self.console = console if console else Console()
+        self.resolver = RDNSResolver(rdns_cache) if rdns_lookup else None
+        self.event_types = event_types
+        self.max_jobs = max(max_jobs, 1)
+
+    def analyze(self, event_logs: List[str]) -> Iterator[CondorLog]:
+        """
+        Read the event logs one after the other, like one log file.
+
+        :param event_logs: the rotated files of an event log, oldest
+            first, see log_source.rotated_event_logs
+        :return: generator over one CondorLog per job,
+            in the order the jobs terminated
+        """
+        condor_logs = self._analyze(event_logs)
+        if self.resolver is not None:
+            condor_logs = self.resolver.resolve_batches(condor_logs)
+        yield from condor_logs
+
+    def _dispatch(
+            self,
+            file: str,
+            event,
+            jobs: Dict[JobId, _JobEvents],
+            event_handler: EventHandler
+    ) -> List[CondorLog]:
+        """
+        Add the event to its job.
+
+        :return: the CondorLogs of the jobs done, the terminated job
+            or the oldest one if more than max_jobs are in flight
+        """
+        job_event = event_handler.get_job_event(event)
+        if job_event is None:
+            return []
+        condor_logs = []
+        job_id = event_handler.get_job_id(event)
+        job_events = jobs.get(job_id)
+        if job_events is None:
+            if len(jobs) >= self.max_jobs:
+                condor_logs.append(self._pop_job(
+                    file,
+                    next(iter(jobs)),
+                    jobs,
+                    event_handler
+                ))
+            job_events = jobs[job_id] = _JobEvents()
+            # its submission may be in an older rotation
+            event_handler.set_initial_state(job_id)
+        job_events.add(job_event)
+        if isinstance(event_handler.get_state(job_id), TerminationState):
+            condor_logs.append(
+                self._pop_job(file, job_id, jobs, event_handler)
+            )
+        return condor_logs
+
+    def _analyze(self, event_logs: List[str]) -> Iterator[CondorLog]:
+        event_handler = EventHandler(self.event_types)
+        jobs: Dict[JobId, _JobEvents] = {}
+        file = None
+        for file in event_logs:
+            event_handler.next_file()
+            profiler = get_profiler()
+            offset = event_handler.offset
+            try:
+                for event in profiler.iterate(
+                        "event reading",
+                        event_handler.get_events(file)
+                ):
+                    # a stage per event, the jobs are yielded outside
+                    with profiler.stage(
+                            "event dispatch",
+                            items=1,
+                            trace=False
+                    ):
+                        condor_logs = self._dispatch(
+                            file,
+                            event,
+                            jobs,
+                            event_handler
+                        )
+                    yield from condor_logs
+                _count_bytes(profiler, offset, event_handler.offset)
+
+            except ReadLogException as err:
+                logging.debug(err)
+                self.console.print(f"[red]{err}[/red]")
+                # the jobs in flight are incomplete
+                _add_read_error(jobs, err)
+                for job_id in list(jobs):
+                    yield self._pop_job(file, job_id, jobs, event_handler)
+                event_handler = EventHandler(self.event_types)
+
+        if event_handler.unhandled_events:
+            logging.debug(
+                "Event types not handled yet: %s",
+                dict(event_handler.unhandled_events)
+            )
+        # jobs still idle or running at the end of the event log
+        for job_id in list(jobs):
+            yield self._pop_job(file, job_id, jobs, event_handler)
+
+    @staticmethod
+    def _pop_job(
+            file: str,
+            job_id: JobId,
+            jobs: Dict[JobId, _JobEvents],
+            event_handler: EventHandler
+    ) -> CondorLog:
+        """Returns the CondorLog of a job, which is not kept anymore."""
+        condor_log = jobs.pop(job_id).to_condor_log(
             file,
-            job_details,
-            error_events,
-            ram_history
+            job_id,
+            event_handler.get_state(job_id)
         )
+        event_handler.forget(job_id)
+        return condor_log
@@ -0,0 +1,179 @@
+"""Follow growing log files and keep the state of their jobs up to date."""
+
+import logging
+import os
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Union
+
+from .event_handler.event_handler import (
+    STATE_EVENT_TYPES,
+    EventHandler,
+    JobId,
+    HTCJobEvent,
+    ReadLogException,
+    jet
+)
+from .event_handler.job_events import (
+    JobAbortedEvent,
+    JobEvictedEvent,
+    JobExecutionEvent,
+    JobHeldEvent,
+    JobTerminationEvent
+)
+from .event_handler.states import JobState
+from .event_handler.user_log_parser import UserLogEvent
+
+# the live summary shows the states, held jobs and evictions
+FOLLOW_EVENT_TYPES = STATE_EVENT_TYPES | {
+    jet.JOB_HELD,
+    jet.JOB_RELEASED,
+    jet.JOB_EVICTED
+}
+
+
+class FollowedLog:
+    """
+    A log file that is kept open to read only newly appended events.
+
+    The EventHandler continues at the byte offset of the last
+    complete event, see EventHandler.get_events. After a fallback to
+    the htcondor module, its JobEventLog is kept open and continues
+    at its own position.
+    If the file shrinks or is replaced, it is read again from the start.
+
+    :param file: HTCondor log file
+    """
+
+    def __init__(self, file: str):
+        self.file = file
+        self._reset()
+
+    def _reset(self):
+        self.event_handler = EventHandler(FOLLOW_EVENT_TYPES, follow=True)
+        self.inode = None
+        self.size = 0
+        self.held_jobs: Set[JobId] = set()
+        self.n_evictions = 0
+        self.error = None
+
+    @property
+    def n_events(self) -> int:
+        """Returns the number of events read."""
+        return self.event_handler.n_events
+
+    @property
+    def states(self) -> Dict[JobId, JobState]:
+        """Returns the current state of each job."""
+        return self.event_handler.states
+
+    def _is_truncated(self) -> bool:
+        """Whether the file was truncated or replaced since the last read."""
+        try:
+            file_stat = os.stat(self.file)
+        except OSError:
+            return False
+        # the offset is unknown if the htcondor module reads the file
+        offset = self.event_handler.offset
+        truncated = (
+            self.inode is not None and file_stat.st_ino != self.inode or
+            file_stat.st_size < self.size or
+            offset is not None and file_stat.st_size < offset
+        )
+        self.inode = file_stat.st_ino
+        self.size = file_stat.st_size
+        return truncated
+
+    def update(self) -> int:
+        """
+        Read the events appended since the last update.
+
+        :return: number of new events, including the skipped ones
+        """
+        if self.error is not None:
+            return 0
+        if self._is_truncated():
+            logging.debug("%s was truncated or replaced", self.file)
+            inode, size = self.inode, self.size
+            self._reset()
+            self.inode, self.size = inode, size
+
+        n_events = self.n_events
+        try:
+            for event in self.event_handler.get_events(self.file):
+                self._handle(event)
+        except ReadLogException as err:
+            logging.debug("Not able to follow %s: %s", self.file, err)
+            self.error = err
+        return self.n_events - n_events
+
+    def _handle(self, event: Union[HTCJobEvent, UserLogEvent]):
+        job_id = self.event_handler.get_job_id(event)
+        if event.type == jet.JOB_RELEASED:
+            self.held_jobs.discard(job_id)
+            return
+        job_event = self.event_handler.get_job_event(event)
+        if isinstance(job_event, JobHeldEvent):
+            self.held_jobs.add(job_id)
+        elif isinstance(job_event, JobEvictedEvent):
+            self.n_evictions += 1
+        elif isinstance(
+                job_event,
+                (JobExecutionEvent, JobTerminationEvent, JobAbortedEvent)
+        ):
+            self.held_jobs.discard(job_id)
+
+
+class LogFollower:
+    """
+    Follows several log files in one process.
+
+    The number of jobs per state is updated incrementally,
+    only the files that changed are read.
+
+    :param log_files: HTCondor log files
+    """
+
+    def __init__(self, log_files: Iterable[str]):
+        self.logs: Dict[str, FollowedLog] = {
+            file: FollowedLog(file) for file in log_files
+        }
+        self.state_counts = Counter()
+        self.n_held = 0
+        self.n_evictions = 0
+        self.n_events = 0
+
+    @property
+    def files(self) -> List[str]:
+        """Returns the followed files."""
+        return list(self.logs)
+
+    @property
+    def n_errors(self) -> int:
+        """Returns the number of files that can't be followed anymore."""
+        return sum(log.error is not None for log in self.logs.values())
+
+    def update(self, files: Iterable[str] = None) -> int:
+        """
+        Read the new events of the given files.
+
+        :param files: changed files, by default all followed files
+        :return: number of new events, including the skipped ones
+        """
+        n_events = 0
+        for file in self.logs if files is None else files:
+            log = self.logs.get(file)
+            if log is None:
+                continue
+            self._count(log, -1)
+            n_events += log.update()
+            self._count(log, 1)
+        self.n_events += n_events
+        return n_events
+
+    def _count(self, log: FollowedLog, sign: int):
+        """Add (sign=1) or remove (sign=-1) the counts of a log."""
+        for state in log.states.values():
+            if state is not None:
+                self.state_counts[state.name] += sign
+        self.n_held += sign * len(log.held_jobs)
+        self.n_evictions += sign * log.n_evictions
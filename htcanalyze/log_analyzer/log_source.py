@@ -0,0 +1,293 @@
+"""
+Open HTCondor logs that are compressed or members of a tar archive.
+
+Supported are:
+    plain files
+    compressed files: .gz, .xz and .zst (requires the zstandard module)
+    members of tar archives, addressed as archive.tar::path/of/job.log,
+        the archive can be compressed as well (.tar.gz, .tar.xz, .tar.zst)
+
+Everything is decompressed while reading, no temporary files are written.
+"""
+import gzip
+import io
+import logging
+import lzma
+import os
+import tarfile
+import zlib
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    # .zst files can't be read without the zstandard module
+    zstandard = None
+
+from htcanalyze.globals import ARCHIVE_MEMBER_SEPARATOR
+
+COMPRESSION_OPENERS = {
+    ".gz": gzip.open,
+    ".tgz": gzip.open,
+    ".xz": lzma.open,
+    ".txz": lzma.open
+}
+ZSTD_SUFFIXES = (".zst", ".tzst")
+COMPRESSION_SUFFIXES = (".gz", ".xz", ".zst")
+ARCHIVE_SUFFIXES = (
+    ".tar", ".tar.gz", ".tgz", ".tar.xz", ".txz", ".tar.zst", ".tzst"
+)
+# raised while reading a corrupted compressed file or archive
+READ_ERRORS = (OSError, EOFError, lzma.LZMAError, zlib.error, tarfile.TarError)
+if zstandard is not None:
+    READ_ERRORS += (zstandard.ZstdError,)
+
+
+def split_member(file: str) -> Tuple[str, Optional[str]]:
+    """Returns the archive and member of a member path, else (file, None)."""
+    archive, separator, member = file.partition(ARCHIVE_MEMBER_SEPARATOR)
+    return (archive, member) if separator else (file, None)
+
+
+def member_path(archive: str, member: str) -> str:
+    """Returns the path of an archive member, see split_member."""
+    return f"{archive}{ARCHIVE_MEMBER_SEPARATOR}{member}"
+
+
+def is_archive(path: str) -> bool:
+    """Whether the path has the suffix of a tar archive."""
+    return path.endswith(ARCHIVE_SUFFIXES)
+
+
+def is_compressed(path: str) -> bool:
+    """Whether the path has the suffix of a compressed file."""
+    return path.endswith(COMPRESSION_SUFFIXES)
+
+
+def is_plain_file(file: str) -> bool:
+    """Whether the log is neither compressed nor an archive member."""
+    return ARCHIVE_MEMBER_SEPARATOR not in file and not is_compressed(file)
+
+
+def strip_compression_suffix(name: str) -> str:
+    """Returns the name without the suffix of a compressed file."""
+    for suffix in COMPRESSION_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def open_compressed(path: str) -> BinaryIO:
+    """
+    Open a file for reading, decompressed by its suffix.
+
+    :param path: path of the file
+    :return: binary file object
+    :raises OSError: if the file can't be opened
+        or the zstandard module is missing for a .zst file
+    """
+    if path.endswith(ZSTD_SUFFIXES):
+        if zstandard is None:
+            raise OSError(
+                f"The zstandard module is required to read {path}"
+            )
+        raw_file = open(path, "rb")
+        # buffered, so lines are read efficiently
+        return io.BufferedReader(
+            zstandard.ZstdDecompressor().stream_reader(
+                raw_file,
+                closefd=True
+            )
+        )
+    for suffix, opener in COMPRESSION_OPENERS.items():
+        if path.endswith(suffix):
+            return opener(path, "rb")
+    return open(path, "rb")
+
+
+def is_seekable_archive(archive: str) -> bool:
+    """Whether the members can be read in any order, i.e. a plain tar."""
+    return archive.endswith(".tar")
+
+
+def iter_members(archive: str) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Generate the regular file members of an archive in a single pass.
+
+    A member has to be read before the next one is generated.
+
+    :param archive: path of the tar archive
+    :return: generator over the names and file objects of the members
+    """
+    with open_compressed(archive) as archive_file:
+        with tarfile.open(fileobj=archive_file, mode="r|") as tar:
+            for tar_info in tar:
+                if tar_info.isfile():
+                    yield tar_info.name, tar.extractfile(tar_info)
+
+
+class _ArchiveReader:
+    """
+    Reads the members of a tar archive, opened once per process.
+
+    Plain tar archives are opened for random access.
+    Compressed archives are streamed, members requested in the order of
+    the archive are read in a single pass, an earlier member
+    restarts the stream. The member read last is kept,
+    it can be opened again without restarting the stream.
+
+    :param archive: path of the tar archive
+    """
+
+    def __init__(self, archive: str):
+        self.archive = archive
+        # a forked worker must not share the file offset with its parent
+        self.pid = os.getpid()
+        self._file = None
+        self._tar = None
+        self._members = None
+        self._last_member: Tuple[Optional[str], bytes] = (None, b"")
+
+    def _open(self):
+        self.close()
+        if is_seekable_archive(self.archive):
+            self._tar = tarfile.open(self.archive, mode="r:")
+        else:
+            self._file = open_compressed(self.archive)
+            self._tar = tarfile.open(fileobj=self._file, mode="r|")
+            self._members = iter(self._tar)
+
+    def open_member(self, member: str) -> BinaryIO:
+        """
+        Open a member of the archive.
+
+        :param member: name of the member
+        :return: binary file object
+        :raises OSError: if the archive or member can't be read
+        """
+        try:
+            return self._open_member(member)
+        except READ_ERRORS as err:
+            self.close()
+            if isinstance(err, OSError):
+                raise
+            raise OSError(f"Not able to read {self.archive}: {err}") from err
+
+    def _open_member(self, member: str) -> BinaryIO:
+        reopened = self._tar is None
+        if reopened:
+            self._open()
+        if self._members is None:
+            try:
+                return self._tar.extractfile(self._tar.getmember(member))
+            except KeyError as err:
+                raise OSError(
+                    f"No member {member} in {self.archive}"
+                ) from err
+
+        last_name, last_data = self._last_member
+        if member == last_name:
+            return io.BytesIO(last_data)
+        member_file = self._next_member(member)
+        if member_file is None and not reopened:
+            # an earlier member, restart the stream
+            self._open()
+            member_file = self._next_member(member)
+        if member_file is None:
+            raise OSError(f"No member {member} in {self.archive}")
+        return member_file
+
+    def _next_member(self, member: str) -> Optional[BinaryIO]:
+        """Read the stream up to the member, None if not found."""
+        for tar_info in self._members:
+            if tar_info.name == member and tar_info.isfile():
+                # the stream moves on with the next member
+                data = self._tar.extractfile(tar_info).read()
+                self._last_member = (member, data)
+                return io.BytesIO(data)
+        return None
+
+    def close(self):
+        """Close the archive."""
+        if self._tar is not None:
+            self._tar.close()
+        if self._file is not None:
+            self._file.close()
+        self._tar = self._file = self._members = None
+        self._last_member = (None, b"")
+
+
+# the archive most recently read by this process
+_archive_readers: Dict[str, _ArchiveReader] = {}
+
+
+def open_member(archive: str, member: str) -> BinaryIO:
+    """
+    Open a member of a tar archive.
+
+    The archive is kept open for the next member,
+    see _ArchiveReader for the cost of reading a compressed archive.
+
+    :param archive: path of the tar archive
+    :param member: name of the member
+    :return: binary file object
+    :raises OSError: if the archive or member can't be read
+    """
+    reader = _archive_readers.get(archive)
+    if reader is None or reader.pid != os.getpid():
+        for other_reader in _archive_readers.values():
+            if other_reader.pid == os.getpid():
+                other_reader.close()
+        _archive_readers.clear()
+        reader = _archive_readers[archive] = _ArchiveReader(archive)
+    logging.debug("Reading %s from %s", member, archive)
+    return reader.open_member(member)
+
+
+def open_log(file: str) -> BinaryIO:
+    """
+    Open a plain, compressed or archived log file for reading.
+
+    :param file: path or member path, see split_member
+    :return: binary file object
+    :raises OSError: if the log can't be opened
+    """
+    archive, member = split_member(file)
+    if member is not None:
+        return open_member(archive, member)
+    return open_compressed(file)
+
+
+def rotated_event_logs(event_log: str) -> List[str]:
+    """
+    Returns the rotated files of a global event log, oldest first.
+
+    HTCondor rotates the EVENT_LOG to EventLog.old, or to EventLog.1,
+    EventLog.2, ... if EVENT_LOG_MAX_ROTATIONS > 1,
+    EventLog.1 being the most recent rotation.
+    Rotated files may be compressed, e.g. EventLog.2.gz.
+
+    :param event_log: path of the current event log
+    :return: the rotated files and the event log, in the order written
+    """
+    directory, name = os.path.split(os.path.abspath(event_log))
+    rotations = []
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        entries = []
+    for entry in entries:
+        if not entry.startswith(name + "."):
+            continue
+        suffix = strip_compression_suffix(entry)[len(name) + 1:]
+        if suffix == "old":
+            rotations.append((1, entry))
+        elif suffix.isdigit():
+            rotations.append((int(suffix), entry))
+    files = [
+        os.path.join(directory, entry)
+        for _, entry in sorted(rotations, reverse=True)
+    ]
+    if os.path.exists(event_log):
+        files.append(os.path.join(directory, name))
+    return files
@@ -3,42 +3,123 @@
 import os
 import re
 import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain
 from typing import List
 from rich.console import Console
 
 from htcanalyze.globals import (
     EXT_LOG_DEFAULT,
     EXT_OUT_DEFAULT,
-    EXT_ERR_DEFAULT
+    EXT_ERR_DEFAULT,
+    VALIDATION_WORKERS,
+    VALIDATION_BATCH_SIZE
 )
+from .event_handler.json_log_parser import (
+    JSON_HEADER_SIZE,
+    is_json_header,
+    is_json_start
+)
+from .log_source import (
+    READ_ERRORS,
+    is_archive,
+    iter_members,
+    member_path,
+    open_log,
+    split_member,
+    strip_compression_suffix
+)
+from .validation_cache import ValidationCache
+
+
+# first line of a HTCondor log file, like: 000 (5993.000.000)
+HEADER_PATTERN = re.compile(r"[0-9]{3} \([0-9]+.[0-9]+.[0-9]{3}\)")
+
+
+def is_header(line: bytes) -> bool:
+    """Check whether a line is a HTCondor event header."""
+    try:
+        return bool(HEADER_PATTERN.match(line.decode("utf-8")))
+    except UnicodeDecodeError:
+        return False
+
+
+def starts_with_header(read_file) -> bool:
+    """
+    Check whether a file starts with a HTCondor event,
+    in the text or in the JSON format.
+
+    :param read_file: binary file object at the start of the file
+    :return: True when valid else False
+    """
+    line = read_file.readline(JSON_HEADER_SIZE)
+    if is_json_start(line):
+        return is_json_header(line + read_file.read(JSON_HEADER_SIZE))
+    return is_header(line)
+
+
+def has_valid_header(file) -> bool:
+    """
+    Check whether a file starts with a HTCondor event,
+    see starts_with_header.
+
+    Compressed files and archive members are decompressed,
+    see log_source.open_log.
+
+    :param file: path of the file
+    :return: True when valid else False
+    """
+    try:
+        with open_log(file) as read_file:
+            return starts_with_header(read_file)
+    except (*READ_ERRORS, TypeError):
+        return False
+
+
+def has_valid_headers(files: List[str]) -> List[bool]:
+    """Check the headers of several files, see has_valid_header."""
+    return [has_valid_header(file) for file in files]
 
 
 class LogValidator:
     """
     HTCondor LogValidator.
 
+    The headers of the files of a directory are read by a thread pool.
+    If a ValidationCache is given, the headers of files with unchanged
+    mtime and size are not read again.
+
     :param ext_log: log file extension (default: .log)
     :param ext_err: stderr file extension (default: .err)
     :param ext_out: stdout file extension (default: .out)
+    :param workers: maximum number of threads reading headers
+    :param cache: ValidationCache or None
     """
 
     def __init__(
             self,
             ext_log=EXT_LOG_DEFAULT,
             ext_err=EXT_ERR_DEFAULT,
-            ext_out=EXT_OUT_DEFAULT
+            ext_out=EXT_OUT_DEFAULT,
+            workers=VALIDATION_WORKERS,
+            cache: ValidationCache = None
     ):
         self.ext_log = ext_log
         self.ext_err = ext_err
         self.ext_out = ext_out
+        self.workers = max(workers, 1)
+        self.cache = cache
 
-    def is_valid_logfile(self, file) -> bool:
+    def has_valid_extension(self, file) -> bool:
         """
-        Validate a single HTCondor log file using regex.
+        Check the extension of a file.
 
-        :param file: HTCondor log file
-        :return: True when valid else False
+        The suffix of a compressed file is ignored, e.g. job.log.gz.
+
+        :param file: file name or path
+        :return: True when ending with ext_log, but not ext_err or ext_out
         """
+        file = strip_compression_suffix(file)
         # if not ending with ext_log
         if self.ext_log.__ne__("") and not file.endswith(self.ext_log):
             return False
@@ -48,49 +129,172 @@ class LogValidator:
             return False
         if self.ext_out.__ne__("") and file.endswith(self.ext_out):
             return False
+        return True
 
-        if os.path.getsize(file) == 0:  # file is empty
-            logging.debug("%s is empty", file)
+    def is_valid_logfile(self, file) -> bool:
+        """
+        Validate a single HTCondor log file using regex.
+
+        :param file: HTCondor log file
+        :return: True when valid else False
+        """
+        if not self.has_valid_extension(file):
             return False
 
+        if split_member(file)[1] is not None:
+            # the header of an empty member is not valid as well
+            return has_valid_header(file)
+
         try:
-            with open(file, "r", encoding='utf-8') as read_file:
-                return bool(
-                    re.match(
-                        r"[0-9]{3} \([0-9]+.[0-9]+.[0-9]{3}\)",
-                        read_file.readline()
-                    )
-                )
-        except (FileNotFoundError, TypeError):
+            if os.path.getsize(file) == 0:  # file is empty
+                logging.debug("%s is empty", file)
+                return False
+        except OSError:
             return False
 
+        return has_valid_header(file)
+
+    def _validate_entries(
+            self,
+            directory: str,
+            entries: List[os.DirEntry],
+            executor: Executor = None
+    ) -> List[str]:
+        """
+        Validate the files of one directory.
+
+        The stat results of the DirEntries are reused,
+        headers are only read if not cached.
+
+        :param directory: directory of the entries
+        :param entries: DirEntries of the files
+        :param executor: executor to read the headers, if any
+        :return: paths of the valid log files in the order of the entries
+        """
+        candidates = []
+        for entry in entries:
+            if not self.has_valid_extension(entry.name):
+                continue
+            try:
+                file_stat = entry.stat()
+            except OSError:
+                continue
+            if file_stat.st_size == 0:  # file is empty
+                logging.debug("%s is empty", entry.path)
+                continue
+            candidates.append((entry, file_stat))
+
+        cached = (
+            self.cache.get_directory(directory)
+            if self.cache is not None else {}
+        )
+        valid = {}
+        unknown = []
+        for entry, file_stat in candidates:
+            key = (file_stat.st_mtime_ns, file_stat.st_size)
+            cached_entry = cached.get(entry.name)
+            if cached_entry is not None and cached_entry[:2] == key:
+                valid[entry.name] = cached_entry[2]
+            else:
+                unknown.append((entry, key))
+
+        paths = [entry.path for entry, _ in unknown]
+        if executor is not None and len(paths) > 1:
+            # a task per batch of files, not per file
+            batch_size = min(
+                -(-len(paths) // self.workers),
+                VALIDATION_BATCH_SIZE
+            )
+            results = chain.from_iterable(executor.map(
+                has_valid_headers,
+                (
+                    paths[i:i + batch_size]
+                    for i in range(0, len(paths), batch_size)
+                )
+            ))
+        else:
+            results = has_valid_headers(paths)
+        new_entries = []
+        for (entry, key), result in zip(unknown, results):
+            valid[entry.name] = result
+            new_entries.append((entry.name, *key, result))
+        if self.cache is not None and new_entries:
+            self.cache.put_directory(directory, new_entries)
+
+        return [
+            entry.path for entry, _ in candidates if valid[entry.name]
+        ]
+
+    @staticmethod
+    def _scan_dir(directory, recursive=False):
+        """
+        Generate the directories and their file entries, like os.walk.
+
+        Recursively, only directories without subdirectories are
+        generated and symbolic links to directories are not followed.
+
+        :param directory: path to directory
+        :param recursive: Search recursively
+        :return: generator over (directory, DirEntries of the files)
+        """
+        try:
+            with os.scandir(directory) as scanned_dir:
+                entries = list(scanned_dir)
+        except OSError as err:
+            logging.debug("Not able to scan %s: %s", directory, err)
+            return
+
+        dirs, files = [], []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirs if is_dir else files).append(entry)
+
+        if not recursive or not dirs:
+            yield directory, files
+        if recursive:
+            for entry in dirs:
+                if not entry.is_symlink():
+                    yield from LogValidator._scan_dir(entry.path, recursive)
+
     def validate_dir(
             self,
             directory,
-            recursive=False
+            recursive=False,
+            executor: Executor = None
     ) -> List[str]:
         """
         Validate all files inside the given directory.
 
         :param directory: path to directory with logs
         :param recursive: Search recursively for log files
+        :param executor: executor to read the headers, if any
         :return:
         """
+        for root, entries in self._scan_dir(directory, recursive):
+            yield from self._validate_entries(root, entries, executor)
 
-        walk_dir = os.walk(directory, topdown=True)
-        if recursive:
-            for root, dirs, files in walk_dir:
-                if not dirs:
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        if self.is_valid_logfile(file_path):
-                            yield file_path
-        else:
-            root, _, files = next(walk_dir)
-            for file in files:
-                file_path = os.path.join(root, file)
-                if self.is_valid_logfile(file_path):
-                    yield os.path.join(root, file)
+    def validate_archive(self, archive) -> List[str]:
+        """
+        Validate the members of a tar archive.
+
+        The archive is read once, only the first line of the
+        members with a valid extension is read.
+
+        :param archive: path of the tar archive
+        :return: member paths of the valid log files, see split_member
+        """
+        try:
+            for member, member_file in iter_members(archive):
+                if (
+                        self.has_valid_extension(member) and
+                        starts_with_header(member_file)
+                ):
+                    yield member_path(archive, member)
+        except READ_ERRORS as err:
+            logging.debug("Not able to read %s: %s", archive, err)
 
     def common_validation(self, path_list, recursive=False, console=None):
         """
@@ -105,28 +309,49 @@ class LogValidator:
             console = Console()
         valid_files = []
 
-        for arg in path_list:
-
-            abs_path = os.path.abspath(arg)
-            if os.path.isdir(abs_path):
-                for file_path in self.validate_dir(abs_path, recursive):
-                    yield file_path
-            elif (
-                    os.path.isfile(abs_path) or
-                    os.path.isfile(abs_path + self.ext_log)
-            ):
-                # check if valid file or try to resolve with the extension,
-                # if only id was given
-                if self.is_valid_logfile(abs_path):
-                    yield abs_path
+        # the thread pool reads the headers of the files of a directory
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for arg in path_list:
+
+                archive, member = split_member(arg)
+                if member is not None:
+                    # a single member of an archive
+                    abs_path = member_path(os.path.abspath(archive), member)
+                    if self.is_valid_logfile(abs_path):
+                        yield abs_path
+                    else:
+                        console.print(
+                            f"[yellow]The given member {abs_path} "
+                            f"is not a valid HTCondor log file[/yellow]"
+                        )
+                    continue
+
+                abs_path = os.path.abspath(arg)
+                if os.path.isfile(abs_path) and is_archive(abs_path):
+                    yield from self.validate_archive(abs_path)
+                elif os.path.isdir(abs_path):
+                    for file_path in self.validate_dir(
+                            abs_path,
+                            recursive,
+                            executor
+                    ):
+                        yield file_path
+                elif (
+                        os.path.isfile(abs_path) or
+                        os.path.isfile(abs_path + self.ext_log)
+                ):
+                    # check if valid file or try to resolve with the extension,
+                    # if only id was given
+                    if self.is_valid_logfile(abs_path):
+                        yield abs_path
+                    else:
+                        console.print(
+                            f"[yellow]The given file {abs_path} "
+                            f"is not a valid HTCondor log file[/yellow]"
+                        )
                 else:
                     console.print(
-                        f"[yellow]The given file {abs_path} "
-                        f"is not a valid HTCondor log file[/yellow]"
+                        f"[red]The given path: {arg} does not exist[/red]"
                     )
-            else:
-                console.print(
-                    f"[red]The given path: {arg} does not exist[/red]"
-                )
 
         return valid_files
@@ -0,0 +1,122 @@
+"""Persistent cache of reverse DNS lookups."""
+
+import logging
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional
+
+from .sqlite_cache import SQLiteCache
+from htcanalyze.globals import (
+    RDNS_CACHE_MAX_ENTRIES,
+    RDNS_NEGATIVE_TTL,
+    RDNS_TTL
+)
+
+
+class RDNSCache(SQLiteCache):
+    """
+    Caches the host names of ip-addresses, see RDNSResolver.
+
+    Failed lookups are cached as well, with a shorter time to live.
+    If more than max_entries addresses are cached, the expired
+    and then the entries expiring first are evicted.
+
+    Worker processes can share the cache file,
+    SQLite serializes the writes.
+
+    :param path: path of the cache file, by default get_cache_file()
+    :param ttl: seconds a resolved host name is valid
+    :param negative_ttl: seconds a failed lookup is valid
+    :param max_entries: maximum number of cached addresses
+    :param rebuild: drop all entries when the cache is opened
+    """
+
+    def __init__(
+            self,
+            path: str = None,
+            ttl: float = RDNS_TTL,
+            negative_ttl: float = RDNS_NEGATIVE_TTL,
+            max_entries: int = RDNS_CACHE_MAX_ENTRIES,
+            rebuild: bool = False
+    ):
+        super().__init__(path, rebuild)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+    def _create_tables(self, connection: sqlite3.Connection):
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS rdns ("
+            "address TEXT PRIMARY KEY, "
+            "host TEXT, "
+            "expires REAL NOT NULL)"
+        )
+
+    def _clear(self, connection: sqlite3.Connection):
+        connection.execute("DELETE FROM rdns")
+
+    def get_many(self, addresses: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Returns the cached lookups, which did not expire.
+
+        :param addresses: ip-addresses
+        :return: host name by address, None if the lookup failed
+        """
+        addresses = list(addresses)
+        now = time.time()
+        found = {}
+        try:
+            # bounded by the maximum number of SQLite variables
+            for i in range(0, len(addresses), 500):
+                batch = addresses[i:i + 500]
+                found.update(self.connection.execute(
+                    "SELECT address, host FROM rdns "
+                    f"WHERE address IN ({', '.join('?' * len(batch))}) "
+                    "AND expires > ?",
+                    (*batch, now)
+                ))
+        except sqlite3.Error as err:
+            logging.debug("rDNS cache lookup failed: %s", err)
+        return found
+
+    def put_many(self, hosts: Dict[str, Optional[str]]):
+        """
+        Cache the lookups.
+
+        :param hosts: host name by address, None if the lookup failed
+        """
+        if not hosts:
+            return
+        now = time.time()
+        try:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO rdns VALUES (?, ?, ?)",
+                (
+                    (
+                        address,
+                        host,
+                        now + (self.ttl if host else self.negative_ttl)
+                    )
+                    for address, host in hosts.items()
+                )
+            )
+            self._evict(now)
+            self.connection.commit()
+        except sqlite3.Error as err:
+            logging.debug("Not able to cache rDNS lookups: %s", err)
+
+    def _evict(self, now: float):
+        if len(self) <= self.max_entries:
+            return
+        self.connection.execute("DELETE FROM rdns WHERE expires <= ?", (now,))
+        self.connection.execute(
+            "DELETE FROM rdns WHERE address IN ("
+            "SELECT address FROM rdns ORDER BY expires "
+            "LIMIT max(0, (SELECT COUNT(*) FROM rdns) - ?))",
+            (self.max_entries,)
+        )
+
+    def __len__(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM rdns"
+        ).fetchone()[0]
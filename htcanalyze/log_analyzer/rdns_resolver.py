@@ -0,0 +1,210 @@
+"""Reverse DNS lookup of the execution hosts, off the parsing path."""
+
+import logging
+import queue
+import socket
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .condor_log.condor_log import CondorLog
+from .event_handler.node_cache import NodeCache
+from .rdns_cache import RDNSCache
+from htcanalyze.profiler import get_profiler
+from htcanalyze.globals import RDNS_BATCH_SIZE, RDNS_TIMEOUT, RDNS_WORKERS
+
+# seconds between two checks of the lookup timeouts
+POLL_INTERVAL = 0.05
+
+
+def get_host_by_addr(address: str) -> str:
+    """
+    Returns the host name of the ip-address.
+
+    :raises OSError: if the address can't be resolved
+    """
+    return socket.gethostbyaddr(address)[0]
+
+
+class RDNSResolver:
+    """
+    Resolves the host addresses of CondorLogs in batches.
+
+    The log files are parsed with the ip-addresses, the addresses of a
+    batch of CondorLogs are collected and resolved concurrently by a
+    thread pool afterwards, so a slow name server does not stall
+    the parsing. Lookups are taken from the in-memory NodeCache of the
+    process, then from the persistent RDNSCache, the rest is looked up.
+    A lookup that fails keeps the ip-address, like NodeCache does,
+    a lookup that exceeds the timeout is not cached.
+    The lookups run in daemon threads: the thread of a lookup that
+    timed out is left behind and replaced, leftover lookups are dropped
+    when the interpreter exits instead of blocking its exit.
+
+    :param cache: RDNSCache or None
+    :param lookup: returns the host name of an address
+        or raises an OSError, e.g. a fake resolver in tests,
+        by default get_host_by_addr
+    :param workers: maximum number of concurrent lookups
+    :param timeout: seconds until a single lookup is given up
+    """
+
+    def __init__(
+            self,
+            cache: RDNSCache = None,
+            lookup: Callable[[str], str] = None,
+            workers: int = RDNS_WORKERS,
+            timeout: float = RDNS_TIMEOUT
+    ):
+        self.cache = cache
+        self.lookup = lookup if lookup else get_host_by_addr
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self.memory = NodeCache().rdns_cache
+
+    def resolve(self, addresses: Iterable[str]) -> Dict[str, str]:
+        """
+        Resolve the addresses.
+
+        :param addresses: ip-addresses
+        :return: host name by address, the address itself if not resolved
+        """
+        addresses = set(addresses)
+        unknown = addresses.difference(self.memory)
+        if not unknown:
+            return {address: self.memory[address] for address in addresses}
+        with get_profiler().stage("rdns", items=len(unknown)):
+            if self.cache is not None:
+                for address, host in self.cache.get_many(unknown).items():
+                    self.memory[address] = host or address
+                unknown.difference_update(self.memory)
+            if unknown:
+                hosts = self._lookup_all(unknown)
+                if self.cache is not None:
+                    self.cache.put_many(hosts)
+                for address in unknown:
+                    self.memory[address] = hosts.get(address) or address
+        return {address: self.memory[address] for address in addresses}
+
+    def _work(
+            self,
+            tasks: "queue.Queue[str]",
+            results: "queue.Queue[tuple]",
+            started: Dict[str, float]
+    ):
+        """Look up the addresses of tasks, until there are none left."""
+        while True:
+            try:
+                address = tasks.get_nowait()
+            except queue.Empty:
+                return
+            started[address] = time.monotonic()
+            try:
+                results.put((address, self.lookup(address), None))
+            except Exception as err:  # pylint: disable=broad-except
+                # raised in the calling thread
+                results.put((address, None, err))
+
+    def _start_worker(self, tasks, results, started):
+        threading.Thread(
+            target=self._work,
+            args=(tasks, results, started),
+            name="rdns-lookup",
+            daemon=True
+        ).start()
+
+    def _lookup_all(
+            self,
+            addresses: Iterable[str]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Look up the addresses concurrently.
+
+        :return: host name by address, None if the lookup failed,
+            addresses that timed out are missing
+        """
+        hosts = {}
+        started: Dict[str, float] = {}
+        tasks: "queue.Queue[str]" = queue.Queue()
+        results: "queue.Queue[tuple]" = queue.Queue()
+        pending = set(addresses)
+        for address in pending:
+            tasks.put(address)
+        for _ in range(min(self.workers, len(pending))):
+            self._start_worker(tasks, results, started)
+        while pending:
+            try:
+                address, host, err = results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                pass
+            else:
+                if address in pending:
+                    pending.remove(address)
+                    if err is None:
+                        hosts[address] = host
+                        logging.debug(
+                            "rDNS lookup successful: %s resolved as %s",
+                            address, host
+                        )
+                    elif isinstance(err, (OSError, UnicodeError)):
+                        logging.debug(
+                            "Unable to perform rDNS lookup for %s: %s",
+                            address, err
+                        )
+                        hosts[address] = None
+                    else:
+                        raise err
+            now = time.monotonic()
+            for address in list(pending):
+                start = started.get(address)
+                if start is not None and now - start > self.timeout:
+                    logging.debug("rDNS lookup timed out for %s", address)
+                    pending.remove(address)
+                    # the thread of the lookup is not waited for
+                    if not tasks.empty():
+                        self._start_worker(tasks, results, started)
+        return hosts
+
+    def resolve_condor_logs(self, condor_logs: List[CondorLog]):
+        """
+        Replace the host addresses of the CondorLogs by their names,
+        of the execution event and of each execution attempt.
+        """
+        # the last attempt shares the execution event, resolve it once
+        execution_events = {}
+        for condor_log in condor_logs:
+            job_details = condor_log.job_details
+            events = [job_details.set_events.execution_event]
+            events.extend(
+                attempt.execution_event
+                for attempt in job_details.execution_attempts
+            )
+            for event in events:
+                if event is not None and event.host_address:
+                    execution_events[id(event)] = event
+        execution_events = list(execution_events.values())
+        hosts = self.resolve(event.host_address for event in execution_events)
+        for event in execution_events:
+            event.host_address = hosts[event.host_address]
+
+    def resolve_batches(
+            self,
+            condor_logs: Iterable[CondorLog],
+            batch_size: int = RDNS_BATCH_SIZE
+    ) -> Iterator[CondorLog]:
+        """
+        Resolve the host addresses of batches of CondorLogs.
+
+        :param condor_logs: CondorLogs, e.g. generated by HTCAnalyzer
+        :param batch_size: number of CondorLogs resolved at once
+        :return: generator over the CondorLogs, in the same order
+        """
+        batch = []
+        for condor_log in condor_logs:
+            batch.append(condor_log)
+            if len(batch) >= batch_size:
+                self.resolve_condor_logs(batch)
+                yield from batch
+                batch = []
+        self.resolve_condor_logs(batch)
+        yield from batch
@@ -0,0 +1,93 @@
+"""Base class of the persistent caches, stored in a single SQLite file."""
+
+import logging
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+
+from htcanalyze.globals import get_cache_file
+
+
+class SQLiteCache(ABC):
+    """
+    Cache stored in the tables of an SQLite file.
+
+    Several caches can share the same file, each manages its own tables.
+    The database connection is opened lazily, hence the cache can be
+    pickled and sent to worker processes, each opens its own connection.
+
+    :param path: path of the cache file, by default get_cache_file()
+    :param rebuild: drop all entries when the cache is opened
+    """
+
+    def __init__(
+            self,
+            path: str = None,
+            rebuild: bool = False
+    ):
+        self.path = os.path.expanduser(
+            path if path is not None else get_cache_file()
+        )
+        self.rebuild = rebuild
+        self._connection = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        # only the process that created the cache rebuilds it
+        state["rebuild"] = False
+        return state
+
+    @abstractmethod
+    def _create_tables(self, connection: sqlite3.Connection):
+        """Create the tables of the cache, if they do not exist."""
+
+    @abstractmethod
+    def _clear(self, connection: sqlite3.Connection):
+        """Delete all entries of the cache."""
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Returns the database connection, creates the database.
+
+        :raises sqlite3.Error: also if the directory can't be created,
+            the callers handle all errors of the cache alike
+        """
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            try:
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+            except OSError as err:
+                raise sqlite3.OperationalError(
+                    f"Can't create the cache directory {directory}: {err}"
+                ) from err
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._create_tables(self._connection)
+            if self.rebuild:
+                self._clear(self._connection)
+                self.rebuild = False
+            self._connection.commit()
+        return self._connection
+
+    def open(self) -> bool:
+        """
+        Open the database connection, e.g. to rebuild the cache before
+        copies are sent to worker processes, which do not rebuild it.
+
+        :return: whether the cache can be used
+        """
+        try:
+            self.connection
+        except sqlite3.Error as err:
+            logging.debug("Not able to open the cache %s: %s", self.path, err)
+            return False
+        return True
+
+    def close(self):
+        """Commit pending changes and close the database connection."""
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,93 @@
+"""Persistent cache of the header validation of log files."""
+
+import logging
+import os
+import sqlite3
+from typing import Dict, Iterable, Tuple
+
+from .sqlite_cache import SQLiteCache
+
+
+class ValidationCache(SQLiteCache):
+    """
+    Caches whether files start with a valid HTCondor log header.
+
+    Entries are keyed by the path, mtime and size of a file
+    and grouped by directory, so all entries of a directory
+    are read with a single query.
+
+    :param path: path of the cache file, by default get_cache_file()
+    :param rebuild: drop all entries when the cache is opened
+    """
+
+    def _create_tables(self, connection: sqlite3.Connection):
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS validated_files ("
+            "directory TEXT NOT NULL, "
+            "name TEXT NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "valid INTEGER NOT NULL, "
+            "PRIMARY KEY (directory, name))"
+        )
+
+    def _clear(self, connection: sqlite3.Connection):
+        connection.execute("DELETE FROM validated_files")
+
+    def get_directory(
+            self,
+            directory: str
+    ) -> Dict[str, Tuple[int, int, bool]]:
+        """
+        Returns the cached entries of all files in the directory.
+
+        :param directory: directory of the files
+        :return: (mtime_ns, size, valid) by file name
+        """
+        try:
+            rows = self.connection.execute(
+                "SELECT name, mtime_ns, size, valid FROM validated_files "
+                "WHERE directory = ?",
+                (os.path.abspath(directory),)
+            )
+            return {
+                name: (mtime_ns, size, bool(valid))
+                for name, mtime_ns, size, valid in rows
+            }
+        except sqlite3.Error as err:
+            logging.debug(
+                "Validation cache lookup failed for %s: %s", directory, err
+            )
+            return {}
+
+    def put_directory(
+            self,
+            directory: str,
+            entries: Iterable[Tuple[str, int, int, bool]]
+    ):
+        """
+        Cache the validation of files in the directory.
+        The entries are committed when the cache is closed.
+
+        :param directory: directory of the files
+        :param entries: (name, mtime_ns, size, valid) per file
+        """
+        directory = os.path.abspath(directory)
+        try:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO validated_files VALUES "
+                "(?, ?, ?, ?, ?)",
+                (
+                    (directory, name, mtime_ns, size, int(valid))
+                    for name, mtime_ns, size, valid in entries
+                )
+            )
+        except sqlite3.Error as err:
+            logging.debug(
+                "Not able to cache the validation of %s: %s", directory, err
+            )
+
+    def __len__(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM validated_files"
+        ).fetchone()[0]
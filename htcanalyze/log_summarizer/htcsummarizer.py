@@ -1,14 +1,30 @@
 """Module to summarize all condor log files regarding the state."""
-from typing import List
+import io
+import json
+import zipfile
+from typing import Callable, Dict, Iterable, List
 
+import numpy as np
+
+from htcanalyze.globals import (
+    JOB_TABLE_CHUNK_SIZE,
+    PARTIAL_SUMMARY_HEADER,
+    PARTIAL_SUMMARY_VERSION
+)
+from htcanalyze.log_analyzer.condor_log.condor_log import CondorLog
+from htcanalyze.profiler import get_profiler
 from htcanalyze.log_analyzer.event_handler.states import (
+    JobState,
     NormalTerminationState,
     AbnormalTerminationState,
     WaitingState,
     RunningState,
     AbortedState,
-    ErrorWhileReadingState
+    ErrorWhileReadingState,
+    State
 )
+from .job_table import JobTable
+from .summarizer.summarizer import Summarizer
 from .summarizer.condor_log_summarizer import (
     CondorLogSummarizer,
     NormalTerminationStateSummarizer,
@@ -22,52 +38,231 @@ from .summarized_condor_logs.summarized_condor_logs import (
     SummarizedCondorLogs
 )
 
+# states are singletons, hence the summarizer is a single lookup
+SUMMARIZER_BY_STATE = {
+    NormalTerminationState(): NormalTerminationStateSummarizer,
+    AbnormalTerminationState(): AbnormalTerminationStateSummarizer,
+    WaitingState(): WaitingStateSummarizer,
+    RunningState(): RunningStateSummarizer,
+    AbortedState(): AbortedStateSummarizer,
+    ErrorWhileReadingState(): ErrorWhileReadingStateSummarizer
+}
+# key of a dictionary in the JSON of a partial summary,
+# that refers to an array in its npz data
+ARRAY_KEY = "npz"
 
-class HTCSummarizer(CondorLogSummarizer):
-    """Summarizer for ALL given condor log files."""
 
-    def __init__(self, condor_logs):
-        super().__init__(condor_logs)
+def _split_arrays(data, arrays: Dict[str, np.ndarray]):
+    """
+    Returns the data with the numpy arrays replaced by references,
+    the arrays are added to arrays by their names.
+    """
+    if isinstance(data, np.ndarray):
+        name = f"array_{len(arrays)}"
+        arrays[name] = data
+        return {ARRAY_KEY: name}
+    if isinstance(data, dict):
+        return {
+            key: _split_arrays(value, arrays) for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [_split_arrays(value, arrays) for value in data]
+    return data
 
-    def _initialize_state_dict(self):
-        """Initialize state dictionary."""
-        state_dict = {}
+
+def _join_arrays(data, arrays: Dict[str, np.ndarray]):
+    """Returns the data with the references replaced by the arrays."""
+    if isinstance(data, dict):
+        if list(data) == [ARRAY_KEY]:
+            return arrays[data[ARRAY_KEY]]
+        return {
+            key: _join_arrays(value, arrays) for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [_join_arrays(value, arrays) for value in data]
+    return data
+
+
+class HTCSummarizer(Summarizer):
+    """
+    Summarizer for ALL given condor log files.
+
+    The condor logs are consumed in a single pass,
+    each is added as a row of a JobTable and dropped right away,
+    hence condor_logs can be a generator of any length.
+
+    The accumulated state summarizers form a partial summary,
+    partial summaries of disjoint sets of logs (e.g. of other worker
+    processes or submit hosts) can be merged in any order
+    and written to and read from a file.
+
+    :param condor_logs: iterable of condor logs
+    :param chunk_size: number of rows of the JobTable
+    """
+
+    def __init__(
+            self,
+            condor_logs: Iterable[CondorLog] = (),
+            chunk_size: int = JOB_TABLE_CHUNK_SIZE
+    ):
+        self.condor_logs = condor_logs
+        self.chunk_size = chunk_size
+        self.state_dict: Dict[JobState, CondorLogSummarizer] = {}
+
+    def _initialize_state_dict(self) -> Dict[JobState, CondorLogSummarizer]:
+        """
+        Initialize state dictionary with a summarizer per state.
+
+        The condor logs are collected in a JobTable,
+        each full chunk is reduced by the summarizers.
+        The condor logs are consumed once, the state dictionary
+        accumulates the logs of all calls.
+        """
+        state_dict = self.state_dict
+        job_table = JobTable(self.chunk_size)
         for condor_log in self.condor_logs:
             state = condor_log.job_details.state
-            if state in state_dict:
-                state_dict[state].append(condor_log)
-            else:
-                state_dict[state] = [condor_log]
+            if state not in state_dict:
+                state_dict[state] = self._get_summarizer_by_state(state)
+            state_dict[state].add_error_events(
+                condor_log.logfile_error_events
+            )
+            state_dict[state].add_execution_attempts(
+                condor_log.job_details.execution_attempts
+            )
+            job_table.append(condor_log)
+            if job_table.is_full:
+                self._reduce(job_table, state_dict)
 
+        self._reduce(job_table, state_dict)
+        self.condor_logs = ()
         return state_dict
 
     @staticmethod
-    def _get_summarizer_by_state(
-            condor_logs,
-            state
-    ) -> CondorLogSummarizer:
-        if isinstance(state, NormalTerminationState):
-            return NormalTerminationStateSummarizer(condor_logs)
-        if isinstance(state, AbnormalTerminationState):
-            return AbnormalTerminationStateSummarizer(condor_logs)
-        if isinstance(state, WaitingState):
-            return WaitingStateSummarizer(condor_logs)
-        if isinstance(state, RunningState):
-            return RunningStateSummarizer(condor_logs)
-        if isinstance(state, AbortedState):
-            return AbortedStateSummarizer(condor_logs)
-        if isinstance(state, ErrorWhileReadingState):
-            return ErrorWhileReadingStateSummarizer(condor_logs)
-        # else:
-        raise ValueError(f"Unknown state: {state}")
+    def _reduce(
+            job_table: JobTable,
+            state_dict: Dict[JobState, CondorLogSummarizer]
+    ):
+        """Reduce the rows of the job table per state and clear it."""
+        with get_profiler().stage("summarization", items=len(job_table)):
+            for state in job_table.states:
+                state_dict[state].add_rows(job_table.select(state))
+            job_table.clear()
+
+    @staticmethod
+    def _get_summarizer_by_state(state) -> CondorLogSummarizer:
+        try:
+            return SUMMARIZER_BY_STATE[state]()
+        except KeyError:
+            raise ValueError(f"Unknown state: {state}") from None
+
+    def accumulate(self) -> "HTCSummarizer":
+        """
+        Consume the condor logs into the partial summary.
+
+        :return: self, e.g. to send the partial summary to another process
+        """
+        self._initialize_state_dict()
+        return self
+
+    def merge(self, other: "HTCSummarizer") -> "HTCSummarizer":
+        """
+        Merge the partial summary of other into this one.
+
+        :param other: summarizer of other condor logs
+        :return: self, to merge several partial summaries in a row
+        """
+        self._initialize_state_dict()
+        for state, summarizer in other._initialize_state_dict().items():
+            if state not in self.state_dict:
+                self.state_dict[state] = self._get_summarizer_by_state(state)
+            self.state_dict[state].merge(summarizer)
+        return self
+
+    def resolve_nodes(
+            self,
+            resolve: Callable[[Iterable[str]], Dict[str, str]]
+    ):
+        """
+        Replace the node addresses by their host names.
+
+        :param resolve: returns the host name by address,
+            e.g. RDNSResolver.resolve
+        """
+        for summarizer in self._initialize_state_dict().values():
+            summarizer.node_summarizer.resolve(resolve)
+            summarizer.badput_summarizer.resolve(resolve)
+
+    def write_partial(self, file: str):
+        """
+        Write the partial summary to a file, see read_partial.
+
+        The file holds only data: the header and version line,
+        the accumulated numbers as a line of JSON
+        and the arrays of the summarizers as npz data.
+
+        :param file: path of the partial summary
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        summary = _split_arrays(
+            [
+                summarizer.to_dict()
+                for summarizer in self._initialize_state_dict().values()
+            ],
+            arrays
+        )
+        with open(file, "wb") as partial_file:
+            partial_file.write(PARTIAL_SUMMARY_HEADER)
+            partial_file.write(b"%d\n" % PARTIAL_SUMMARY_VERSION)
+            partial_file.write(json.dumps(summary).encode() + b"\n")
+            np.savez(partial_file, **arrays)
+
+    @classmethod
+    def read_partial(cls, file: str) -> "HTCSummarizer":
+        """
+        Read a partial summary written by write_partial.
+
+        :param file: path of the partial summary
+        :return: HTCSummarizer with the partial summary
+        :raises OSError: if the file can't be read
+        :raises ValueError: if the file is not a partial summary
+            of this version
+        """
+        with open(file, "rb") as partial_file:
+            if partial_file.read(
+                    len(PARTIAL_SUMMARY_HEADER)
+            ) != PARTIAL_SUMMARY_HEADER:
+                raise ValueError(f"Not a partial summary: {file}")
+            version = partial_file.readline()
+            summary = partial_file.readline()
+            npz_data = partial_file.read()
+        if version != b"%d\n" % PARTIAL_SUMMARY_VERSION:
+            raise ValueError(
+                f"Partial summary of version {version.strip()[:8]!r}, "
+                f"expected {PARTIAL_SUMMARY_VERSION}: {file}"
+            )
+        state_dict = {}
+        try:
+            with np.load(io.BytesIO(npz_data)) as npz_file:
+                arrays = dict(npz_file)
+            for data in _join_arrays(json.loads(summary), arrays):
+                state = State.from_name(data["state"])
+                state_dict[state] = SUMMARIZER_BY_STATE[state].from_dict(
+                    data
+                )
+        except (ValueError, KeyError, TypeError, EOFError, OSError,
+                zipfile.BadZipFile) as err:
+            raise ValueError(
+                f"Corrupted partial summary: {file}"
+            ) from err
+        summarizer = cls()
+        summarizer.state_dict = state_dict
+        return summarizer
 
     def summarize(self) -> List[SummarizedCondorLogs]:
         """Summarize logs per state."""
         state_dict = self._initialize_state_dict()
-        state_summarizers = [
-            self._get_summarizer_by_state(condor_logs, state)
-            for state, condor_logs in state_dict.items()
-        ]
-        return [
-            summarizer.summarize() for summarizer in state_summarizers
-        ]
+        with get_profiler().stage("summarization"):
+            return [
+                summarizer.summarize() for summarizer in state_dict.values()
+            ]
@@ -0,0 +1,236 @@
+"""Columnar table of analyzed jobs used by the summarizers."""
+from datetime import datetime as date_time, timedelta
+from typing import Dict, List
+
+import numpy as np
+
+from htcanalyze.globals import JOB_TABLE_CHUNK_SIZE
+from htcanalyze.log_analyzer.condor_log.condor_log import CondorLog
+from htcanalyze.log_analyzer.condor_log.logresource import LogResources
+from htcanalyze.log_analyzer.condor_log.time_manager import JobTimes
+from htcanalyze.log_analyzer.event_handler.states import JobState
+
+EPOCH = date_time(1970, 1, 1)
+# marks a missing date in the int64 date columns
+NO_DATE = np.iinfo(np.int64).min
+
+# resources in the order of LogResources.resources
+RESOURCES = ["cpu", "disk", "memory", "gpu"]
+RESOURCE_VALUES = ["usage", "requested", "allocated"]
+RESOURCE_COLUMNS = [
+    f"{resource}_{value}"
+    for resource in RESOURCES
+    for value in RESOURCE_VALUES
+]
+DATE_COLUMNS = ["submission_date", "execution_date", "termination_date"]
+TIME_COLUMNS = ["waiting_time", "execution_time", "total_runtime"]
+
+
+def to_epoch(date: date_time) -> int:
+    """Returns seconds since the epoch of a naive datetime or NO_DATE."""
+    if date is None:
+        return NO_DATE
+    return (date - EPOCH) // timedelta(seconds=1)
+
+
+def to_seconds(time_delta: timedelta) -> int:
+    """Returns the whole seconds of a timedelta."""
+    return time_delta.days * 86400 + time_delta.seconds
+
+
+def get_resource_values(log_resources: LogResources) -> List[float]:
+    """Returns the log resource values in the order of RESOURCE_COLUMNS."""
+    return [
+        getattr(resource, value) if resource else np.nan
+        for resource in log_resources.resources
+        for value in RESOURCE_VALUES
+    ]
+
+
+def get_time_values(job_times: JobTimes) -> List[int]:
+    """Returns the job times in seconds in the order of TIME_COLUMNS."""
+    return [
+        to_seconds(job_times.waiting_time),
+        to_seconds(job_times.execution_time),
+        to_seconds(job_times.total_runtime)
+    ]
+
+
+class JobTable:
+    """
+    Struct of arrays holding one row per job.
+
+    The table is filled one CondorLog at a time, until chunk_size rows
+    are reached. Then the summarizers reduce over the columns and the
+    table is cleared, so the memory does not depend on the number of jobs.
+
+    Columns:
+        state: code of the job state, see states
+        node: code of the execution node address, see nodes
+        has_resources: whether the job has log resources
+        resources: float64, one column per entry of RESOURCE_COLUMNS,
+            NaN if the value is missing
+        submission_date, execution_date, termination_date:
+            int64 seconds since the epoch, NO_DATE if missing
+        waiting_time, execution_time, total_runtime:
+            int64 seconds, as computed by the TimeManager
+
+    :param chunk_size: number of rows
+    """
+
+    def __init__(self, chunk_size: int = JOB_TABLE_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.states: List[JobState] = []
+        self._state_codes: Dict[JobState, int] = {}
+        self.nodes: List[str] = []
+        self._node_codes: Dict[str, int] = {}
+        self.state = np.empty(chunk_size, dtype=np.int16)
+        self.node = np.empty(chunk_size, dtype=np.int32)
+        self.has_resources = np.empty(chunk_size, dtype=bool)
+        # column major, every resource column is contiguous
+        self.resources = np.empty(
+            (chunk_size, len(RESOURCE_COLUMNS)),
+            dtype=np.float64,
+            order="F"
+        )
+        self.dates = np.empty(
+            (chunk_size, len(DATE_COLUMNS)),
+            dtype=np.int64,
+            order="F"
+        )
+        self.times = np.empty(
+            (chunk_size, len(TIME_COLUMNS)),
+            dtype=np.int64,
+            order="F"
+        )
+        self.n_rows = 0
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def is_full(self) -> bool:
+        """Returns True if no more rows can be appended."""
+        return self.n_rows == self.chunk_size
+
+    def clear(self):
+        """Remove all rows, the state and node codes are kept."""
+        self.n_rows = 0
+
+    def get_state_code(self, state: JobState) -> int:
+        """Returns the code of the state, adds unknown states."""
+        code = self._state_codes.get(state)
+        if code is None:
+            code = self._state_codes[state] = len(self.states)
+            self.states.append(state)
+        return code
+
+    def get_node_code(self, address: str) -> int:
+        """Returns the code of the node address, adds unknown nodes."""
+        code = self._node_codes.get(address)
+        if code is None:
+            code = self._node_codes[address] = len(self.nodes)
+            self.nodes.append(address)
+        return code
+
+    def append(self, condor_log: CondorLog) -> int:
+        """
+        Append the row of a CondorLog.
+
+        :param condor_log: CondorLog
+        :return: row index
+        """
+        assert not self.is_full
+        row = self.n_rows
+        job_details = condor_log.job_details
+        self.state[row] = self.get_state_code(job_details.state)
+        self.node[row] = self.get_node_code(job_details.host_address)
+
+        resources = job_details.resources
+        self.has_resources[row] = resources is not None
+        if resources is None:
+            self.resources[row] = np.nan
+        else:
+            self.resources[row] = get_resource_values(resources)
+
+        time_manager = job_details.time_manager
+        self.dates[row] = [
+            to_epoch(time_manager.submission_date),
+            to_epoch(time_manager.execution_date),
+            to_epoch(time_manager.termination_date)
+        ]
+        self.times[row] = get_time_values(time_manager.job_times)
+        self.n_rows += 1
+        return row
+
+    def column(self, name: str) -> np.ndarray:
+        """Returns the filled part of a column by name."""
+        for columns, names in (
+                (self.resources, RESOURCE_COLUMNS),
+                (self.dates, DATE_COLUMNS),
+                (self.times, TIME_COLUMNS)
+        ):
+            if name in names:
+                return columns[:self.n_rows, names.index(name)]
+        return getattr(self, name)[:self.n_rows]
+
+    def select(self, state: JobState) -> "JobTableRows":
+        """Returns the rows of all jobs with the given state."""
+        code = self._state_codes.get(state)
+        mask = self.state[:self.n_rows] == code
+        return JobTableRows(
+            node=self.node[:self.n_rows][mask],
+            has_resources=self.has_resources[:self.n_rows][mask],
+            resources=self.resources[:self.n_rows][mask],
+            dates=self.dates[:self.n_rows][mask],
+            times=self.times[:self.n_rows][mask],
+            nodes=self.nodes
+        )
+
+
+class JobTableRows:
+    """
+    Selected rows of a JobTable, the summarizers reduce over these.
+
+    :param node: node codes
+    :param has_resources: whether the jobs have log resources
+    :param resources: resource columns
+    :param dates: date columns
+    :param times: time columns
+    :param nodes: node addresses by code
+    """
+
+    def __init__(
+            self,
+            node: np.ndarray,
+            has_resources: np.ndarray,
+            resources: np.ndarray,
+            dates: np.ndarray,
+            times: np.ndarray,
+            nodes: List[str]
+    ):
+        self.node = node
+        self.has_resources = has_resources
+        self.resources = resources
+        self.dates = dates
+        self.times = times
+        self.nodes = nodes
+
+    def __len__(self):
+        return len(self.node)
+
+    @classmethod
+    def from_condor_logs(cls, condor_logs: List[CondorLog]) -> "JobTableRows":
+        """Create the rows of the given condor logs."""
+        job_table = JobTable(max(len(condor_logs), 1))
+        for condor_log in condor_logs:
+            job_table.append(condor_log)
+        n_rows = len(job_table)
+        return cls(
+            node=job_table.node[:n_rows],
+            has_resources=job_table.has_resources[:n_rows],
+            resources=job_table.resources[:n_rows],
+            dates=job_table.dates[:n_rows],
+            times=job_table.times[:n_rows],
+            nodes=job_table.nodes
+        )
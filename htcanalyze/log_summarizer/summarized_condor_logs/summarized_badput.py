@@ -0,0 +1,60 @@
+"""Module to represent the summarized goodput and badput of jobs."""
+from typing import List
+
+from htcanalyze import ReprObject
+
+
+class SummarizedWastedCoreHours(ReprObject):
+    """
+    Represents the core hours of lost execution attempts.
+
+    :param name: node address or name of the state that ended the attempts
+    :param core_hours: summed up core hours of the attempts
+    :param n_attempts: number of lost attempts
+    """
+
+    def __init__(self, name: str, core_hours: float, n_attempts: int):
+        self.name = name
+        self.core_hours = core_hours
+        self.n_attempts = n_attempts
+
+    def __lt__(self, other):
+        return self.core_hours < other.core_hours
+
+
+class SummarizedBadput(ReprObject):
+    """
+    Represents the goodput and badput of the execution attempts of jobs.
+
+    :param goodput_core_hours: core hours of the attempts whose progress
+        was kept, i.e. that were checkpointed or terminated the job
+    :param badput_core_hours: core hours of the lost attempts
+    :param n_attempts: number of finished attempts
+    :param nodes: wasted core hours per execution node
+    :param states: wasted core hours per state that ended the attempts
+    """
+
+    def __init__(
+            self,
+            goodput_core_hours: float = 0.0,
+            badput_core_hours: float = 0.0,
+            n_attempts: int = 0,
+            nodes: List[SummarizedWastedCoreHours] = None,
+            states: List[SummarizedWastedCoreHours] = None
+    ):
+        self.goodput_core_hours = goodput_core_hours
+        self.badput_core_hours = badput_core_hours
+        self.n_attempts = n_attempts
+        self.nodes = nodes if nodes else []
+        self.states = states if states else []
+
+    @property
+    def n_lost_attempts(self) -> int:
+        """Returns the number of lost attempts."""
+        return sum(state.n_attempts for state in self.states)
+
+    @property
+    def badput_ratio(self) -> float:
+        """Returns the fraction of the core hours that were lost."""
+        total = self.goodput_core_hours + self.badput_core_hours
+        return self.badput_core_hours / total if total else 0.0
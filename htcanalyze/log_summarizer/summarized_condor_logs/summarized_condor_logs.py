@@ -1,5 +1,5 @@
 """Module to represent summarized condor logs."""
-from typing import List
+from typing import Dict, List
 
 from htcanalyze import ReprObject
 from htcanalyze.log_analyzer.condor_log.time_manager import JobTimes
@@ -7,6 +7,8 @@ from htcanalyze.log_analyzer.condor_log.logresource import LogResources
 from htcanalyze.log_analyzer.event_handler.states import JobState
 from .summarized_node_jobs import SummarizedNodeJobs
 from .summarized_error_events import SummarizedErrorState
+from .summarized_distribution import Distribution
+from .summarized_badput import SummarizedBadput
 
 
 class SummarizedCondorLogs(ReprObject):
@@ -19,6 +21,10 @@ class SummarizedCondorLogs(ReprObject):
     :param avg_resources: average log resources
     :param summarized_node_jobs: summarized node jobs
     :param summarized_error_states: summarized error states
+    :param distributions: distribution of job times and resources
+        by JobTable column name
+    :param summarized_badput: goodput and wasted core hours
+        of the execution attempts
     """
     def __init__(
             self,
@@ -27,7 +33,9 @@ class SummarizedCondorLogs(ReprObject):
             avg_times: JobTimes = None,
             avg_resources: LogResources = None,
             summarized_node_jobs: List[SummarizedNodeJobs] = None,
-            summarized_error_states: List[SummarizedErrorState] = None
+            summarized_error_states: List[SummarizedErrorState] = None,
+            distributions: Dict[str, Distribution] = None,
+            summarized_badput: SummarizedBadput = None
     ):
         self.state = state
         self.n_jobs = n_jobs
@@ -35,6 +43,8 @@ class SummarizedCondorLogs(ReprObject):
         self.avg_resources = avg_resources
         self.summarized_node_jobs = summarized_node_jobs
         self.summarized_error_states = summarized_error_states
+        self.distributions = distributions
+        self.summarized_badput = summarized_badput
 
     def __lt__(self, other):
         return self.n_jobs < other.n_jobs
@@ -0,0 +1,46 @@
+"""Module to represent the distribution of a summarized value."""
+from typing import Dict, List
+
+from htcanalyze import ReprObject
+
+
+class Distribution(ReprObject):
+    """
+    Represents the distribution of a value over all jobs of a state.
+
+    The quantiles and the histogram can be estimates,
+    if the number of values exceeded the size of the quantile sketch.
+
+    :param n_values: number of values
+    :param mean: mean value
+    :param stddev: population standard deviation
+    :param min_value: minimum value
+    :param max_value: maximum value
+    :param quantiles: value by quantile, e.g. {0.5: median}
+    :param histogram_counts: number of values per bin
+    :param histogram_bins: bin edges, one more than counts
+    """
+
+    def __init__(
+            self,
+            n_values: int,
+            mean: float,
+            stddev: float,
+            min_value: float,
+            max_value: float,
+            quantiles: Dict[float, float],
+            histogram_counts: List[int] = None,
+            histogram_bins: List[float] = None
+    ):
+        self.n_values = n_values
+        self.mean = mean
+        self.stddev = stddev
+        self.min_value = min_value
+        self.max_value = max_value
+        self.quantiles = quantiles
+        self.histogram_counts = histogram_counts
+        self.histogram_bins = histogram_bins
+
+    def quantile(self, quantile: float) -> float:
+        """Returns the value of the given quantile."""
+        return self.quantiles[quantile]
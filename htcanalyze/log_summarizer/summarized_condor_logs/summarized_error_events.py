@@ -2,7 +2,6 @@
 from typing import List
 
 from htcanalyze import ReprObject
-from htcanalyze.log_analyzer.event_handler.job_events import ErrorEvent
 from htcanalyze.log_analyzer.event_handler.states import ErrorState
 
 
@@ -12,22 +11,25 @@ class SummarizedErrorState(ReprObject):
 
     :param error_state: error state
         The error state
-    :param error_events: error events
-        All events with that error state
+    :param n_error_events: number of error events
+        with that error state
     :param files: files
-        All files in which this error state occurred
+        Files in which this error state occurred, can be a sample
+    :param n_files: number of files in which this error state occurred,
+        defaults to the number of files given
     """
 
     def __init__(
             self,
             error_state: ErrorState,
-            error_events: List[ErrorEvent],
-            files: List = None
+            n_error_events: int,
+            files: List = None,
+            n_files: int = None
     ):
         self.error_state = error_state
-        self.error_events = error_events
-        self.n_error_events = len(error_events)
-        self.files = files
+        self.n_error_events = n_error_events
+        self.files = files if files else []
+        self.n_files = len(self.files) if n_files is None else n_files
 
     def __lt__(self, other):
         return self.n_error_events < other.n_error_events
@@ -0,0 +1,141 @@
+"""Module to summarize the goodput and badput of execution attempts."""
+from typing import Callable, Dict, Iterable, List, Optional
+
+from htcanalyze.log_analyzer.condor_log.execution_attempt import (
+    ExecutionAttempt
+)
+from htcanalyze.log_analyzer.event_handler.states import State
+from .summarizer import Summarizer
+from ..summarized_condor_logs.summarized_badput import (
+    SummarizedBadput,
+    SummarizedWastedCoreHours
+)
+
+# name of the lost attempts, that ended without a logged event
+UNKNOWN_END = "UNKNOWN"
+
+
+def _add_to(totals: Dict, key, core_hours: float, n_attempts: int):
+    """Add to the [core hours, number of attempts] of key."""
+    total = totals.get(key)
+    if total is None:
+        totals[key] = [core_hours, n_attempts]
+    else:
+        total[0] += core_hours
+        total[1] += n_attempts
+
+
+class BadputSummarizer(Summarizer):
+    """
+    Summarize the execution attempts of jobs.
+
+    Only the totals are kept: the goodput core hours and the core hours
+    and number of the lost attempts per execution node and per state
+    that ended them. Each attempt is added in constant time, hence jobs
+    with hundreds of restarts are summarized in linear time.
+    """
+
+    def __init__(self):
+        self.goodput_core_hours = 0.0
+        self.n_attempts = 0
+        self.nodes: Dict[str, List] = {}
+        self.states: Dict[Optional[State], List] = {}
+
+    def add(self, execution_attempts: Iterable[ExecutionAttempt]):
+        """Add the execution attempts of a single job."""
+        for attempt in execution_attempts:
+            if not attempt.is_finished:
+                continue
+            self.n_attempts += 1
+            core_hours = attempt.core_hours
+            if attempt.is_goodput:
+                self.goodput_core_hours += core_hours
+            else:
+                _add_to(self.nodes, attempt.host_address, core_hours, 1)
+                _add_to(self.states, attempt.end_state, core_hours, 1)
+
+    def to_dict(self) -> dict:
+        """Returns the totals, see from_dict."""
+        return {
+            "goodput_core_hours": self.goodput_core_hours,
+            "n_attempts": self.n_attempts,
+            "nodes": [
+                [address, *total] for address, total in self.nodes.items()
+            ],
+            "states": [
+                [state.name if state else None, *total]
+                for state, total in self.states.items()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BadputSummarizer":
+        """Returns the summarizer of the data returned by to_dict."""
+        summarizer = cls()
+        summarizer.goodput_core_hours = float(data["goodput_core_hours"])
+        summarizer.n_attempts = int(data["n_attempts"])
+        for address, core_hours, n_attempts in data["nodes"]:
+            _add_to(summarizer.nodes, address, core_hours, n_attempts)
+        for name, core_hours, n_attempts in data["states"]:
+            _add_to(
+                summarizer.states,
+                State.from_name(name) if name is not None else None,
+                core_hours,
+                n_attempts
+            )
+        return summarizer
+
+    def merge(self, other: "BadputSummarizer"):
+        """Merge the execution attempts of other into this summarizer."""
+        self.goodput_core_hours += other.goodput_core_hours
+        self.n_attempts += other.n_attempts
+        for totals, other_totals in (
+                (self.nodes, other.nodes),
+                (self.states, other.states)
+        ):
+            for key, (core_hours, n_attempts) in other_totals.items():
+                _add_to(totals, key, core_hours, n_attempts)
+
+    def resolve(self, resolve: Callable[[Iterable[str]], Dict[str, str]]):
+        """
+        Replace the node addresses by their host names,
+        nodes with the same host name are merged.
+
+        :param resolve: returns the host name by address,
+            e.g. RDNSResolver.resolve
+        """
+        addresses = [address for address in self.nodes if address]
+        if not addresses:
+            return
+        hosts = resolve(addresses)
+        nodes = self.nodes
+        self.nodes = {}
+        for address, (core_hours, n_attempts) in nodes.items():
+            _add_to(
+                self.nodes,
+                hosts.get(address, address),
+                core_hours,
+                n_attempts
+            )
+
+    def summarize(self) -> SummarizedBadput:
+        """Returns the SummarizedBadput, most wasted core hours first."""
+        def wasted(totals: Dict, get_name: Callable):
+            return sorted(
+                (
+                    SummarizedWastedCoreHours(get_name(key), *total)
+                    for key, total in totals.items()
+                ),
+                reverse=True
+            )
+
+        return SummarizedBadput(
+            self.goodput_core_hours,
+            sum(core_hours for core_hours, _ in self.states.values()),
+            self.n_attempts,
+            nodes=wasted(self.nodes, str),
+            states=wasted(
+                self.states,
+                lambda state: state.name if state else UNKNOWN_END
+            )
+        )
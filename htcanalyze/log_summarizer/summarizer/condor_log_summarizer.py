@@ -2,7 +2,10 @@
 from abc import ABC, abstractmethod
 from typing import List
 
-from htcanalyze.log_analyzer.condor_log.condor_log import CondorLog, JobDetails
+from htcanalyze.log_analyzer.condor_log.condor_log import CondorLog
+from htcanalyze.log_analyzer.condor_log.execution_attempt import (
+    ExecutionAttempt
+)
 from htcanalyze.log_analyzer.event_handler.states import (
     WaitingState,
     RunningState,
@@ -12,10 +15,13 @@ from htcanalyze.log_analyzer.event_handler.states import (
     ErrorWhileReadingState
 )
 from .summarizer import Summarizer
-from .log_resource_summarizer import LogResourceSummarizer, LogResources
-from .time_summarizer import TimeSummarizer, TimeManager
-from .node_summarizer import NodeSummarizer, SingleNodeJob
+from .log_resource_summarizer import LogResourceSummarizer
+from .time_summarizer import TimeSummarizer
+from .node_summarizer import NodeSummarizer
+from .badput_summarizer import BadputSummarizer
 from .error_event_summarizer import ErrorEventSummarizer, LogfileErrorEvents
+from .distribution_summarizer import DistributionSummarizer
+from ..job_table import JobTableRows
 from ..summarized_condor_logs.summarized_condor_logs import (
     SummarizedCondorLogs
 )
@@ -27,52 +33,124 @@ class CondorLogSummarizer(Summarizer, ABC):
     For each state there should be a summarizer with the ability to summarize
     the data provided for that state.
 
+    The summarizer accumulates the data of the condor logs,
+    either one at a time or as rows of a JobTable,
+    condor logs are not kept after they were added.
+
     :param condor_logs: log files with that state
     :param state: the state
     """
 
-    def __init__(self, condor_logs, state=None):
-        self.condor_logs = condor_logs
+    def __init__(self, condor_logs=None, state=None):
         self.state = state
-        resources, time_managers, job_details, logfiles_error_events = (
-            self._get_data()
-        )
+        self._n_jobs = 0
         self.resource_summarizer = LogResourceSummarizer(
-            resources,
             ignore_empty=False  # Todo
         )
         self.time_summarizer = TimeSummarizer(
-            time_managers,
             ignore_empty=False  # Todo
         )
-        self.node_summarizer = NodeSummarizer(job_details)
-        self.error_event_summarizer = ErrorEventSummarizer(
-            logfiles_error_events
-        )
-
-    def _get_data(self) -> (
-            List[LogResources],
-            List[TimeManager],
-            List[JobDetails],
-            List[LogfileErrorEvents]
-    ):
-        """Returns tuple of relevant data."""
-        resources = []
-        time_managers = []
-        nodes = []
-        log_files_error_events = []
-        for condor_log in self.condor_logs:
-            resources.append(condor_log.job_details.resources)
-            time_managers.append(condor_log.job_details.time_manager)
-            nodes.append(
-                SingleNodeJob(
-                    condor_log.job_details.host_address,
-                    condor_log.job_details.job_times
+        self.node_summarizer = NodeSummarizer()
+        self.error_event_summarizer = ErrorEventSummarizer()
+        self.distribution_summarizer = DistributionSummarizer()
+        self.badput_summarizer = BadputSummarizer()
+        if condor_logs:
+            self.add_rows(JobTableRows.from_condor_logs(condor_logs))
+            for condor_log in condor_logs:
+                self.add_error_events(condor_log.logfile_error_events)
+                self.add_execution_attempts(
+                    condor_log.job_details.execution_attempts
                 )
-            )
-            log_files_error_events.append(condor_log.logfile_error_events)
 
-        return resources, time_managers, nodes, log_files_error_events
+    def add(self, condor_log: CondorLog):
+        """Add the relevant data of a single condor log."""
+        self.add_rows(JobTableRows.from_condor_logs([condor_log]))
+        self.add_error_events(condor_log.logfile_error_events)
+        self.add_execution_attempts(condor_log.job_details.execution_attempts)
+
+    def add_rows(self, rows: JobTableRows):
+        """Reduce the rows of a JobTable with jobs of this state."""
+        if not len(rows):
+            return
+        resources = rows.resources[rows.has_resources]
+        if len(resources):
+            self.resource_summarizer.add_rows(resources)
+        self.time_summarizer.add_rows(rows.times)
+        self.node_summarizer.add_rows(rows.node, rows.times, rows.nodes)
+        self.distribution_summarizer.add_rows(rows)
+        self._n_jobs += len(rows)
+
+    def add_error_events(self, logfile_error_events: LogfileErrorEvents):
+        """Add the error events of a single condor log."""
+        self.error_event_summarizer.add(logfile_error_events)
+
+    def add_execution_attempts(
+            self,
+            execution_attempts: List[ExecutionAttempt]
+    ):
+        """Add the execution attempts of a single condor log."""
+        self.badput_summarizer.add(execution_attempts)
+
+    def merge(self, other: "CondorLogSummarizer"):
+        """
+        Merge the accumulated data of other into this summarizer.
+
+        Merging is associative, the summary of merged summarizers is the
+        summary of all their condor logs, up to the quantile sketches
+        and the order of the nodes and errors.
+
+        :param other: summarizer of the same state
+        """
+        assert other.state == self.state
+        self.resource_summarizer.merge(other.resource_summarizer)
+        self.time_summarizer.merge(other.time_summarizer)
+        self.node_summarizer.merge(other.node_summarizer)
+        self.error_event_summarizer.merge(other.error_event_summarizer)
+        self.distribution_summarizer.merge(other.distribution_summarizer)
+        self.badput_summarizer.merge(other.badput_summarizer)
+        self._n_jobs += other.n_jobs
+
+    def to_dict(self) -> dict:
+        """
+        Returns the accumulated data as dictionaries, lists, numbers,
+        strings and numpy arrays, e.g. to write a partial summary.
+        """
+        return {
+            "state": self.state.name,
+            "n_jobs": self._n_jobs,
+            "resources": self.resource_summarizer.to_dict(),
+            "times": self.time_summarizer.to_dict(),
+            "nodes": self.node_summarizer.to_dict(),
+            "error_events": self.error_event_summarizer.to_dict(),
+            "distributions": self.distribution_summarizer.to_dict(),
+            "badput": self.badput_summarizer.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CondorLogSummarizer":
+        """
+        Returns the summarizer of the data returned by to_dict,
+        cls is the summarizer of its state.
+        """
+        summarizer = cls()
+        if summarizer.state.name != data["state"]:
+            raise ValueError(f"Summarizer of another state: {data['state']}")
+        summarizer._n_jobs = int(data["n_jobs"])
+        summarizer.resource_summarizer = LogResourceSummarizer.from_dict(
+            data["resources"]
+        )
+        summarizer.time_summarizer = TimeSummarizer.from_dict(data["times"])
+        summarizer.node_summarizer = NodeSummarizer.from_dict(data["nodes"])
+        summarizer.error_event_summarizer = ErrorEventSummarizer.from_dict(
+            data["error_events"]
+        )
+        summarizer.distribution_summarizer = (
+            DistributionSummarizer.from_dict(data["distributions"])
+        )
+        summarizer.badput_summarizer = BadputSummarizer.from_dict(
+            data["badput"]
+        )
+        return summarizer
 
     @abstractmethod
     def summarize(self) -> SummarizedCondorLogs:
@@ -81,13 +159,13 @@ class CondorLogSummarizer(Summarizer, ABC):
     @property
     def n_jobs(self) -> int:
         """Returns number of jobs."""
-        return len(self.condor_logs)
+        return self._n_jobs
 
 
 class NormalTerminationStateSummarizer(CondorLogSummarizer):
     """Summarizer for NormalTerminationState."""
 
-    def __init__(self, condor_logs: List[CondorLog]):
+    def __init__(self, condor_logs: List[CondorLog] = None):
         super().__init__(condor_logs, NormalTerminationState())
 
     def summarize(self) -> SummarizedCondorLogs:
@@ -96,6 +174,8 @@ class NormalTerminationStateSummarizer(CondorLogSummarizer):
         avg_times = self.time_summarizer.summarize()
         summarized_node_jobs = self.node_summarizer.summarize()
         summarized_error_events = self.error_event_summarizer.summarize()
+        distributions = self.distribution_summarizer.summarize()
+        summarized_badput = self.badput_summarizer.summarize()
 
         return SummarizedCondorLogs(
             self.state,
@@ -103,7 +183,9 @@ class NormalTerminationStateSummarizer(CondorLogSummarizer):
             avg_times,
             avg_resources,
             summarized_node_jobs,
-            summarized_error_events
+            summarized_error_events,
+            distributions,
+            summarized_badput
         )
 
 
@@ -113,7 +195,7 @@ class AbnormalTerminationStateSummarizer(NormalTerminationStateSummarizer):
     Does not differ form NormalTerminationStateSummarizer for now.
     """
 
-    def __init__(self, condor_logs: List[CondorLog]):
+    def __init__(self, condor_logs: List[CondorLog] = None):
         super().__init__(condor_logs)
         self.state = AbnormalTerminationState()
 
@@ -121,25 +203,29 @@ class AbnormalTerminationStateSummarizer(NormalTerminationStateSummarizer):
 class WaitingStateSummarizer(CondorLogSummarizer):
     """Summarizer for WaitingState."""
 
-    def __init__(self, condor_logs: List[CondorLog]):
+    def __init__(self, condor_logs: List[CondorLog] = None):
         super().__init__(condor_logs, WaitingState())
 
     def summarize(self) -> SummarizedCondorLogs:
         """Summarize."""
         avg_times = self.time_summarizer.summarize()
         summarized_error_states = self.error_event_summarizer.summarize()
+        distributions = self.distribution_summarizer.summarize()
+        summarized_badput = self.badput_summarizer.summarize()
         return SummarizedCondorLogs(
             self.state,
             self.n_jobs,
             avg_times=avg_times,
-            summarized_error_states=summarized_error_states
+            summarized_error_states=summarized_error_states,
+            distributions=distributions,
+            summarized_badput=summarized_badput
         )
 
 
 class RunningStateSummarizer(CondorLogSummarizer):
     """Summarizer for RunningState."""
 
-    def __init__(self, condor_logs: List[CondorLog]):
+    def __init__(self, condor_logs: List[CondorLog] = None):
         super().__init__(condor_logs, RunningState())
 
     def summarize(self) -> SummarizedCondorLogs:
@@ -147,36 +233,44 @@ class RunningStateSummarizer(CondorLogSummarizer):
         avg_times = self.time_summarizer.summarize()
         summarized_node_jobs = self.node_summarizer.summarize()
         summarized_error_states = self.error_event_summarizer.summarize()
+        distributions = self.distribution_summarizer.summarize()
+        summarized_badput = self.badput_summarizer.summarize()
         return SummarizedCondorLogs(
             self.state,
             self.n_jobs,
             avg_times=avg_times,
             summarized_node_jobs=summarized_node_jobs,
-            summarized_error_states=summarized_error_states
+            summarized_error_states=summarized_error_states,
+            distributions=distributions,
+            summarized_badput=summarized_badput
         )
 
 
 class AbortedStateSummarizer(CondorLogSummarizer):
     """Summarizer for AbortedState."""
 
-    def __init__(self, condor_logs: List[CondorLog]):
+    def __init__(self, condor_logs: List[CondorLog] = None):
         super().__init__(condor_logs, AbortedState())
 
     def summarize(self) -> SummarizedCondorLogs:
         """Summarize."""
         avg_times = self.time_summarizer.summarize()
         summarized_error_states = self.error_event_summarizer.summarize()
+        distributions = self.distribution_summarizer.summarize()
+        summarized_badput = self.badput_summarizer.summarize()
         return SummarizedCondorLogs(
             self.state,
             self.n_jobs,
             avg_times=avg_times,
-            summarized_error_states=summarized_error_states
+            summarized_error_states=summarized_error_states,
+            distributions=distributions,
+            summarized_badput=summarized_badput
         )
 
 
 class ErrorWhileReadingStateSummarizer(CondorLogSummarizer):
     """Summarizer for ErrorWhileReadingState"""
-    def __init__(self, condor_logs: List[CondorLog]):
+    def __init__(self, condor_logs: List[CondorLog] = None):
         super().__init__(condor_logs, ErrorWhileReadingState())
 
     def summarize(self) -> SummarizedCondorLogs:
@@ -0,0 +1,330 @@
+"""Module to summarize the distribution of job times and resources."""
+import random
+from typing import Dict, List
+
+import numpy as np
+
+from htcanalyze.globals import HISTOGRAM_BINS, QUANTILES, SKETCH_SIZE
+from .summarizer import Summarizer
+from ..job_table import (
+    RESOURCES,
+    RESOURCE_COLUMNS,
+    TIME_COLUMNS,
+    JobTableRows
+)
+from ..summarized_condor_logs.summarized_distribution import Distribution
+
+# resource columns with a distribution, allocated equals mostly requested
+DISTRIBUTION_RESOURCE_COLUMNS = [
+    f"{resource}_{value}"
+    for resource in RESOURCES
+    for value in ["usage", "requested"]
+]
+
+
+class RunningMoments:
+    """
+    Count, mean and sum of squared deviations of a stream of values.
+
+    Batches of values are combined with the parallel algorithm of
+    Chan et al., so two RunningMoments can be merged as well.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, n: int, mean: float, m2: float):
+        if n == 0:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def update(self, values: np.ndarray):
+        """Add a batch of values."""
+        if len(values) == 0:
+            return
+        mean = float(values.mean())
+        self._combine(
+            len(values),
+            mean,
+            float(np.square(values - mean).sum())
+        )
+
+    def to_dict(self) -> dict:
+        """Returns the moments, see from_dict."""
+        return {"n": self.n, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningMoments":
+        """Returns the moments of the data returned by to_dict."""
+        moments = cls()
+        moments.n = int(data["n"])
+        moments.mean = float(data["mean"])
+        moments.m2 = float(data["m2"])
+        return moments
+
+    def merge(self, other: "RunningMoments"):
+        """Merge the moments of other into these."""
+        self._combine(other.n, other.mean, other.m2)
+
+    @property
+    def stddev(self) -> float:
+        """Returns the population standard deviation."""
+        if self.n == 0:
+            return np.nan
+        return float(np.sqrt(self.m2 / self.n))
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch, keeps O(k log(n / k)) of n values.
+
+    The values are kept in compactors, an item on level h
+    represents 2 ** h values. A full compactor is sorted and every
+    second item is promoted to the next level.
+    Quantiles are exact as long as no compaction happened.
+
+    :param k: size of the highest compactor, controls the accuracy
+    :param seed: seed of the random compaction offsets
+    """
+
+    def __init__(self, k: int = SKETCH_SIZE, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+        self._random = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        while sum(map(len, self.compactors)) > sum(
+                self._capacity(level)
+                for level in range(len(self.compactors))
+        ):
+            for level, compactor in enumerate(self.compactors):
+                if len(compactor) < self._capacity(level):
+                    continue
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                compactor = np.sort(compactor)
+                # an odd item stays on this level
+                kept = compactor[len(compactor) - len(compactor) % 2:]
+                offset = self._random.randint(0, 1)
+                self.compactors[level + 1] = np.concatenate((
+                    self.compactors[level + 1],
+                    compactor[offset:len(compactor) - len(kept):2]
+                ))
+                self.compactors[level] = kept
+                break
+
+    def update(self, values: np.ndarray):
+        """Add a batch of values, NaN values are ignored."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.compactors[0] = np.concatenate((self.compactors[0], values))
+        self._compress()
+
+    def to_dict(self) -> dict:
+        """
+        Returns the compactors and the state of the random compaction
+        offsets, see from_dict.
+        """
+        version, random_state, gauss_next = self._random.getstate()
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": self.min,
+            "max": self.max,
+            "compactors": list(self.compactors),
+            "random_version": version,
+            "random_state": np.array(random_state, dtype=np.int64),
+            "gauss_next": gauss_next
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KLLSketch":
+        """Returns the sketch of the data returned by to_dict."""
+        sketch = cls(int(data["k"]))
+        sketch.n = int(data["n"])
+        sketch.min = float(data["min"])
+        sketch.max = float(data["max"])
+        sketch.compactors = [
+            np.asarray(compactor, dtype=np.float64)
+            for compactor in data["compactors"]
+        ]
+        sketch._random.setstate((
+            int(data["random_version"]),
+            tuple(int(value) for value in data["random_state"]),
+            data["gauss_next"]
+        ))
+        return sketch
+
+    def merge(self, other: "KLLSketch"):
+        """Merge the values of other into this sketch."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate(
+                (self.compactors[level], compactor)
+            )
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _weighted_items(self) -> (np.ndarray, np.ndarray):
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([
+            np.full(len(compactor), 2.0 ** level)
+            for level, compactor in enumerate(self.compactors)
+        ])
+        return items, weights
+
+    def quantiles(self, quantiles: List[float]) -> List[float]:
+        """Returns the lower quantiles, the values at rank ceil(q * n)."""
+        if self.n == 0:
+            return [np.nan] * len(quantiles)
+        items, weights = self._weighted_items()
+        order = np.argsort(items, kind="stable")
+        items = items[order]
+        ranks = np.cumsum(weights[order])
+        indices = np.searchsorted(
+            ranks,
+            np.asarray(quantiles) * ranks[-1],
+            side="left"
+        )
+        return items[np.minimum(indices, len(items) - 1)].tolist()
+
+    def histogram(self, bins: int = HISTOGRAM_BINS) -> (List, List):
+        """Returns the estimated counts and the bin edges."""
+        if self.n == 0:
+            return [], []
+        items, weights = self._weighted_items()
+        counts, edges = np.histogram(
+            items,
+            bins=bins,
+            range=(self.min, self.max),
+            weights=weights
+        )
+        # rescale, the weights of a compacted sketch only estimate n
+        counts = np.round(counts * self.n / weights.sum()).astype(int)
+        return counts.tolist(), edges.tolist()
+
+
+class DistributionAccumulator:
+    """Accumulates the moments and a quantile sketch of one value."""
+
+    def __init__(self):
+        self.moments = RunningMoments()
+        self.sketch = KLLSketch()
+
+    def update(self, values: np.ndarray):
+        """Add a batch of values, NaN values are ignored."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.moments.update(values)
+        self.sketch.update(values)
+
+    def to_dict(self) -> dict:
+        """Returns the moments and the sketch, see from_dict."""
+        return {
+            "moments": self.moments.to_dict(),
+            "sketch": self.sketch.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DistributionAccumulator":
+        """Returns the accumulator of the data returned by to_dict."""
+        accumulator = cls()
+        accumulator.moments = RunningMoments.from_dict(data["moments"])
+        accumulator.sketch = KLLSketch.from_dict(data["sketch"])
+        return accumulator
+
+    def merge(self, other: "DistributionAccumulator"):
+        """Merge other into this accumulator."""
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+
+    def summarize(self) -> Distribution:
+        """Returns the distribution of the values."""
+        counts, bins = self.sketch.histogram()
+        return Distribution(
+            n_values=self.moments.n,
+            mean=self.moments.mean,
+            stddev=self.moments.stddev,
+            min_value=self.sketch.min,
+            max_value=self.sketch.max,
+            quantiles=dict(zip(QUANTILES, self.sketch.quantiles(QUANTILES))),
+            histogram_counts=counts,
+            histogram_bins=bins
+        )
+
+
+class DistributionSummarizer(Summarizer):
+    """
+    Summarize the distribution of the job times
+    and of the used and requested resources.
+
+    Memory is bounded by the size of the quantile sketches,
+    not by the number of jobs.
+    """
+
+    def __init__(self):
+        self.accumulators: Dict[str, DistributionAccumulator] = {
+            name: DistributionAccumulator()
+            for name in TIME_COLUMNS + DISTRIBUTION_RESOURCE_COLUMNS
+        }
+
+    def add_rows(self, rows: JobTableRows):
+        """Add the time and resource columns of a JobTable."""
+        for i, name in enumerate(TIME_COLUMNS):
+            self.accumulators[name].update(rows.times[:, i])
+        resources = rows.resources[rows.has_resources]
+        for name in DISTRIBUTION_RESOURCE_COLUMNS:
+            self.accumulators[name].update(
+                resources[:, RESOURCE_COLUMNS.index(name)]
+            )
+
+    def to_dict(self) -> dict:
+        """Returns the accumulators by column name, see from_dict."""
+        return {
+            name: accumulator.to_dict()
+            for name, accumulator in self.accumulators.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DistributionSummarizer":
+        """Returns the summarizer of the data returned by to_dict."""
+        summarizer = cls()
+        for name in summarizer.accumulators:
+            summarizer.accumulators[name] = DistributionAccumulator.from_dict(
+                data[name]
+            )
+        return summarizer
+
+    def merge(self, other: "DistributionSummarizer"):
+        """Merge other into this summarizer."""
+        for name, accumulator in other.accumulators.items():
+            self.accumulators[name].merge(accumulator)
+
+    def summarize(self) -> Dict[str, Distribution]:
+        """Returns the distributions by column name, if any values."""
+        return {
+            name: accumulator.summarize()
+            for name, accumulator in self.accumulators.items()
+            if accumulator.moments.n
+        }
@@ -1,6 +1,7 @@
 """Module to summarize error events."""
 from typing import List
 
+from htcanalyze.globals import MAX_ERROR_LIMIT
 from htcanalyze.log_analyzer.condor_log.error_events import LogfileErrorEvents
 from htcanalyze.log_analyzer.event_handler.job_events import ErrorEvent
 from htcanalyze.log_analyzer.event_handler.states import ErrorState
@@ -12,22 +13,51 @@ from ..summarized_condor_logs.summarized_error_events import (
 
 class ErrorEventCollection:
     """
-    Used to collect all ErrorEvent(s) with the same ErrorState.
+    Used to count all ErrorEvent(s) with the same ErrorState.
+
+    The events are only counted, of the files only the number and
+    a sample of at most max_files file names are kept.
+    The error events of one file are expected to be added consecutively.
 
     :param error_state: ErrorState
+    :param max_files: maximum number of file names to keep
     """
-    def __init__(self, error_state: ErrorState):
+    def __init__(self, error_state: ErrorState, max_files=MAX_ERROR_LIMIT):
         self.error_state = error_state
-        self.error_events: List[ErrorEvent] = []
+        self.max_files = max_files
+        self.n_error_events = 0
         self.files = []
+        self.n_files = 0
+        self._last_file = None
 
     def add_error_event(self, error_event: ErrorEvent, file):
         """Add error event to collection."""
-        assert error_event.error_state == self.error_state
-        self.error_events.append(error_event)
-        if file not in self.files:
+        assert error_event.error_state is self.error_state
+        self.n_error_events += 1
+        if file == self._last_file or file in self.files:
+            return
+        self._last_file = file
+        self.n_files += 1
+        if len(self.files) < self.max_files:
             self.files.append(file)
 
+    def merge(self, other: "ErrorEventCollection"):
+        """
+        Merge the error events of other into this collection.
+
+        Files of both collections are only counted once if they are
+        in both samples, the logs of partial summaries are expected
+        to be disjoint.
+        """
+        assert other.error_state is self.error_state
+        self.n_error_events += other.n_error_events
+        self.n_files += other.n_files
+        for file in other.files:
+            if file in self.files:
+                self.n_files -= 1
+            elif len(self.files) < self.max_files:
+                self.files.append(file)
+
 
 class ErrorEventManager:
     """Manages error events."""
@@ -37,19 +67,26 @@ class ErrorEventManager:
 
     def add_events(self, log_file_error_events: LogfileErrorEvents):
         """Add events to each collection with the same error state."""
+        error_dict = self.error_dict
+        file = log_file_error_events.file
         for error_event in log_file_error_events.error_events:
-            err_st = error_event.error_state
-            try:
-                self.error_dict[err_st].add_error_event(
-                    error_event,
-                    log_file_error_events.file
+            error_state = error_event.error_state
+            collection = error_dict.get(error_state)
+            if collection is None:
+                collection = error_dict[error_state] = ErrorEventCollection(
+                    error_state
                 )
-            except KeyError:
-                self.error_dict[err_st] = ErrorEventCollection(err_st)
-                self.error_dict[err_st].add_error_event(
-                    error_event,
-                    log_file_error_events.file
+            collection.add_error_event(error_event, file)
+
+    def merge(self, other: "ErrorEventManager"):
+        """Merge the collections of other, new ones are appended."""
+        for error_state, collection in other.error_dict.items():
+            own_collection = self.error_dict.get(error_state)
+            if own_collection is None:
+                own_collection = self.error_dict[error_state] = (
+                    ErrorEventCollection(error_state)
                 )
+            own_collection.merge(collection)
 
     @property
     def error_event_collections(self) -> List[ErrorEventCollection]:
@@ -60,20 +97,62 @@ class ErrorEventManager:
 class ErrorEventSummarizer(Summarizer):
     """Summarize error events."""
 
-    def __init__(self, log_files_error_events: List[LogfileErrorEvents]):
-        self.log_files_error_events = log_files_error_events
+    def __init__(
+            self,
+            log_files_error_events: List[LogfileErrorEvents] = None
+    ):
+        self.error_event_manager = ErrorEventManager()
+        for log_file_error_events in log_files_error_events or []:
+            self.add(log_file_error_events)
+
+    def add(self, log_file_error_events: LogfileErrorEvents):
+        """Add the error events of a single log file."""
+        self.error_event_manager.add_events(log_file_error_events)
+
+    def to_dict(self) -> dict:
+        """Returns the counted error events, see from_dict."""
+        return {
+            "collections": [
+                {
+                    "error_state": collection.error_state.name,
+                    "max_files": collection.max_files,
+                    "n_error_events": collection.n_error_events,
+                    "files": collection.files,
+                    "n_files": collection.n_files
+                }
+                for collection
+                in self.error_event_manager.error_event_collections
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ErrorEventSummarizer":
+        """Returns the summarizer of the data returned by to_dict."""
+        summarizer = cls()
+        error_dict = summarizer.error_event_manager.error_dict
+        for collection_data in data["collections"]:
+            collection = ErrorEventCollection(
+                ErrorState.from_name(collection_data["error_state"]),
+                int(collection_data["max_files"])
+            )
+            collection.n_error_events = int(collection_data["n_error_events"])
+            collection.files = list(collection_data["files"])
+            collection.n_files = int(collection_data["n_files"])
+            error_dict[collection.error_state] = collection
+        return summarizer
+
+    def merge(self, other: "ErrorEventSummarizer"):
+        """Merge the error events of other into this summarizer."""
+        self.error_event_manager.merge(other.error_event_manager)
 
     def summarize(self) -> List[SummarizedErrorState]:
         """Returns a list of SummarizedErrorStates."""
-        error_event_manager = ErrorEventManager()
-        for log_file_error_events in self.log_files_error_events:
-            error_event_manager.add_events(log_file_error_events)
-
         return [
             SummarizedErrorState(
                 eec.error_state,
-                eec.error_events,
-                eec.files
+                eec.n_error_events,
+                eec.files,
+                eec.n_files
             )
-            for eec in error_event_manager.error_event_collections
+            for eec in self.error_event_manager.error_event_collections
         ]
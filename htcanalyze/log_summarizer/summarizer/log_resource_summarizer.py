@@ -1,14 +1,28 @@
 """Module to summarize log resources"""
 from typing import List
 
-from htcanalyze.log_analyzer.condor_log.logresource import LogResources
+import numpy as np
+
+from htcanalyze.log_analyzer.condor_log.logresource import (
+    LogResources,
+    CPULogResource,
+    DiskLogResource,
+    MemoryLogResource,
+    GPULogResource
+)
 from .summarizer import Summarizer
+from ..job_table import RESOURCES, RESOURCE_VALUES, get_resource_values
 
 
 class LogResourceSummarizer(Summarizer):
     """
     Summarizes log resources
 
+    Only the column sums and the number of log resources are kept,
+    log resources are added one at a time or as rows of a JobTable.
+    Like the sum of LogResources, missing values of a resource count as 0,
+    a resource is NaN only if it is missing in all log resources.
+
     :param m_log_resources: multiple log resources
     :param ignore_empty: ignore empty resources for the calculation
     """
@@ -17,9 +31,67 @@ class LogResourceSummarizer(Summarizer):
             m_log_resources: List[LogResources] = None,
             ignore_empty=False
     ):
-        self.m_log_resources = m_log_resources if m_log_resources else []
         self.ignore_empty = ignore_empty  # todo
+        self.sums = np.zeros((len(RESOURCES), len(RESOURCE_VALUES)))
+        self.non_empty = np.zeros(len(RESOURCES), dtype=bool)
+        self.n_log_resources = 0
+        for log_resources in m_log_resources or []:
+            self.add(log_resources)
+
+    def add(self, log_resources: LogResources):
+        """Add a single log resources object."""
+        self.add_rows(np.array([get_resource_values(log_resources)]))
+
+    def add_rows(self, resources: np.ndarray):
+        """
+        Add the resource columns of a JobTable.
+
+        :param resources: array with one row per job
+            and the columns of RESOURCE_COLUMNS
+        """
+        values = resources.reshape(
+            len(resources), len(RESOURCES), len(RESOURCE_VALUES)
+        )
+        self.sums += np.nansum(values, axis=0)
+        self.non_empty |= ~np.isnan(values).all(axis=(0, 2))
+        self.n_log_resources += len(resources)
+
+    def to_dict(self) -> dict:
+        """Returns the accumulated data, see from_dict."""
+        return {
+            "ignore_empty": self.ignore_empty,
+            "sums": self.sums,
+            "non_empty": self.non_empty,
+            "n_log_resources": self.n_log_resources
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LogResourceSummarizer":
+        """Returns the summarizer of the data returned by to_dict."""
+        summarizer = cls(ignore_empty=data["ignore_empty"])
+        summarizer.sums[:] = data["sums"]
+        summarizer.non_empty[:] = data["non_empty"]
+        summarizer.n_log_resources = int(data["n_log_resources"])
+        return summarizer
+
+    def merge(self, other: "LogResourceSummarizer"):
+        """Merge the log resources of other into this summarizer."""
+        self.sums += other.sums
+        self.non_empty |= other.non_empty
+        self.n_log_resources += other.n_log_resources
 
     def summarize(self) -> LogResources:
         """Calculates average of log resources."""
-        return sum(self.m_log_resources) / len(self.m_log_resources)
+        if not self.n_log_resources:
+            return None
+        averages = np.where(
+            self.non_empty[:, np.newaxis],
+            self.sums / self.n_log_resources,
+            np.nan
+        ).tolist()
+        return LogResources(
+            CPULogResource(*averages[0]),
+            DiskLogResource(*averages[1]),
+            MemoryLogResource(*averages[2]),
+            GPULogResource(*averages[3])
+        )
@@ -1,8 +1,12 @@
 """Module to summarize node jobs."""
-from typing import List
+from typing import Callable, Dict, Iterable, List
+
+import numpy as np
 
 from htcanalyze.log_analyzer.condor_log.time_manager import JobTimes
 from .summarizer import Summarizer
+from .time_summarizer import average_job_times
+from ..job_table import TIME_COLUMNS, get_time_values
 from ..summarized_condor_logs.summarized_node_jobs import (
     SingleNodeJob,
     SummarizedNodeJobs
@@ -13,27 +17,30 @@ class NodeJobCollection:
     """
     Create a Node-job collection of jobs executed on the same node.
 
+    Only the summed up job times in seconds and the number of jobs are kept.
+
     :param address: Address of the Node
     """
 
     def __init__(self, address: str):
         self.address = address
-        self.nodes: List[SingleNodeJob] = []
+        self.sums = np.zeros(len(TIME_COLUMNS), dtype=np.int64)
+        self.n_jobs = 0
 
     def add_node(self, node: SingleNodeJob):
         """Add a node."""
         assert node.address == self.address
-        self.nodes.append(node)
+        self.add_times(np.array(get_time_values(node.job_times)), 1)
 
-    @property
-    def n_jobs(self):
-        """Returns number of jobs."""
-        return len(self.nodes)
+    def add_times(self, sums: np.ndarray, n_jobs: int):
+        """Add summed up job times in seconds of n_jobs jobs."""
+        self.sums += sums
+        self.n_jobs += n_jobs
 
     @property
     def avg_job_times(self) -> JobTimes:
         """Returns average of job times of one node."""
-        return sum(node.job_times for node in self.nodes) / self.n_jobs
+        return average_job_times(self.sums, self.n_jobs)
 
 
 class NodeManager:
@@ -45,13 +52,38 @@ class NodeManager:
     def __init__(self):
         self.nodes_dict = {}
 
-    def add_node(self, node: SingleNodeJob):
-        """Add node to nodes_dict."""
+    def get_node_collection(self, address: str) -> NodeJobCollection:
+        """Returns the NodeJobCollection of the address, creates it."""
         try:
-            self.nodes_dict[node.address].add_node(node)
+            return self.nodes_dict[address]
         except KeyError:
-            self.nodes_dict[node.address] = NodeJobCollection(node.address)
-            self.nodes_dict[node.address].add_node(node)
+            self.nodes_dict[address] = NodeJobCollection(address)
+            return self.nodes_dict[address]
+
+    def add_node(self, node: SingleNodeJob):
+        """Add node to nodes_dict."""
+        self.get_node_collection(node.address).add_node(node)
+
+    def merge(self, other: "NodeManager"):
+        """Merge the nodes of other, new nodes are appended."""
+        for address, collection in other.nodes_dict.items():
+            self.get_node_collection(address).add_times(
+                collection.sums,
+                collection.n_jobs
+            )
+
+    def rename(self, addresses: Dict[str, str]):
+        """
+        Rename the nodes, nodes with the same new address are merged.
+
+        :param addresses: new address by address, others are kept
+        """
+        nodes_dict = self.nodes_dict
+        self.nodes_dict = {}
+        for address, collection in nodes_dict.items():
+            self.get_node_collection(
+                addresses.get(address, address)
+            ).add_times(collection.sums, collection.n_jobs)
 
     @property
     def node_collections(self) -> List[NodeJobCollection]:
@@ -66,11 +98,93 @@ class NodeSummarizer(Summarizer):
 
     :param nodes: List of SingleNodeJob
     """
-    def __init__(self, nodes: List[SingleNodeJob]):
-        self.nodes = nodes
+    def __init__(self, nodes: List[SingleNodeJob] = None):
         self.node_manager = NodeManager()
-        for node in self.nodes:
-            self.node_manager.add_node(node)
+        for node in nodes or []:
+            self.add(node)
+
+    def add(self, node: SingleNodeJob):
+        """Add a single node job."""
+        self.node_manager.add_node(node)
+
+    def add_rows(
+            self,
+            node_codes: np.ndarray,
+            times: np.ndarray,
+            addresses: List[str]
+    ):
+        """
+        Add the node and time columns of a JobTable.
+
+        The nodes are added in order of their first appearance.
+
+        :param node_codes: node code per job
+        :param times: array with one row per job
+            and the columns of TIME_COLUMNS in seconds
+        :param addresses: node addresses by node code
+        """
+        if len(node_codes) == 0:
+            return
+        codes, first_rows, inverse = np.unique(
+            node_codes,
+            return_index=True,
+            return_inverse=True
+        )
+        counts = np.bincount(inverse)
+        sums = np.stack([
+            np.bincount(inverse, weights=times[:, i], minlength=len(codes))
+            for i in range(times.shape[1])
+        ], axis=1).round().astype(np.int64)
+        for i in np.argsort(first_rows):
+            self.node_manager.get_node_collection(
+                addresses[codes[i]]
+            ).add_times(sums[i], int(counts[i]))
+
+    def to_dict(self) -> dict:
+        """Returns the node jobs, see from_dict."""
+        collections = self.node_manager.node_collections
+        return {
+            "addresses": [
+                collection.address for collection in collections
+            ],
+            "sums": np.array(
+                [collection.sums for collection in collections],
+                dtype=np.int64
+            ).reshape(len(collections), len(TIME_COLUMNS)),
+            "n_jobs": [collection.n_jobs for collection in collections]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NodeSummarizer":
+        """Returns the summarizer of the data returned by to_dict."""
+        summarizer = cls()
+        for address, sums, n_jobs in zip(
+                data["addresses"],
+                data["sums"],
+                data["n_jobs"]
+        ):
+            summarizer.node_manager.get_node_collection(address).add_times(
+                sums,
+                int(n_jobs)
+            )
+        return summarizer
+
+    def merge(self, other: "NodeSummarizer"):
+        """Merge the node jobs of other into this summarizer."""
+        self.node_manager.merge(other.node_manager)
+
+    def resolve(self, resolve: Callable[[Iterable[str]], Dict[str, str]]):
+        """
+        Replace the node addresses by their host names.
+
+        :param resolve: returns the host name by address,
+            e.g. RDNSResolver.resolve
+        """
+        addresses = [
+            address for address in self.node_manager.nodes_dict if address
+        ]
+        if addresses:
+            self.node_manager.rename(resolve(addresses))
 
     def summarize(self) -> List[SummarizedNodeJobs]:
         """Returns list of summarized node jobs."""
@@ -1,25 +1,85 @@
 """Module to summarize time differences."""
+from datetime import timedelta
 from typing import List
+
+import numpy as np
+
 from htcanalyze.log_analyzer.condor_log.time_manager import (
     TimeManager,
     JobTimes
 )
 from .summarizer import Summarizer
+from ..job_table import TIME_COLUMNS, get_time_values
+
+
+def average_job_times(sums: np.ndarray, n_jobs: int) -> JobTimes:
+    """
+    Returns the average job times of summed up seconds,
+    just like the average of JobTimes objects.
+    """
+    return JobTimes(
+        *(timedelta(seconds=int(seconds)) / n_jobs for seconds in sums)
+    )
 
 
 class TimeSummarizer(Summarizer):
     """
     Use this class to summarize job times given by a list of time managers
 
+    Only the summed up seconds and the number of job times are kept,
+    time managers are added one at a time or as rows of a JobTable.
+
     :param time_managers: List[TimeManger]
         used to summarized job times of each time manager
     :param ignore_empty:
         ignore empty job times
     """
-    def __init__(self, time_managers: List[TimeManager], ignore_empty=False):
-        self.job_times = [tm.job_times for tm in time_managers]
+    def __init__(
+            self,
+            time_managers: List[TimeManager] = None,
+            ignore_empty=False
+    ):
         self.ignore_empty = ignore_empty  # Todo
+        self.sums = np.zeros(len(TIME_COLUMNS), dtype=np.int64)
+        self.n_job_times = 0
+        for time_manager in time_managers or []:
+            self.add(time_manager)
+
+    def add(self, time_manager: TimeManager):
+        """Add the job times of a time manager."""
+        self.add_rows(np.array([get_time_values(time_manager.job_times)]))
+
+    def add_rows(self, times: np.ndarray):
+        """
+        Add the time columns of a JobTable.
+
+        :param times: array with one row per job
+            and the columns of TIME_COLUMNS in seconds
+        """
+        self.sums += times.sum(axis=0)
+        self.n_job_times += len(times)
+
+    def to_dict(self) -> dict:
+        """Returns the accumulated data, see from_dict."""
+        return {
+            "ignore_empty": self.ignore_empty,
+            "sums": self.sums,
+            "n_job_times": self.n_job_times
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TimeSummarizer":
+        """Returns the summarizer of the data returned by to_dict."""
+        summarizer = cls(ignore_empty=data["ignore_empty"])
+        summarizer.sums[:] = data["sums"]
+        summarizer.n_job_times = int(data["n_job_times"])
+        return summarizer
+
+    def merge(self, other: "TimeSummarizer"):
+        """Merge the job times of other into this summarizer."""
+        self.sums += other.sums
+        self.n_job_times += other.n_job_times
 
     def summarize(self) -> JobTimes:
         """Returns average of job times."""
-        return sum(self.job_times) / len(self.job_times)
+        return average_job_times(self.sums, self.n_job_times)
@@ -6,28 +6,29 @@ Create visible output by using htcanalyze.
 
 import sys
 import logging
-import subprocess
 import traceback
 
-from typing import List
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, List
 from datetime import datetime as date_time
-from rich.console import Console
 
 # own classes
-from . import setup_logging_tool
-from .log_analyzer.logvalidator import LogValidator
-from .log_analyzer.htcanalyzer import HTCAnalyzer
-from .log_summarizer.htcsummarizer import HTCSummarizer
-from .view.view import track_progress
-from .view.analyzed_logfile_view import AnalyzedLogfileView
-from .view.summarized_logfile_view import SummarizedLogfileView
+# rich, numpy, plotille and htcondor are imported by the functions
+# that use them, so --version and --help start fast
+from . import get_package_name, setup_logging_tool
 from .cli_argument_parser import setup_parser
+from .profiler import get_profiler
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .log_summarizer.htcsummarizer import HTCSummarizer
 
 from .globals import (
     BAD_USAGE,
     TOLERATED_USAGE,
     EXT_ERR_DEFAULT,
     EXT_OUT_DEFAULT,
+    JOBS_DEFAULT,
+    OUTPUT_FORMAT_DEFAULT,
     NORMAL_EXECUTION,
     NO_VALID_FILES,
     TYPE_ERROR,
@@ -35,6 +36,16 @@ from .globals import (
 )
 
 
+# options of print_summary given by the commandline arguments
+PRINT_SUMMARY_PARAMS = (
+    "output_format",
+    "emit_partial",
+    "bad_usage",
+    "tolerated_usage",
+    "show_list"
+)
+
+
 class HTCAnalyzeTerminationEvent(Exception):
     """
     Exception called with a message and an exit code
@@ -61,13 +72,23 @@ def check_for_redirection() -> (bool, bool, list):
     return redirecting_stdout, reading_stdin, stdin_input
 
 
-def version():
-    """Get version from setup.py."""
-    output = subprocess.check_output(
-        "pip show htcanalyze | grep Version",
-        shell=True
-    )
-    return output.decode('utf-8').split()[-1]
+def version() -> str:
+    """Get the version from the metadata of the installed package."""
+    try:
+        from importlib.metadata import PackageNotFoundError
+        from importlib.metadata import version as package_version
+    except ImportError:  # pragma: no cover
+        # Python < 3.8
+        from pkg_resources import DistributionNotFound as PackageNotFoundError
+        from pkg_resources import get_distribution
+
+        def package_version(name):
+            return get_distribution(name).version
+
+    try:
+        return package_version(get_package_name())
+    except PackageNotFoundError:
+        return "unknown (not installed)"
 
 
 def print_results(
@@ -80,6 +101,12 @@ def print_results(
         ext_err: str = EXT_ERR_DEFAULT,
         bad_usage: float = BAD_USAGE,
         tolerated_usage: float = TOLERATED_USAGE,
+        jobs: int = JOBS_DEFAULT,
+        no_cache: bool = False,
+        rebuild_cache: bool = False,
+        output_format: str = OUTPUT_FORMAT_DEFAULT,
+        event_log: bool = False,
+        emit_partial: str = None,
         console=None,
         **__
 ) -> None:
@@ -91,7 +118,8 @@ def print_results(
     :param analyze: bool, default: False
         whether to analyze the files
     :param rdns_lookup: bool
-        reverse dns lookup of ip-addresses
+        reverse dns lookup of ip-addresses,
+        the host names are cached unless no_cache is set
     :param show_legend: bool
         Show legend of RAM histogram if analyzed and possible
     :param show_list: list
@@ -106,36 +134,168 @@ def print_results(
     :param tolerated_usage: float
         Threshold to signalize a tolerated but unpleasant percentage
         the usage is away from the requested resources (usually yellow colored)
+    :param jobs: int
+        Number of worker processes to analyze the files,
+        0 uses all available cpus
+    :param no_cache: bool
+        Do not use the analysis cache
+    :param rebuild_cache: bool
+        Drop all entries of the analysis cache before analyzing
+    :param output_format: str
+        rich prints tables, jsonl and csv stream records to stdout
+    :param event_log: bool
+        the log files are the rotated files of a global event log,
+        read one after the other without the cache
+    :param emit_partial: str
+        summarize and write the partial summary to this file,
+        instead of printing it, see merge_partials
     :param console: Console
     :param __: ignore unknown params
 
     :return: None
     """
+    from rich.console import Console
+    from .log_analyzer.htcanalyzer import EventLogAnalyzer, HTCAnalyzer
+    from .log_analyzer.event_handler.event_handler import SUMMARY_EVENT_TYPES
+    from .log_analyzer.analysis_cache import AnalysisCache
+    from .log_analyzer.rdns_cache import RDNSCache
+    from .log_summarizer.htcsummarizer import HTCSummarizer
+    from .view.view import iter_progress
+
     if console is None:
         console = Console()
     if show_list is None:
         show_list = []
-    # analyze files if only one file was given
-    if len(log_files) == 1:
-        analyze = True
-
-    htc_analyze = HTCAnalyzer(
-        console=console,
-        rdns_lookup=rdns_lookup
-    )
-    condor_logs = htc_analyze.analyze(log_files)
+    rdns_cache = None
+    if rdns_lookup and not no_cache:
+        rdns_cache = RDNSCache(rebuild=rebuild_cache)
+    if event_log:
+        cache = None
+        # the number of jobs is not known before reading
+        n_items = None
+        condor_logs = EventLogAnalyzer(
+            console=console,
+            rdns_lookup=rdns_lookup,
+            event_types=None if analyze else SUMMARY_EVENT_TYPES,
+            rdns_cache=rdns_cache
+        ).analyze(log_files)
+        partials = None
+    else:
+        # analyze files if only one file was given
+        if len(log_files) == 1 and emit_partial is None:
+            analyze = True
 
+        cache = None if no_cache else AnalysisCache(rebuild=rebuild_cache)
+        htc_analyze = HTCAnalyzer(
+            console=console,
+            rdns_lookup=rdns_lookup,
+            workers=jobs,
+            cache=cache,
+            # summaries skip the events they don't use, the cache
+            # keeps their CondorLogs apart from the complete ones
+            event_types=None if analyze else SUMMARY_EVENT_TYPES,
+            rdns_cache=rdns_cache
+        )
+        n_items = len(log_files)
+        if not analyze and htc_analyze.workers > 1:
+            # the workers send back partial summaries, not the condor logs
+            condor_logs = None
+            partials = htc_analyze.summarize(log_files)
+        else:
+            # the summary does not depend on the order of the files
+            condor_logs = htc_analyze.analyze(log_files, ordered=analyze)
+            partials = None
+
+    show_progress = output_format == OUTPUT_FORMAT_DEFAULT
     if analyze:
-        view = AnalyzedLogfileView(
+        print_condor_logs(
+            condor_logs,
+            n_items,
+            output_format=output_format,
             console=console,
             ext_out=ext_out,
-            ext_err=ext_err
+            ext_err=ext_err,
+            bad_usage=bad_usage,
+            tolerated_usage=tolerated_usage,
+            show_list=show_list,
+            show_legend=show_legend
         )
-        analyzed_logs = track_progress(
-            condor_logs,
-            len(log_files),
-            tracking_title="Analyzing files ..."
+    elif partials is not None:
+        if show_progress:
+            # the number of chunks is not known here
+            partials = iter_progress(
+                partials,
+                None,
+                tracking_title="Summarizing files ..."
+            )
+        htc_state_summarizer = HTCSummarizer()
+        for partial_summarizer in partials:
+            htc_state_summarizer.merge(partial_summarizer)
+    else:
+        if show_progress:
+            # the condor logs are summarized one by one, without keeping them
+            condor_logs = iter_progress(
+                condor_logs,
+                n_items,
+                tracking_title="Summarizing files ..."
+            )
+        htc_state_summarizer = HTCSummarizer(condor_logs)
+    if not analyze:
+        print_summary(
+            htc_state_summarizer,
+            output_format=output_format,
+            emit_partial=emit_partial,
+            console=console,
+            bad_usage=bad_usage,
+            tolerated_usage=tolerated_usage,
+            show_list=show_list
         )
+
+    if cache is not None:
+        cache.close()
+    if rdns_cache is not None:
+        rdns_cache.close()
+
+
+def print_condor_logs(
+        condor_logs,
+        n_items=None,
+        output_format: str = OUTPUT_FORMAT_DEFAULT,
+        console=None,
+        ext_out: str = EXT_OUT_DEFAULT,
+        ext_err: str = EXT_ERR_DEFAULT,
+        bad_usage: float = BAD_USAGE,
+        tolerated_usage: float = TOLERATED_USAGE,
+        show_list: List = (),
+        show_legend: bool = True
+) -> None:
+    """
+    Print the analyzed condor logs one by one, see print_results.
+
+    :param condor_logs: iterable of CondorLogs
+    :param n_items: number of log files, if known
+    :return: None
+    """
+    from .view.analyzed_logfile_view import AnalyzedLogfileView
+    from .view.record_writer import get_record_writer
+    from .view.view import track_progress
+
+    if output_format != OUTPUT_FORMAT_DEFAULT:
+        # records are written one by one, bypassing rich
+        with get_profiler().stage("rendering", items=n_items or 0):
+            get_record_writer(output_format).write_all(condor_logs)
+        return
+    view = AnalyzedLogfileView(
+        console=console,
+        ext_out=ext_out,
+        ext_err=ext_err
+    )
+    analyzed_logs = track_progress(
+        condor_logs,
+        n_items,
+        tracking_title="Analyzing files ..."
+    )
+    with get_profiler().stage("rendering", items=len(analyzed_logs)):
         view.print_condor_logs(
             analyzed_logs,
             bad_usage=bad_usage,
@@ -144,23 +304,241 @@ def print_results(
             show_out="htc-out" in show_list,
             show_legend=show_legend
         )
-    # else summarize
-    else:
-        view = SummarizedLogfileView(console=console)
-        analyzed_logs = track_progress(
-            condor_logs,
-            len(log_files),
-            tracking_title="Summarizing files ..."
+
+
+def print_summary(
+        htc_state_summarizer: "HTCSummarizer",
+        output_format: str = OUTPUT_FORMAT_DEFAULT,
+        emit_partial: str = None,
+        console=None,
+        bad_usage: float = BAD_USAGE,
+        tolerated_usage: float = TOLERATED_USAGE,
+        show_list: List = ()
+) -> None:
+    """
+    Print the summary or write it as a partial summary.
+
+    :param htc_state_summarizer: HTCSummarizer
+    :param output_format: str
+        rich prints tables, jsonl and csv stream records to stdout
+    :param emit_partial: str
+        write the partial summary to this file instead of printing it
+    :return: None
+    """
+    from .view.record_writer import get_record_writer
+    from .view.summarized_logfile_view import SummarizedLogfileView
+
+    if emit_partial is not None:
+        htc_state_summarizer.write_partial(emit_partial)
+        console.print(
+            f"[green]Partial summary written to {emit_partial}[/green]"
         )
-        htc_state_summarizer = HTCSummarizer(analyzed_logs)
-        summarized_condor_logs = htc_state_summarizer.summarize()
+        return
+    summarized_condor_logs = htc_state_summarizer.summarize()
+    with get_profiler().stage(
+            "rendering",
+            items=len(summarized_condor_logs)
+    ):
+        if output_format != OUTPUT_FORMAT_DEFAULT:
+            # records are written one by one, bypassing rich
+            get_record_writer(output_format).write_all(summarized_condor_logs)
+            return
+        view = SummarizedLogfileView(console=console)
         view.print_summarized_condor_logs(
             summarized_condor_logs,
             bad_usage=bad_usage,
             tolerated_usage=tolerated_usage,
+            show_histograms="histograms" in show_list
         )
 
 
+def merge_partials(
+        partial_files: List[str],
+        rdns_lookup: bool = False,
+        no_cache: bool = False,
+        rebuild_cache: bool = False,
+        console=None,
+        **kwargs
+) -> None:
+    """
+    Merge partial summaries written with --emit-partial
+    and print the summary, or write it as a partial summary again.
+
+    :param partial_files: List[str]
+        paths of partial summaries
+    :param rdns_lookup: bool
+        reverse dns lookup of the node addresses
+    :param no_cache: bool
+        Do not use the cache of the reverse dns lookups
+    :param rebuild_cache: bool
+        Drop all entries of the cache before
+    :param console: Console
+    :param kwargs: print options, see print_summary
+    :return: None
+    """
+    from .log_analyzer.rdns_cache import RDNSCache
+    from .log_analyzer.rdns_resolver import RDNSResolver
+    from .log_summarizer.htcsummarizer import HTCSummarizer
+
+    htc_state_summarizer = HTCSummarizer()
+    n_merged = 0
+    for file in partial_files:
+        try:
+            htc_state_summarizer.merge(HTCSummarizer.read_partial(file))
+            n_merged += 1
+        except (OSError, ValueError) as err:
+            logging.debug(err)
+            console.print(f"[red]{err}[/red]")
+    if not n_merged:
+        raise HTCAnalyzeTerminationEvent(
+            "No valid partial summaries found",
+            NO_VALID_FILES
+        )
+    console.print(f"[green]{n_merged} partial summaries merged[/green]\n")
+
+    if rdns_lookup:
+        rdns_cache = None if no_cache else RDNSCache(rebuild=rebuild_cache)
+        htc_state_summarizer.resolve_nodes(RDNSResolver(rdns_cache).resolve)
+        if rdns_cache is not None:
+            rdns_cache.close()
+    print_summary(
+        htc_state_summarizer,
+        console=console,
+        **{
+            key: value for key, value in kwargs.items()
+            if key in PRINT_SUMMARY_PARAMS
+        }
+    )
+
+
+def follow_logs(
+        log_files: List[str],
+        console=None
+) -> None:
+    """
+    Follow the log files and show a live summary until interrupted.
+
+    :param log_files: List[str]
+        valid log file paths
+    :param console: Console
+    :return: None
+    """
+    from .log_analyzer.file_watcher import get_file_watcher
+    from .log_analyzer.log_follower import LogFollower
+    from .view.follow_view import FollowView
+
+    log_follower = LogFollower(log_files)
+    FollowView(console=console).follow(
+        log_follower,
+        get_file_watcher(log_files)
+    )
+
+
+def validate_files(params, console=None) -> List[str]:
+    """
+    Validate the given paths, see LogValidator.common_validation.
+
+    :param params: parsed commandline arguments
+    :param console: Console
+    :return: valid log file paths
+    """
+    from .log_analyzer.logvalidator import LogValidator
+    from .log_analyzer.validation_cache import ValidationCache
+
+    validation_cache = None if params.no_cache else ValidationCache(
+        rebuild=params.rebuild_cache
+    )
+    validator = LogValidator(
+        ext_log=params.ext_log,
+        ext_out=params.ext_out,
+        ext_err=params.ext_err,
+        cache=validation_cache
+    )
+    valid_files_generator = validator.common_validation(
+        params.paths,
+        console=console,
+        recursive=params.recursive
+    )
+    with console.status("[bold green]Validating files ..."):
+        with get_profiler().stage("validation"):
+            valid_files = list(valid_files_generator)
+    get_profiler().count("validation", items=len(valid_files))
+    if validation_cache is not None:
+        validation_cache.close()
+    return valid_files
+
+
+def get_event_logs(paths: List[str], console=None) -> List[str]:
+    """
+    Returns the rotated files of the global event logs, oldest first.
+
+    :param paths: paths of the current event logs
+    :param console: Console
+    :return: event log files in the order they are read
+    """
+    from .log_analyzer.log_source import rotated_event_logs
+
+    event_logs = []
+    for path in paths:
+        files = rotated_event_logs(path)
+        if not files:
+            console.print(
+                f"[red]The given path: {path} does not exist[/red]"
+            )
+        event_logs.extend(files)
+    return event_logs
+
+
+@contextmanager
+def profile_run(
+        profile: bool = False,
+        profile_pstats: str = None,
+        profile_trace: str = None,
+        **__
+):
+    """
+    Profile the run and print the stages to stderr, see --profile.
+
+    :param profile: bool
+        print the wall time, CPU time and throughput of each stage
+    :param profile_pstats: str
+        profile with cProfile and dump the statistics to this file
+    :param profile_trace: str
+        write the stages as Chrome trace-event JSON to this file
+    :return: context manager
+    """
+    if not (profile or profile_pstats or profile_trace):
+        yield
+        return
+
+    import cProfile
+    from rich.console import Console
+    from .profiler import Profiler, profiling
+    from .view.profile_view import ProfileView
+
+    profiler = Profiler(trace=profile_trace is not None)
+    python_profiler = cProfile.Profile() if profile_pstats else None
+    try:
+        with profiling(profiler):
+            if python_profiler is not None:
+                python_profiler.enable()
+            try:
+                yield
+            finally:
+                if python_profiler is not None:
+                    python_profiler.disable()
+    finally:
+        # the report must not end up in redirected output
+        console = Console(stderr=True)
+        ProfileView(console=console).print_profile(profiler)
+        if profile_trace is not None:
+            profiler.write_trace(profile_trace)
+            console.print(f"Trace written to {profile_trace}")
+        if python_profiler is not None:
+            python_profiler.dump_stats(profile_pstats)
+            console.print(f"Profiling statistics written to {profile_pstats}")
+
+
 def run(commandline_args, console=None) -> None:
     """
     Run this script.
@@ -169,8 +547,6 @@ def run(commandline_args, console=None) -> None:
     :param console: Console
     :return: None
     """
-    if console is None:
-        console = Console()
     if not isinstance(commandline_args, list):
         commandline_args = commandline_args.split()
 
@@ -187,51 +563,71 @@ def run(commandline_args, console=None) -> None:
         setup_logging_tool(params.verbose)
 
         if params.version:
-            console.print(f"Version: {version()}")
+            # without rich, nothing else has to be imported
+            print(f"Version: {version()}")
             raise HTCAnalyzeTerminationEvent(
                 "Get current version",
                 NORMAL_EXECUTION
             )
 
+        from rich.console import Console
+        if params.output_format != OUTPUT_FORMAT_DEFAULT:
+            # keep stdout clean for the records
+            console = Console(stderr=True)
+        elif console is None:
+            console = Console()
+
         if reading_stdin:
             logging.debug("Reading from stdin")
         if redirecting_stdout:
             logging.debug("Output is getting redirected")
 
-        validator = LogValidator(
-            ext_log=params.ext_log,
-            ext_out=params.ext_out,
-            ext_err=params.ext_err
-        )
-        valid_files_generator = validator.common_validation(
-            params.paths,
-            console=console,
-            recursive=params.recursive
-        )
-        with console.status("[bold green]Validating files ..."):
-            valid_files = list(valid_files_generator)
-
-        console.print(
-            f"[green]{len(valid_files)} valid log file(s)[/green]\n"
-        )
+        if params.emit_partial is not None and (
+                params.analyze or params.follow
+        ):
+            parser.error(
+                "--emit-partial writes a summary, "
+                "it can't be used with --analyze or --follow"
+            )
 
-        if not valid_files:
-            raise HTCAnalyzeTerminationEvent(
-                "No valid HTCondor log files found",
-                NO_VALID_FILES
+        with profile_run(**vars(params)):
+            if params.merge:
+                merge_partials(
+                    params.paths,
+                    console=console,
+                    **vars(params)
+                )
+                sys.exit(NORMAL_EXECUTION)
+
+            if params.event_log:
+                valid_files = get_event_logs(params.paths, console=console)
+            else:
+                valid_files = validate_files(params, console=console)
+
+            console.print(
+                f"[green]{len(valid_files)} valid log file(s)[/green]\n"
             )
 
-        print_results(
-            log_files=valid_files,
-            show_legend=False,
-            console=console,
-            **vars(params)
-        )
+            if not valid_files:
+                raise HTCAnalyzeTerminationEvent(
+                    "No valid HTCondor log files found",
+                    NO_VALID_FILES
+                )
+
+            if params.follow:
+                follow_logs(valid_files, console=console)
+            else:
+                print_results(
+                    log_files=valid_files,
+                    show_legend=False,
+                    console=console,
+                    **vars(params)
+                )
 
-        sys.exit(NORMAL_EXECUTION)
+            sys.exit(NORMAL_EXECUTION)
 
     except TypeError as err:
-        console.print(traceback.print_exc())
+        traceback.print_exc()
         raise HTCAnalyzeTerminationEvent(err, TYPE_ERROR) from TypeError
 
     except KeyboardInterrupt:
@@ -243,15 +639,15 @@ def run(commandline_args, console=None) -> None:
 
 def main():
     """Main function (entry point)."""
-    console = Console()
     start = date_time.now()
     exit_code = NORMAL_EXECUTION
     try:
-        run(sys.argv[1:], console=console)
+        run(sys.argv[1:])
     except HTCAnalyzeTerminationEvent as err:
         if not err.exit_code == NORMAL_EXECUTION:
+            from rich.console import Console
             logging.debug(err.message)
-            console.print(f"[red]{err.message}[/red]")
+            Console().print(f"[red]{err.message}[/red]")
         exit_code = err.exit_code
 
     end = date_time.now()
@@ -260,5 +656,5 @@ def main():
     sys.exit(exit_code)
 
 
-if __name__ == "main":
+if __name__ == "__main__":
     main()
@@ -0,0 +1,335 @@
+"""
+Per-stage timing of a run, see --profile.
+
+The stages of the analysis record their wall time, CPU time and the
+number of items they processed in the active Profiler:
+
+    with profiling(Profiler()) as profiler:
+        ...
+    profiler.stages["event reading"].items
+
+Without an active profiler, get_profiler returns a profiler that
+records nothing, the stages cost a function call.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .globals import PROFILE_MAX_TRACE_EVENTS
+
+# stages in the order they are reported, with the unit of their items
+STAGE_UNITS = {
+    "validation": "files",
+    "analysis": "files",
+    "event reading": "events",
+    "event dispatch": "events",
+    "rdns": "addresses",
+    "summarization": "jobs",
+    "rendering": "items"
+}
+
+
+class StageStats:
+    """
+    Accumulated times and counts of a stage.
+
+    The self times exclude the time spent in stages nested inside
+    this stage, e.g. the event reading inside the event dispatch.
+
+    :param name: name of the stage
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.unit = STAGE_UNITS.get(name, "items")
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+        self.items = 0
+        self.n_bytes = 0
+
+    @property
+    def self_wall(self) -> float:
+        """Returns the wall time without nested stages in seconds."""
+        return self.wall - self.child_wall
+
+    @property
+    def self_cpu(self) -> float:
+        """Returns the CPU time without nested stages in seconds."""
+        return self.cpu - self.child_cpu
+
+    def merge(self, other: "StageStats"):
+        """Add the times and counts of other, e.g. of a worker."""
+        self.calls += other.calls
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.child_wall += other.child_wall
+        self.child_cpu += other.child_cpu
+        self.items += other.items
+        self.n_bytes += other.n_bytes
+
+
+class _Frame:
+    """A running stage, collects the times of its nested stages."""
+
+    __slots__ = (
+        "stats", "trace", "start_wall", "start_cpu", "child_wall", "child_cpu"
+    )
+
+    def __init__(self, stats: StageStats, trace: bool):
+        self.stats = stats
+        self.trace = trace
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+
+
+class _Stage:
+    """Context manager of Profiler.stage."""
+
+    __slots__ = ("profiler", "name", "items", "n_bytes", "trace")
+
+    def __init__(self, profiler: "Profiler", name, items, n_bytes, trace):
+        self.profiler = profiler
+        self.name = name
+        self.items = items
+        self.n_bytes = n_bytes
+        self.trace = trace
+
+    def __enter__(self):
+        self.profiler.enter(self.name, self.trace)
+        return self
+
+    def __exit__(self, *_):
+        self.profiler.exit(self.items, self.n_bytes)
+
+
+class Profiler:
+    """
+    Records the wall time, CPU time and item counts per stage.
+
+    Stages nest, a stage has to be exited before the stage it was
+    entered in. The CPU time is the time of the whole process,
+    including the threads of the rDNS lookups and the validation.
+    The stages of worker processes are merged into the profiler
+    of the main process, their times add up to worker seconds.
+
+    :param trace: keep the spans of the stages for a trace-event file,
+        at most PROFILE_MAX_TRACE_EVENTS spans
+    """
+
+    def __init__(self, trace: bool = False):
+        self.stages: Dict[str, StageStats] = {}
+        self.trace_events: Optional[List[dict]] = [] if trace else None
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self._stack: List[_Frame] = []
+
+    def _get_stats(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        return stats
+
+    def enter(self, name: str, trace: bool = True):
+        """
+        Enter a stage, see stage.
+
+        :param name: name of the stage
+        :param trace: keep the span for the trace-event file
+        """
+        self._stack.append(_Frame(self._get_stats(name), trace))
+
+    def exit(self, items: int = 0, n_bytes: int = 0):
+        """Exit the stage entered last and count its items and bytes."""
+        end_wall = time.perf_counter()
+        end_cpu = time.process_time()
+        frame = self._stack.pop()
+        wall = end_wall - frame.start_wall
+        cpu = end_cpu - frame.start_cpu
+        stats = frame.stats
+        stats.calls += 1
+        stats.wall += wall
+        stats.cpu += cpu
+        stats.child_wall += frame.child_wall
+        stats.child_cpu += frame.child_cpu
+        stats.items += items
+        stats.n_bytes += n_bytes
+        if self._stack:
+            self._stack[-1].child_wall += wall
+            self._stack[-1].child_cpu += cpu
+        if (
+                frame.trace
+                and self.trace_events is not None
+                and len(self.trace_events) < PROFILE_MAX_TRACE_EVENTS
+        ):
+            self.trace_events.append({
+                "name": stats.name,
+                "cat": "htcanalyze",
+                "ph": "X",
+                "ts": frame.start_wall * 1e6,
+                "dur": wall * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident()
+            })
+
+    def stage(
+            self,
+            name: str,
+            items: int = 0,
+            n_bytes: int = 0,
+            trace: bool = True
+    ) -> _Stage:
+        """
+        Time a stage, use as context manager.
+
+        :param name: name of the stage, see STAGE_UNITS
+        :param items: items processed, if known beforehand, see count
+        :param n_bytes: bytes processed, if known beforehand
+        :param trace: keep the span for the trace-event file,
+            e.g. not for a stage per event
+        """
+        return _Stage(self, name, items, n_bytes, trace)
+
+    def count(self, name: str, items: int = 0, n_bytes: int = 0):
+        """Count items and bytes of a stage, without timing it."""
+        stats = self._get_stats(name)
+        stats.items += items
+        stats.n_bytes += n_bytes
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """
+        Time the iteration over iterable as a stage, counts the items.
+
+        Each item is a call of the stage, the spans are not traced.
+        """
+        iterator = iter(iterable)
+        while True:
+            self.enter(name, trace=False)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.exit()
+                return
+            except BaseException:
+                self.exit()
+                raise
+            self.exit(1)
+            yield item
+
+    def merge(self, other: "Profiler"):
+        """Merge the stages of other, e.g. of a worker process."""
+        for name, stats in other.stages.items():
+            self._get_stats(name).merge(stats)
+        if self.trace_events is not None and other.trace_events:
+            self.trace_events.extend(
+                other.trace_events[
+                    :PROFILE_MAX_TRACE_EVENTS - len(self.trace_events)
+                ]
+            )
+
+    @property
+    def wall(self) -> float:
+        """Returns the wall time since the profiler was created."""
+        return time.perf_counter() - self.start_wall
+
+    @property
+    def cpu(self) -> float:
+        """Returns the CPU time since the profiler was created."""
+        return time.process_time() - self.start_cpu
+
+    def ordered_stages(self) -> List[StageStats]:
+        """Returns the stages in the order of STAGE_UNITS, others last."""
+        order = list(STAGE_UNITS)
+        return sorted(
+            self.stages.values(),
+            key=lambda stats: (
+                order.index(stats.name) if stats.name in order
+                else len(order)
+            )
+        )
+
+    def write_trace(self, file: str):
+        """
+        Write the stage spans as Chrome trace-event JSON,
+        e.g. for chrome://tracing or https://ui.perfetto.dev
+
+        :param file: path of the trace file
+        """
+        with open(file, "w") as trace_file:
+            json.dump(
+                {
+                    "traceEvents": self.trace_events or [],
+                    "displayTimeUnit": "ms"
+                },
+                trace_file
+            )
+
+
+class _NullStage:
+    """Context manager that does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return None
+
+
+class NullProfiler:
+    """Profiler that records nothing, used if profiling is disabled."""
+
+    _stage = _NullStage()
+
+    def stage(self, *_, **__) -> _NullStage:
+        """Does not time the stage."""
+        return self._stage
+
+    def count(self, *_, **__):
+        """Does not count."""
+
+    @staticmethod
+    def iterate(_, iterable: Iterable) -> Iterable:
+        """Returns iterable itself."""
+        return iterable
+
+
+NULL_PROFILER = NullProfiler()
+_active_profiler: Optional[Profiler] = None
+
+
+def get_profiler():
+    """Returns the active Profiler, else the NULL_PROFILER."""
+    if _active_profiler is None:
+        return NULL_PROFILER
+    return _active_profiler
+
+
+def is_profiling() -> bool:
+    """Whether a Profiler is active."""
+    return _active_profiler is not None
+
+
+@contextmanager
+def profiling(profiler: Optional[Profiler]) -> Iterator[Optional[Profiler]]:
+    """
+    Activate the profiler in this process, use as context manager.
+
+    :param profiler: Profiler, None deactivates profiling
+    :return: the profiler
+    """
+    global _active_profiler  # pylint: disable=global-statement
+    previous = _active_profiler
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous
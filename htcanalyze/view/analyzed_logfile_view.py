@@ -99,9 +99,43 @@ class AnalyzedLogfileView(View):
             term_str,
             str(time_manager.total_runtime)
         )
+        if time_manager.badput:
+            time_table.add_row("Goodput", "", str(time_manager.goodput))
+            time_table.add_row("Badput", "", str(time_manager.badput))
 
         self.console.print(time_table)
 
+    def print_execution_attempts(self, execution_attempts):
+        """Prints the execution attempts, if the job ran more than once."""
+        if len(execution_attempts) < 2:
+            return
+
+        attempt_table = self.create_table(
+            ["Host Address", "Start", "End", "Wall Time", "Outcome"],
+            title="Execution Attempts"
+        )
+        for attempt in execution_attempts:
+            if attempt.end_state is not None:
+                color = "green" if attempt.is_goodput else "red"
+                outcome = f"[{color}]{attempt.end_state.name}[/{color}]"
+                if attempt.checkpointed:
+                    outcome += " (checkpointed)"
+            elif attempt.is_finished:
+                outcome = "[red]UNKNOWN[/red]"
+            else:
+                outcome = "[blue]RUNNING[/blue]"
+            attempt_table.add_row(
+                str(attempt.host_address),
+                attempt.start_date.strftime(STRF_FORMAT)
+                if attempt.start_date else str(None),
+                attempt.end_date.strftime(STRF_FORMAT)
+                if attempt.end_date else str(None),
+                str(attempt.wall_time) if attempt.is_finished else "",
+                outcome
+            )
+
+        self.console.print(attempt_table)
+
     def print_ram_history(self, ram_history, show_legend=True):
         """Prints ram histogram."""
         if not ram_history.image_size_events:
@@ -206,14 +240,21 @@ class AnalyzedLogfileView(View):
         :param show_legend: show legend of ram histogram
         :return:
         """
+        file_name = os.path.basename(condor_log.file)
+        if condor_log.job_id is not None:
+            file_name = f"{file_name} (job {condor_log.job_id})"
         self.print_desc_line(
             "Job Analysis of:",
-            os.path.basename(condor_log.file),
+            file_name,
             color="cyan"
         )
 
         self.print_job_details(condor_log.job_details)
 
+        self.print_execution_attempts(
+            condor_log.job_details.execution_attempts
+        )
+
         self.print_analyzed_resources(
             condor_log.job_details.resources,
             bad_usage=bad_usage,
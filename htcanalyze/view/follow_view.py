@@ -0,0 +1,113 @@
+"""Module to create a live view of followed log files."""
+import time
+from datetime import datetime as date_time
+
+from rich.console import Group
+from rich.live import Live
+from rich.table import Table
+
+from htcanalyze.globals import FOLLOW_REFRESH_INTERVAL
+from .view import View
+from ..log_analyzer.file_watcher import FileWatcher
+from ..log_analyzer.log_follower import LogFollower
+from ..log_analyzer.event_handler.states import (
+    NormalTerminationState,
+    AbnormalTerminationState,
+    WaitingState,
+    RunningState,
+    AbortedState,
+    ErrorWhileReadingState
+)
+
+STATE_COLORS = {
+    state.name: state.color
+    for state in [
+        WaitingState(),
+        RunningState(),
+        NormalTerminationState(),
+        AbnormalTerminationState(),
+        AbortedState(),
+        ErrorWhileReadingState()
+    ]
+}
+
+
+class FollowView(View):
+    """Live summary of followed log files, redrawn at a fixed rate."""
+
+    def create_summary(self, log_follower: LogFollower) -> Group:
+        """
+        Create the summary of the followed log files.
+
+        :param log_follower: LogFollower
+        :return: renderable group of tables
+        """
+        jobs_table = self.create_table(
+            ["State", "No. of Jobs"],
+            title="Number of Jobs per State"
+        )
+        for state, n_jobs in log_follower.state_counts.most_common():
+            if n_jobs <= 0:
+                continue
+            color = STATE_COLORS.get(state, "default")
+            jobs_table.add_row(f"[{color}]{state}[/{color}]", str(n_jobs))
+
+        info_table = Table.grid(padding=(0, 2))
+        info_table.add_column(style="bold")
+        info_table.add_column()
+        info_table.add_row("Held jobs", str(log_follower.n_held))
+        info_table.add_row("Evictions", str(log_follower.n_evictions))
+        info_table.add_row("Followed files", str(len(log_follower.logs)))
+        if log_follower.n_errors:
+            info_table.add_row(
+                "[red]Unreadable files[/red]",
+                str(log_follower.n_errors)
+            )
+        info_table.add_row("Events", str(log_follower.n_events))
+        info_table.add_row(
+            "Last update",
+            date_time.now().strftime("%H:%M:%S")
+        )
+        return Group(jobs_table, info_table)
+
+    def follow(
+            self,
+            log_follower: LogFollower,
+            file_watcher: FileWatcher,
+            refresh_interval: float = FOLLOW_REFRESH_INTERVAL
+    ):
+        """
+        Read new events whenever the files change and redraw the summary
+        every refresh_interval seconds, until interrupted by the user.
+
+        :param log_follower: LogFollower
+        :param file_watcher: FileWatcher of the followed files
+        :param refresh_interval: seconds between two redraws
+        :return:
+        """
+        log_follower.update()
+        with Live(
+                self.create_summary(log_follower),
+                console=self.console,
+                auto_refresh=False
+        ) as live:
+            next_refresh = time.monotonic() + refresh_interval
+            try:
+                while True:
+                    # new events are read as soon as they are written,
+                    # but the summary is only redrawn at the refresh rate
+                    changed = file_watcher.wait(
+                        max(next_refresh - time.monotonic(), 0)
+                    )
+                    if changed:
+                        log_follower.update(changed)
+                    if time.monotonic() >= next_refresh:
+                        live.update(
+                            self.create_summary(log_follower),
+                            refresh=True
+                        )
+                        next_refresh = time.monotonic() + refresh_interval
+            except KeyboardInterrupt:
+                pass
+            finally:
+                file_watcher.close()
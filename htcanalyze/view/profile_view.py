@@ -0,0 +1,53 @@
+"""Module to print the per-stage timings of a run, see --profile."""
+from htcanalyze.profiler import Profiler, StageStats
+from .view import View
+
+
+def _rate(amount: float, seconds: float) -> float:
+    return amount / seconds if seconds > 0 else 0.0
+
+
+class ProfileView(View):
+    """Prints the stages recorded by a Profiler as a table."""
+
+    @staticmethod
+    def _stage_row(stats: StageStats) -> list:
+        # the rates refer to the self time of the stage
+        return [
+            stats.name,
+            str(stats.calls),
+            f"{stats.self_wall:.3f}",
+            f"{stats.self_cpu:.3f}",
+            f"{stats.items} {stats.unit}" if stats.items else "",
+            f"{_rate(stats.items, stats.self_wall):,.0f}/s"
+            if stats.items else "",
+            f"{_rate(stats.n_bytes / 1e6, stats.self_wall):.1f}"
+            if stats.n_bytes else ""
+        ]
+
+    def print_profile(self, profiler: Profiler):
+        """
+        Print the wall time, CPU time and throughput of each stage.
+
+        The times of worker processes add up, the total of the stages
+        can exceed the wall time of the run.
+
+        :param profiler: Profiler of the run
+        """
+        profile_table = self.create_table(
+            [
+                "Stage", "Calls", "Self wall [s]", "Self CPU [s]",
+                "Items", "Items/s", "MB/s"
+            ],
+            title="Profile"
+        )
+        for stats in profiler.ordered_stages():
+            profile_table.add_row(*self._stage_row(stats))
+        profile_table.add_row(
+            "[bold]Run[/bold]",
+            "",
+            f"{profiler.wall:.3f}",
+            f"{profiler.cpu:.3f}",
+            "", "", ""
+        )
+        self.console.print(profile_table)
@@ -0,0 +1,299 @@
+"""
+Module to write condor logs and summaries as machine-readable records.
+
+The writers do not use rich, every record is written as soon as it is
+given, hence the memory does not depend on the number of records.
+"""
+import csv
+import json
+import math
+import sys
+from abc import ABC, abstractmethod
+from datetime import datetime as date_time, timedelta
+from typing import Dict, Iterable, Iterator
+
+import numpy as np
+
+from htcanalyze.globals import QUANTILES
+from ..log_analyzer.condor_log.condor_log import CondorLog
+from ..log_analyzer.event_handler.states import State
+from ..log_summarizer.job_table import (
+    RESOURCE_COLUMNS,
+    TIME_COLUMNS,
+    get_resource_values,
+    to_seconds
+)
+from ..log_summarizer.summarized_condor_logs.summarized_condor_logs import (
+    SummarizedCondorLogs
+)
+from ..log_summarizer.summarizer.distribution_summarizer import (
+    DISTRIBUTION_RESOURCE_COLUMNS
+)
+
+DISTRIBUTION_STATISTICS = (
+    ["min"] +
+    [f"p{round(quantile * 100)}" for quantile in QUANTILES] +
+    ["max", "stddev"]
+)
+
+# columns of the csv format
+CONDOR_LOG_COLUMNS = [
+    "file",
+    "job_id",
+    "state",
+    "submitter_address",
+    "host_address",
+    "submission_date",
+    "execution_date",
+    "termination_date",
+    *TIME_COLUMNS,
+    *RESOURCE_COLUMNS,
+    "ram_peak",
+    "n_error_events",
+    "n_execution_attempts",
+    "goodput",
+    "badput"
+]
+SUMMARY_COLUMNS = [
+    "state",
+    "n_jobs",
+    *(f"avg_{name}" for name in TIME_COLUMNS + RESOURCE_COLUMNS),
+    "n_nodes",
+    "n_error_events",
+    "n_execution_attempts",
+    "n_lost_attempts",
+    "goodput_core_hours",
+    "badput_core_hours",
+    *(
+        f"{name}_{statistic}"
+        for name in TIME_COLUMNS + DISTRIBUTION_RESOURCE_COLUMNS
+        for statistic in DISTRIBUTION_STATISTICS
+    )
+]
+
+
+def to_record(obj):
+    """
+    Convert obj to JSON compatible values.
+
+    Like ReprObject.__repr__, objects are represented by their __dict__.
+    States are represented by their name, dates in ISO format,
+    time deltas in seconds and missing (NaN) values by None.
+
+    :param obj: any object
+    :return: dict, list, str, int, float, bool or None
+    """
+    if obj is None or isinstance(obj, (bool, str, int)):
+        return obj
+    if isinstance(obj, (float, np.floating)):
+        return float(obj) if math.isfinite(obj) else None
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, State):
+        return obj.name
+    if isinstance(obj, date_time):
+        return obj.isoformat()
+    if isinstance(obj, timedelta):
+        return to_seconds(obj)
+    if isinstance(obj, dict):
+        return {str(key): to_record(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, np.ndarray)):
+        return [to_record(value) for value in obj]
+    if getattr(obj, "__dict__", None) is not None:
+        # some __dict__ properties represent their values as strings,
+        # the attributes of the same name hold the actual values
+        return {
+            key: to_record(getattr(obj, key, value))
+            for key, value in vars(obj).items()
+        }
+    return str(obj)
+
+
+def condor_log_row(condor_log: CondorLog) -> Dict:
+    """Returns the flat record of a CondorLog, see CONDOR_LOG_COLUMNS."""
+    job_details = condor_log.job_details
+    time_manager = job_details.time_manager
+    job_times = time_manager.job_times
+    resources = job_details.resources
+    resource_values = (
+        get_resource_values(resources)
+        if resources else [None] * len(RESOURCE_COLUMNS)
+    )
+    image_size_events = condor_log.ram_history.image_size_events
+    row = {
+        "file": condor_log.file,
+        "job_id": condor_log.job_id,
+        "state": job_details.state,
+        "submitter_address": job_details.submitter_address,
+        "host_address": job_details.host_address,
+        "submission_date": time_manager.submission_date,
+        "execution_date": time_manager.execution_date,
+        "termination_date": time_manager.termination_date,
+        **{
+            name: getattr(job_times, name)
+            for name in TIME_COLUMNS
+        },
+        **dict(zip(RESOURCE_COLUMNS, resource_values)),
+        "ram_peak": max(
+            (event.memory_usage for event in image_size_events),
+            default=None
+        ),
+        "n_error_events": len(
+            condor_log.logfile_error_events.error_events
+        ),
+        "n_execution_attempts": len(job_details.execution_attempts),
+        "goodput": time_manager.goodput,
+        "badput": time_manager.badput
+    }
+    return to_record(row)
+
+
+def summary_row(summarized_condor_logs: SummarizedCondorLogs) -> Dict:
+    """Returns the flat record of SummarizedCondorLogs, see SUMMARY_COLUMNS."""
+    row = {
+        "state": summarized_condor_logs.state,
+        "n_jobs": summarized_condor_logs.n_jobs
+    }
+    if summarized_condor_logs.avg_times:
+        for name in TIME_COLUMNS:
+            row[f"avg_{name}"] = getattr(
+                summarized_condor_logs.avg_times, name
+            )
+    if summarized_condor_logs.avg_resources:
+        row.update(zip(
+            (f"avg_{name}" for name in RESOURCE_COLUMNS),
+            get_resource_values(summarized_condor_logs.avg_resources)
+        ))
+    if summarized_condor_logs.summarized_node_jobs is not None:
+        row["n_nodes"] = len(summarized_condor_logs.summarized_node_jobs)
+    if summarized_condor_logs.summarized_error_states is not None:
+        row["n_error_events"] = sum(
+            summarized_error_state.n_error_events
+            for summarized_error_state
+            in summarized_condor_logs.summarized_error_states
+        )
+    summarized_badput = summarized_condor_logs.summarized_badput
+    if summarized_badput is not None:
+        row["n_execution_attempts"] = summarized_badput.n_attempts
+        row["n_lost_attempts"] = summarized_badput.n_lost_attempts
+        row["goodput_core_hours"] = summarized_badput.goodput_core_hours
+        row["badput_core_hours"] = summarized_badput.badput_core_hours
+    for name, distribution in (
+            summarized_condor_logs.distributions or {}
+    ).items():
+        values = (
+            [distribution.min_value] +
+            [distribution.quantile(quantile) for quantile in QUANTILES] +
+            [distribution.max_value, distribution.stddev]
+        )
+        row.update(zip(
+            (
+                f"{name}_{statistic}"
+                for statistic in DISTRIBUTION_STATISTICS
+            ),
+            values
+        ))
+    return to_record(row)
+
+
+def iter_records(objects: Iterable, flat: bool = False) -> Iterator[Dict]:
+    """
+    Generate one record per CondorLog or SummarizedCondorLogs.
+
+    :param objects: CondorLogs or SummarizedCondorLogs
+    :param flat: generate the flat records of the csv format,
+        else the nested records of the jsonl format
+    :return: generator over JSON compatible dicts
+    """
+    for obj in objects:
+        if not flat:
+            yield to_record(obj)
+        elif isinstance(obj, SummarizedCondorLogs):
+            yield summary_row(obj)
+        else:
+            yield condor_log_row(obj)
+
+
+class RecordWriter(ABC):
+    """
+    Writes records to a text file, stdout by default.
+
+    :param file: writable text file
+    """
+
+    def __init__(self, file=None):
+        self.file = sys.stdout if file is None else file
+
+    @abstractmethod
+    def write(self, obj):
+        """Write the record of a CondorLog or SummarizedCondorLogs."""
+
+    def write_all(self, objects: Iterable) -> int:
+        """
+        Write the records of all objects one by one.
+
+        :param objects: CondorLogs or SummarizedCondorLogs
+        :return: number of written records
+        """
+        n_records = 0
+        for obj in objects:
+            self.write(obj)
+            n_records += 1
+        return n_records
+
+
+class JsonLinesWriter(RecordWriter):
+    """Writes one JSON object per line."""
+
+    def write(self, obj):
+        record, = iter_records([obj])
+        self.file.write(json.dumps(record, allow_nan=False) + "\n")
+        self.file.flush()
+
+
+class CsvWriter(RecordWriter):
+    """
+    Writes one flat record per row.
+
+    The header is written with the first record,
+    the columns depend on the type of the first object.
+    """
+
+    def __init__(self, file=None):
+        super().__init__(file)
+        self._writer = None
+
+    def write(self, obj):
+        if self._writer is None:
+            columns = (
+                SUMMARY_COLUMNS
+                if isinstance(obj, SummarizedCondorLogs)
+                else CONDOR_LOG_COLUMNS
+            )
+            self._writer = csv.DictWriter(
+                self.file,
+                fieldnames=columns,
+                restval="",
+                extrasaction="ignore"
+            )
+            self._writer.writeheader()
+        record, = iter_records([obj], flat=True)
+        self._writer.writerow(record)
+        self.file.flush()
+
+
+RECORD_WRITERS = {
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter
+}
+
+
+def get_record_writer(output_format: str, file=None) -> RecordWriter:
+    """
+    Returns the writer of the output format.
+
+    :param output_format: one of RECORD_WRITERS
+    :param file: writable text file, default: stdout
+    :return: RecordWriter
+    """
+    return RECORD_WRITERS[output_format](file)
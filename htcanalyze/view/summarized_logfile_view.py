@@ -1,12 +1,34 @@
 """Module to create a view for summarized log files."""
 from datetime import timedelta
-from typing import List
+from typing import Dict, List
 
-from htcanalyze.globals import BAD_USAGE, TOLERATED_USAGE
+from plotille import hist_aggregated
+
+from htcanalyze.globals import BAD_USAGE, TOLERATED_USAGE, QUANTILES
 from .view import View
 from ..log_summarizer.summarized_condor_logs.summarized_condor_logs import (
     SummarizedCondorLogs
 )
+from ..log_summarizer.summarized_condor_logs.summarized_distribution import (
+    Distribution
+)
+
+# descriptions of the distributions, times are given in seconds
+TIME_DISTRIBUTIONS = {
+    "waiting_time": "Waiting Time",
+    "execution_time": "Execution Time",
+    "total_runtime": "Runtime (Total)"
+}
+RESOURCE_DISTRIBUTIONS = {
+    "cpu_usage": "Cpus Usage",
+    "cpu_requested": "Cpus Request",
+    "disk_usage": "Disk (KB) Usage",
+    "disk_requested": "Disk (KB) Request",
+    "memory_usage": "Memory (MB) Usage",
+    "memory_requested": "Memory (MB) Request",
+    "gpu_usage": "Gpus Usage",
+    "gpu_requested": "Gpus Request"
+}
 
 
 class SummarizedLogfileView(View):
@@ -121,6 +143,83 @@ class SummarizedLogfileView(View):
 
         self.console.print(resource_table)
 
+    def print_distributions(
+            self,
+            distributions: Dict[str, Distribution],
+            show_histograms=False,
+            precision=3
+    ):
+        """
+        Prints a table with min, quantiles, max and standard deviation
+        of the job times and resources.
+        Distributions that are 0 for all jobs are left out.
+
+        :param distributions: distributions by JobTable column name
+        :param show_histograms: print a histogram for each distribution
+        :param precision: precision of the resource values
+        :return:
+        """
+        if not distributions:
+            return
+
+        def format_time(seconds):
+            return str(timedelta(seconds=round(seconds)))
+
+        def format_resource(value):
+            return str(round(value, precision))
+
+        rows = []
+        for descriptions, format_value in (
+                (TIME_DISTRIBUTIONS, format_time),
+                (RESOURCE_DISTRIBUTIONS, format_resource)
+        ):
+            for name, description in descriptions.items():
+                distribution = distributions.get(name)
+                if distribution is None or distribution.max_value == 0:
+                    continue
+                rows.append((description, distribution, format_value))
+
+        if not rows:
+            return
+
+        distribution_table = self.create_table(
+            ["Distribution", "Min"] +
+            [f"p{round(quantile * 100)}" for quantile in QUANTILES] +
+            ["Max", "Std. Dev."],
+            title="Distribution of Job Times and Resources"
+        )
+        for description, distribution, format_value in rows:
+            distribution_table.add_row(
+                description,
+                format_value(distribution.min_value),
+                *(
+                    format_value(distribution.quantile(quantile))
+                    for quantile in QUANTILES
+                ),
+                format_value(distribution.max_value),
+                format_value(distribution.stddev)
+            )
+
+        self.console.print(distribution_table)
+
+        if not show_histograms:
+            return
+
+        for description, distribution, format_value in rows:
+            if distribution.min_value == distribution.max_value:
+                continue
+            unit = " (seconds)" if format_value is format_time else ""
+            self.console.print(f"Histogram of {description}{unit}")
+            self.console.out(
+                hist_aggregated(
+                    distribution.histogram_counts,
+                    distribution.histogram_bins,
+                    width=40
+                ),
+                highlight=False,
+                style=None
+            )
+
     def print_summarized_error_events(
             self,
             summarized_error_states,
@@ -149,21 +248,21 @@ class SummarizedLogfileView(View):
         headers = ["Error Event", "No. of Occurrences"]
         use_file_lim = True
         for ses in summarized_error_states:
-            if len(ses.files) > file_lim:
+            if ses.n_files > file_lim:
                 use_file_lim = False
                 break
 
         if use_file_lim:
             headers.append("Files")
 
-            def file_func(files):
-                return "\n".join(files)
+            def file_func(summarized_error_state):
+                return "\n".join(summarized_error_state.files)
 
         else:
             headers.append("No. of Files")
 
-            def file_func(files):
-                return str(len(files))
+            def file_func(summarized_error_state):
+                return str(summarized_error_state.n_files)
 
         error_table = self.create_table(
             headers,
@@ -173,18 +272,72 @@ class SummarizedLogfileView(View):
             error_table.add_row(
                 summarized_error_state.error_state.name,
                 str(summarized_error_state.n_error_events),
-                file_func(summarized_error_state.files)
+                file_func(summarized_error_state)
             )
 
         self.console.print(error_table)
 
+    def print_summarized_badput(
+            self,
+            summarized_badput,
+            precision=2
+    ):
+        """
+        Prints the goodput and badput in core hours,
+        followed by the wasted core hours per state that ended
+        the lost execution attempts and per node.
+        Nothing is printed if no execution attempt was lost.
+
+        :param summarized_badput: SummarizedBadput
+        :param precision: precision of the core hours
+        :return:
+        """
+        if not summarized_badput or not summarized_badput.states:
+            return
+
+        badput_table = self.create_table(
+            ["Description", "Value"],
+            title="Goodput and Badput"
+        )
+        badput_table.add_row(
+            "Goodput (Core Hours)",
+            str(round(summarized_badput.goodput_core_hours, precision))
+        )
+        badput_table.add_row(
+            "Badput (Core Hours)",
+            f"[red]{round(summarized_badput.badput_core_hours, precision)}"
+            f"[/red]"
+        )
+        badput_table.add_row(
+            "Lost Execution Attempts",
+            f"{summarized_badput.n_lost_attempts} "
+            f"of {summarized_badput.n_attempts}"
+        )
+        self.console.print(badput_table)
+
+        for description, wasted_core_hours in (
+                ("Ended by", summarized_badput.states),
+                ("Node Address", summarized_badput.nodes)
+        ):
+            wasted_table = self.create_table(
+                [description, "Lost Attempts", "Wasted Core Hours"]
+            )
+            for wasted in wasted_core_hours:
+                wasted_table.add_row(
+                    wasted.name,
+                    str(wasted.n_attempts),
+                    str(round(wasted.core_hours, precision))
+                )
+            self.console.print(wasted_table)
+
     def print_summarized_condor_logs(
             self,
             summarized_condor_logs: List[SummarizedCondorLogs],
             sort_states_by_n_jobs=True,
             bad_usage=BAD_USAGE,
             tolerated_usage=TOLERATED_USAGE,
-            sep_char='~'
+            sep_char='~',
+            show_histograms=False
     ):
         """
         Prints summarized log files
@@ -196,6 +349,7 @@ class SummarizedLogfileView(View):
         :param bad_usage:
         :param tolerated_usage
         :param sep_char:
+        :param show_histograms: print histograms of the distributions
         :return:
         """
         if sort_states_by_n_jobs:
@@ -242,6 +396,11 @@ class SummarizedLogfileView(View):
                 ]
             )
 
+            self.print_distributions(
+                state_summarized_logs.distributions,
+                show_histograms=show_histograms
+            )
+
             self.print_summarized_node_jobs(
                 state_summarized_logs.summarized_node_jobs
             )
@@ -250,5 +409,9 @@ class SummarizedLogfileView(View):
                 state_summarized_logs.summarized_error_states
             )
 
+            self.print_summarized_badput(
+                state_summarized_logs.summarized_badput
+            )
+
             self.console.print()
             self.console.print(sep_char * self.window_width)
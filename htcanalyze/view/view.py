@@ -11,19 +11,20 @@ from rich.text import Text
 from rich.progress import Progress
 
 
-def track_progress(
+def iter_progress(
         generator,
         n_items=100,
         tracking_title="...",
 ):
     """
     Visualize the process of generating objects.
-    Takes a generator and generates a finite amount of objects.
+    Yields the objects of the generator one by one,
+    the progress bar is shown until the generator is exhausted.
 
     :param generator: generator or iterrator
     :param n_items: if possible provide the number of objects
     :param tracking_title: Title of the process
-    :return:
+    :return: generator over the objects
     """
     with Progress(
             transient=True,
@@ -32,11 +33,26 @@ def track_progress(
             expand=True
     ) as progress:
         task = progress.add_task(tracking_title, total=n_items)
-        items = []
         for item in generator:
             progress.update(task, advance=1)
-            items.append(item)
-        return items
+            yield item
+
+
+def track_progress(
+        generator,
+        n_items=100,
+        tracking_title="...",
+):
+    """
+    Visualize the process of generating objects.
+    Takes a generator and generates a finite amount of objects.
+
+    :param generator: generator or iterrator
+    :param n_items: if possible provide the number of objects
+    :param tracking_title: Title of the process
+    :return: list of the objects
+    """
+    return list(iter_progress(generator, n_items, tracking_title))
 
 
 class View(ABC):
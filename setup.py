@@ -22,11 +22,15 @@ setup(
     install_requires=[
         "numpy",
         "htcondor>=8.8.6",
-        "plotille>=3.7",
+        "plotille>=4.0",
         "configargparse==1.2.3",
         "rich>=3.0.3",
         "wheel==0.38.1"
     ],
+    extras_require={
+        # read zstandard compressed logs and archives
+        "zstd": ["zstandard"]
+    },
     tests_require=[
         'pytest>=6.0.1'
     ],
@@ -0,0 +1,319 @@
+"""Test the AnalysisCache and its use by the HTCAnalyzer."""
+import os
+import pickle
+import shutil
+import sqlite3
+
+import pytest
+
+from htcanalyze.log_analyzer.analysis_cache import AnalysisCache
+from htcanalyze.log_analyzer.condor_log.ram_history import RamHistory
+from htcanalyze.log_analyzer.event_handler.event_handler import (
+    SUMMARY_EVENT_TYPES
+)
+from htcanalyze.log_analyzer.event_handler.job_events import ImageSizeEvent
+from htcanalyze.log_analyzer.event_handler.states import TerminationState
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache" / "analysis.sqlite"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    file = tmp_path / "normal_log.log"
+    shutil.copy(os.path.join(VALID_LOGS_DIR, "normal_log.log"), file)
+    return str(file)
+
+
+def test_cached_analysis(cache, log_file):
+    htc_analyzer = HTCAnalyzer(cache=cache)
+    condor_logs = htc_analyzer.get_condor_logs(log_file)
+    assert len(cache) == 1
+    assert cache.get(log_file, os.stat(log_file)) is not None
+    # served from the cache, the file is not read
+    assert [repr(log) for log in htc_analyzer.get_condor_logs(log_file)] == [
+        repr(log) for log in condor_logs
+    ]
+
+
+def test_invalidation(cache, log_file):
+    htc_analyzer = HTCAnalyzer(cache=cache)
+    htc_analyzer.get_condor_logs(log_file)
+    with open(log_file, "a") as file:
+        file.write("\n")
+    assert cache.get(log_file, os.stat(log_file)) is None
+    assert len(cache) == 0
+
+    htc_analyzer.get_condor_logs(log_file)
+    # replaced by a new file (new inode)
+    os.replace(
+        shutil.copy(log_file, log_file + ".new"),
+        log_file
+    )
+    assert cache.get(log_file, os.stat(log_file)) is None
+
+
+def test_summary_entries_are_kept_apart(cache, log_file):
+    file_stat = os.stat(log_file)
+    summary_logs = HTCAnalyzer(
+        cache=cache,
+        event_types=SUMMARY_EVENT_TYPES
+    ).get_condor_logs(log_file)
+    # the image size events are skipped
+    assert not summary_logs[0].ram_history.image_size_events
+    assert cache.get(log_file, file_stat, SUMMARY_EVENT_TYPES) is not None
+    assert cache.get(log_file, file_stat) is None
+
+    condor_logs = HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    assert condor_logs[0].ram_history.image_size_events
+    assert len(cache) == 2
+
+
+def test_complete_entries_serve_summaries(cache, log_file):
+    condor_logs = HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    assert [
+        repr(log) for log in HTCAnalyzer(
+            cache=cache,
+            event_types=SUMMARY_EVENT_TYPES
+        ).get_condor_logs(log_file)
+    ] == [repr(log) for log in condor_logs]
+    assert len(cache) == 1
+
+
+def test_only_terminated_jobs_are_cached(cache):
+    htc_analyzer = HTCAnalyzer(cache=cache)
+    for name in ["running_process.log", "just_submission.log"]:
+        htc_analyzer.get_condor_logs(os.path.join(VALID_LOGS_DIR, name))
+    assert len(cache) == 0
+    htc_analyzer.get_condor_logs(
+        os.path.join(VALID_LOGS_DIR, "aborted_with_errors.log")
+    )
+    assert len(cache) == 1
+
+
+def test_cache_directory_not_creatable(tmp_path, log_file):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    cache = AnalysisCache(str(not_a_directory / "cache" / "analysis.sqlite"))
+    htc_analyzer = HTCAnalyzer(cache=cache)
+    # the log files are analyzed without the cache
+    assert [repr(log) for log in htc_analyzer.get_condor_logs(log_file)] == [
+        repr(log) for log in htc_analyzer.read_condor_logs(log_file)
+    ]
+    cache.close()
+
+
+def test_lru_eviction(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "analysis.sqlite"))
+    htc_analyzer = HTCAnalyzer(cache=cache)
+    files = []
+    for i in range(3):
+        file = str(tmp_path / f"job_{i}.log")
+        shutil.copy(os.path.join(VALID_LOGS_DIR, "normal_log.log"), file)
+        files.append(file)
+        htc_analyzer.get_condor_logs(file)
+    entry_size = cache.size // 3
+
+    # job_0 was used most recently, job_1 is the least recently used
+    cache.get(files[0], os.stat(files[0]))
+    cache.max_size = 2 * entry_size
+    file = str(tmp_path / "job_3.log")
+    shutil.copy(os.path.join(VALID_LOGS_DIR, "normal_log.log"), file)
+    htc_analyzer.get_condor_logs(file)
+
+    assert len(cache) == 2
+    assert cache.get(files[0], os.stat(files[0])) is not None
+    assert cache.get(files[1], os.stat(files[1])) is None
+    assert cache.get(files[2], os.stat(files[2])) is None
+    cache.close()
+
+
+def test_size_is_summed_up_once(cache, tmp_path):
+    statements = []
+    cache.connection.set_trace_callback(statements.append)
+    htc_analyzer = HTCAnalyzer(cache=cache)
+    for i in range(10):
+        file = str(tmp_path / f"job_{i}.log")
+        shutil.copy(os.path.join(VALID_LOGS_DIR, "normal_log.log"), file)
+        htc_analyzer.get_condor_logs(file)
+    assert len(cache) == 10
+    assert len([
+        statement for statement in statements if "SUM(" in statement
+    ]) == 1
+
+
+def test_entries_are_written_at_once(cache, tmp_path):
+    statements = []
+    cache.connection.set_trace_callback(statements.append)
+    htc_analyzer = HTCAnalyzer(cache=cache)
+    for i in range(10):
+        file = str(tmp_path / f"job_{i}.log")
+        shutil.copy(os.path.join(VALID_LOGS_DIR, "running_process.log"), file)
+        htc_analyzer.get_condor_logs(file)
+    # the first entry is written to sum up the size, see _added
+    assert statements.count("COMMIT") == 1
+    cache.close()
+    assert statements.count("COMMIT") == 2
+    assert cache.n_checkpoints == 10
+
+
+def test_unchanged_checkpoint_is_not_written(cache, tmp_path):
+    log_file = str(tmp_path / "running.log")
+    shutil.copy(os.path.join(VALID_LOGS_DIR, "running_process.log"), log_file)
+    HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    cache.close()
+    statements = []
+    cache.connection.set_trace_callback(statements.append)
+    HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    cache.close()
+    assert not any("INTO checkpoints" in statement for statement in statements)
+    assert cache.n_checkpoints == 1
+
+
+def test_last_accesses_are_written_at_once(cache, log_file):
+    def last_access():
+        return cache.connection.execute(
+            "SELECT last_access FROM condor_logs"
+        ).fetchone()[0]
+
+    HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    written = last_access()
+    assert cache.get(log_file, os.stat(log_file)) is not None
+    assert last_access() == written
+    cache.close()
+    assert last_access() > written
+
+
+def test_rebuild(cache, log_file):
+    HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    cache.close()
+    rebuilt_cache = AnalysisCache(cache.path, rebuild=True)
+    assert len(rebuilt_cache) == 0
+    rebuilt_cache.close()
+
+
+def test_rebuild_with_workers(cache, log_file):
+    HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    cache.close()
+    rebuilt_cache = AnalysisCache(cache.path, rebuild=True)
+    # running jobs are not cached, only the rebuild removes the entry
+    running_log = os.path.join(VALID_LOGS_DIR, "running_process.log")
+    list(HTCAnalyzer(workers=2, cache=rebuilt_cache).analyze(
+        [running_log, running_log]
+    ))
+    rebuilt_cache.close()
+    # opened again, without rebuilding it
+    reopened_cache = AnalysisCache(cache.path)
+    assert len(reopened_cache) == 0
+    reopened_cache.close()
+
+
+def test_tables_of_older_versions_are_dropped(tmp_path, log_file):
+    path = str(tmp_path / "analysis.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE condor_logs (path TEXT NOT NULL, "
+        "rdns_lookup INTEGER NOT NULL, data BLOB NOT NULL)"
+    )
+    connection.execute("CREATE TABLE rdns (address TEXT PRIMARY KEY)")
+    connection.execute("INSERT INTO rdns VALUES ('10.0.9.1')")
+    connection.commit()
+    connection.close()
+
+    cache = AnalysisCache(path)
+    HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    assert len(cache) == 1
+    # the tables of the other caches are kept
+    assert cache.connection.execute(
+        "SELECT COUNT(*) FROM rdns"
+    ).fetchone()[0] == 1
+    cache.close()
+    reopened_cache = AnalysisCache(path)
+    assert len(reopened_cache) == 1
+    reopened_cache.close()
+
+
+def test_cache_is_picklable(cache, log_file):
+    HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    unpickled = pickle.loads(pickle.dumps(cache))
+    assert len(unpickled) == 1
+    unpickled.close()
+
+
+def test_parallel_analysis_with_cache(cache):
+    log_files = sorted(
+        os.path.join(VALID_LOGS_DIR, file)
+        for file in os.listdir(VALID_LOGS_DIR)
+        if file.endswith(".log")
+    )
+    htc_analyzer = HTCAnalyzer(workers=2, chunk_size=2, cache=cache)
+    first = list(htc_analyzer.analyze(log_files))
+    assert len(cache) > 0
+    second = list(htc_analyzer.analyze(log_files))
+    assert len(first) == len(second)
+    # times of idle and running jobs depend on the current time
+    for first_log, second_log in zip(first, second):
+        if isinstance(first_log.job_details.state, TerminationState):
+            assert repr(first_log) == repr(second_log)
+
+
+def test_resume_from_checkpoint(cache, tmp_path):
+    with open(os.path.join(VALID_LOGS_DIR, "normal_log.log")) as log:
+        events = [event + "...\n" for event in log.read().split("...\n")]
+    file = tmp_path / "growing.log"
+    file.write_text("".join(events[:2]))
+    log_file = str(file)
+
+    htc_analyzer = HTCAnalyzer(cache=cache)
+    htc_analyzer.get_condor_logs(log_file)
+    assert len(cache) == 0
+    assert cache.n_checkpoints == 1
+    checkpoint = cache.get_checkpoint(log_file, os.stat(log_file))
+    assert checkpoint.event_handler.offset == len("".join(events[:2]))
+
+    file.write_text("".join(events))
+    resumed = htc_analyzer.get_condor_logs(log_file)
+    assert [repr(log) for log in resumed] == [
+        repr(log) for log in htc_analyzer.read_condor_logs(log_file)
+    ]
+    # all jobs terminated, the checkpoint is replaced by the entry
+    assert len(cache) == 1
+    assert cache.n_checkpoints == 0
+
+
+def test_checkpoint_invalidation(cache, tmp_path):
+    log_file = str(tmp_path / "running.log")
+    shutil.copy(os.path.join(VALID_LOGS_DIR, "running_process.log"), log_file)
+    HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    assert cache.get_checkpoint(log_file, os.stat(log_file)) is not None
+
+    # rewritten in place, the bytes before the offset changed
+    with open(log_file, "r+") as file:
+        file.seek(os.stat(log_file).st_size - 10)
+        file.write("X")
+    assert cache.get_checkpoint(log_file, os.stat(log_file)) is None
+    assert cache.n_checkpoints == 0
+
+    HTCAnalyzer(cache=cache).get_condor_logs(log_file)
+    with open(log_file, "r+") as file:
+        file.truncate(10)
+    assert cache.get_checkpoint(log_file, os.stat(log_file)) is None
+
+
+def test_ram_history_downsample():
+    events = [ImageSizeEvent(6, None, size, 0, 0) for size in range(1000)]
+    events[500].size_update = 10 ** 6
+    ram_history = RamHistory(events)
+    downsampled = ram_history.downsample(100)
+    assert len(downsampled.image_size_events) <= 100
+    assert downsampled.image_size_events[0] is events[0]
+    assert downsampled.image_size_events[-1] is events[-1]
+    assert events[500] in downsampled.image_size_events
+    assert ram_history.downsample(1000) is ram_history
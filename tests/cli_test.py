@@ -97,6 +97,40 @@ def test_rdns_lookup(parser):
     assert params.rdns_lookup is True
 
 
+def test_jobs(parser):
+    params = parser.get_params()
+    assert params.jobs == 1
+    args = "--jobs 4".split()
+    params = parser.get_params(args)
+    assert params.jobs == 4
+    args = "-j 0".split()
+    params = parser.get_params(args)
+    assert params.jobs == 0
+
+
+def test_cache(parser):
+    params = parser.get_params()
+    assert params.no_cache is False
+    assert params.rebuild_cache is False
+    params = parser.get_params("--no-cache".split())
+    assert params.no_cache is True
+    params = parser.get_params("--rebuild-cache".split())
+    assert params.rebuild_cache is True
+    with pytest.raises(SystemExit):
+        parser.get_params("--no-cache --rebuild-cache".split())
+
+
+def test_output_format(parser):
+    params = parser.get_params()
+    assert params.output_format == "rich"
+    for output_format in ["jsonl", "csv"]:
+        args = f"--output-format {output_format}".split()
+        params = parser.get_params(args)
+        assert params.output_format == output_format
+    with pytest.raises(SystemExit):
+        parser.get_params("--output-format xml".split())
+
+
 def test_ignore_config(parser):
     params = parser.get_params()
     assert params.ignore_config is False
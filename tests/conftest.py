@@ -0,0 +1,10 @@
+"""Fixtures shared by all tests."""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    """Keep the default cache file of the tests out of the user's cache."""
+    cache_home = tmp_path / "xdg_cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
@@ -0,0 +1,105 @@
+"""Test the distribution statistics of the summary mode."""
+import numpy as np
+
+from htcanalyze.log_summarizer.summarizer.distribution_summarizer import (
+    DistributionSummarizer,
+    KLLSketch,
+    RunningMoments
+)
+from htcanalyze.log_summarizer.job_table import JobTableRows, TIME_COLUMNS
+
+QUANTILES = [0.1, 0.5, 0.9, 0.99]
+
+
+def test_exact_quantiles():
+    values = np.random.default_rng(1).exponential(100, 150)
+    sketch = KLLSketch()
+    sketch.update(values)
+    assert sketch.quantiles(QUANTILES) == np.quantile(
+        values, QUANTILES, method="inverted_cdf"
+    ).tolist()
+    assert sketch.min == values.min()
+    assert sketch.max == values.max()
+
+
+def test_approximate_quantiles():
+    values = np.random.default_rng(2).lognormal(3, 1, 100000)
+    sketch = KLLSketch()
+    for batch in np.array_split(values, 100):
+        sketch.update(batch)
+    assert sketch.n == len(values)
+    assert sum(map(len, sketch.compactors)) < 1000
+    sorted_values = np.sort(values)
+    for quantile, estimate in zip(QUANTILES, sketch.quantiles(QUANTILES)):
+        rank = np.searchsorted(sorted_values, estimate) / len(values)
+        assert abs(rank - quantile) < 0.02
+
+
+def test_merged_sketches():
+    values = np.random.default_rng(3).normal(0, 1, 20000)
+    sketches = [KLLSketch(seed=seed) for seed in range(4)]
+    for sketch, part in zip(sketches, np.array_split(values, 4)):
+        sketch.update(part)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    assert merged.n == len(values)
+    assert merged.min == values.min()
+    assert merged.max == values.max()
+    for quantile, estimate in zip(QUANTILES, merged.quantiles(QUANTILES)):
+        assert abs((values < estimate).mean() - quantile) < 0.02
+    counts, edges = merged.histogram(10)
+    assert len(counts) == 10 and len(edges) == 11
+    assert abs(sum(counts) - len(values)) <= 10
+
+
+def test_sketch_from_dict():
+    values = np.random.default_rng(4).normal(0, 1, (2, 5000))
+    sketch = KLLSketch(k=20)
+    sketch.update(values[0])
+    restored = KLLSketch.from_dict(sketch.to_dict())
+    # the random compaction offsets continue the same way
+    sketch.update(values[1])
+    restored.update(values[1])
+    assert [list(compactor) for compactor in restored.compactors] == [
+        list(compactor) for compactor in sketch.compactors
+    ]
+    assert (restored.n, restored.min, restored.max) == (
+        sketch.n, sketch.min, sketch.max
+    )
+
+
+def test_running_moments():
+    values = np.random.default_rng(4).normal(1e6, 3, 10001)
+    moments, other = RunningMoments(), RunningMoments()
+    moments.update(values[:5000])
+    other.update(values[5000:7000])
+    other.update(values[7000:])
+    moments.merge(other)
+    assert moments.n == len(values)
+    assert np.isclose(moments.mean, values.mean())
+    assert np.isclose(moments.stddev, values.std())
+    assert np.isnan(RunningMoments().stddev)
+
+
+def test_distribution_summarizer():
+    resources = np.full((3, 12), np.nan)
+    resources[:2] = np.arange(12)
+    rows = JobTableRows(
+        node=np.zeros(3, dtype=np.int32),
+        has_resources=np.array([True, True, False]),
+        resources=resources,
+        dates=np.zeros((3, 3), dtype=np.int64),
+        times=np.array([[1, 2, 3], [3, 4, 7], [5, 6, 11]]),
+        nodes=[None]
+    )
+    summarizer = DistributionSummarizer()
+    summarizer.add_rows(rows)
+    distributions = summarizer.summarize()
+    assert set(TIME_COLUMNS) <= set(distributions)
+    waiting_time = distributions["waiting_time"]
+    assert waiting_time.n_values == 3
+    assert waiting_time.quantile(0.5) == 3
+    assert (waiting_time.min_value, waiting_time.max_value) == (1, 5)
+    assert distributions["cpu_usage"].n_values == 2
+    assert "cpu_allocated" not in distributions
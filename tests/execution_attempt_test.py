@@ -0,0 +1,315 @@
+"""Test the execution attempts of jobs and their goodput and badput."""
+import pickle
+from datetime import datetime as date_time, timedelta
+
+import pytest
+
+from htcanalyze.log_analyzer.condor_log.execution_attempt import (
+    ExecutionAttempt
+)
+from htcanalyze.log_analyzer.condor_log.time_manager import TimeManager
+from htcanalyze.log_analyzer.event_handler.job_events import (
+    JobExecutionEvent
+)
+from htcanalyze.log_analyzer.event_handler.states import (
+    AbnormalTerminationState,
+    AbortedState,
+    JobDisconnectedState,
+    JobEvictedState,
+    JobReconnectFailedState,
+    NormalTerminationState
+)
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+from htcanalyze.log_summarizer.htcsummarizer import HTCSummarizer
+from htcanalyze.log_summarizer.summarizer.badput_summarizer import (
+    UNKNOWN_END,
+    BadputSummarizer
+)
+from htcanalyze.view.record_writer import condor_log_row, summary_row
+
+START = date_time(2021, 1, 1)
+HOST = "<10.0.9.{}:9618?addrs=10.0.9.{}-9618&noUDP&sock=1607_d8c8_3>"
+TERMINATED = """\
+005 (1.000.000) {} Job terminated.
+\t(1) Normal termination (return value 0)
+\tPartitionable Resources :    Usage  Request Allocated
+\t   Cpus                 :     1.50        2         4
+\t   Disk (KB)            :     1          10        10
+\t   Memory (MB)          :     1          10        10
+...
+"""
+
+
+def stamp(minutes: int) -> str:
+    return (START + timedelta(minutes=minutes)).strftime("%m/%d %H:%M:%S")
+
+
+def execute(minutes: int, node: int) -> str:
+    return (
+        f"001 (1.000.000) {stamp(minutes)} Job executing on host: "
+        f"{HOST.format(node, node)}\n...\n"
+    )
+
+
+def evicted(minutes: int, checkpointed=False) -> str:
+    return (
+        f"004 (1.000.000) {stamp(minutes)} Job was evicted.\n"
+        f"\t({int(checkpointed)}) Job was "
+        f"{'' if checkpointed else 'not '}checkpointed.\n...\n"
+    )
+
+
+def write_log(tmp_path, events: list) -> str:
+    file = tmp_path / "job.log"
+    file.write_text(
+        f"000 (1.000.000) {stamp(0)} Job submitted from host: "
+        f"{HOST.format(0, 0)}\n...\n" + "".join(events)
+    )
+    return str(file)
+
+
+def analyze(file: str):
+    condor_logs = HTCAnalyzer().get_condor_logs(file)
+    assert len(condor_logs) == 1
+    return condor_logs[0]
+
+
+def test_evicted_job():
+    condor_log = analyze("tests/test_logs/valid_logs/job_evicted.log")
+    attempts = condor_log.job_details.execution_attempts
+    assert [attempt.host_address for attempt in attempts] == [
+        "10.0.9.1", "10.0.9.2"
+    ]
+    assert [attempt.end_state for attempt in attempts] == [
+        JobEvictedState(), NormalTerminationState()
+    ]
+    assert not attempts[0].is_goodput and attempts[1].is_goodput
+    # the last attempt shares the execution event of the job
+    assert (
+        attempts[-1].execution_event
+        is condor_log.job_details.set_events.execution_event
+    )
+    time_manager = condor_log.job_details.time_manager
+    assert time_manager.badput == timedelta(minutes=18, seconds=3)
+    assert time_manager.goodput == timedelta(minutes=5, seconds=37)
+
+
+def test_evicted_attempt_cpus(tmp_path):
+    events = [
+        execute(1, 1),
+        evicted(9)[:-len("...\n")] +
+        "\tPartitionable Resources :    Usage  Request Allocated\n"
+        "\t   Cpus                 :     0.50        2         2\n"
+        "...\n",
+        execute(11, 2),
+        TERMINATED.format(stamp(19))
+    ]
+    # the parser reads the cpus of the evicted attempt
+    attempts = analyze(
+        write_log(tmp_path, events)
+    ).job_details.execution_attempts
+    assert [attempt.cpus for attempt in attempts] == [2, 4]
+    assert attempts[0].core_hours == pytest.approx(2 * 8 / 60)
+
+
+def test_many_restarts(tmp_path):
+    n_restarts = 300
+    events = []
+    for i in range(n_restarts):
+        events.append(execute(10 * i + 1, i % 7 + 1))
+        events.append(evicted(10 * i + 9, checkpointed=i % 3 == 0))
+    events.append(execute(10 * n_restarts + 1, 1))
+    events.append(TERMINATED.format(stamp(10 * n_restarts + 9)))
+    condor_log = analyze(write_log(tmp_path, events))
+
+    attempts = condor_log.job_details.execution_attempts
+    assert len(attempts) == n_restarts + 1
+    assert all(attempt.is_finished for attempt in attempts)
+    # the attempts without end event take the allocated cpus of the job
+    assert {attempt.cpus for attempt in attempts} == {4}
+    n_checkpointed = len(range(0, n_restarts, 3))
+    time_manager = condor_log.job_details.time_manager
+    assert time_manager.goodput == timedelta(
+        minutes=8 * (n_checkpointed + 1)
+    )
+    assert time_manager.badput == timedelta(
+        minutes=8 * (n_restarts - n_checkpointed)
+    )
+
+    summarized_badput = [
+        summarized_condor_logs.summarized_badput
+        for summarized_condor_logs
+        in HTCSummarizer([condor_log]).summarize()
+    ][0]
+    assert summarized_badput.n_attempts == n_restarts + 1
+    assert summarized_badput.n_lost_attempts == n_restarts - n_checkpointed
+    assert summarized_badput.badput_core_hours == pytest.approx(
+        4 * 8 * (n_restarts - n_checkpointed) / 60
+    )
+    assert [state.name for state in summarized_badput.states] == [
+        "JOB_EVICTED"
+    ]
+    assert len(summarized_badput.nodes) == 7
+    assert sum(
+        node.core_hours for node in summarized_badput.nodes
+    ) == pytest.approx(summarized_badput.badput_core_hours)
+
+
+def test_disconnected(tmp_path):
+    events = [
+        execute(1, 1),
+        f"022 (1.000.000) {stamp(5)} Job disconnected, "
+        f"attempting to reconnect\n    Socket between submit and "
+        f"execute hosts closed unexpectedly\n...\n",
+        f"023 (1.000.000) {stamp(6)} Job reconnected to "
+        f"slot1@node1\n...\n",
+        f"022 (1.000.000) {stamp(10)} Job disconnected, "
+        f"attempting to reconnect\n    Socket closed\n...\n",
+        execute(20, 2),
+        f"022 (1.000.000) {stamp(25)} Job disconnected, "
+        f"attempting to reconnect\n    Socket closed\n...\n",
+        f"024 (1.000.000) {stamp(30)} Job reconnection failed\n"
+        f"    Job lease expired\n...\n",
+        execute(40, 3),
+        f"009 (1.000.000) {stamp(50)} Job was aborted.\n"
+        f"\tvia condor_rm\n...\n"
+    ]
+    attempts = analyze(
+        write_log(tmp_path, events)
+    ).job_details.execution_attempts
+    assert [attempt.end_state for attempt in attempts] == [
+        JobDisconnectedState(), JobReconnectFailedState(), AbortedState()
+    ]
+    assert [attempt.wall_time for attempt in attempts] == [
+        timedelta(minutes=19),
+        timedelta(minutes=10),
+        timedelta(minutes=10)
+    ]
+    assert not any(attempt.is_goodput for attempt in attempts)
+
+
+def test_abnormal_termination_of_the_job_is_goodput():
+    condor_log = analyze("tests/test_logs/valid_logs/abnormal_termination.log")
+    attempt, = condor_log.job_details.execution_attempts
+    assert attempt.end_state == AbnormalTerminationState()
+    assert attempt.is_goodput
+    time_manager = condor_log.job_details.time_manager
+    assert time_manager.badput == timedelta()
+    assert time_manager.goodput == attempt.wall_time > timedelta()
+
+
+def test_terminated_attempt_followed_by_another_is_badput(tmp_path):
+    abnormal_termination = TERMINATED.replace(
+        "(1) Normal termination (return value 0)",
+        "(0) Abnormal termination (signal 9)"
+    )
+    events = [
+        execute(1, 1),
+        abnormal_termination.format(stamp(9)),
+        execute(11, 2),
+        TERMINATED.format(stamp(19))
+    ]
+    condor_log = analyze(write_log(tmp_path, events))
+    attempts = condor_log.job_details.execution_attempts
+    assert [attempt.end_state for attempt in attempts] == [
+        AbnormalTerminationState(), NormalTerminationState()
+    ]
+    assert [attempt.is_goodput for attempt in attempts] == [False, True]
+    time_manager = condor_log.job_details.time_manager
+    assert time_manager.badput == time_manager.goodput == timedelta(minutes=8)
+    summarized_badput = HTCSummarizer(
+        [condor_log]
+    ).summarize()[0].summarized_badput
+    assert [state.name for state in summarized_badput.states] == [
+        "ABNORMAL_TERMINATION"
+    ]
+
+
+def test_running_attempt(tmp_path):
+    condor_log = analyze(write_log(tmp_path, [execute(1, 1)]))
+    attempt, = condor_log.job_details.execution_attempts
+    assert not attempt.is_finished
+    assert attempt.wall_time == timedelta()
+    time_manager = condor_log.job_details.time_manager
+    assert time_manager.goodput == time_manager.badput == timedelta()
+
+
+def test_rolled_over_year_boundary():
+    attempt = ExecutionAttempt(
+        JobExecutionEvent(1, date_time(2021, 12, 31, 23, 0), "10.0.9.1"),
+        end_date=date_time(2021, 1, 1, 1, 0),
+        end_state=JobEvictedState()
+    )
+    assert attempt.wall_time == timedelta(hours=2)
+    assert attempt.core_hours == 2
+
+
+def attempt_on(node: str, hours: int, end_state=JobEvictedState()):
+    return ExecutionAttempt(
+        JobExecutionEvent(1, START, node),
+        end_date=START + timedelta(hours=hours),
+        end_state=end_state,
+        cpus=2
+    )
+
+
+def test_badput_summarizer_merge_and_resolve():
+    summarizer = BadputSummarizer()
+    summarizer.add([
+        attempt_on("10.0.9.1", 1),
+        attempt_on("10.0.9.1", 2, NormalTerminationState())
+    ])
+    other = BadputSummarizer()
+    other.add([attempt_on("10.0.9.2", 3), attempt_on("10.0.9.3", 1, None)])
+    summarizer.merge(other)
+    summarizer.resolve(lambda addresses: {
+        address: "node-a" if address != "10.0.9.3" else "node-b"
+        for address in addresses
+    })
+
+    summarized_badput = summarizer.summarize()
+    assert summarized_badput.goodput_core_hours == 4
+    assert summarized_badput.badput_core_hours == 10
+    assert summarized_badput.n_attempts == 4
+    assert summarized_badput.badput_ratio == pytest.approx(10 / 14)
+    assert [
+        (node.name, node.core_hours, node.n_attempts)
+        for node in summarized_badput.nodes
+    ] == [("node-a", 8, 2), ("node-b", 2, 1)]
+    assert [
+        (state.name, state.n_attempts)
+        for state in summarized_badput.states
+    ] == [("JOB_EVICTED", 2), (UNKNOWN_END, 1)]
+
+
+def test_partial_summary_keeps_badput(tmp_path):
+    condor_log = analyze("tests/test_logs/valid_logs/job_evicted.log")
+    file = str(tmp_path / "partial.bin")
+    HTCSummarizer([condor_log]).write_partial(file)
+    summarized_badput = HTCSummarizer.read_partial(
+        file
+    ).summarize()[0].summarized_badput
+    assert summarized_badput.n_lost_attempts == 1
+    assert summarized_badput.nodes[0].name == "10.0.9.1"
+
+
+def test_records():
+    condor_log = analyze("tests/test_logs/valid_logs/job_evicted.log")
+    row = condor_log_row(condor_log)
+    assert row["n_execution_attempts"] == 2
+    assert row["badput"] == 18 * 60 + 3
+    row = summary_row(HTCSummarizer([condor_log]).summarize()[0])
+    assert row["n_lost_attempts"] == 1
+    assert row["badput_core_hours"] == pytest.approx((18 * 60 + 3) / 3600)
+
+
+def test_old_pickles():
+    condor_log = analyze("tests/test_logs/valid_logs/job_evicted.log")
+    job_details = condor_log.job_details
+    time_manager = TimeManager.__new__(TimeManager)
+    time_manager.__setstate__(job_details.time_manager.__getstate__()[:5])
+    assert time_manager.badput == timedelta()
+    # cached CondorLogs without execution attempts are read again
+    del job_details.execution_attempts
+    with pytest.raises(AttributeError):
+        pickle.loads(pickle.dumps(condor_log))
@@ -0,0 +1,251 @@
+"""Test the HTCAnalyzer, in particular the parallel analysis."""
+import os
+import pickle
+
+import pytest
+
+from htcanalyze.log_analyzer.event_handler.states import (
+    AbortedState,
+    ErrorWhileReadingState,
+    NormalTerminationState,
+    RunningState,
+    TerminationState,
+    WaitingState
+)
+from htcanalyze.log_analyzer.htcanalyzer import EventLogAnalyzer, HTCAnalyzer
+from htcanalyze.log_analyzer.log_source import rotated_event_logs
+from htcanalyze.log_summarizer.htcsummarizer import HTCSummarizer
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+
+
+@pytest.fixture(scope="module")
+def log_files():
+    return sorted(
+        os.path.join(VALID_LOGS_DIR, file)
+        for file in os.listdir(VALID_LOGS_DIR)
+        if file.endswith(".log")
+    )
+
+
+def test_condor_log_is_picklable(log_files):
+    htc_analyzer = HTCAnalyzer()
+    for file in log_files:
+        for condor_log in htc_analyzer.get_condor_logs(file):
+            unpickled = pickle.loads(pickle.dumps(condor_log))
+            assert repr(unpickled) == repr(condor_log)
+
+
+def test_parallel_analysis_ordered(log_files):
+    sequential = list(HTCAnalyzer().analyze(log_files))
+    parallel = list(
+        HTCAnalyzer(workers=2, chunk_size=2).analyze(log_files)
+    )
+    assert [log.file for log in parallel] == log_files
+    # times of idle and running jobs depend on the current time
+    for parallel_log, sequential_log in zip(parallel, sequential):
+        if isinstance(sequential_log.job_details.state, TerminationState):
+            assert repr(parallel_log) == repr(sequential_log)
+
+
+def test_parallel_analysis_unordered(log_files):
+    parallel = list(
+        HTCAnalyzer(workers=2, chunk_size=1).analyze(
+            log_files,
+            ordered=False
+        )
+    )
+    assert sorted(log.file for log in parallel) == log_files
+
+
+def test_chunk_size():
+    assert HTCAnalyzer(workers=2)._get_chunk_size(1) == 1
+    assert HTCAnalyzer(workers=2)._get_chunk_size(80) == 10
+    assert HTCAnalyzer(workers=2)._get_chunk_size(10 ** 6) == 256
+    assert HTCAnalyzer(workers=2, chunk_size=7)._get_chunk_size(80) == 7
+    assert HTCAnalyzer(workers=0).workers == (os.cpu_count() or 1)
+
+
+def test_no_files():
+    with pytest.raises(ValueError):
+        list(HTCAnalyzer(workers=2).analyze([]))
+
+
+SHARED_LOG = """\
+000 (469.000.000) 02/28 12:49:24 Job submitted from host: <10.0.8.10:9618?a>
+...
+000 (469.001.000) 02/28 12:49:24 Job submitted from host: <10.0.8.10:9618?a>
+...
+000 (469.002.000) 02/28 12:49:24 Job submitted from host: <10.0.8.10:9618?a>
+...
+001 (469.000.000) 02/28 12:49:30 Job executing on host: <10.0.9.1:9618?a>
+...
+001 (469.001.000) 02/28 12:49:31 Job executing on host: <10.0.9.2:9618?a>
+...
+009 (469.002.000) 02/28 12:50:00 Job was aborted.
+\tremoved by user
+...
+005 (469.000.000) 02/28 12:55:00 Job terminated.
+\t(1) Normal termination (return value 0)
+\tPartitionable Resources :    Usage   Request Allocated
+\t   Cpus                 :     0.50         1         1
+\t   Disk (KB)            :     4          100       200
+\t   Memory (MB)          :   10          128       128
+...
+"""
+
+
+def test_shared_log_file(tmp_path):
+    file = tmp_path / "jobs.log"
+    file.write_text(SHARED_LOG)
+    condor_logs = list(HTCAnalyzer().analyze([str(file)]))
+
+    assert [log.job_id for log in condor_logs] == [
+        "469.0", "469.1", "469.2"
+    ]
+    assert [log.job_details.state for log in condor_logs] == [
+        NormalTerminationState(), RunningState(), AbortedState()
+    ]
+    assert condor_logs[0].job_details.host_address == "10.0.9.1"
+    assert condor_logs[1].job_details.host_address == "10.0.9.2"
+    assert condor_logs[0].resources.resources[0].usage == 0.5
+    # the abort of 469.2 is not mistaken for an abort of a running job
+    aborted_event = condor_logs[2].logfile_error_events.error_events[0]
+    assert type(aborted_event).__name__ == "JobAbortedBeforeExecutionEvent"
+
+
+def test_shared_log_file_read_error(tmp_path):
+    file = tmp_path / "jobs.log"
+    lines = SHARED_LOG.splitlines(keepends=True)
+    # two complete submit events, followed by a manipulated event
+    file.write_text("".join(lines[:4]) + (
+        "007 (469.000.000) 02/28 12:49:29 Image size of job updated: 98\n"
+        "\t950  -  MemoryUsage of job (MB)\n"
+        "...\n"
+    ))
+    condor_logs = HTCAnalyzer().get_condor_logs(str(file))
+    assert [log.job_id for log in condor_logs] == ["469.0", "469.1"]
+    for condor_log in condor_logs:
+        assert condor_log.job_details.state == ErrorWhileReadingState()
+        assert condor_log.logfile_error_events.error_events
+
+
+def test_unreadable_log_file(tmp_path):
+    condor_logs = HTCAnalyzer().get_condor_logs(str(tmp_path / "no.log"))
+    assert len(condor_logs) == 1
+    assert condor_logs[0].job_id is None
+    assert condor_logs[0].job_details.state == ErrorWhileReadingState()
+
+
+def event_blocks(file):
+    with open(file) as log_file:
+        # the last separator of a file may lack the newline
+        text = log_file.read().rstrip("\n") + "\n"
+    return [block + "...\n" for block in text.split("...\n") if block]
+
+
+@pytest.fixture
+def event_log(tmp_path, log_files):
+    # the events of several jobs interleaved like in a global event log,
+    # just_submission.log shares the job id of aborted_with_errors.log
+    files = [
+        file for file in log_files
+        if not file.endswith("just_submission.log")
+    ]
+    blocks = [event_blocks(file) for file in files]
+    interleaved = [
+        file_blocks[i]
+        for i in range(max(map(len, blocks)))
+        for file_blocks in blocks
+        if i < len(file_blocks)
+    ]
+    # rotated twice, EventLog.1 is the most recent rotation
+    third = len(interleaved) // 3
+    for name, part in [
+        ("EventLog.2", interleaved[:third]),
+        ("EventLog.1", interleaved[third:2 * third]),
+        ("EventLog", interleaved[2 * third:])
+    ]:
+        (tmp_path / name).write_text("".join(part))
+    return files, str(tmp_path / "EventLog")
+
+
+def test_rotated_event_logs(event_log):
+    _, file = event_log
+    assert rotated_event_logs(file) == [file + ".2", file + ".1", file]
+
+
+@pytest.mark.parametrize("max_jobs", [1000, 2])
+def test_event_log_analyzer(event_log, max_jobs):
+    files, file = event_log
+    condor_logs = list(
+        EventLogAnalyzer(max_jobs=max_jobs).analyze(rotated_event_logs(file))
+    )
+    by_job = {}
+    for condor_log in condor_logs:
+        by_job.setdefault(condor_log.job_id, []).append(condor_log)
+    expected = [
+        condor_log
+        for log_file in files
+        for condor_log in HTCAnalyzer().get_condor_logs(log_file)
+    ]
+    assert set(by_job) == {condor_log.job_id for condor_log in expected}
+    if max_jobs < len(files):
+        return
+    for condor_log in expected:
+        job_log, = by_job[condor_log.job_id]
+        assert type(job_log.job_details.state) is type(
+            condor_log.job_details.state
+        )
+        if isinstance(condor_log.job_details.state, TerminationState):
+            assert repr(job_log.job_details) == repr(condor_log.job_details)
+            assert repr(job_log.ram_history) == repr(condor_log.ram_history)
+    # terminated jobs are given out first, in the order they terminated
+    assert not any(
+        isinstance(condor_log.job_details.state, TerminationState)
+        for condor_log in condor_logs[
+            sum(
+                isinstance(log.job_details.state, TerminationState)
+                for log in condor_logs
+            ):
+        ]
+    )
+
+
+# the event log starts in the middle of the history of job 2.0
+MID_HISTORY_EVENT_LOG = """\
+012 (2.000.000) 02/11 12:31:27 Job was held.
+\tError from slot1_4@cpu1: Job has encountered an out-of-memory event.
+\tCode 34 Subcode 0
+...
+000 (3.000.000) 02/11 12:32:00 Job submitted from host: <10.0.8.10:9618?a>
+...
+006 (2.000.000) 02/11 12:33:00 Image size of job updated: 1000
+\t1  -  MemoryUsage of job (MB)
+\t1000  -  ResidentSetSize of job (KB)
+...
+001 (3.000.000) 02/11 12:34:00 Job executing on host: <10.0.9.1:9618?a>
+...
+"""
+
+
+@pytest.mark.parametrize("max_jobs", [1000, 1])
+def test_event_log_starts_mid_history(tmp_path, max_jobs):
+    file = tmp_path / "EventLog"
+    file.write_text(MID_HISTORY_EVENT_LOG)
+    condor_logs = list(
+        EventLogAnalyzer(max_jobs=max_jobs).analyze([str(file)])
+    )
+    states = {}
+    for condor_log in condor_logs:
+        states.setdefault(condor_log.job_id, []).append(
+            condor_log.job_details.state
+        )
+    if max_jobs == 1:
+        # given out at the submission of 3.0, seen again at its update
+        assert states["2.0"] == [WaitingState(), WaitingState()]
+    else:
+        assert states["2.0"] == [WaitingState()]
+    assert states["3.0"][-1] == RunningState()
+    # every job has a state to be summarized by
+    assert HTCSummarizer(condor_logs).summarize()
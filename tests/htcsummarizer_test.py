@@ -0,0 +1,202 @@
+"""Test the streaming summarization of the HTCSummarizer."""
+import gc
+import io
+import json
+import os
+import weakref
+
+import numpy as np
+import pytest
+
+from htcanalyze.globals import PARTIAL_SUMMARY_HEADER
+from htcanalyze.log_analyzer.condor_log.error_events import LogfileErrorEvents
+from htcanalyze.log_analyzer.event_handler.event_handler import (
+    SUMMARY_EVENT_TYPES
+)
+from htcanalyze.log_analyzer.event_handler.job_events import ErrorEvent
+from htcanalyze.log_analyzer.event_handler.states import (
+    ErrorWhileReadingState
+)
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+from htcanalyze.log_summarizer.htcsummarizer import HTCSummarizer
+from htcanalyze.log_summarizer.summarizer.error_event_summarizer import (
+    ErrorEventSummarizer
+)
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+LOG_FILES = sorted(
+    os.path.join(VALID_LOGS_DIR, file)
+    for file in os.listdir(VALID_LOGS_DIR)
+    if file.endswith(".log")
+)
+
+
+def test_generator_equals_list():
+    condor_logs = list(HTCAnalyzer().analyze(LOG_FILES))
+    from_list = HTCSummarizer(condor_logs).summarize()
+    from_generator = HTCSummarizer(iter(condor_logs)).summarize()
+    assert [repr(summary) for summary in from_list] == [
+        repr(summary) for summary in from_generator
+    ]
+    assert sum(summary.n_jobs for summary in from_list) == len(condor_logs)
+
+
+def test_summary_without_image_size_events():
+    condor_logs = list(HTCAnalyzer().analyze(LOG_FILES))
+    filtered_logs = list(
+        HTCAnalyzer(event_types=SUMMARY_EVENT_TYPES).analyze(LOG_FILES)
+    )
+    assert all(
+        not condor_log.ram_history.image_size_events
+        for condor_log in filtered_logs
+    )
+    # times of idle and running jobs depend on the current time
+    terminated = [
+        summary for summary in HTCSummarizer(condor_logs).summarize()
+        if summary.state.name not in ("WAITING", "RUNNING")
+    ]
+    filtered_terminated = [
+        summary for summary in HTCSummarizer(filtered_logs).summarize()
+        if summary.state.name not in ("WAITING", "RUNNING")
+    ]
+    assert [repr(summary) for summary in terminated] == [
+        repr(summary) for summary in filtered_terminated
+    ]
+
+
+def test_condor_logs_are_dropped():
+    refs = []
+
+    def condor_logs():
+        for condor_log in HTCAnalyzer().analyze(LOG_FILES):
+            refs.append(weakref.ref(condor_log))
+            yield condor_log
+
+    HTCSummarizer(condor_logs()).summarize()
+    gc.collect()
+    assert refs
+    assert all(ref() is None for ref in refs)
+
+
+def test_error_files_are_sampled():
+    error_event_summarizer = ErrorEventSummarizer()
+    for i in range(100):
+        error_event_summarizer.add(
+            LogfileErrorEvents(
+                [
+                    ErrorEvent(None, None, ErrorWhileReadingState()),
+                    ErrorEvent(None, None, ErrorWhileReadingState())
+                ],
+                f"job_{i}.log"
+            )
+        )
+    summarized_error_state, = error_event_summarizer.summarize()
+    assert summarized_error_state.n_error_events == 200
+    assert summarized_error_state.n_files == 100
+    assert summarized_error_state.files == [f"job_{i}.log" for i in range(10)]
+
+
+def terminated_summaries(htc_summarizer):
+    # times of idle and running jobs depend on the current time
+    return [
+        summary for summary in htc_summarizer.summarize()
+        if summary.state.name not in ("WAITING", "RUNNING")
+    ]
+
+
+def test_merged_partial_summaries():
+    condor_logs = list(HTCAnalyzer().analyze(LOG_FILES))
+    single_pass = terminated_summaries(HTCSummarizer(condor_logs))
+    parts = [condor_logs[:3], condor_logs[3:4], condor_logs[4:]]
+    left = HTCSummarizer(parts[0]).merge(
+        HTCSummarizer(parts[1])
+    ).merge(HTCSummarizer(parts[2]))
+    right = HTCSummarizer(parts[0]).merge(
+        HTCSummarizer(parts[1]).merge(HTCSummarizer(parts[2]))
+    )
+    for merged in (left, right):
+        summaries = terminated_summaries(merged)
+        assert [summary.n_jobs for summary in summaries] == [
+            summary.n_jobs for summary in single_pass
+        ]
+        assert [repr(summary.avg_times) for summary in summaries] == [
+            repr(summary.avg_times) for summary in single_pass
+        ]
+        assert [
+            repr(summary.summarized_node_jobs) for summary in summaries
+        ] == [
+            repr(summary.summarized_node_jobs) for summary in single_pass
+        ]
+        assert [
+            repr(summary.summarized_error_states) for summary in summaries
+        ] == [
+            repr(summary.summarized_error_states) for summary in single_pass
+        ]
+        for summary, expected in zip(summaries, single_pass):
+            for name, distribution in expected.distributions.items():
+                merged_distribution = summary.distributions[name]
+                assert merged_distribution.quantiles == (
+                    distribution.quantiles
+                )
+                assert merged_distribution.mean == pytest.approx(
+                    distribution.mean
+                )
+
+
+def test_partial_summary_file(tmp_path):
+    partial = str(tmp_path / "partial.bin")
+    htc_summarizer = HTCSummarizer(HTCAnalyzer().analyze(LOG_FILES))
+    htc_summarizer.write_partial(partial)
+    assert [
+        repr(summary) for summary in
+        terminated_summaries(HTCSummarizer.read_partial(partial))
+    ] == [repr(summary) for summary in terminated_summaries(htc_summarizer)]
+
+    with pytest.raises(ValueError):
+        HTCSummarizer.read_partial(LOG_FILES[0])
+    with open(partial, "rb") as read_file:
+        data = read_file.read()
+    with open(partial, "wb") as write_file:
+        write_file.write(data[:len(data) // 2])
+    with pytest.raises(ValueError):
+        HTCSummarizer.read_partial(partial)
+
+
+def test_partial_summary_is_data_only(tmp_path):
+    partial = str(tmp_path / "partial.bin")
+    condor_logs = list(HTCAnalyzer().analyze(LOG_FILES))
+    HTCSummarizer(condor_logs[:3]).write_partial(partial)
+    with open(partial, "rb") as read_file:
+        assert read_file.readline() == PARTIAL_SUMMARY_HEADER
+        read_file.readline()
+        summary = json.loads(read_file.readline())
+        # no pickled objects
+        with np.load(io.BytesIO(read_file.read())) as npz_file:
+            assert all(array.dtype != object for array in npz_file.values())
+    assert len(summary) == len(HTCSummarizer(condor_logs[:3]).summarize())
+
+    merged = HTCSummarizer.read_partial(partial).merge(
+        HTCSummarizer(condor_logs[3:])
+    )
+    assert [repr(summary) for summary in terminated_summaries(merged)] == [
+        repr(summary) for summary in terminated_summaries(
+            HTCSummarizer(condor_logs[:3]).merge(
+                HTCSummarizer(condor_logs[3:])
+            )
+        )
+    ]
+
+
+def test_parallel_partial_summaries():
+    sequential = terminated_summaries(
+        HTCSummarizer(HTCAnalyzer().analyze(LOG_FILES))
+    )
+    merged = HTCSummarizer()
+    for partial in HTCAnalyzer(workers=2, chunk_size=2).summarize(LOG_FILES):
+        merged.merge(partial)
+    assert sorted(
+        (summary.state.name, summary.n_jobs)
+        for summary in terminated_summaries(merged)
+    ) == sorted(
+        (summary.state.name, summary.n_jobs) for summary in sequential
+    )
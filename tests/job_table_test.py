@@ -0,0 +1,139 @@
+"""Test the JobTable and the vectorized summarizers."""
+import os
+import random
+from datetime import timedelta
+
+import numpy as np
+
+from htcanalyze.log_analyzer.condor_log.logresource import (
+    LogResources,
+    CPULogResource,
+    DiskLogResource,
+    MemoryLogResource,
+    GPULogResource
+)
+from htcanalyze.log_analyzer.condor_log.time_manager import JobTimes
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+from htcanalyze.log_summarizer.htcsummarizer import HTCSummarizer
+from htcanalyze.log_summarizer.job_table import (
+    EPOCH,
+    JobTable,
+    NO_DATE,
+    get_resource_values
+)
+from htcanalyze.log_summarizer.summarizer.log_resource_summarizer import (
+    LogResourceSummarizer
+)
+from htcanalyze.log_summarizer.summarizer.time_summarizer import (
+    TimeSummarizer
+)
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+LOG_FILES = sorted(
+    os.path.join(VALID_LOGS_DIR, file)
+    for file in os.listdir(VALID_LOGS_DIR)
+    if file.endswith(".log")
+)
+
+
+def random_value(rand):
+    return rand.choice([np.nan, rand.randint(0, 100), rand.random() * 10])
+
+
+def random_log_resources(rand):
+    values = [random_value(rand) for _ in range(12)]
+    if rand.random() < 0.3:
+        values[9:] = [np.nan] * 3  # no gpus
+    return LogResources(
+        CPULogResource(*values[0:3]),
+        DiskLogResource(*values[3:6]),
+        MemoryLogResource(*values[6:9]),
+        GPULogResource(*values[9:12])
+    )
+
+
+def test_resource_average_like_sum_of_log_resources():
+    rand = random.Random(42)
+    for n_jobs in [1, 2, 7, 100]:
+        m_log_resources = [random_log_resources(rand) for _ in range(n_jobs)]
+        expected = sum(m_log_resources) / len(m_log_resources)
+        summarized = LogResourceSummarizer(m_log_resources).summarize()
+        assert np.allclose(
+            get_resource_values(summarized),
+            get_resource_values(expected),
+            equal_nan=True
+        )
+
+
+def test_all_empty_resource_stays_nan():
+    empty = LogResources(
+        CPULogResource(1, 1, 1),
+        DiskLogResource(np.nan, np.nan, np.nan),
+        MemoryLogResource(np.nan, 2, np.nan),
+        GPULogResource(np.nan, np.nan, np.nan)
+    )
+    summarized = LogResourceSummarizer([empty, empty]).summarize()
+    assert summarized.disc_resource.is_empty()
+    assert summarized.gpu_resource.is_empty()
+    assert summarized.memory_resource.usage == 0
+    assert summarized.memory_resource.requested == 2
+
+
+def test_time_average_like_sum_of_job_times():
+    rand = random.Random(7)
+
+    class TimeManagerStub:
+        def __init__(self, job_times):
+            self.job_times = job_times
+
+    m_job_times = [
+        JobTimes(*(
+            timedelta(seconds=rand.randint(0, 10 ** 6)) for _ in range(3)
+        ))
+        for _ in range(101)
+    ]
+    expected = sum(m_job_times) / len(m_job_times)
+    summarized = TimeSummarizer(
+        [TimeManagerStub(job_times) for job_times in m_job_times]
+    ).summarize()
+    assert repr(summarized) == repr(expected)
+
+
+def test_job_table_columns():
+    condor_logs = list(HTCAnalyzer().analyze(LOG_FILES))
+    job_table = JobTable(len(condor_logs))
+    for condor_log in condor_logs:
+        job_table.append(condor_log)
+    assert job_table.is_full
+    assert len(job_table.column("cpu_usage")) == len(condor_logs)
+    submission_dates = job_table.column("submission_date")
+    for condor_log, date in zip(condor_logs, submission_dates):
+        submission_date = condor_log.job_details.time_manager.submission_date
+        if submission_date is None:
+            assert date == NO_DATE
+        else:
+            assert date == (submission_date - EPOCH).total_seconds()
+    job_table.clear()
+    assert len(job_table) == 0
+
+
+def test_chunked_summary_equals_single_chunk():
+    condor_logs = list(HTCAnalyzer().analyze(LOG_FILES)) * 5
+    single_chunk = HTCSummarizer(condor_logs).summarize()
+    chunked = HTCSummarizer(iter(condor_logs), chunk_size=3).summarize()
+    assert len(chunked) == len(single_chunk)
+    for summary, expected in zip(chunked, single_chunk):
+        assert summary.state == expected.state
+        assert summary.n_jobs == expected.n_jobs
+        assert repr(summary.avg_times) == repr(expected.avg_times)
+        assert repr(summary.summarized_node_jobs) == repr(
+            expected.summarized_node_jobs
+        )
+        if expected.avg_resources is not None:
+            # the order of the float additions differs
+            assert np.allclose(
+                get_resource_values(summary.avg_resources),
+                get_resource_values(expected.avg_resources),
+                equal_nan=True
+            )
+    assert sum(summary.n_jobs for summary in chunked) == len(condor_logs)
@@ -0,0 +1,167 @@
+"""Test the JsonLogParser against the text format of the same logs."""
+import json
+import os
+
+import pytest
+
+from htcanalyze.log_analyzer.event_handler import json_log_parser
+from htcanalyze.log_analyzer.event_handler.event_handler import (
+    SUMMARY_EVENT_TYPES
+)
+from htcanalyze.log_analyzer.event_handler.json_log_parser import (
+    JsonLogParser,
+    is_json_log
+)
+from htcanalyze.log_analyzer.event_handler.states import TerminationState
+from htcanalyze.log_analyzer.event_handler.user_log_parser import (
+    UnsupportedEventError,
+    UserLogParser
+)
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+from htcanalyze.log_analyzer.logvalidator import LogValidator
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+
+
+@pytest.fixture(scope="module")
+def log_files():
+    return sorted(
+        os.path.join(VALID_LOGS_DIR, file)
+        for file in os.listdir(VALID_LOGS_DIR)
+        if file.endswith(".log")
+    )
+
+
+def to_json_log(file, json_file):
+    """Write the events of a text log in the layout of HTCondor."""
+    objects = []
+    for event in UserLogParser(file).events():
+        event_dict = {"MyType": event.type.name, **event.to_dict()}
+        objects.append(json.dumps(event_dict, indent=4))
+    with open(json_file, "w") as write_file:
+        write_file.write("[\n" + "\n,\n".join(objects) + "\n")
+
+
+@pytest.fixture
+def json_logs(tmp_path, log_files):
+    json_files = []
+    for file in log_files:
+        json_file = str(tmp_path / os.path.basename(file))
+        to_json_log(file, json_file)
+        json_files.append(json_file)
+    return json_files
+
+
+def test_is_json_log(json_logs, log_files):
+    assert all(is_json_log(file) for file in json_logs)
+    assert not any(is_json_log(file) for file in log_files)
+
+
+def test_same_events(json_logs, log_files, monkeypatch):
+    # events span several chunks
+    monkeypatch.setattr(json_log_parser, "JSON_READ_SIZE", 100)
+    for file, json_file in zip(log_files, json_logs):
+        parser = JsonLogParser(json_file)
+        json_events = [event.to_dict() for event in parser.events()]
+        for event in json_events:
+            # only written to the JSON format
+            del event["MyType"]
+        assert json_events == [
+            event.to_dict() for event in UserLogParser(file).events()
+        ]
+        # right after the last event
+        with open(json_file, "rb") as read_file:
+            assert read_file.read()[parser.offset - 1:] == b"}\n"
+        assert parser.n_events == len(json_events)
+
+
+def test_same_condor_logs(json_logs, log_files):
+    for file, json_file in zip(log_files, json_logs):
+        text_logs = HTCAnalyzer().get_condor_logs(file)
+        json_logs = HTCAnalyzer().get_condor_logs(json_file)
+        assert len(json_logs) == len(text_logs)
+        for json_log, text_log in zip(json_logs, text_logs):
+            assert type(json_log.job_details.state) is type(
+                text_log.job_details.state
+            )
+            if isinstance(text_log.job_details.state, TerminationState):
+                assert repr(json_log.job_details) == repr(
+                    text_log.job_details
+                )
+                assert repr(json_log.ram_history) == repr(
+                    text_log.ram_history
+                )
+
+
+def test_skipped_event_types(json_logs):
+    for json_file in json_logs:
+        all_events = list(JsonLogParser(json_file).events())
+        parser = JsonLogParser(json_file, event_types=SUMMARY_EVENT_TYPES)
+        events = list(parser.events())
+        assert [event.to_dict() for event in events] == [
+            event.to_dict() for event in all_events
+            if event.type in SUMMARY_EVENT_TYPES
+        ]
+        assert parser.n_events == len(all_events)
+
+
+def test_resume_incomplete_event(tmp_path, json_logs):
+    json_file = json_logs[0]
+    with open(json_file, "rb") as read_file:
+        data = read_file.read()
+    all_events = [
+        event.to_dict() for event in JsonLogParser(json_file).events()
+    ]
+    growing_file = tmp_path / "growing.json.log"
+    # the last event is still being written
+    growing_file.write_bytes(data[:-20])
+    parser = JsonLogParser(str(growing_file))
+    events = [event.to_dict() for event in parser.events()]
+    assert events == all_events[:-1]
+
+    growing_file.write_bytes(data)
+    parser = JsonLogParser(str(growing_file), offset=parser.offset)
+    assert [event.to_dict() for event in parser.events()] == all_events[-1:]
+
+
+def test_invalid_json_event(tmp_path):
+    json_file = tmp_path / "invalid.log"
+    json_file.write_text('[\n{"EventTypeNumber": 0, "Cluster": 1}\n')
+    with pytest.raises(UnsupportedEventError):
+        list(JsonLogParser(str(json_file)).events())
+
+
+def test_offset_with_multibyte_characters(tmp_path):
+    first = '[\n{"EventTypeNumber": 0, "Cluster": 1, "Proc": 0, ' \
+        '"EventTime": "2021-07-11T20:39:51", "Note": "\u00fcber \u2713"}\n'
+    second = ',\n{"EventTypeNumber": 1, "Cluster": 1, "Proc": 0, ' \
+        '"EventTime": "2021-07-11T20:40:51", "Note": "'
+    json_file = tmp_path / "multibyte.log"
+    # the second event is cut off within a character
+    json_file.write_bytes(
+        (first + second + "\u2713").encode("utf-8")[:-1]
+    )
+    parser = JsonLogParser(str(json_file))
+    assert [event.get("Note") for event in parser.events()] == [
+        "\u00fcber \u2713"
+    ]
+    assert parser.offset == len(first.encode("utf-8")) - 1
+
+    # an invalid byte would be counted as a three byte replacement
+    json_file.write_bytes(
+        first.replace("\u00fc", "\udcff").encode(
+            "utf-8", errors="surrogateescape"
+        ) + second.encode("utf-8") + b'"}\n'
+    )
+    parser = JsonLogParser(str(json_file))
+    with pytest.raises(UnsupportedEventError):
+        list(parser.events())
+    assert parser.n_events == 0
+
+
+def test_validate_json_logs(tmp_path, json_logs):
+    validator = LogValidator()
+    assert all(validator.is_valid_logfile(file) for file in json_logs)
+    not_a_log = tmp_path / "not_a_log.log"
+    not_a_log.write_text('[\n{"name": "value"}\n]\n')
+    assert not validator.is_valid_logfile(str(not_a_log))
@@ -0,0 +1,147 @@
+"""Test following growing log files."""
+import os
+import shutil
+
+import pytest
+
+from htcanalyze.log_analyzer.event_handler.user_log_parser import (
+    PAYLOAD_READERS,
+    JobEventType,
+    UnsupportedEventError
+)
+from htcanalyze.log_analyzer.file_watcher import (
+    InotifyWatcher,
+    PollingWatcher
+)
+from htcanalyze.log_analyzer.log_follower import LogFollower
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+
+with open(os.path.join(VALID_LOGS_DIR, "normal_log.log")) as log:
+    EVENTS = [event + "...\n" for event in log.read().split("...\n")[:-1]]
+
+HELD = (
+    "012 (107799.000.000) 2021-07-11 20:41:00 Job was held.\n"
+    "\tOut of memory\n"
+    "\tCode 34 Subcode 0\n"
+    "...\n"
+)
+RELEASED = (
+    "013 (107799.000.000) 2021-07-11 20:42:00 Job was released.\n"
+    "\tvia condor_release\n"
+    "...\n"
+)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    file = tmp_path / "job.log"
+    file.write_text("".join(EVENTS[:2]))
+    return str(file)
+
+
+def append(file, text):
+    with open(file, "a") as log:
+        log.write(text)
+
+
+def test_incremental_update(log_file):
+    log_follower = LogFollower([log_file])
+    assert log_follower.update() == 2
+    assert log_follower.state_counts["RUNNING"] == 1
+    # nothing new, no events are read again
+    assert log_follower.update() == 0
+
+    append(log_file, HELD)
+    # an incomplete event is not read yet
+    append(log_file, RELEASED[:20])
+    assert log_follower.update([log_file]) == 1
+    assert log_follower.n_held == 1
+
+    append(log_file, RELEASED[20:])
+    assert log_follower.update([log_file]) == 1
+    assert log_follower.n_held == 0
+
+    append(log_file, "".join(EVENTS[2:]))
+    log_follower.update([log_file])
+    assert log_follower.state_counts["RUNNING"] == 0
+    assert log_follower.state_counts["NORMAL_TERMINATION"] == 1
+    assert log_follower.n_events == len(EVENTS) + 2
+
+
+def test_truncated_file(log_file):
+    log_follower = LogFollower([log_file])
+    append(log_file, "".join(EVENTS[2:]))
+    log_follower.update()
+    assert log_follower.state_counts["NORMAL_TERMINATION"] == 1
+
+    with open(log_file, "w") as log:
+        log.write(EVENTS[0])
+    log_follower.update([log_file])
+    assert log_follower.state_counts["NORMAL_TERMINATION"] == 0
+    assert log_follower.state_counts["WAITING"] == 1
+
+
+def test_fallback_to_bindings(monkeypatch, log_file):
+    def unsupported(description, _):
+        raise UnsupportedEventError(description)
+
+    monkeypatch.setitem(PAYLOAD_READERS, JobEventType.JOB_HELD, unsupported)
+    log_follower = LogFollower([log_file])
+    followed_log = log_follower.logs[log_file]
+    assert log_follower.update() == 2
+
+    append(log_file, HELD)
+    assert log_follower.update() == 1
+    assert log_follower.n_held == 1
+    job_event_log = followed_log.event_handler._job_event_log
+    assert job_event_log is not None
+
+    # the JobEventLog continues at its position, nothing is read again
+    append(log_file, RELEASED)
+    assert log_follower.update() == 1
+    assert log_follower.update() == 0
+    assert log_follower.n_held == 0
+    assert followed_log.event_handler._job_event_log is job_event_log
+    assert log_follower.n_events == 4
+
+    # without an offset, truncation is detected by the file size
+    with open(log_file, "w") as log:
+        log.write(EVENTS[0])
+    assert log_follower.update() == 1
+    assert log_follower.state_counts["WAITING"] == 1
+    assert log_follower.state_counts["RUNNING"] == 0
+    assert followed_log.error is None
+
+
+def test_several_files(tmp_path, log_file):
+    other_file = str(tmp_path / "other.log")
+    shutil.copy(os.path.join(VALID_LOGS_DIR, "normal_log.log"), other_file)
+    log_follower = LogFollower([log_file, other_file])
+    log_follower.update()
+    assert log_follower.state_counts["RUNNING"] == 1
+    assert log_follower.state_counts["NORMAL_TERMINATION"] == 1
+    # unknown files are ignored
+    assert log_follower.update(["unknown.log"]) == 0
+
+
+@pytest.mark.parametrize("watcher_class", [PollingWatcher, InotifyWatcher])
+def test_file_watcher(watcher_class, log_file, tmp_path):
+    try:
+        watcher = watcher_class([log_file], interval=0.01)
+    except OSError:
+        pytest.skip("inotify is not available")
+    try:
+        assert watcher.wait(0.05) == set()
+        append(log_file, EVENTS[2])
+        assert watcher.wait(1) == {log_file}
+        # replaced by a new file
+        os.replace(shutil.copy(log_file, tmp_path / "new.log"), log_file)
+        changed = set()
+        for _ in range(10):
+            changed |= watcher.wait(0.1)
+        assert changed == {log_file}
+        append(log_file, EVENTS[3])
+        assert watcher.wait(1) == {log_file}
+    finally:
+        watcher.close()
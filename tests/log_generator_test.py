@@ -0,0 +1,118 @@
+"""Test the synthetic logs of benchmarks/log_generator.py."""
+import importlib.util
+import os
+from collections import Counter
+
+import pytest
+from htcondor import JobEventLog
+
+from htcanalyze.log_analyzer.event_handler.user_log_parser import (
+    JobEventType,
+    UserLogParser
+)
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+from htcanalyze.log_analyzer.logvalidator import LogValidator
+
+GENERATOR_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "benchmarks", "log_generator.py"
+)
+N_FILES = 300
+
+
+@pytest.fixture(scope="module")
+def log_generator():
+    spec = importlib.util.spec_from_file_location(
+        "log_generator", GENERATOR_FILE
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def log_files(log_generator, tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("synthetic"))
+    return log_generator.generate_data_set(directory, N_FILES, seed=1)
+
+
+def test_seeded(log_generator):
+    assert log_generator.generate_log(1, 7) == log_generator.generate_log(1, 7)
+    assert log_generator.generate_log(1, 7) != log_generator.generate_log(2, 7)
+
+
+def test_data_set_is_reused(log_generator, log_files):
+    directory = os.path.dirname(os.path.dirname(log_files[0]))
+    mtime = os.path.getmtime(log_files[-1])
+    assert log_generator.generate_data_set(directory, N_FILES, 1) == log_files
+    assert os.path.getmtime(log_files[-1]) == mtime
+
+
+def test_logs_are_valid(log_files):
+    directory = os.path.dirname(os.path.dirname(log_files[0]))
+    valid_files = LogValidator().common_validation(
+        [directory],
+        recursive=True
+    )
+    assert sorted(valid_files) == sorted(map(os.path.abspath, log_files))
+
+
+def test_events(log_files):
+    event_types = Counter()
+    procs = set()
+    for file in log_files:
+        # the pure-python parser reads every event, no fallback needed
+        for event in UserLogParser(file).events():
+            event_types[event.type] += 1
+            procs.add(event.proc)
+    assert {
+        JobEventType.SUBMIT,
+        JobEventType.EXECUTE,
+        JobEventType.IMAGE_SIZE,
+        JobEventType.JOB_EVICTED,
+        JobEventType.SHADOW_EXCEPTION,
+        JobEventType.JOB_HELD,
+        JobEventType.JOB_RELEASED,
+        JobEventType.JOB_ABORTED,
+        JobEventType.JOB_TERMINATED
+    }.issubset(event_types)
+    # multi-proc clusters
+    assert len(procs) > 1
+
+
+def test_same_events_as_bindings(log_files):
+    n_resources = 0
+    for file in log_files[:100]:
+        htc_events = list(JobEventLog(file).events(0))
+        events = list(UserLogParser(file).events())
+        assert len(events) == len(htc_events)
+        for event, htc_event in zip(events, htc_events):
+            assert event.type == htc_event.type
+            for key, value in event.attributes.items():
+                # the htcondor module skips the resources of evicted jobs
+                if (
+                        event.type == JobEventType.JOB_EVICTED
+                        and key not in htc_event
+                ):
+                    continue
+                assert value == htc_event.get(key), (file, key)
+            # the bindings read the resources at fixed positions
+            if (
+                    "RequestMemory" in event.attributes
+                    and event.type != JobEventType.JOB_EVICTED
+            ):
+                n_resources += 1
+                for key in ("RequestDisk", "Disk", "Memory", "MemoryUsage"):
+                    assert htc_event.get(key) is not None, (file, key)
+    assert n_resources > 0
+
+
+def test_states(log_files):
+    states = Counter(
+        condor_log.job_details.state.name
+        for condor_log in HTCAnalyzer().analyze(log_files)
+    )
+    assert {
+        "NORMAL_TERMINATION", "ABNORMAL_TERMINATION", "ABORTED",
+        "RUNNING", "WAITING"
+    }.issubset(states)
+    assert "ERROR_WHILE_READING" not in states
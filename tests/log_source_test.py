@@ -0,0 +1,179 @@
+"""Test reading compressed logs and the members of tar archives."""
+import gzip
+import lzma
+import os
+import tarfile
+
+import pytest
+
+from htcanalyze.log_analyzer.event_handler.states import TerminationState
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+from htcanalyze.log_analyzer.log_source import (
+    member_path,
+    open_log,
+    split_member
+)
+from htcanalyze.log_analyzer.logvalidator import LogValidator
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+
+
+@pytest.fixture(scope="module")
+def log_files():
+    return sorted(
+        os.path.join(VALID_LOGS_DIR, file)
+        for file in os.listdir(VALID_LOGS_DIR)
+        if file.endswith(".log")
+    )
+
+
+def terminated_details(condor_logs):
+    # times of idle and running jobs depend on the current time
+    return [
+        (repr(log.job_details), repr(log.ram_history))
+        for log in condor_logs
+        if isinstance(log.job_details.state, TerminationState)
+    ]
+
+
+def write_archive(path, log_files, mode):
+    with tarfile.open(path, mode) as tar:
+        tar.add(VALID_LOGS_DIR + "/normal_log.out", "logs/normal_log.out")
+        for file in log_files:
+            tar.add(file, "logs/" + os.path.basename(file))
+
+
+def test_split_member():
+    assert split_member("logs.tar::logs/job.log") == (
+        "logs.tar", "logs/job.log"
+    )
+    assert split_member("job.log") == ("job.log", None)
+    assert member_path("logs.tar", "job.log") == "logs.tar::job.log"
+
+
+@pytest.mark.parametrize("suffix, opener", [
+    (".gz", gzip.open),
+    (".xz", lzma.open)
+])
+def test_compressed_logs(tmp_path, log_files, suffix, opener):
+    compressed_files = []
+    for file in log_files:
+        compressed_file = str(tmp_path / os.path.basename(file)) + suffix
+        with open(file, "rb") as log_file:
+            with opener(compressed_file, "wb") as write_file:
+                write_file.write(log_file.read())
+        compressed_files.append(compressed_file)
+
+    validator = LogValidator()
+    assert sorted(validator.common_validation([str(tmp_path)])) == sorted(
+        compressed_files
+    )
+    for file, compressed_file in zip(log_files, compressed_files):
+        assert terminated_details(
+            HTCAnalyzer().get_condor_logs(compressed_file)
+        ) == terminated_details(HTCAnalyzer().get_condor_logs(file))
+
+
+def test_zstd_compressed_log(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    file = VALID_LOGS_DIR + "/normal_log.log"
+    compressed_file = str(tmp_path / "normal_log.log.zst")
+    with open(file, "rb") as log_file:
+        with open(compressed_file, "wb") as write_file:
+            write_file.write(
+                zstandard.ZstdCompressor().compress(log_file.read())
+            )
+    assert LogValidator().is_valid_logfile(compressed_file)
+    assert terminated_details(
+        HTCAnalyzer().get_condor_logs(compressed_file)
+    ) == terminated_details(HTCAnalyzer().get_condor_logs(file))
+
+
+@pytest.mark.parametrize("suffix, mode", [
+    (".tar", "w"),
+    (".tar.gz", "w:gz")
+])
+def test_archive_members(tmp_path, log_files, suffix, mode):
+    archive = str(tmp_path / "logs") + suffix
+    write_archive(archive, log_files, mode)
+
+    members = list(LogValidator().common_validation([archive]))
+    assert members == [
+        member_path(archive, "logs/" + os.path.basename(file))
+        for file in log_files
+    ]
+    expected = [
+        terminated_details(HTCAnalyzer().get_condor_logs(file))
+        for file in log_files
+    ]
+    assert [
+        terminated_details(HTCAnalyzer().get_condor_logs(member))
+        for member in members
+    ] == expected
+    # members requested in reverse order restart a streamed archive
+    assert [
+        terminated_details(HTCAnalyzer().get_condor_logs(member))
+        for member in reversed(members)
+    ] == expected[::-1]
+
+    parallel = list(
+        HTCAnalyzer(workers=2, chunk_size=2).analyze(members)
+    )
+    assert [log.file for log in parallel] == members
+
+
+def test_archive_members_in_forked_workers(tmp_path, log_files):
+    archive = str(tmp_path / "logs.tar")
+    write_archive(archive, log_files, "w")
+    members = list(LogValidator().common_validation([archive]))
+    expected = [
+        terminated_details(HTCAnalyzer().get_condor_logs(member))
+        for member in members
+    ]
+    # the workers inherit the archive opened by this process,
+    # reading through its file descriptor would move the shared offset
+    parallel = HTCAnalyzer(workers=4, chunk_size=1).analyze(members * 10)
+    condor_logs_by_file = {}
+    for log in parallel:
+        condor_logs_by_file.setdefault(log.file, []).append(log)
+    for member, details in zip(members, expected):
+        assert terminated_details(condor_logs_by_file[member]) == details * 10
+    # the archive of this process is still usable afterwards
+    assert terminated_details(
+        HTCAnalyzer().get_condor_logs(members[0])
+    ) == expected[0]
+
+
+def test_single_member(tmp_path, log_files):
+    archive = str(tmp_path / "logs.tar.xz")
+    write_archive(archive, log_files, "w:xz")
+    member = member_path(archive, "logs/normal_log.log")
+    validator = LogValidator()
+    assert list(validator.common_validation([member])) == [member]
+    assert not list(validator.common_validation(
+        [member_path(archive, "logs/normal_log.out")]
+    ))
+    with pytest.raises(OSError):
+        open_log(member_path(archive, "logs/missing.log"))
+
+
+def test_compressed_archive_chunks():
+    files = [
+        "a.log",
+        "logs.tar.gz::1.log",
+        "logs.tar.gz::2.log",
+        "logs.tar.gz::3.log",
+        "logs.tar::1.log",
+        "logs.tar::2.log",
+        "b.log"
+    ]
+    assert HTCAnalyzer._get_chunks(files, 2) == [
+        [
+            "a.log",
+            "logs.tar.gz::1.log",
+            "logs.tar.gz::2.log",
+            "logs.tar.gz::3.log"
+        ],
+        ["logs.tar::1.log", "logs.tar::2.log"],
+        ["b.log"]
+    ]
@@ -0,0 +1,88 @@
+"""Test the LogValidator and its ValidationCache."""
+import os
+import shutil
+
+import pytest
+
+from htcanalyze.log_analyzer.logvalidator import LogValidator
+from htcanalyze.log_analyzer.validation_cache import ValidationCache
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    log_dir = tmp_path / "logs"
+    shutil.copytree(VALID_LOGS_DIR, log_dir)
+    (log_dir / "empty.log").touch()
+    (log_dir / "invalid.log").write_text("no header\n")
+    (log_dir / "binary.log").write_bytes(b"\xff\xfe\x00")
+    return log_dir
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ValidationCache(str(tmp_path / "cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+def validate(validator, path, recursive=False):
+    return list(validator.common_validation([str(path)], recursive))
+
+
+def test_validate_dir(log_dir):
+    serial = validate(LogValidator(workers=1), log_dir)
+    expected = sorted(
+        os.path.join(str(log_dir), file)
+        for file in os.listdir(VALID_LOGS_DIR)
+        if file.endswith(".log")
+    )
+    assert sorted(serial) == expected
+    # the order does not depend on the number of threads
+    assert validate(LogValidator(workers=8), log_dir) == serial
+
+
+def test_recursive(log_dir):
+    nested = log_dir / "nested" / "deeper"
+    nested.mkdir(parents=True)
+    shutil.copy(log_dir / "normal_log.log", nested)
+    validator = LogValidator()
+    # like os.walk, only directories without subdirectories are searched
+    assert validate(validator, log_dir, recursive=True) == [
+        str(nested / "normal_log.log")
+    ]
+    assert str(nested / "normal_log.log") not in validate(validator, log_dir)
+
+
+def test_cached_validation(log_dir, cache, monkeypatch):
+    validator = LogValidator(cache=cache)
+    valid_files = validate(validator, log_dir)
+    # all .log files except the empty one
+    assert len(cache) == len(
+        [file for file in os.listdir(log_dir) if file.endswith(".log")]
+    ) - 1
+
+    def fail(*_):
+        raise AssertionError("header was read")
+
+    monkeypatch.setattr(
+        "htcanalyze.log_analyzer.logvalidator.has_valid_header", fail
+    )
+    assert validate(validator, log_dir) == valid_files
+
+    # changed files are validated again
+    monkeypatch.undo()
+    (log_dir / "invalid.log").write_text("000 (001.000.000) header\n")
+    assert str(log_dir / "invalid.log") in validate(validator, log_dir)
+
+
+def test_cache_directory_not_creatable(log_dir, tmp_path):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    cache = ValidationCache(str(not_a_directory / "cache" / "cache.sqlite"))
+    # validated without the cache
+    assert validate(LogValidator(cache=cache), log_dir) == validate(
+        LogValidator(), log_dir
+    )
+    cache.close()
@@ -1,8 +1,13 @@
 """Blackbox tests with test files."""
 
+import os
 import sys
 import pytest
 from htcanalyze.globals import NORMAL_EXECUTION
+from htcanalyze.log_analyzer.event_handler.event_handler import (
+    SUMMARY_EVENT_TYPES
+)
+from htcanalyze.log_analyzer.analysis_cache import AnalysisCache
 from htcanalyze.main import run
 from . import PseudoTTY
 
@@ -62,5 +67,46 @@ def test_valid_files_analyzed():
     assert pytest_wrapped_e.value.code == NORMAL_EXECUTION
 
 
+def test_partial_summaries_merged(tmp_path):
+    paths = "tests/test_logs/valid_logs"
+    partial = str(tmp_path / "partial.bin")
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        run_htcanalyze(paths, ["--emit-partial", partial, "--jobs", "2"])
+    assert pytest_wrapped_e.value.code == NORMAL_EXECUTION
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        run_htcanalyze([partial, partial], ["--merge"])
+    assert pytest_wrapped_e.value.code == NORMAL_EXECUTION
 
 
+def test_profiled_run(tmp_path):
+    paths = "tests/test_logs/valid_logs"
+    trace = tmp_path / "trace.json"
+    pstats = tmp_path / "run.pstats"
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        run_htcanalyze(
+            paths,
+            ["--profile-trace", str(trace), "--profile-pstats", str(pstats)]
+        )
+    assert pytest_wrapped_e.value.code == NORMAL_EXECUTION
+    assert trace.stat().st_size > 0
+    assert pstats.stat().st_size > 0
+
+
+def test_cache_in_xdg_cache_home(cache_home):
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        run_htcanalyze("tests/test_logs/valid_logs")
+    assert pytest_wrapped_e.value.code == NORMAL_EXECUTION
+    assert list(cache_home.glob("*/analysis_cache.sqlite"))
+
+
+def test_cached_summary_skips_image_size_events(cache_home):
+    log_file = "tests/test_logs/valid_logs/normal_log.log"
+    with pytest.raises(SystemExit) as pytest_wrapped_e:
+        run_htcanalyze(["tests/test_logs/valid_logs"])
+    assert pytest_wrapped_e.value.code == NORMAL_EXECUTION
+    cache = AnalysisCache()
+    # only the entries of the summary events are cached
+    assert cache.get(log_file, os.stat(log_file)) is None
+    condor_logs = cache.get(log_file, os.stat(log_file), SUMMARY_EVENT_TYPES)
+    assert not condor_logs[0].ram_history.image_size_events
+    cache.close()
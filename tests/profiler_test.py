@@ -0,0 +1,142 @@
+"""Test the per-stage timing of the Profiler."""
+import json
+import os
+import time
+
+import pytest
+
+from htcanalyze.log_analyzer.htcanalyzer import EventLogAnalyzer, HTCAnalyzer
+from htcanalyze.log_summarizer.htcsummarizer import HTCSummarizer
+from htcanalyze.profiler import (
+    NULL_PROFILER,
+    Profiler,
+    get_profiler,
+    is_profiling,
+    profiling
+)
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+LOG_FILES = sorted(
+    os.path.join(VALID_LOGS_DIR, file)
+    for file in os.listdir(VALID_LOGS_DIR)
+    if file.endswith(".log")
+)
+
+
+def test_nested_stages():
+    profiler = Profiler()
+    with profiler.stage("analysis", items=1):
+        with profiler.stage("event reading", items=3, n_bytes=100):
+            time.sleep(0.02)
+    analysis = profiler.stages["analysis"]
+    reading = profiler.stages["event reading"]
+    assert analysis.calls == reading.calls == 1
+    assert (analysis.items, reading.items, reading.n_bytes) == (1, 3, 100)
+    assert reading.self_wall >= 0.02
+    # the nested stage is not part of the self time
+    assert analysis.wall >= reading.wall
+    assert analysis.self_wall < 0.02
+    assert [stats.name for stats in profiler.ordered_stages()] == [
+        "analysis", "event reading"
+    ]
+
+
+def test_iterate():
+    profiler = Profiler(trace=True)
+    assert list(profiler.iterate("event reading", range(5))) == list(range(5))
+    stats = profiler.stages["event reading"]
+    assert stats.items == 5
+    # the last call raises StopIteration
+    assert stats.calls == 6
+    # single items are not traced
+    assert not profiler.trace_events
+
+
+def test_iterate_exception():
+    def events():
+        yield 1
+        raise ValueError("broken")
+
+    profiler = Profiler()
+    with pytest.raises(ValueError):
+        with profiler.stage("event dispatch"):
+            list(profiler.iterate("event reading", events()))
+    assert profiler.stages["event reading"].items == 1
+    assert not profiler._stack
+
+
+def test_null_profiler():
+    assert not is_profiling()
+    assert get_profiler() is NULL_PROFILER
+    events = iter(range(3))
+    assert NULL_PROFILER.iterate("event reading", events) is events
+    with NULL_PROFILER.stage("analysis", items=1):
+        NULL_PROFILER.count("analysis", items=1)
+
+
+def test_profiling():
+    profiler = Profiler()
+    with profiling(profiler):
+        assert get_profiler() is profiler
+        with profiling(None):
+            assert not is_profiling()
+        assert is_profiling()
+    assert not is_profiling()
+
+
+def test_merge():
+    profiler = Profiler(trace=True)
+    worker = Profiler(trace=True)
+    with profiler.stage("analysis", items=1):
+        pass
+    with worker.stage("analysis", items=2):
+        pass
+    profiler.merge(worker)
+    assert profiler.stages["analysis"].items == 3
+    assert profiler.stages["analysis"].calls == 2
+    assert len(profiler.trace_events) == 2
+
+
+def test_write_trace(tmp_path):
+    profiler = Profiler(trace=True)
+    with profiler.stage("validation"):
+        with profiler.stage("analysis"):
+            pass
+    file = str(tmp_path / "trace.json")
+    profiler.write_trace(file)
+    with open(file) as trace_file:
+        trace = json.load(trace_file)
+    assert [event["name"] for event in trace["traceEvents"]] == [
+        "analysis", "validation"
+    ]
+    for event in trace["traceEvents"]:
+        assert event["ph"] == "X"
+        assert event["dur"] >= 0
+        assert event["pid"] == os.getpid()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analysis_stages(workers):
+    with profiling(Profiler()) as profiler:
+        HTCSummarizer(
+            HTCAnalyzer(workers=workers).analyze(LOG_FILES)
+        ).summarize()
+    stages = profiler.stages
+    # the stages of the workers are merged
+    assert stages["analysis"].items == len(LOG_FILES)
+    assert stages["event reading"].items > 0
+    assert stages["event reading"].n_bytes > 0
+    assert stages["event dispatch"].calls == len(LOG_FILES)
+    assert stages["event dispatch"].items == stages["event reading"].items
+    assert stages["summarization"].items == len(LOG_FILES)
+
+
+def test_event_log_stages():
+    with profiling(Profiler(trace=True)) as profiler:
+        condor_logs = list(EventLogAnalyzer().analyze(LOG_FILES))
+    stages = profiler.stages
+    assert condor_logs
+    assert stages["event dispatch"].items == stages["event reading"].items
+    assert stages["event dispatch"].items > len(LOG_FILES)
+    # a stage per event is not traced
+    assert not profiler.trace_events
@@ -0,0 +1,204 @@
+"""Test the RDNSResolver and the persistent RDNSCache."""
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from htcanalyze.log_analyzer import rdns_resolver
+from htcanalyze.log_analyzer.event_handler.node_cache import NodeCache
+from htcanalyze.log_analyzer.htcanalyzer import EventLogAnalyzer, HTCAnalyzer
+from htcanalyze.log_analyzer.rdns_cache import RDNSCache
+from htcanalyze.log_analyzer.rdns_resolver import RDNSResolver
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+UNKNOWN_ADDRESS = "10.0.9.201"
+
+
+class FakeLookup:
+    """Resolves 1.2.3.4 as node-1-2-3-4, UNKNOWN_ADDRESS fails."""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, address):
+        with self.lock:
+            self.calls.append(address)
+        time.sleep(self.delay)
+        if address == UNKNOWN_ADDRESS:
+            raise OSError("host not found")
+        return "node-" + address.replace(".", "-")
+
+
+@pytest.fixture(autouse=True)
+def empty_node_cache(monkeypatch):
+    monkeypatch.setattr(NodeCache(), "rdns_cache", {})
+
+
+@pytest.fixture
+def rdns_cache(tmp_path):
+    rdns_cache = RDNSCache(str(tmp_path / "cache.sqlite"))
+    yield rdns_cache
+    rdns_cache.close()
+
+
+@pytest.fixture(scope="module")
+def log_files():
+    return sorted(
+        os.path.join(VALID_LOGS_DIR, file)
+        for file in os.listdir(VALID_LOGS_DIR)
+        if file.endswith(".log")
+    )
+
+
+def host_addresses(condor_logs):
+    """Addresses of the execution events and of all execution attempts."""
+    addresses = set()
+    for condor_log in condor_logs:
+        job_details = condor_log.job_details
+        if job_details.set_events.execution_event is not None:
+            addresses.add(job_details.set_events.execution_event.host_address)
+        addresses.update(
+            attempt.host_address for attempt in job_details.execution_attempts
+        )
+    return addresses
+
+
+def test_resolve():
+    lookup = FakeLookup()
+    resolver = RDNSResolver(lookup=lookup, workers=4)
+    addresses = ["10.0.9.1", "10.0.9.2", UNKNOWN_ADDRESS, "10.0.9.1"]
+    assert resolver.resolve(addresses) == {
+        "10.0.9.1": "node-10-0-9-1",
+        "10.0.9.2": "node-10-0-9-2",
+        UNKNOWN_ADDRESS: UNKNOWN_ADDRESS
+    }
+    assert sorted(lookup.calls) == sorted(set(addresses))
+    # the negative lookup is kept in memory as well
+    resolver.resolve(addresses)
+    assert len(lookup.calls) == 3
+
+
+def test_timeout():
+    resolver = RDNSResolver(lookup=FakeLookup(delay=1), timeout=0.1)
+    start = time.monotonic()
+    assert resolver.resolve(["10.0.9.1"]) == {"10.0.9.1": "10.0.9.1"}
+    assert time.monotonic() - start < 1
+
+
+def test_timed_out_lookup_is_replaced():
+    class SlowLookup(FakeLookup):
+        def __call__(self, address):
+            if address == "10.0.9.1":
+                time.sleep(1)
+            return super().__call__(address)
+
+    resolver = RDNSResolver(lookup=SlowLookup(), workers=1, timeout=0.1)
+    start = time.monotonic()
+    # the other address is looked up in a new thread
+    assert resolver.resolve(["10.0.9.1", "10.0.9.2"]) == {
+        "10.0.9.1": "10.0.9.1",
+        "10.0.9.2": "node-10-0-9-2"
+    }
+    assert time.monotonic() - start < 1
+
+
+def test_timed_out_lookup_does_not_block_exit():
+    code = (
+        "import time\n"
+        "from htcanalyze.log_analyzer.rdns_resolver import RDNSResolver\n"
+        "RDNSResolver(lookup=lambda _: time.sleep(60), timeout=0.1)"
+        ".resolve(['10.0.9.1'])\n"
+    )
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=30)
+    assert time.monotonic() - start < 30
+
+
+def test_persistent_cache(rdns_cache):
+    RDNSResolver(rdns_cache, lookup=FakeLookup()).resolve(
+        ["10.0.9.1", UNKNOWN_ADDRESS]
+    )
+    assert rdns_cache.get_many(["10.0.9.1", UNKNOWN_ADDRESS]) == {
+        "10.0.9.1": "node-10-0-9-1",
+        UNKNOWN_ADDRESS: None
+    }
+    # a new process only has the persistent cache
+    NodeCache().rdns_cache.clear()
+    lookup = FakeLookup()
+    hosts = RDNSResolver(rdns_cache, lookup=lookup).resolve(
+        ["10.0.9.1", UNKNOWN_ADDRESS]
+    )
+    assert hosts["10.0.9.1"] == "node-10-0-9-1"
+    assert hosts[UNKNOWN_ADDRESS] == UNKNOWN_ADDRESS
+    assert not lookup.calls
+
+
+def test_timed_out_lookups_are_not_cached(rdns_cache):
+    RDNSResolver(
+        rdns_cache,
+        lookup=FakeLookup(delay=1),
+        timeout=0.1
+    ).resolve(["10.0.9.1"])
+    assert rdns_cache.get_many(["10.0.9.1"]) == {}
+
+
+def test_expiry(tmp_path):
+    rdns_cache = RDNSCache(str(tmp_path / "cache.sqlite"), negative_ttl=0)
+    rdns_cache.put_many({"10.0.9.1": "node", UNKNOWN_ADDRESS: None})
+    assert rdns_cache.get_many(["10.0.9.1", UNKNOWN_ADDRESS]) == {
+        "10.0.9.1": "node"
+    }
+    rdns_cache.close()
+
+
+def test_eviction(tmp_path):
+    rdns_cache = RDNSCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    rdns_cache.put_many({"10.0.9.1": "node-1"})
+    rdns_cache.put_many({"10.0.9.2": "node-2", "10.0.9.3": "node-3"})
+    assert len(rdns_cache) == 2
+    # the entry expiring first is evicted
+    assert rdns_cache.get_many(["10.0.9.1", "10.0.9.2", "10.0.9.3"]) == {
+        "10.0.9.2": "node-2",
+        "10.0.9.3": "node-3"
+    }
+    rdns_cache.close()
+
+
+def test_rebuild(rdns_cache):
+    rdns_cache.put_many({"10.0.9.1": "node"})
+    rebuilt = RDNSCache(rdns_cache.path, rebuild=True)
+    assert len(rebuilt) == 0
+    rebuilt.close()
+
+
+def test_analyze_resolves_in_batches(log_files, monkeypatch):
+    lookup = FakeLookup()
+    monkeypatch.setattr(rdns_resolver, "get_host_by_addr", lookup)
+    addresses = host_addresses(HTCAnalyzer().analyze(log_files))
+    condor_logs = list(
+        HTCAnalyzer(rdns_lookup=True, workers=2).analyze(log_files)
+    )
+    assert host_addresses(condor_logs) == {
+        address if address == UNKNOWN_ADDRESS
+        else "node-" + address.replace(".", "-")
+        for address in addresses
+    }
+    # each address is looked up once
+    assert sorted(lookup.calls) == sorted(addresses)
+
+
+def test_event_log_resolves_in_batches(log_files, monkeypatch):
+    monkeypatch.setattr(rdns_resolver, "get_host_by_addr", FakeLookup())
+    condor_logs = list(
+        EventLogAnalyzer(rdns_lookup=True).analyze(log_files[:1])
+    )
+    assert condor_logs
+    assert all(
+        host.startswith("node-") or host == UNKNOWN_ADDRESS
+        for host in host_addresses(condor_logs)
+    )
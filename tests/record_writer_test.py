@@ -0,0 +1,87 @@
+"""Test the machine-readable output formats."""
+import csv
+import io
+import json
+import os
+
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+from htcanalyze.log_summarizer.htcsummarizer import HTCSummarizer
+from htcanalyze.view.record_writer import (
+    CONDOR_LOG_COLUMNS,
+    SUMMARY_COLUMNS,
+    CsvWriter,
+    JsonLinesWriter,
+    iter_records,
+    to_record
+)
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+LOG_FILES = sorted(
+    os.path.join(VALID_LOGS_DIR, file)
+    for file in os.listdir(VALID_LOGS_DIR)
+    if file.endswith(".log")
+)
+
+
+def test_to_record():
+    condor_log, = HTCAnalyzer().get_condor_logs(
+        os.path.join(VALID_LOGS_DIR, "normal_log.log")
+    )
+    record = to_record(condor_log)
+    assert record["job_id"] == "107799.0"
+    job_details = record["job_details"]
+    assert job_details["state"] == "NORMAL_TERMINATION"
+    assert job_details["time_manager"]["total_runtime"] == 359
+    assert job_details["time_manager"]["submission_date"].endswith(
+        "-07-11T20:39:51"
+    )
+    gpu_resource = (
+        job_details["set_events"]["termination_event"]["resources"]
+        ["gpu_resource"]
+    )
+    assert gpu_resource["usage"] is None
+    # strict JSON, no NaN
+    json.dumps(record, allow_nan=False)
+
+
+def test_json_lines_are_streamed():
+    condor_logs = HTCAnalyzer().analyze(LOG_FILES)
+    file = io.StringIO()
+    writer = JsonLinesWriter(file)
+    for i, condor_log in enumerate(condor_logs, start=1):
+        writer.write(condor_log)
+        # every record is written as soon as it is given
+        assert len(file.getvalue().splitlines()) == i
+    records = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert [record["file"] for record in records] == LOG_FILES
+
+
+def test_csv():
+    condor_logs = list(HTCAnalyzer().analyze(LOG_FILES))
+    file = io.StringIO()
+    assert CsvWriter(file).write_all(condor_logs) == len(condor_logs)
+    rows = list(csv.DictReader(io.StringIO(file.getvalue())))
+    assert list(rows[0]) == CONDOR_LOG_COLUMNS
+    assert [row["file"] for row in rows] == LOG_FILES
+
+    summaries = HTCSummarizer(condor_logs).summarize()
+    file = io.StringIO()
+    CsvWriter(file).write_all(summaries)
+    rows = list(csv.DictReader(io.StringIO(file.getvalue())))
+    assert list(rows[0]) == SUMMARY_COLUMNS
+    assert sum(int(row["n_jobs"]) for row in rows) == len(condor_logs)
+    normal, = (row for row in rows if row["state"] == "NORMAL_TERMINATION")
+    assert float(normal["waiting_time_min"]) <= float(
+        normal["waiting_time_p50"]
+    ) <= float(normal["waiting_time_max"])
+
+
+def test_iter_records():
+    summaries = HTCSummarizer(HTCAnalyzer().analyze(LOG_FILES)).summarize()
+    records = list(iter_records(summaries))
+    flat_records = list(iter_records(summaries, flat=True))
+    assert len(records) == len(flat_records) == len(summaries)
+    for record, flat_record in zip(records, flat_records):
+        assert record["state"] == flat_record["state"]
+        assert record["n_jobs"] == flat_record["n_jobs"]
+        assert set(flat_record) <= set(SUMMARY_COLUMNS)
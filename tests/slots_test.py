@@ -0,0 +1,175 @@
+"""Test the __slots__ of the objects created per event and per job."""
+import json
+import os
+import pickle
+import tracemalloc
+from datetime import datetime as date_time
+
+import pytest
+
+from htcanalyze import SlotsReprObject
+from htcanalyze.log_analyzer.htcanalyzer import HTCAnalyzer
+from htcanalyze.log_analyzer.condor_log.logresource import (
+    CPULogResource,
+    DiskLogResource,
+    GPULogResource,
+    LogResources,
+    MemoryLogResource
+)
+from htcanalyze.log_analyzer.condor_log.time_manager import (
+    JobTimes,
+    TimeManager
+)
+from htcanalyze.log_analyzer.event_handler.job_events import (
+    ImageSizeEvent,
+    JobAbortedEvent,
+    JobExecutionEvent,
+    JobHeldEvent,
+    JobTerminationEvent,
+    NormalTerminationEvent
+)
+from htcanalyze.log_analyzer.event_handler.set_events import SETEvents
+from htcanalyze.log_analyzer.event_handler.states import (
+    AbortedState,
+    JobHeldState,
+    NormalTerminationState
+)
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+TIME_STAMP = date_time(2021, 7, 11, 20, 41)
+N_OBJECTS = 10_000
+# bytes per object, with an instance dictionary an ImageSizeEvent
+# took 112 bytes and LogResources (with three resources) 416 bytes
+BYTES_PER_OBJECT = {
+    ImageSizeEvent: 80,
+    LogResources: 300
+}
+# an analyzed job of the test logs took 3800 bytes with instance dicts
+BYTES_PER_JOB = 3200
+
+
+def resources():
+    return LogResources(
+        CPULogResource(0.5, 1.0, 1.0),
+        DiskLogResource(1.0, 2.0, 2.0),
+        MemoryLogResource(1.0, 2.0, 2.0),
+        GPULogResource(0.9, 1.0, 1.0, "CUDA0")
+    )
+
+
+SLOTTED_OBJECTS = [
+    ImageSizeEvent(6, TIME_STAMP, 1024, 1, 1024),
+    JobExecutionEvent(1, TIME_STAMP, "10.0.9.1"),
+    JobHeldEvent(12, TIME_STAMP, "held"),
+    JobAbortedEvent(9, TIME_STAMP, "aborted"),
+    NormalTerminationEvent(5, TIME_STAMP, resources(), 0),
+    resources(),
+    SETEvents(None, JobExecutionEvent(1, TIME_STAMP), None),
+    JobTimes(),
+    TimeManager(TIME_STAMP, TIME_STAMP, TIME_STAMP),
+    NormalTerminationState(),
+    JobHeldState()
+]
+
+
+@pytest.mark.parametrize("obj", SLOTTED_OBJECTS)
+def test_no_instance_dict(obj):
+    with pytest.raises(AttributeError):
+        obj.undeclared_attribute = None
+
+
+@pytest.mark.parametrize("obj", SLOTTED_OBJECTS)
+def test_pickle(obj):
+    copy = pickle.loads(pickle.dumps(obj))
+    assert type(copy) is type(obj)
+    assert repr(copy) == repr(obj)
+
+
+def test_unpickle_instance_dict():
+    # pickled by a version without __slots__
+    event = ImageSizeEvent.__new__(ImageSizeEvent)
+    event.__setstate__({
+        "event_number": 6,
+        "time_stamp": TIME_STAMP,
+        "memory_usage": 1
+    })
+    assert event.memory_usage == 1
+    assert event.size_update is None
+
+
+def test_repr():
+    event = ImageSizeEvent(6, None, 1024, 1, 1024)
+    assert json.loads(repr(event)) == {
+        "event_number": 6,
+        "time_stamp": None,
+        "size_update": 1024,
+        "memory_usage": 1,
+        "resident_set_size": 1024
+    }
+    assert json.loads(repr(CPULogResource(0.5, 1.0, 1.0))) == {
+        "usage": 0.5,
+        "requested": 1.0,
+        "allocated": 1.0,
+        "description": "Cpus"
+    }
+    assert json.loads(repr(AbortedState()))["_name"] == "ABORTED"
+
+
+def test_equality():
+    assert resources() == resources()
+    assert CPULogResource(0.5, 1.0, 1.0) != CPULogResource(0.6, 1.0, 1.0)
+    assert NormalTerminationState() == NormalTerminationState()
+
+
+def test_aborted_event_is_termination_event():
+    event = JobAbortedEvent(9, TIME_STAMP, "aborted")
+    assert isinstance(event, JobTerminationEvent)
+    assert isinstance(event.termination_state, AbortedState)
+    assert event.resources is None
+    assert isinstance(event, SlotsReprObject)
+
+
+@pytest.mark.parametrize("create", [
+    lambda: ImageSizeEvent(6, TIME_STAMP, 1024, 1, 1024),
+    lambda: LogResources(
+        CPULogResource(0.5, 1.0, 1.0),
+        DiskLogResource(1.0, 2.0, 2.0),
+        MemoryLogResource(1.0, 2.0, 2.0)
+    )
+])
+def test_bytes_per_object(create):
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        objects = [create() for _ in range(N_OBJECTS)]
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    bytes_per_object = size / N_OBJECTS - 8  # the list of the objects
+    print(f"{type(objects[0]).__name__}: {bytes_per_object:.1f} bytes")
+    assert bytes_per_object <= BYTES_PER_OBJECT[type(objects[0])]
+
+
+def test_bytes_per_analyzed_job():
+    log_files = sorted(
+        os.path.join(VALID_LOGS_DIR, file)
+        for file in os.listdir(VALID_LOGS_DIR)
+        if file.endswith(".log")
+    )
+    analyzer = HTCAnalyzer()
+    # the modules and caches are loaded by a first run
+    list(analyzer.analyze(log_files))
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        condor_logs = [
+            condor_log
+            for _ in range(10)
+            for condor_log in analyzer.analyze(log_files)
+        ]
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    bytes_per_job = size / len(condor_logs)
+    print(f"analyzed job: {bytes_per_job:.1f} bytes")
+    assert bytes_per_job <= BYTES_PER_JOB
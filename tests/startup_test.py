@@ -0,0 +1,76 @@
+"""Test that the script starts without importing the heavy modules."""
+import re
+import subprocess
+import sys
+
+import pytest
+
+from htcanalyze.main import version
+
+HEAVY_MODULES = {"htcondor", "numpy", "plotille", "rich"}
+# imported only for an analysis
+DEFERRED_MODULES = ("numpy", "htcondor", "rich.live", "sqlite3")
+IMPORT_TIME_REGEX = re.compile(
+    r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)"
+)
+
+
+def import_times(*args) -> dict:
+    """Run the script with -X importtime, cumulative time by module."""
+    script = (
+        "import sys; from htcanalyze.main import main; "
+        f"sys.argv = ['htcanalyze', *{list(args)!r}]; main()"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=False
+    )
+    return {
+        match.group(4): int(match.group(2))
+        for match in map(IMPORT_TIME_REGEX.match, process.stderr.splitlines())
+        if match
+    }
+
+
+@pytest.mark.parametrize("args", [
+    ["--version"],
+    ["--help"]
+])
+def test_startup_imports(args):
+    times = import_times(*args, "--ignore-config")
+    assert "htcanalyze.main" in times
+    assert not HEAVY_MODULES.intersection(times)
+
+
+def test_import_main():
+    script = (
+        "import sys; import htcanalyze.main; "
+        f"print(*[m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", script],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+    # the machine independent part of the startup time
+    assert process.stdout.split() == []
+
+
+def test_htcondor_module_is_not_needed():
+    times = import_times(
+        "tests/test_logs/valid_logs",
+        "--ignore-config",
+        "--no-cache"
+    )
+    assert "htcanalyze.log_analyzer.htcanalyzer" in times
+    # all test logs are read by the UserLogParser
+    assert "htcondor" not in times
+
+
+def test_version():
+    assert version()
@@ -0,0 +1,158 @@
+"""Test the job states, immutable singletons hashed by identity."""
+import json
+import pickle
+from datetime import datetime as date_time
+
+import pytest
+
+from htcanalyze.log_analyzer.condor_log.error_events import (
+    LogfileErrorEvents
+)
+from htcanalyze.log_analyzer.event_handler.job_events import ErrorEvent
+from htcanalyze.log_analyzer.event_handler.states import (
+    AbnormalTerminationState,
+    AbortedState,
+    ErrorState,
+    ErrorWhileReadingState,
+    ExecutableErrorState,
+    InvalidHostAddressState,
+    InvalidUserAddressState,
+    JobDisconnectedState,
+    JobEvictedState,
+    JobHeldState,
+    JobReconnectFailedState,
+    JobSuspendedState,
+    NormalTerminationState,
+    RunningState,
+    ShadowExceptionState,
+    WaitingState
+)
+from htcanalyze.log_summarizer.htcsummarizer import (
+    SUMMARIZER_BY_STATE,
+    HTCSummarizer
+)
+from htcanalyze.log_summarizer.summarizer.error_event_summarizer import (
+    ErrorEventManager
+)
+
+TIME_STAMP = date_time(2021, 7, 11, 20, 41)
+STATE_CLASSES = [
+    NormalTerminationState,
+    AbnormalTerminationState,
+    WaitingState,
+    RunningState,
+    ErrorWhileReadingState,
+    InvalidHostAddressState,
+    InvalidUserAddressState,
+    AbortedState,
+    JobHeldState,
+    ShadowExceptionState,
+    JobSuspendedState,
+    JobEvictedState,
+    ExecutableErrorState,
+    JobDisconnectedState,
+    JobReconnectFailedState
+]
+ERROR_STATE_CLASSES = [
+    state_class for state_class in STATE_CLASSES
+    if issubclass(state_class, ErrorState)
+]
+
+
+@pytest.mark.parametrize("state_class", STATE_CLASSES)
+def test_singleton(state_class):
+    assert state_class() is state_class()
+    assert state_class() == state_class()
+
+
+@pytest.mark.parametrize("state_class", STATE_CLASSES)
+def test_immutable(state_class):
+    state = state_class()
+    with pytest.raises(AttributeError):
+        state.name = "CHANGED"
+    with pytest.raises(AttributeError):
+        state.other = None
+    assert state.name
+    assert state.color
+
+
+def test_distinct():
+    states = [state_class() for state_class in STATE_CLASSES]
+    assert len({state.name for state in states}) == len(states)
+    assert len({hash(state) for state in states}) == len(states)
+    assert len(set(states)) == len(states)
+    assert WaitingState() != RunningState()
+    # no longer equal to instances of a base class
+    assert AbortedState() != ErrorWhileReadingState()
+
+
+@pytest.mark.parametrize("state_class", STATE_CLASSES)
+def test_pickle(state_class):
+    assert pickle.loads(pickle.dumps(state_class())) is state_class()
+
+
+def test_unpickle_old_state():
+    """States pickled with their name and color are the singletons."""
+    old_state = {"_name": "JOB_HELD", "_color": "red"}
+    # NEWOBJ of the class without arguments, BUILD with the old dict
+    old_pickle = (
+        b"\x80\x02c" + JobHeldState.__module__.encode()
+        + b"\nJobHeldState\n)\x81"
+        + pickle.dumps(old_state, protocol=2)[2:-1]
+        + b"b."
+    )
+    assert pickle.loads(old_pickle) is JobHeldState()
+
+
+def test_repr():
+    state = json.loads(repr(ShadowExceptionState()))
+    assert state == {"_name": "SHADOW_EXCEPTION", "_color": "red"}
+
+
+def test_summarizer_by_state():
+    for state, summarizer_class in SUMMARIZER_BY_STATE.items():
+        assert isinstance(
+            HTCSummarizer._get_summarizer_by_state(state),
+            summarizer_class
+        )
+    with pytest.raises(ValueError):
+        HTCSummarizer._get_summarizer_by_state(JobHeldState())
+
+
+def test_error_event_manager():
+    error_event_manager = ErrorEventManager()
+    for i, state_class in enumerate(ERROR_STATE_CLASSES * 3):
+        error_event_manager.add_events(
+            LogfileErrorEvents(
+                [ErrorEvent(i, TIME_STAMP, state_class(), "reason")] * 2,
+                file=f"job{i}.log"
+            )
+        )
+    collections = error_event_manager.error_event_collections
+    assert [collection.error_state for collection in collections] == [
+        state_class() for state_class in ERROR_STATE_CLASSES
+    ]
+    for collection in collections:
+        assert collection.n_error_events == 6
+        assert collection.n_files == 3
+
+
+def test_no_comparison_in_lookups(monkeypatch):
+    """
+    The previous states hashed all alike and each lookup compared the
+    key with every state of the dictionary, now none is compared.
+    """
+    comparisons = []
+
+    def count_comparisons(self, other):
+        comparisons.append(other)
+        return self is other
+
+    states = [state_class() for state_class in STATE_CLASSES]
+    state_dict = {state: i for i, state in enumerate(states)}
+    monkeypatch.setattr(
+        ErrorState, "__eq__", count_comparisons, raising=False
+    )
+    for i, state in enumerate(states):
+        assert state_dict[state] == i
+    assert not comparisons
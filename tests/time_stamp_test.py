@@ -0,0 +1,53 @@
+"""Test the fixed-format time stamp decoder against strptime."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from htcanalyze.globals import STRP_FORMAT
+from htcanalyze.log_analyzer.event_handler.time_stamp import (
+    decode_epoch,
+    decode_time_stamp
+)
+
+
+def test_same_as_strptime():
+    date = datetime(2019, 12, 31, 23, 59, 58)
+    for _ in range(1000):
+        time_stamp = date.strftime(STRP_FORMAT)
+        assert decode_time_stamp(time_stamp) == datetime.strptime(
+            time_stamp, STRP_FORMAT
+        )
+        date += timedelta(seconds=3607)
+
+
+def test_non_ascii_digits():
+    # left to strptime, which accepts them in the year only
+    time_stamp = "\uff12021-07-11T20:41:00"
+    assert decode_time_stamp(time_stamp) == datetime.strptime(
+        time_stamp, STRP_FORMAT
+    )
+
+
+def test_epoch():
+    assert decode_epoch("1970-01-01T00:00:00") == 0
+    assert decode_epoch("2021-07-11T20:41:00") == int(
+        (datetime(2021, 7, 11, 20, 41) - datetime(1970, 1, 1)).total_seconds()
+    )
+
+
+@pytest.mark.parametrize("time_stamp", [
+    "2021-02-30T00:00:00",
+    "2021-07-11 20:41:00",
+    "2021-07-11T20:41",
+    "2021-07-11T20:41:00.5",
+    "2021-07-11T+0:41:00",
+    "2021-07-11T2 :41:00",
+    # non-ASCII digits
+    "2021-07-11T2\u0660:41:00",
+    "garbage"
+])
+def test_invalid(time_stamp):
+    with pytest.raises(ValueError):
+        datetime.strptime(time_stamp, STRP_FORMAT)
+    with pytest.raises(ValueError):
+        decode_time_stamp(time_stamp)
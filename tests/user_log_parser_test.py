@@ -0,0 +1,374 @@
+"""
+Test the UserLogParser against the HTCondor python bindings.
+
+Every valid test log has to result in the same events and
+the same values for the attributes read by the parser.
+"""
+import gzip
+import os
+import random
+from datetime import datetime
+
+import pytest
+from htcondor import JobEventLog
+
+from htcanalyze.log_analyzer.event_handler import (
+    event_handler,
+    user_log_parser
+)
+from htcanalyze.log_analyzer.event_handler.event_handler import (
+    STATE_EVENT_TYPES,
+    SUMMARY_EVENT_TYPES,
+    EventHandler,
+    ReadLogException
+)
+from htcanalyze.log_analyzer.event_handler.user_log_parser import (
+    PAYLOAD_READERS,
+    UserLogParser,
+    UserLogEvent,
+    JobEventType,
+    UnsupportedEventError
+)
+
+VALID_LOGS_DIR = "tests/test_logs/valid_logs"
+VALID_LOGS = sorted(
+    os.path.join(VALID_LOGS_DIR, file)
+    for file in os.listdir(VALID_LOGS_DIR)
+    if file.endswith(".log")
+)
+TERMINATED_LOGS = [
+    file for file in VALID_LOGS
+    if "just_submission" not in file and "running" not in file
+]
+
+FAULTY_RESOURCE_LOGS_DIR = "tests/test_logs/faulty_resource_logs"
+FAULTY_RESOURCE_LOGS = sorted(
+    os.path.join(FAULTY_RESOURCE_LOGS_DIR, file)
+    for file in os.listdir(FAULTY_RESOURCE_LOGS_DIR)
+)
+
+SUBMIT_BLOCK = (
+    "000 (107799.000.000) 07/11 20:39:51 Job submitted from host: "
+    "<10.0.8.10:9618?addrs=10.0.8.10-9618&noUDP&sock=2364585_35f2_3>\n"
+    "...\n"
+)
+
+
+@pytest.mark.parametrize("file", VALID_LOGS)
+def test_same_events_as_bindings(file):
+    htc_events = list(JobEventLog(file).events(0))
+    events = list(UserLogParser(file).events())
+    assert len(events) == len(htc_events)
+    for event, htc_event in zip(events, htc_events):
+        assert event.type == htc_event.type
+        assert event.cluster == htc_event.cluster
+        assert event.proc == htc_event.proc
+        assert event.get("EventTime") == htc_event.get("EventTime")
+        for key, value in event.attributes.items():
+            # the htcondor module skips the resources of evicted jobs
+            if (
+                    event.type == JobEventType.JOB_EVICTED
+                    and key not in htc_event
+            ):
+                continue
+            assert value == htc_event.get(key), key
+
+
+def test_termination_event():
+    file = os.path.join(VALID_LOGS_DIR, "gpu_usage.log")
+    termination_event = list(UserLogParser(file).events())[-1]
+    assert termination_event.type == JobEventType.JOB_TERMINATED
+    assert termination_event.event_number == 5
+    assert termination_event.get("TerminatedNormally") is True
+    assert termination_event.get("ReturnValue") == 0
+    assert termination_event.get("CpusUsage") == 0.11
+    assert termination_event.get("RequestDisk") == 220200960
+    assert termination_event.get("Disk") == 222312484
+    assert termination_event.get("AssignedGpus") == "CUDA4"
+    assert termination_event.get("RequestGpus") == 1
+    assert termination_event.get("NotThere", 42) == 42
+
+
+def test_iso_time_stamp():
+    event = UserLogParser(None).parse_block([
+        "000 (1.2.3) 2021-07-11 20:39:51 Job submitted from host: <a:1?b>"
+    ])
+    assert event.time_stamp == datetime(2021, 7, 11, 20, 39, 51)
+    assert (event.cluster, event.proc, event.subproc) == (1, 2, 3)
+    assert event.get("SubmitHost") == "<a:1?b>"
+
+
+def test_unsupported_event():
+    parser = UserLogParser(None)
+    with pytest.raises(UnsupportedEventError):
+        parser.parse_block(["no event header"])
+    with pytest.raises(UnsupportedEventError):
+        parser.parse_block([
+            "007 (1.0.0) 07/11 20:39:51 Image size of job updated: 1"
+        ])
+    with pytest.raises(UnsupportedEventError):
+        parser.parse_block([])
+
+
+@pytest.mark.parametrize("file", FAULTY_RESOURCE_LOGS)
+def test_misaligned_resources_are_read_by_bindings(file):
+    with pytest.raises(UnsupportedEventError):
+        list(UserLogParser(file).events())
+    htc_event = list(JobEventLog(file).events(0))[-1]
+    event = list(EventHandler().get_events(file))[-1]
+    assert event.type == JobEventType.JOB_TERMINATED
+    assert dict(event.items()) == dict(htc_event.items())
+
+
+def test_resource_fields():
+    def read_cpus(row):
+        event = UserLogParser(None).parse_block([
+            "005 (1.0.0) 07/11 20:39:51 Job terminated.",
+            "\t(1) Normal termination (return value 0)",
+            "\tPartitionable Resources :    Usage  Request Allocated",
+            "\t   Cpus                 :" + row
+        ])
+        return tuple(
+            event.get(key) for key in ("CpusUsage", "RequestCpus", "Cpus")
+        )
+
+    assert read_cpus("    0.11        1         1") == (0.11, 1, 1)
+    # the Usage and Request fields end one character after their header
+    assert read_cpus("       5.0        1        1") == (5.0, 1, 1)
+    assert read_cpus("    0.11        1  1") == (0.11, 1, 1)
+    assert read_cpus("                          1") == (None, None, 1)
+    for row in [
+        "    0.11 1                1",
+        "    0.11        1 1",
+        "    0.11        1           1",
+        "        1.3   12        34"
+    ]:
+        with pytest.raises(UnsupportedEventError):
+            read_cpus(row)
+
+
+def test_offset_and_incomplete_event(tmp_path):
+    file = tmp_path / "job.log"
+    file.write_text(SUBMIT_BLOCK + "\n001 (107799.000.000) 07/11 20:39:54")
+    parser = UserLogParser(str(file))
+    events = list(parser.events())
+    assert len(events) == 1
+    assert isinstance(events[0], UserLogEvent)
+    # the incomplete event is not consumed, empty lines are
+    assert parser.offset == len(SUBMIT_BLOCK) + 1
+
+    with open(file, "a") as log_file:
+        log_file.write(" Job executing on host: <10.0.9.1:9618?a>\n...\n")
+    events = list(parser.events())
+    assert [event.type for event in events] == [JobEventType.EXECUTE]
+    assert parser.offset == os.path.getsize(file)
+
+
+def test_get_events_falls_back_to_bindings():
+    file = os.path.join(VALID_LOGS_DIR, "my_own_log.logging")
+    event_handler = EventHandler()
+    events = []
+    with pytest.raises(ReadLogException):
+        for event in event_handler.get_events(file):
+            events.append(event)
+    # the parser read the first four events, the bindings failed on the next
+    assert len(events) == 4
+    assert all(isinstance(event, UserLogEvent) for event in events)
+
+
+def test_fallback_continues_with_failed_event(monkeypatch):
+    def unsupported(description, _):
+        raise UnsupportedEventError(description)
+
+    file = os.path.join(VALID_LOGS_DIR, "job_evicted.log")
+    monkeypatch.setitem(
+        PAYLOAD_READERS, JobEventType.JOB_EVICTED, unsupported
+    )
+    with pytest.raises(UnsupportedEventError) as info:
+        list(UserLogParser(file).events())
+    assert info.value.event_id == (JobEventType.JOB_EVICTED, 164275, 0)
+    assert [event.type for event in EventHandler().get_events(file)] == [
+        event.type for event in JobEventLog(file).events(0)
+    ]
+
+
+def test_fallback_with_other_event_count(monkeypatch):
+    class MiscountingParser(UserLogParser):
+        def events(self):
+            try:
+                yield from super().events()
+            except UnsupportedEventError:
+                self.n_events += 1
+                raise
+
+    def unsupported(description, _):
+        raise UnsupportedEventError(description)
+
+    file = os.path.join(VALID_LOGS_DIR, "job_evicted.log")
+    monkeypatch.setitem(
+        PAYLOAD_READERS, JobEventType.JOB_EVICTED, unsupported
+    )
+    monkeypatch.setattr(event_handler, "UserLogParser", MiscountingParser)
+    handler = EventHandler()
+    # the bindings would skip the event the parser failed on
+    with pytest.raises(ReadLogException):
+        list(handler.get_events(file))
+
+
+def test_get_events_missing_file():
+    with pytest.raises(ReadLogException):
+        list(EventHandler().get_events("does/not/exist.log"))
+
+
+def test_event_types_are_skipped():
+    file = os.path.join(VALID_LOGS_DIR, "normal_log.log")
+    all_events = list(UserLogParser(file).events())
+    parser = UserLogParser(file, event_types=STATE_EVENT_TYPES)
+    events = list(parser.events())
+    assert [event.type for event in events] == [
+        event.type for event in all_events
+        if event.type in STATE_EVENT_TYPES
+    ]
+    # skipped events are consumed as well
+    assert parser.n_events == len(all_events)
+    assert parser.offset == os.path.getsize(file)
+
+    event_handler = EventHandler(SUMMARY_EVENT_TYPES)
+    events = list(event_handler.get_events(file))
+    assert JobEventType.IMAGE_SIZE not in [event.type for event in events]
+    assert event_handler.n_events == len(all_events)
+
+
+def test_unhandled_events_are_counted(tmp_path):
+    file = tmp_path / "job.log"
+    file.write_text(
+        SUBMIT_BLOCK +
+        "011 (107799.000.000) 07/11 20:40:51 Job was unsuspended.\n...\n" * 2
+    )
+    event_handler = EventHandler()
+    job_events = [
+        event_handler.get_job_event(event)
+        for event in event_handler.get_events(str(file))
+    ]
+    assert job_events[0] is not None
+    assert job_events[1:] == [None, None]
+    assert event_handler.unhandled_events == {"JOB_UNSUSPENDED": 2}
+
+
+def _read(parser, events):
+    return [repr(event) for event in events], parser.offset, parser.n_events
+
+
+@pytest.mark.parametrize("file", TERMINATED_LOGS)
+def test_tail_first_same_as_events(file):
+    parser = UserLogParser(file, event_types=SUMMARY_EVENT_TYPES)
+    tail_first_parser = UserLogParser(file, event_types=SUMMARY_EVENT_TYPES)
+    events = tail_first_parser.tail_first_events()
+    assert events is not None
+    assert _read(tail_first_parser, events) == _read(
+        parser, parser.events()
+    )
+
+
+def test_tail_first_layout(tmp_path):
+    file = tmp_path / "job.log"
+    execute = (
+        "001 (107799.000.000) 07/11 20:39:54 "
+        "Job executing on host: <10.0.9.1:9618?a>\n...\n"
+    )
+    image_size = (
+        "006 (107799.000.000) 07/11 20:40:00 Image size of job updated: 1\n"
+        "\t1  -  MemoryUsage of job (MB)\n"
+        "\t1  -  ResidentSetSize of job (KB)\n"
+        "...\n"
+    )
+    aborted = (
+        "009 (107799.000.000) 07/11 20:41:00 Job was aborted.\n"
+        "\tvia condor_rm\n...\n"
+    )
+    layouts = [
+        SUBMIT_BLOCK + execute + image_size * 3 + aborted,
+        SUBMIT_BLOCK + image_size + execute + image_size + aborted[:-1],
+        SUBMIT_BLOCK + "\n \n" + execute + aborted,
+        # not the plain layout, continued by events()
+        SUBMIT_BLOCK + execute.replace("...", "...  ") + image_size + aborted,
+        # the separator of the last block is not found
+        SUBMIT_BLOCK + execute.replace("...", "...  \r") + aborted,
+        # not terminated yet or still being written
+        SUBMIT_BLOCK + execute,
+        SUBMIT_BLOCK + aborted + "001 (1"
+    ]
+    for i, text in enumerate(layouts):
+        file.write_text(text)
+        parser = UserLogParser(str(file), event_types=SUMMARY_EVENT_TYPES)
+        tail_first_parser = UserLogParser(
+            str(file),
+            event_types=SUMMARY_EVENT_TYPES
+        )
+        events = tail_first_parser.tail_first_events()
+        if i < 4:
+            assert _read(tail_first_parser, events) == _read(
+                parser, parser.events()
+            )
+        else:
+            assert events is None
+    # nothing is skipped without event types
+    assert UserLogParser(str(file)).tail_first_events() is None
+
+    # an empty block raises the error of events()
+    file.write_text(SUBMIT_BLOCK + execute + "...\n" + aborted)
+    events = UserLogParser(
+        str(file),
+        event_types=SUMMARY_EVENT_TYPES
+    ).tail_first_events()
+    with pytest.raises(UnsupportedEventError, match="Empty event"):
+        list(events)
+
+
+def test_tail_first_random_layouts(tmp_path):
+    with open(os.path.join(VALID_LOGS_DIR, "normal_log.log")) as log:
+        blocks = [block + "...\n" for block in log.read().split("...\n")]
+    pieces = blocks[:-1] + ["\n", "...\n", "... \n", "garbage\n"]
+    rng = random.Random(0)
+    n_tail_first = 0
+    for i in range(200):
+        file = tmp_path / f"job_{i}.log"
+        file.write_text("".join(rng.choices(pieces, k=8)) + blocks[-2])
+        tail_first_parser = UserLogParser(
+            str(file),
+            event_types=SUMMARY_EVENT_TYPES
+        )
+        events = tail_first_parser.tail_first_events()
+        if events is None:
+            continue
+        n_tail_first += 1
+        parser = UserLogParser(str(file), event_types=SUMMARY_EVENT_TYPES)
+        try:
+            expected = _read(parser, parser.events())
+        except UnsupportedEventError:
+            with pytest.raises(UnsupportedEventError):
+                _read(tail_first_parser, events)
+        else:
+            assert _read(tail_first_parser, events) == expected
+    assert n_tail_first
+
+
+def test_tail_first_in_small_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(user_log_parser, "TAIL_SIZE", 16)
+    monkeypatch.setattr(user_log_parser, "TAIL_FIRST_READ_SIZE", 100)
+    for i, file in enumerate(TERMINATED_LOGS):
+        compressed_file = str(tmp_path / f"job_{i}.log.gz")
+        with open(file, "rb") as log, gzip.open(compressed_file, "wb") as gz:
+            gz.write(log.read())
+        for path in [file, compressed_file]:
+            tail_first_parser = UserLogParser(
+                path,
+                event_types=SUMMARY_EVENT_TYPES
+            )
+            events = tail_first_parser.tail_first_events()
+            assert events is not None
+            parser = UserLogParser(path, event_types=SUMMARY_EVENT_TYPES)
+            assert _read(tail_first_parser, events) == _read(
+                parser, parser.events()
+            )
+    test_tail_first_random_layouts(tmp_path)